@@ -8,7 +8,13 @@ Validates feasibility of research requests by:
 - Providing recommendations
 """
 
-from typing import Dict, Any, List
+from collections import OrderedDict
+from contextlib import aclosing
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
 import logging
 import os
 import traceback
@@ -22,11 +28,19 @@ from ..sql_on_fhir.view_definition_manager import ViewDefinitionManager
 from ..sql_on_fhir.runner.in_memory_runner import InMemoryRunner
 from ..sql_on_fhir.runner.hybrid_runner import HybridRunner
 from ..sql_on_fhir.runner.freshness import FreshnessAnnotation
-from ..cache.redis_client import RedisClient
+from ..cache.redis_client import get_redis_client
 
 logger = logging.getLogger(__name__)
 
 
+def _years_before(today: date, years: int) -> date:
+    """Return the calendar date ``years`` years before ``today`` (Feb 29 -> Feb 28)."""
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        return today.replace(year=today.year - years, day=28)
+
+
 class PhenotypeValidationAgent(BaseAgent):
     """
     Agent for validating phenotype feasibility and translating to SQL
@@ -39,12 +53,55 @@ class PhenotypeValidationAgent(BaseAgent):
     - Route to calendar agent if feasible, or escalate if not
     """
 
+    # Resource cap for FHIR-server cohort estimation. Age and concept filters
+    # are pushed into the search itself, so the server only returns matches.
+    VIEW_DEFINITION_ESTIMATE_MAX_RESOURCES = 5000
+
+    # Concept type -> FHIR resource type for reverse-chained _has filters
+    HAS_CHAIN_RESOURCE_TYPES = {"condition": "Condition", "observation": "Observation"}
+
+    # Max concurrent FHIR searches when fanning out shards / ViewDefinitions
+    FHIR_QUERY_CONCURRENCY = 8
+
+    # Pool sizing for the agent's long-lived FHIR client: enough sockets for
+    # concurrent fan-out, kept alive between calls to skip TCP/TLS setup
+    FHIR_POOL_OPTIONS = {
+        "max_connections": 32,
+        "max_keepalive_connections": 32,
+        "keepalive_expiry": 60.0,
+    }
+
+    # Cohort-estimate cache: interactive refinement re-submits identical
+    # requirements, so reuse the count instead of re-scanning the FHIR server
+    COHORT_ESTIMATE_CACHE_TTL_SECONDS = 900
+    COHORT_ESTIMATE_CACHE_MAX_ENTRIES = 256
+
+    # Generated cohorts (patient ids) shared via Redis with later phases
+    COHORT_IDS_CACHE_TTL_SECONDS = 3600
+
+    # Largest cohort pinned into FHIR searches as an id list; beyond this the
+    # query string outgrows what FHIR servers accept on GET
+    COHORT_ID_PUSHDOWN_MAX = 100
+
     def __init__(self, orchestrator=None, database_url: str = None):
         super().__init__(agent_id="phenotype_agent", orchestrator=orchestrator)
         self.sql_generator = SQLGenerator(use_materialized_views=True)
         self.sql_adapter = SQLonFHIRAdapter(database_url)
         self.view_definition_manager = ViewDefinitionManager()
 
+        # Long-lived FHIR client, created on first use (see _get_fhir_client)
+        self._fhir_client = None
+        self._fhir_client_lock = asyncio.Lock()
+
+        # requirements_hash -> (cached_at, cohort_size), oldest first (LRU)
+        self._cohort_estimate_cache: "OrderedDict[str, Tuple[datetime, int]]" = OrderedDict()
+
+        # query key -> in-flight ViewDefinition execution shared by identical callers
+        self._inflight_view_queries: Dict[str, asyncio.Task] = {}
+
+        # Cross-phase cohort cache (cohort:<requirements_hash> -> patient ids)
+        self.redis_client = get_redis_client()
+
         # Sprint 6.5 Phase 2B (#70): wire cohort-estimation reads through
         # HybridRunner with FORMAL_DRAFT mode. The pre-approval workflow
         # step iterates on criteria; FORMAL_DRAFT speed-merges so the
@@ -71,7 +128,7 @@ class PhenotypeValidationAgent(BaseAgent):
             self.hapi_db_client = HAPIDBClient(connection_url=hapi_url)
             self.hybrid_runner = HybridRunner(
                 db_client=self.hapi_db_client,
-                redis_client=RedisClient(),
+                redis_client=self.redis_client,
                 enable_cache=True,
                 cache_ttl_seconds=300,
             )
@@ -92,6 +149,32 @@ class PhenotypeValidationAgent(BaseAgent):
         else:
             raise ValueError(f"Unknown task: {task}")
 
+    async def _get_fhir_client(self):
+        """
+        Return the agent's pooled FHIR client, creating it on first use
+
+        The client (and its keep-alive connection pool) is reused across calls
+        instead of being created and closed per query. Released by close().
+        """
+        if self._fhir_client is None:
+            async with self._fhir_client_lock:
+                if self._fhir_client is None:
+                    self._fhir_client = await create_fhir_client(**self.FHIR_POOL_OPTIONS)
+        return self._fhir_client
+
+    async def close(self):
+        """
+        Release the pooled FHIR client and HAPI DB connections
+
+        The Redis client is the process-wide one shared with the speed layer;
+        close_redis_client() shuts it down from the application lifespan.
+        """
+        if self._fhir_client is not None:
+            await self._fhir_client.close()
+            self._fhir_client = None
+        if self.hapi_db_client and self.hapi_db_client.pool:
+            await self.hapi_db_client.close()
+
     async def _validate_feasibility(self, context: Dict) -> Dict[str, Any]:
         """
         Check if requested data exists and is feasible to extract
@@ -942,53 +1025,112 @@ class PhenotypeValidationAgent(BaseAgent):
             )
 
     async def _estimate_cohort_size_with_view_definitions(
-        self, requirements: Dict[str, Any]
+        self, requirements: Dict[str, Any], count_limit: Optional[int] = None
     ) -> int:
         """
         Estimate cohort size using SQL-on-FHIR v2 ViewDefinitions
 
+        A single search is counted without building rows (``runner.count``:
+        server-side ``_summary=count`` when the view has no where clauses).
+        OR-ed code lists are split into one FHIR search per code (see
+        ``_shard_search_params``) and the shards stream concurrently; the
+        cohort is the number of distinct patient ids across shards. Rows are
+        counted page by page and never materialized as a list.
+
+        Results are cached per ``requirements_hash`` for
+        COHORT_ESTIMATE_CACHE_TTL_SECONDS; failed or truncated estimates are
+        not cached. Streamed estimates also publish their patient ids to Redis
+        (``cohort:<hash>``) so later phases reuse the generated cohort; see
+        ``get_cohort_patient_ids``.
+
         Args:
             requirements: Structured requirements
+            count_limit: Stop fetching once more than this many patients are
+                found (the result is then a lower bound, count_limit + 1)
 
         Returns:
             Estimated patient count
         """
+        cache_key = self.requirements_hash(requirements)
+        cached = self._get_cached_cohort_estimate(cache_key)
+        if cached is not None:
+            logger.info(
+                f"[{self.agent_id}] Cohort estimate cache HIT ({cache_key}): {cached} patients"
+            )
+            return cached
+
+        cohort_ids = await self.get_cohort_patient_ids(requirements)
+        if cohort_ids is not None:
+            logger.info(
+                f"[{self.agent_id}] Reusing generated cohort ({cache_key}): "
+                f"{len(cohort_ids)} patients"
+            )
+            self._put_cached_cohort_estimate(cache_key, len(cohort_ids))
+            return len(cohort_ids)
+
         try:
-            # Create FHIR client
-            fhir_client = await create_fhir_client()
+            fhir_client = await self._get_fhir_client()
 
-            try:
-                # Use patient_demographics ViewDefinition for cohort estimation
-                view_def = self.view_definition_manager.load("patient_demographics")
+            # Use patient_demographics ViewDefinition for cohort estimation
+            view_def = self.view_definition_manager.load("patient_demographics")
 
-                # Build search parameters from requirements
-                search_params = self._build_search_params_from_requirements(requirements)
+            # Build search parameters from requirements (filters pushed to FHIR server)
+            search_params = self._build_fhir_search_params_from_requirements(requirements)
+            shards = self._shard_search_params(search_params)
 
-                # Execute ViewDefinition with in-memory runner
-                runner = InMemoryRunner(fhir_client)
+            # One runner for every shard so they share the client's connection pool
+            runner = InMemoryRunner(fhir_client)
+
+            logger.info(
+                f"[{self.agent_id}] Estimating cohort using ViewDefinition 'patient_demographics' "
+                f"({len(shards)} concurrent search(es))"
+            )
 
+            if count_limit is None and len(shards) == 1:
+                # No cross-shard union to dedupe: count without building rows
+                cohort_size = await runner.count(
+                    view_def,
+                    search_params=shards[0],
+                    max_resources=self.VIEW_DEFINITION_ESTIMATE_MAX_RESOURCES,
+                )
                 logger.info(
-                    f"[{self.agent_id}] Estimating cohort using ViewDefinition 'patient_demographics'"
+                    f"[{self.agent_id}] ViewDefinition-based cohort estimation: "
+                    f"{cohort_size} patients (count-only)"
                 )
+                self._put_cached_cohort_estimate(cache_key, cohort_size)
+                return cohort_size
+
+            patient_ids = set()
 
-                rows = await runner.execute(
+            async def count_shard(shard: Dict[str, Any]) -> None:
+                rows = runner.execute_stream(
                     view_def,
-                    search_params=search_params,
-                    max_resources=10000,  # Limit for estimation
+                    search_params=shard,
+                    max_resources=self.VIEW_DEFINITION_ESTIMATE_MAX_RESOURCES,
                 )
+                async with aclosing(rows):
+                    async for row in rows:
+                        if count_limit is not None and len(patient_ids) > count_limit:
+                            return
+                        # forEach blocks add rows without the resource id
+                        patient_id = row.get("id")
+                        if patient_id is not None:
+                            patient_ids.add(patient_id)
 
-                # Apply additional filters based on requirements
-                filtered_rows = self._filter_rows_by_requirements(rows, requirements)
+            await self._gather_bounded(count_shard(shard) for shard in shards)
 
-                cohort_size = len(filtered_rows)
-                logger.info(
-                    f"[{self.agent_id}] ViewDefinition-based cohort estimation: {cohort_size} patients"
-                )
+            cohort_size = len(patient_ids)
+            truncated = count_limit is not None and cohort_size > count_limit
 
-                return cohort_size
+            logger.info(
+                f"[{self.agent_id}] ViewDefinition-based cohort estimation: {cohort_size} patients"
+                + (f" (stopped early, limit {count_limit})" if truncated else "")
+            )
 
-            finally:
-                await fhir_client.close()
+            if not truncated:
+                self._put_cached_cohort_estimate(cache_key, cohort_size)
+                await self._store_cohort_patient_ids(cache_key, patient_ids)
+            return cohort_size
 
         except Exception as e:
             logger.error(
@@ -998,80 +1140,342 @@ class PhenotypeValidationAgent(BaseAgent):
             logger.info(f"[{self.agent_id}] Falling back to legacy SQL estimation")
             return 0
 
+    @staticmethod
+    def requirements_hash(requirements: Dict[str, Any]) -> str:
+        """
+        Stable identifier for a requirements dict
+
+        Canonical JSON (sorted keys) hashed with BLAKE2b, so re-submitted
+        requirements map to the same key regardless of dict ordering. Callers
+        can use it to key their own per-cohort results.
+        """
+        canonical = json.dumps(requirements, sort_keys=True, default=str)
+        return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+    async def get_cohort_patient_ids(self, requirements: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Patient ids of the cohort generated for these requirements, if cached
+
+        Returns None when no cohort was generated within
+        COHORT_IDS_CACHE_TTL_SECONDS or Redis is unavailable.
+        """
+        try:
+            return await self.redis_client.get_cohort_patient_ids(
+                self.requirements_hash(requirements)
+            )
+        except Exception as e:
+            logger.debug(f"[{self.agent_id}] Cohort id cache unavailable: {e}")
+            return None
+
+    async def _store_cohort_patient_ids(self, cache_key: str, patient_ids) -> None:
+        """Publish a generated cohort to Redis; a cache failure never fails the estimate"""
+        try:
+            await self.redis_client.set_cohort_patient_ids(
+                cache_key,
+                sorted(pid for pid in patient_ids if pid is not None),
+                ttl_seconds=self.COHORT_IDS_CACHE_TTL_SECONDS,
+            )
+        except Exception as e:
+            logger.debug(f"[{self.agent_id}] Could not cache cohort ids: {e}")
+
+    @classmethod
+    def _pin_to_cohort(
+        cls,
+        search_params: Dict[str, Any],
+        resource_type: str,
+        cohort_ids: Optional[List[str]],
+    ) -> Dict[str, Any]:
+        """
+        Restrict a search to a previously generated cohort
+
+        Patient searches get ``_id=<ids>``, other resources
+        ``patient=Patient/<id>,...``. Skipped for unknown, empty, or large
+        cohorts (see COHORT_ID_PUSHDOWN_MAX), where the other params still
+        apply.
+        """
+        if not cohort_ids or len(cohort_ids) > cls.COHORT_ID_PUSHDOWN_MAX:
+            return search_params
+
+        if resource_type == "Patient":
+            return {**search_params, "_id": ",".join(cohort_ids)}
+        return {**search_params, "patient": ",".join(f"Patient/{pid}" for pid in cohort_ids)}
+
+    def _get_cached_cohort_estimate(self, cache_key: str) -> Optional[int]:
+        """Return a cached cohort size, or None if missing or expired"""
+        entry = self._cohort_estimate_cache.get(cache_key)
+        if entry is None:
+            return None
+
+        cached_at, cohort_size = entry
+        age = (datetime.now() - cached_at).total_seconds()
+        if age > self.COHORT_ESTIMATE_CACHE_TTL_SECONDS:
+            del self._cohort_estimate_cache[cache_key]
+            return None
+
+        self._cohort_estimate_cache.move_to_end(cache_key)
+        return cohort_size
+
+    def _put_cached_cohort_estimate(self, cache_key: str, cohort_size: int):
+        """Store a cohort size, evicting the least recently used entry when full"""
+        self._cohort_estimate_cache[cache_key] = (datetime.now(), cohort_size)
+        self._cohort_estimate_cache.move_to_end(cache_key)
+        while len(self._cohort_estimate_cache) > self.COHORT_ESTIMATE_CACHE_MAX_ENTRIES:
+            self._cohort_estimate_cache.popitem(last=False)
+
+    def clear_cohort_estimate_cache(self):
+        """Drop cached cohort estimates (call when the FHIR data source changes)"""
+        self._cohort_estimate_cache.clear()
+
+    async def _gather_bounded(self, coroutines) -> list:
+        """
+        Await coroutines concurrently, at most FHIR_QUERY_CONCURRENCY at a time
+
+        Returns:
+            Results in the same order as the input coroutines
+        """
+        semaphore = asyncio.Semaphore(self.FHIR_QUERY_CONCURRENCY)
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(bounded(coro) for coro in coroutines))
+
+    async def _execute_view_coalesced(
+        self,
+        runner: InMemoryRunner,
+        view_def: Dict[str, Any],
+        search_params: Dict[str, Any],
+        max_resources: Optional[int],
+    ) -> list:
+        """
+        Run a ViewDefinition, sharing one FHIR search among identical concurrent calls
+
+        Concurrent phenotype validations often ask for the same view with the
+        same scoped params. The first caller starts the query; later callers
+        with the same key await that task instead of issuing their own search.
+        The entry is dropped once the query finishes, so this never serves
+        stale rows (result caching stays with the runner).
+
+        Callers receive the same list object and must not mutate it.
+        """
+        key = self.requirements_hash(
+            {
+                "view": view_def.get("name"),
+                "search_params": search_params,
+                "max_resources": max_resources,
+            }
+        )
+
+        task = self._inflight_view_queries.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                runner.execute(view_def, search_params=search_params, max_resources=max_resources)
+            )
+            self._inflight_view_queries[key] = task
+            task.add_done_callback(lambda done: self._release_inflight_view_query(key, done))
+        else:
+            logger.debug(
+                f"[{self.agent_id}] Joining in-flight query for ViewDefinition "
+                f"'{view_def.get('name')}'"
+            )
+
+        # Shield so one caller's cancellation doesn't fail the others
+        return await asyncio.shield(task)
+
+    def _release_inflight_view_query(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished in-flight query (done-callback)"""
+        if self._inflight_view_queries.get(key) is task:
+            del self._inflight_view_queries[key]
+        # Mark the exception retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    def _scope_search_params(search_params: Dict[str, Any], resource_type: str) -> Dict[str, Any]:
+        """
+        Re-target Patient-level search params at another resource type
+
+        Patient searches use the params as-is. For other resources the
+        demographic params are chained through the ``patient`` reference
+        (``Condition?patient.gender=female``) and reverse ``_has`` chains,
+        which only make sense on Patient, are dropped.
+        """
+        if resource_type in (None, "Patient"):
+            return dict(search_params)
+        return {
+            f"patient.{key}": value
+            for key, value in search_params.items()
+            if not key.startswith("_has:")
+        }
+
+    @staticmethod
+    def _shard_search_params(search_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split an OR-ed ``_has`` code list into one search per code
+
+        ``_has:Condition:patient:code=a,b,c`` ORs the codes inside a single
+        chained query; one search per code returns the same patients (once
+        unioned) and lets the searches overlap. Only a key with a single value
+        is split — repeated values are AND-ed and must stay together.
+
+        Returns:
+            List of search-param dicts (just ``[search_params]`` when unsplittable)
+        """
+        for key, values in search_params.items():
+            if key.startswith("_has:") and isinstance(values, list) and len(values) == 1:
+                codes = values[0].split(",")
+                if len(codes) > 1:
+                    return [{**search_params, key: [code]} for code in codes]
+        return [search_params]
+
+    @staticmethod
+    def _inclusion_concepts(requirements: Dict[str, Any]) -> List[Tuple[Dict, Dict]]:
+        """Flatten inclusion criteria into (criterion, concept) pairs, walked once per build"""
+        return [
+            (criterion, concept)
+            for criterion in requirements.get("inclusion_criteria", [])
+            if isinstance(criterion, dict)
+            for concept in criterion.get("concepts", [])
+        ]
+
     def _build_search_params_from_requirements(
-        self, requirements: Dict[str, Any]
+        self,
+        requirements: Dict[str, Any],
+        inclusion_concepts: Optional[List[Tuple[Dict, Dict]]] = None,
     ) -> Dict[str, Any]:
         """
-        Build FHIR search parameters from requirements
+        Build search parameters from requirements
+
+        Only emits parameters every runner understands (currently ``gender``).
+        The MaterializedViewRunner maps these straight onto WHERE clauses, so
+        FHIR-only syntax (date prefixes, ``_has`` chains) must not leak in here;
+        use ``_build_fhir_search_params_from_requirements`` for FHIR-server reads.
 
         Args:
             requirements: Structured requirements
+            inclusion_concepts: Pre-flattened ``_inclusion_concepts`` pairs, if
+                the caller already has them
 
         Returns:
             FHIR search parameters dict
         """
+        if inclusion_concepts is None:
+            inclusion_concepts = self._inclusion_concepts(requirements)
+
         params = {}
 
         # Extract demographic criteria
-        inclusion_criteria = requirements.get("inclusion_criteria", [])
+        demographic_terms = [
+            concept.get("term", "").lower()
+            for _, concept in inclusion_concepts
+            if concept.get("type") == "demographic"
+        ]
 
-        for criterion in inclusion_criteria:
-            concepts = criterion.get("concepts", [])
-
-            for concept in concepts:
-                if concept.get("type") == "demographic":
-                    term = concept.get("term", "").lower()
-                    details = concept.get("details", "")
-
-                    # Gender filter
-                    if term in ["male", "female"]:
-                        params["gender"] = term
-
-                    # Age filter (approximate with birthdate)
-                    if "age" in term and ">" in details:
-                        # Example: "age > 18" -> birthdate before X years ago
-                        try:
-                            age = int(details.split(">")[1].strip())
-                            # Could calculate birthdate range here
-                            # For now, we'll filter in memory
-                        except:
-                            pass
+        for term in demographic_terms:
+            # Gender filter
+            if term in ("male", "female"):
+                params["gender"] = term
 
         logger.debug(f"[{self.agent_id}] Built search params: {params}")
         return params
 
-    def _filter_rows_by_requirements(self, rows: list, requirements: Dict[str, Any]) -> list:
+    def _build_fhir_search_params_from_requirements(
+        self, requirements: Dict[str, Any], today: Optional[date] = None
+    ) -> Dict[str, Any]:
         """
-        Apply additional filters to ViewDefinition results based on requirements
+        Build FHIR REST search parameters from requirements
+
+        Pushes the age and inclusion-concept filters down to the FHIR server
+        so InMemoryRunner only fetches matching resources:
+        - age criteria become ``birthdate`` prefix comparisons (le/gt)
+        - condition concepts become ``_has:Condition:patient:code`` chains
+        - observation concepts become ``_has:Observation:patient:code`` chains
+
+        Repeated parameters are emitted as lists (httpx sends them as repeated
+        query keys, which FHIR search ANDs together).
 
         Args:
-            rows: ViewDefinition result rows
             requirements: Structured requirements
+            today: Reference date for age arithmetic (defaults to date.today())
 
         Returns:
-            Filtered rows
+            FHIR search parameters dict
         """
-        filtered = rows
-
-        # Apply age filters
-        inclusion_criteria = requirements.get("inclusion_criteria", [])
+        inclusion_concepts = self._inclusion_concepts(requirements)
+        params = self._build_search_params_from_requirements(requirements, inclusion_concepts)
+        today = today or date.today()
+        has_chain_types = self.HAS_CHAIN_RESOURCE_TYPES
+
+        for criterion, concept in inclusion_concepts:
+            concept_type = concept.get("type")
+            term = concept.get("term", "")
+
+            if concept_type == "demographic" and "age" in term.lower():
+                for value in self._age_to_birthdate_params(concept.get("details", ""), today):
+                    params.setdefault("birthdate", []).append(value)
+
+            elif concept_type in has_chain_types:
+                resource_type = has_chain_types[concept_type]
+                tokens = self._concept_code_tokens(concept, criterion)
+                if tokens:
+                    key = f"_has:{resource_type}:patient:code"
+                    params.setdefault(key, []).append(",".join(tokens))
+                elif term:
+                    key = f"_has:{resource_type}:patient:code:text"
+                    params.setdefault(key, []).append(term)
+
+        logger.debug(f"[{self.agent_id}] Built FHIR search params: {params}")
+        return params
 
-        for criterion in inclusion_criteria:
-            concepts = criterion.get("concepts", [])
+    @staticmethod
+    def _age_to_birthdate_params(details: str, today: date) -> List[str]:
+        """
+        Translate an age criterion into FHIR ``birthdate`` prefix values
 
-            for concept in concepts:
-                if concept.get("type") == "demographic":
-                    term = concept.get("term", "").lower()
-                    details = concept.get("details", "")
+        Ages are whole years, so "over N" means age >= N+1 (born on or before
+        today minus N+1 years) and "under N" means born after today minus N
+        years. Ranges are inclusive on both ends.
 
-                    if "age" in term:
-                        # Apply age filter
-                        # This would require calculating age from birth_date
-                        # For now, we'll keep all rows
-                        pass
+        Returns:
+            List of prefixed dates (e.g. ["le2006-05-01"]); empty if unparseable
+        """
+        op, value = SQLGenerator._parse_age_details(details)
+        if op == "BETWEEN":
+            lo, hi = value
+            return [
+                f"le{_years_before(today, lo).isoformat()}",
+                f"gt{_years_before(today, hi + 1).isoformat()}",
+            ]
+        if op == ">":
+            return [f"le{_years_before(today, value + 1).isoformat()}"]
+        if op == "<":
+            return [f"gt{_years_before(today, value).isoformat()}"]
+        return []
+
+    @staticmethod
+    def _concept_code_tokens(concept: Dict[str, Any], criterion: Dict[str, Any]) -> List[str]:
+        """
+        Collect ``system|code`` search tokens for a concept
 
-        logger.debug(f"[{self.agent_id}] Filtered {len(rows)} -> {len(filtered)} rows")
-        return filtered
+        Codes may sit on the concept itself (``code``/``system`` or a ``codes``
+        list) or on the parent criterion's ``codes`` list once the terminology
+        server populates it.
+        """
+        codings = list(concept.get("codes") or [])
+        if concept.get("code"):
+            codings.append({"system": concept.get("system"), "code": concept["code"]})
+        if not codings:
+            codings = list(criterion.get("codes") or [])
+
+        tokens = []
+        for coding in codings:
+            if isinstance(coding, str):
+                tokens.append(coding)
+            elif isinstance(coding, dict) and coding.get("code"):
+                system = coding.get("system")
+                tokens.append(f"{system}|{coding['code']}" if system else coding["code"])
+        return tokens
 
     async def execute_view_definition_for_phenotype(
         self, view_name: str, requirements: Dict[str, Any], max_resources: int = None
@@ -1099,36 +1503,93 @@ class PhenotypeValidationAgent(BaseAgent):
             # Load ViewDefinition
             view_def = self.view_definition_manager.load(view_name)
 
-            # Create FHIR client and runner
-            fhir_client = await create_fhir_client()
+            fhir_client = await self._get_fhir_client()
+            runner = InMemoryRunner(fhir_client)
+
+            # Build search parameters, pinned to the generated cohort if known
+            search_params = self._pin_to_cohort(
+                self._scope_search_params(
+                    self._build_fhir_search_params_from_requirements(requirements),
+                    view_def.get("resource"),
+                ),
+                view_def.get("resource"),
+                await self.get_cohort_patient_ids(requirements),
+            )
 
-            try:
-                runner = InMemoryRunner(fhir_client)
+            logger.info(
+                f"[{self.agent_id}] Executing ViewDefinition '{view_name}' "
+                f"for phenotype validation"
+            )
 
-                # Build search parameters
-                search_params = self._build_search_params_from_requirements(requirements)
+            # Execute ViewDefinition (joining an identical in-flight query if any)
+            rows = await self._execute_view_coalesced(
+                runner, view_def, search_params, max_resources
+            )
 
-                logger.info(
-                    f"[{self.agent_id}] Executing ViewDefinition '{view_name}' "
-                    f"for phenotype validation"
-                )
+            logger.info(
+                f"[{self.agent_id}] ViewDefinition '{view_name}' returned " f"{len(rows)} rows"
+            )
 
-                # Execute ViewDefinition
-                rows = await runner.execute(
-                    view_def, search_params=search_params, max_resources=max_resources
-                )
+            return rows
 
-                logger.info(
-                    f"[{self.agent_id}] ViewDefinition '{view_name}' returned " f"{len(rows)} rows"
-                )
+        except Exception as e:
+            logger.error(
+                f"[{self.agent_id}] Failed to execute ViewDefinition '{view_name}': {str(e)}"
+            )
+            raise
 
-                return rows
+    async def execute_view_definitions_for_phenotype(
+        self, view_names: List[str], requirements: Dict[str, Any], max_resources: int = None
+    ) -> Dict[str, list]:
+        """
+        Execute several ViewDefinitions concurrently with requirements-based filtering
+
+        All views share the pooled FHIR client and one runner; at most
+        FHIR_QUERY_CONCURRENCY searches are in flight at once.
+
+        Args:
+            view_names: Names of ViewDefinitions to execute
+            requirements: Structured requirements for filtering
+            max_resources: Maximum resources to process per view
 
-            finally:
-                await fhir_client.close()
+        Returns:
+            Dict mapping view name to its result rows
+
+        Example:
+            results = await agent.execute_view_definitions_for_phenotype(
+                ["patient_demographics", "condition_diagnoses"], requirements
+            )
+        """
+        view_defs = [self.view_definition_manager.load(name) for name in view_names]
+        search_params = self._build_fhir_search_params_from_requirements(requirements)
+        cohort_ids = await self.get_cohort_patient_ids(requirements)
+
+        try:
+            runner = InMemoryRunner(await self._get_fhir_client())
+
+            logger.info(
+                f"[{self.agent_id}] Executing {len(view_names)} ViewDefinitions concurrently "
+                f"for phenotype validation"
+            )
+
+            results = await self._gather_bounded(
+                self._execute_view_coalesced(
+                    runner,
+                    view_def,
+                    self._pin_to_cohort(
+                        self._scope_search_params(search_params, view_def.get("resource")),
+                        view_def.get("resource"),
+                        cohort_ids,
+                    ),
+                    max_resources,
+                )
+                for view_def in view_defs
+            )
+
+            return dict(zip(view_names, results))
 
         except Exception as e:
             logger.error(
-                f"[{self.agent_id}] Failed to execute ViewDefinition '{view_name}': {str(e)}"
+                f"[{self.agent_id}] Failed to execute ViewDefinitions {view_names}: {str(e)}"
             )
             raise
@@ -4,13 +4,72 @@ Quality Assurance Agent
 Validates extracted data quality before delivery to researcher.
 """
 
-from typing import Dict, Any
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Any, Optional
 import logging
+import re
+import numpy as np
+import orjson
 from langsmith import traceable
 from .base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+# Fields that must be absent (or empty) for each PHI level
+PROHIBITED_FIELDS_BY_PHI_LEVEL = {
+    "de-identified": ["patient_name", "ssn", "mrn", "address", "phone"],
+    "limited_dataset": ["patient_name", "ssn", "address"],
+}
+
+
+def _compile_prohibited_field_pattern(fields: list) -> "re.Pattern[bytes]":
+    """
+    Match a prohibited key followed by a non-empty value in compact JSON
+
+    Falsy values (null, "", false, 0, [], {}) are excluded, mirroring the
+    per-record truthiness check. Anything the lookahead misses only costs a
+    fall-through to the exact per-field scan, never a missed PHI field.
+    """
+    names = "|".join(re.escape(field) for field in fields)
+    return re.compile(rb'"(?:' + names.encode() + rb')":(?!null|""|false|0[,}]|0\.0[,}]|\[\]|\{\})')
+
+
+PROHIBITED_FIELD_PATTERNS = {
+    phi_level: _compile_prohibited_field_pattern(fields)
+    for phi_level, fields in PROHIBITED_FIELDS_BY_PHI_LEVEL.items()
+}
+
+# Dates before this are treated as data-entry errors rather than real events
+EARLIEST_PLAUSIBLE_DATE = date(1900, 1, 1)
+
+
+@lru_cache(maxsize=8192)
+def _parse_iso_date(value: str) -> Optional[date]:
+    """
+    Calendar date of an ISO-8601 string, else None
+
+    Memoized: a cohort's date columns repeat the same few thousand values
+    across many rows, so most lookups skip the slice and parse entirely.
+    """
+    if len(value) < 10:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    """Calendar date of an ISO-8601 string or date/datetime, else None"""
+    if isinstance(value, str):
+        return _parse_iso_date(value)
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return None
+
 
 class QualityAssuranceAgent(BaseAgent):
     """
@@ -25,6 +84,15 @@ class QualityAssuranceAgent(BaseAgent):
     - Route to delivery if passed, escalate if failed
     """
 
+    # Duplicate records listed in the data-quality report (all are counted)
+    DUPLICATE_DETAILS_LIMIT = 10
+
+    # De-identification scans every record, serializing this many per regex pass
+    DEIDENTIFICATION_SCAN_CHUNK = 1000
+
+    # Leaking records reported per element before its scan stops early
+    DEIDENTIFICATION_ISSUES_PER_ELEMENT = 100
+
     def __init__(self, orchestrator=None):
         super().__init__(agent_id="qa_agent", orchestrator=orchestrator)
 
@@ -55,6 +123,7 @@ class QualityAssuranceAgent(BaseAgent):
         requirements = context.get("structured_requirements") or context.get("requirements")
 
         data_package = context.get("data_package")
+        phi_level = requirements.get("phi_level")
 
         logger.info(f"[{self.agent_id}] Running QA checks for {request_id}")
 
@@ -69,10 +138,8 @@ class QualityAssuranceAgent(BaseAgent):
         qa_report["checks"].append(quality_check)
 
         # Check 3: PHI scrubbing validation (if de-identified)
-        if requirements.get("phi_level") != "identified":
-            phi_check = await self._validate_deidentification(
-                data_package, requirements.get("phi_level")
-            )
+        if phi_level != "identified":
+            phi_check = await self._validate_deidentification(data_package, phi_level)
             qa_report["checks"].append(phi_check)
 
         # Check 4: Cohort validation
@@ -405,8 +472,9 @@ class QualityAssuranceAgent(BaseAgent):
         Returns:
             Check result dict
         """
-        requested_elements = set(requirements.get("data_elements", []))
-        extracted_elements = set(data_package.get("data_elements", {}).keys())
+        requested_elements = frozenset(requirements.get("data_elements") or ())
+        # dict keys views support set difference directly; no copy needed
+        extracted_elements = data_package.get("data_elements", {}).keys()
 
         missing_elements = requested_elements - extracted_elements
         passed = len(missing_elements) == 0
@@ -418,7 +486,7 @@ class QualityAssuranceAgent(BaseAgent):
             "details": {
                 "requested_count": len(requested_elements),
                 "extracted_count": len(extracted_elements),
-                "missing_elements": list(missing_elements),
+                "missing_elements": sorted(missing_elements),
             },
             "message": (
                 "All requested data elements extracted"
@@ -435,41 +503,54 @@ class QualityAssuranceAgent(BaseAgent):
         - High missing data rates
         - Duplicate records
         - Date inconsistencies
+
+        Each element's records are walked once (see _profile_records) and
+        every check reads from that profile.
         """
         issues = []
+        duplicate_count = 0
+        duplicate_details = []
+        date_issues = []
         data_elements = data_package.get("data_elements", {})
 
-        # Check missing data rates
         for element_name, records in data_elements.items():
             if not records:
                 continue
 
-            missing_rate = self._calculate_missing_rate(records)
+            profile = self._profile_records(records)
 
-            if missing_rate > 0.3:  # 30% threshold
+            if profile["missing_rate"] > 0.3:  # 30% threshold
                 issues.append(
                     {
                         "element": element_name,
                         "issue": "high_missing_rate",
-                        "rate": missing_rate,
+                        "rate": profile["missing_rate"],
                         "severity": "warning",
                     }
                 )
 
-        # Check for duplicates
-        duplicates = self._check_duplicates(data_package)
-        if duplicates:
+            # Count every repeat, but only materialize the few that get reported
+            duplicate_count += len(profile["repeat_indices"])
+            duplicate_details.extend(
+                self._duplicate_details(
+                    element_name,
+                    records,
+                    profile,
+                    limit=self.DUPLICATE_DETAILS_LIMIT - len(duplicate_details),
+                )
+            )
+            date_issues.extend(self._date_issues(element_name, profile))
+
+        if duplicate_count:
             issues.append(
                 {
                     "issue": "duplicate_records",
-                    "count": len(duplicates),
+                    "count": duplicate_count,
                     "severity": "critical",
-                    "details": duplicates[:10],  # First 10 duplicates
+                    "details": duplicate_details,  # First DUPLICATE_DETAILS_LIMIT duplicates
                 }
             )
 
-        # Check date consistency
-        date_issues = self._validate_dates(data_package)
         issues.extend(date_issues)
 
         passed = len([i for i in issues if i.get("severity") == "critical"]) == 0
@@ -496,27 +577,44 @@ class QualityAssuranceAgent(BaseAgent):
         data_elements = data_package.get("data_elements", {})
 
         # Fields that should not be present
-        prohibited_fields = []
-        if phi_level == "de-identified":
-            prohibited_fields = ["patient_name", "ssn", "mrn", "address", "phone"]
-        elif phi_level == "limited_dataset":
-            prohibited_fields = ["patient_name", "ssn", "address"]
+        prohibited_fields = PROHIBITED_FIELDS_BY_PHI_LEVEL.get(phi_level, [])
+        pattern = PROHIBITED_FIELD_PATTERNS.get(phi_level)
 
-        # Check for prohibited fields
+        # Check for prohibited fields in every record (not just a sample).
+        # Records are serialized and regex-scanned in chunks; only a chunk
+        # with a hit gets the per-record walk that pinpoints the PHI
         for element_name, records in data_elements.items():
-            for record in records[:100]:  # Sample first 100
-                for field in prohibited_fields:
-                    if field in record and record[field]:
-                        issues.append(
-                            {
-                                "issue": "phi_not_removed",
-                                "field": field,
-                                "element": element_name,
-                                "severity": "critical",
-                            }
-                        )
+            if pattern is None:
+                break
+
+            element_issues = 0
+            for start in range(0, len(records), self.DEIDENTIFICATION_SCAN_CHUNK):
+                chunk = records[start : start + self.DEIDENTIFICATION_SCAN_CHUNK]
+                blob = orjson.dumps(chunk, default=str, option=orjson.OPT_NON_STR_KEYS)
+                if not pattern.search(blob):
+                    continue
+
+                for record in chunk:
+                    for field in prohibited_fields:
+                        if field in record and record[field]:
+                            issues.append(
+                                {
+                                    "issue": "phi_not_removed",
+                                    "field": field,
+                                    "element": element_name,
+                                    "severity": "critical",
+                                }
+                            )
+                            element_issues += 1
+                            break
+
+                    if element_issues >= self.DEIDENTIFICATION_ISSUES_PER_ELEMENT:
                         break
 
+                # The element already fails; stop scanning it
+                if element_issues >= self.DEIDENTIFICATION_ISSUES_PER_ELEMENT:
+                    break
+
         passed = len(issues) == 0
 
         return {
@@ -539,8 +637,11 @@ class QualityAssuranceAgent(BaseAgent):
         - Cohort size within expected range
         - Demographic distribution reasonable
         """
-        cohort = data_package.get("cohort", [])
-        cohort_size = len(cohort)
+        # Extraction records the count in metadata, so a streamed package
+        # need not carry the full cohort list just to be measured
+        cohort_size = (data_package.get("metadata") or {}).get("cohort_size")
+        if cohort_size is None:
+            cohort_size = len(data_package.get("cohort", []))
 
         feasibility_report = requirements.get("feasibility_report", {})
         estimated_size = feasibility_report.get("estimated_cohort_size", cohort_size)
@@ -565,47 +666,148 @@ class QualityAssuranceAgent(BaseAgent):
             "message": f"Cohort size: {cohort_size} " f"(expected: {estimated_size})",
         }
 
-    def _calculate_missing_rate(self, records: list) -> float:
-        """Calculate rate of missing/null values in records"""
-        if not records:
-            return 0.0
+    def _profile_records(self, records: list, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Collect every data-quality signal for one element in a single pass
 
+        Per record: field and missing-value counts (None and "" are missing;
+        keys a record lacks are not fields), the (patient_id, date)
+        fingerprint for duplicate detection, and out-of-range values in
+        date fields (``date`` or ``*_date``). A plain loop over the dicts
+        beats building a DataFrame first, which is itself a full pass.
+
+        Returns:
+            Dict with missing_rate, repeat_indices (positions of records
+            whose fingerprint appeared earlier), future_dates and
+            implausible_dates counts
+        """
+        today = today or date.today()
         total_fields = 0
         missing_fields = 0
+        future_dates = 0
+        implausible_dates = 0
+        fingerprints = np.empty(len(records), dtype=np.int64)
+
+        # An element's records share (nearly) one schema, so each key is
+        # classified once instead of string-matching every field of every row
+        is_date_key: Dict[Any, bool] = {}
 
-        for record in records:
-            for key, value in record.items():
-                total_fields += 1
+        for i, record in enumerate(records):
+            total_fields += len(record)
+            for value in record.values():
                 if value is None or value == "":
                     missing_fields += 1
 
-        return missing_fields / total_fields if total_fields > 0 else 0.0
+            for key in record:
+                flag = is_date_key.get(key)
+                if flag is None:
+                    flag = is_date_key[key] = isinstance(key, str) and (
+                        key == "date" or key.endswith("_date")
+                    )
+                if not flag:
+                    continue
+                parsed = _parse_date(record[key])
+                if parsed is None:
+                    continue
+                if parsed > today:
+                    future_dates += 1
+                elif parsed < EARLIEST_PLAUSIBLE_DATE:
+                    implausible_dates += 1
+
+            fingerprints[i] = self._record_fingerprint(record)
+
+        repeat_indices = np.empty(0, dtype=np.intp)
+        if len(records) > 1:
+            _, first_index = np.unique(fingerprints, return_index=True)
+            if len(first_index) < len(records):
+                is_repeat = np.ones(len(records), dtype=bool)
+                is_repeat[first_index] = False
+                repeat_indices = np.flatnonzero(is_repeat)
+
+        return {
+            "missing_rate": missing_fields / total_fields if total_fields else 0.0,
+            "repeat_indices": repeat_indices,
+            "future_dates": future_dates,
+            "implausible_dates": implausible_dates,
+        }
+
+    def _calculate_missing_rate(self, records: list) -> float:
+        """Calculate rate of missing/null values in records"""
+        if not records:
+            return 0.0
+        return self._profile_records(records)["missing_rate"]
 
     def _check_duplicates(self, data_package: Dict) -> list:
-        """Check for duplicate records"""
+        """
+        Check for duplicate records
+
+        Records are fingerprinted by hashing their (patient_id, date) tuple;
+        one np.unique pass finds every repeat (see _profile_records).
+        """
         duplicates = []
         data_elements = data_package.get("data_elements", {})
 
         for element_name, records in data_elements.items():
-            seen = set()
-            for record in records:
-                # Create a simple fingerprint (in production use better method)
-                fingerprint = str(record.get("patient_id", "")) + str(record.get("date", ""))
-                if fingerprint in seen:
-                    duplicates.append({"element": element_name, "fingerprint": fingerprint})
-                seen.add(fingerprint)
+            if len(records) < 2:
+                continue
+            profile = self._profile_records(records)
+            duplicates.extend(self._duplicate_details(element_name, records, profile))
 
         return duplicates
 
+    @staticmethod
+    def _duplicate_details(
+        element_name: str, records: list, profile: Dict, limit: Optional[int] = None
+    ) -> list:
+        """Readable fingerprints for (the first `limit`) repeats found by _profile_records"""
+        details = []
+        for i in profile["repeat_indices"][:limit]:
+            record = records[i]
+            fingerprint = str(record.get("patient_id", "")) + str(record.get("date", ""))
+            details.append({"element": element_name, "fingerprint": fingerprint})
+        return details
+
+    @staticmethod
+    def _record_fingerprint(record: Dict) -> int:
+        """64-bit hash of a record's (patient_id, date) identity"""
+        key = (record.get("patient_id", ""), record.get("date", ""))
+        try:
+            return hash(key)
+        except TypeError:
+            # Unhashable values (e.g. nested dicts) fall back to their repr
+            return hash(repr(key))
+
     def _validate_dates(self, data_package: Dict) -> list:
-        """Check for date inconsistencies"""
+        """Check for future and impossibly old dates"""
         issues = []
+        for element_name, records in data_package.get("data_elements", {}).items():
+            if records:
+                issues.extend(self._date_issues(element_name, self._profile_records(records)))
+        return issues
 
-        # TODO: Implement date validation
-        # - Check for future dates
-        # - Check for impossibly old dates
-        # - Check date ordering
-
+    @staticmethod
+    def _date_issues(element_name: str, profile: Dict) -> list:
+        """Date warnings for one element from its _profile_records counts"""
+        issues = []
+        if profile["future_dates"]:
+            issues.append(
+                {
+                    "element": element_name,
+                    "issue": "future_dates",
+                    "count": profile["future_dates"],
+                    "severity": "warning",
+                }
+            )
+        if profile["implausible_dates"]:
+            issues.append(
+                {
+                    "element": element_name,
+                    "issue": "implausible_dates",
+                    "count": profile["implausible_dates"],
+                    "earliest_plausible": EARLIEST_PLAUSIBLE_DATE.isoformat(),
+                    "severity": "warning",
+                }
+            )
         return issues
 
     async def _escalate_qa_failure(self, request_id: str, qa_report: Dict):
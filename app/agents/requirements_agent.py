@@ -5,12 +5,15 @@ Converses with researchers to extract structured data requirements using LLM.
 Validates completeness and routes to phenotype validation when ready.
 """
 
-from typing import Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
 from langsmith import traceable
 from .base_agent import BaseAgent
-from ..utils.llm_client import LLMClient
+from ..utils.llm_client import get_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +30,30 @@ class RequirementsAgent(BaseAgent):
     - Route to phenotype agent when ready
     """
 
+    # Max concurrent per-criterion LLM calls when batch extraction fails
+    CONCEPT_EXTRACTION_CONCURRENCY = 8
+
+    # Recent turns sent to the LLM besides the initial request. The window
+    # start advances in steps of this size, so between steps the prompt only
+    # grows at the end and the provider's prefix cache keeps hitting.
+    HISTORY_WINDOW_TURNS = 6
+
+    # Delta extractions below this self-reported confidence fall back to a
+    # full extraction over the conversation window
+    DELTA_MIN_CONFIDENCE = 0.7
+
+    # In-progress conversations kept in memory; idle or excess ones are evicted
+    CONVERSATION_STATE_TTL_SECONDS = 3600
+    CONVERSATION_STATE_MAX_ENTRIES = 10_000
+
+    # Asked without an LLM call when a new conversation has no request text
+    FIRST_QUESTION = "What is the study title, and who is the principal investigator?"
+
     def __init__(self, orchestrator=None):
         super().__init__(agent_id="requirements_agent", orchestrator=orchestrator)
-        self.llm_client = LLMClient()
-        self.conversation_state = {}  # Store conversation state per request
+        self.llm_client = get_llm_client()
+        # request_id -> conversation state, least recently used first
+        self.conversation_state: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
     @traceable(tags=["requirements-agent", "agent-execution", "portal:formal"])
     async def execute_task(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -49,7 +72,13 @@ class RequirementsAgent(BaseAgent):
         Args:
             context: Contains initial_request, request_id, researcher_info,
                     conversation_history (optional), user_response (optional),
-                    structured_requirements (optional), skip_conversation (optional)
+                    current_requirements (optional; the requirements returned by
+                    the previous turn, used if this conversation's state was
+                    evicted), structured_requirements (optional),
+                    skip_conversation (optional),
+                    on_question_delta (optional async callback that receives the
+                    next question's text as it is generated), on_question_reset
+                    (optional async callback run when streamed text is discarded)
 
         Returns:
             Dict with:
@@ -62,6 +91,10 @@ class RequirementsAgent(BaseAgent):
         initial_request = context.get("initial_request")
         conversation_history = context.get("conversation_history", [])
         user_response = context.get("user_response")
+        if user_response is not None and not user_response.strip():
+            user_response = None
+        on_question_delta = context.get("on_question_delta")
+        on_question_reset = context.get("on_question_reset")
 
         # Check if pre-structured requirements are provided (from Research Notebook)
         pre_structured_requirements = context.get("structured_requirements")
@@ -181,21 +214,31 @@ class RequirementsAgent(BaseAgent):
                 "additional_context": {"requirements": final_requirements},
             }
 
-        # Initialize conversation state if new
-        if request_id not in self.conversation_state:
+        # One timestamp for every message appended during this turn
+        turn_timestamp = datetime.now().isoformat()
+
+        # Initialize conversation state if new. A turn that arrives with
+        # questions already asked but no state resumes a conversation whose
+        # state was evicted.
+        is_new_conversation = request_id not in self.conversation_state
+        resumed_without_requirements = False
+        if is_new_conversation and any(
+            message.get("role") == "assistant" for message in conversation_history
+        ):
+            conversation_history = list(conversation_history)
+            current_requirements = context.get("current_requirements")
+            self.conversation_state[request_id] = self._resumed_conversation_state(
+                conversation_history, current_requirements
+            )
+            is_new_conversation = False
+            resumed_without_requirements = not current_requirements
+            logger.info(
+                f"[{self.agent_id}] Resuming conversation {request_id} from "
+                f"{len(conversation_history)} messages"
+            )
+        elif is_new_conversation:
             self.conversation_state[request_id] = {
-                "requirements": {
-                    "study_title": None,
-                    "principal_investigator": None,
-                    "irb_number": None,
-                    "inclusion_criteria": [],
-                    "exclusion_criteria": [],
-                    "data_elements": [],
-                    "time_period": {"start": None, "end": None},
-                    "estimated_cohort_size": None,
-                    "delivery_format": None,
-                    "phi_level": None,
-                },
+                "requirements": self._blank_requirements(),
                 "questions_asked": [],
                 "completeness_score": 0.0,
             }
@@ -205,28 +248,58 @@ class RequirementsAgent(BaseAgent):
                 {
                     "role": "user",
                     "content": initial_request,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": turn_timestamp,
                 }
             ]
 
         # Add user response if provided
         if user_response:
             conversation_history.append(
-                {"role": "user", "content": user_response, "timestamp": datetime.now().isoformat()}
+                {"role": "user", "content": user_response, "timestamp": turn_timestamp}
             )
 
         state = self.conversation_state[request_id]
+        state["last_active"] = time.monotonic()
+        self.conversation_state.move_to_end(request_id)
+        self._prune_conversation_state()
+
+        # A turn with no new text has nothing to extract: an empty reply
+        # repeats the last question and an empty request gets the first one.
+        # (A non-empty initial request still goes to the LLM; a detailed one
+        # can be complete on the first turn.)
+        if not user_response and not (is_new_conversation and (initial_request or "").strip()):
+            return await self._ask_without_extraction(
+                state, conversation_history, turn_timestamp, on_question_delta
+            )
 
         logger.info(
             f"[{self.agent_id}] Extracting requirements from conversation (turns: {len(conversation_history)})"
         )
 
-        # Use LLM to extract structured info from conversation
+        # Use LLM to extract structured info from conversation. Follow-up
+        # replies are applied as a delta; the full extraction is the fallback.
         try:
-            analysis = await self.llm_client.extract_requirements(
-                conversation_history=conversation_history,
-                current_requirements=state["requirements"],
-            )
+            analysis = None
+            if user_response and not is_new_conversation and not resumed_without_requirements:
+                analysis = await self._extract_requirements_delta(
+                    state, user_response, on_question_delta
+                )
+                if analysis is None and on_question_reset is not None:
+                    # The delta attempt may already have streamed a question
+                    await on_question_reset()
+
+            if analysis is None:
+                # Without carried-over requirements, facts from turns outside
+                # the window would be lost, so a resumed turn sends them all
+                analysis = await self.llm_client.extract_requirements(
+                    conversation_history=(
+                        conversation_history
+                        if resumed_without_requirements
+                        else self._history_window(conversation_history)
+                    ),
+                    current_requirements=state["requirements"],
+                    on_question_delta=on_question_delta,
+                )
 
             # Update state
             state["requirements"] = analysis["extracted_requirements"]
@@ -238,7 +311,7 @@ class RequirementsAgent(BaseAgent):
                     {
                         "role": "assistant",
                         "content": analysis["next_question"],
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": turn_timestamp,
                     }
                 )
                 state["questions_asked"].append(analysis["next_question"])
@@ -258,6 +331,9 @@ class RequirementsAgent(BaseAgent):
                 # Save to database (TODO: implement when DB is connected)
                 await self._save_requirements(request_id, final_requirements)
 
+                # The conversation is finished; its state is no longer needed
+                self.conversation_state.pop(request_id, None)
+
                 logger.info(f"[{self.agent_id}] Requirements complete for {request_id}")
 
                 # IMPORTANT: Requirements must be reviewed by informatician for medical accuracy (Gap #3)
@@ -306,6 +382,189 @@ class RequirementsAgent(BaseAgent):
             logger.error(f"[{self.agent_id}] Failed to extract requirements: {str(e)}")
             raise
 
+    @staticmethod
+    def _blank_requirements() -> Dict[str, Any]:
+        """Requirements of a conversation that has extracted nothing yet"""
+        return {
+            "study_title": None,
+            "principal_investigator": None,
+            "irb_number": None,
+            "inclusion_criteria": [],
+            "exclusion_criteria": [],
+            "data_elements": [],
+            "time_period": {"start": None, "end": None},
+            "estimated_cohort_size": None,
+            "delivery_format": None,
+            "phi_level": None,
+        }
+
+    @classmethod
+    def _resumed_conversation_state(
+        cls,
+        conversation_history: List[Dict[str, Any]],
+        current_requirements: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Rebuild the state of a conversation that is no longer in memory
+
+        The caller's conversation_history is the record of the conversation;
+        questions asked are recovered from its assistant messages and the
+        requirements from current_requirements when the caller echoes them back.
+        """
+        requirements = cls._blank_requirements()
+        requirements.update(current_requirements or {})
+        return {
+            "requirements": requirements,
+            "questions_asked": [
+                message.get("content")
+                for message in conversation_history
+                if message.get("role") == "assistant" and message.get("content")
+            ],
+            "completeness_score": 0.0,
+        }
+
+    def _prune_conversation_state(self) -> None:
+        """Evict conversations idle past the TTL, then the oldest beyond the size bound"""
+        cutoff = time.monotonic() - self.CONVERSATION_STATE_TTL_SECONDS
+        while self.conversation_state:
+            request_id, state = next(iter(self.conversation_state.items()))
+            if (
+                state.get("last_active", 0.0) >= cutoff
+                and len(self.conversation_state) <= self.CONVERSATION_STATE_MAX_ENTRIES
+            ):
+                break
+            self.conversation_state.pop(request_id)
+
+    async def _ask_without_extraction(
+        self,
+        state: Dict[str, Any],
+        conversation_history: List[Dict[str, Any]],
+        timestamp: str,
+        on_question_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Ask the next question without an LLM call
+
+        Used when the turn carries no new reply; returns the same shape as an
+        unfinished _gather_requirements() turn.
+        """
+        if state["questions_asked"]:
+            question = state["questions_asked"][-1]
+        else:
+            question = self.FIRST_QUESTION
+            state["questions_asked"].append(question)
+
+        conversation_history.append(
+            {"role": "assistant", "content": question, "timestamp": timestamp}
+        )
+        if on_question_delta is not None:
+            await on_question_delta(question)
+
+        return {
+            "requirements_complete": False,
+            "next_question": question,
+            "completeness_score": state["completeness_score"],
+            "current_requirements": state["requirements"],
+            "missing_fields": [
+                field
+                for field, value in state["requirements"].items()
+                if not value or (isinstance(value, dict) and not any(value.values()))
+            ],
+            "conversation_history": conversation_history,
+        }
+
+    async def _extract_requirements_delta(
+        self,
+        state: Dict[str, Any],
+        user_response: str,
+        on_question_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply the latest reply as a patch onto the accumulated requirements
+
+        Returns an analysis shaped like extract_requirements() with the merged
+        requirements, or None when the delta failed or was not confident
+        enough, in which case the caller runs a full extraction.
+        """
+        last_question = state["questions_asked"][-1] if state["questions_asked"] else None
+        try:
+            delta = await self.llm_client.extract_requirements_delta(
+                user_response,
+                state["requirements"],
+                last_question=last_question,
+                on_question_delta=on_question_delta,
+            )
+            confidence = float(delta.get("confidence", 0.0))
+            patch = delta["extracted_requirements"]
+            analysis = {
+                "extracted_requirements": self._merge_requirements_patch(
+                    state["requirements"], patch
+                ),
+                "missing_fields": delta["missing_fields"],
+                "next_question": delta["next_question"],
+                "completeness_score": delta["completeness_score"],
+                "ready_for_submission": delta["ready_for_submission"],
+            }
+        except Exception as e:
+            logger.warning(f"[{self.agent_id}] Delta extraction failed, using full extraction: {e}")
+            return None
+
+        if confidence < self.DELTA_MIN_CONFIDENCE:
+            logger.info(
+                f"[{self.agent_id}] Delta confidence {confidence:.2f} below "
+                f"{self.DELTA_MIN_CONFIDENCE}, using full extraction"
+            )
+            return None
+        return analysis
+
+    @staticmethod
+    def _merge_requirements_patch(
+        requirements: Dict[str, Any], patch: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Merge a requirements patch: lists are extended (without duplicates),
+        dicts are updated with non-null values, and scalars are overwritten
+        when the patch value is non-null.
+        """
+        merged = dict(requirements)
+        for field, value in patch.items():
+            current = merged.get(field)
+            if isinstance(current, list) and isinstance(value, list):
+                merged[field] = current + [item for item in value if item not in current]
+            elif isinstance(current, dict) and isinstance(value, dict):
+                merged[field] = {
+                    **current,
+                    **{key: item for key, item in value.items() if item is not None},
+                }
+            elif value is not None:
+                merged[field] = value
+        return merged
+
+    @classmethod
+    def _history_window(cls, conversation_history: list) -> list:
+        """
+        Bound the conversation sent to the LLM
+
+        Keeps the initial request plus the most recent turns (between one and
+        two HISTORY_WINDOW_TURNS). Facts from dropped turns are already carried
+        in current_requirements, which is sent alongside the window.
+        """
+        window = cls.HISTORY_WINDOW_TURNS
+        older = len(conversation_history) - 1 - window
+        if older < window:
+            return conversation_history
+
+        dropped = (older // window) * window
+        return [
+            conversation_history[0],
+            {
+                "role": "system",
+                "content": f"{dropped} earlier turns omitted; their details are reflected "
+                "in the current extracted requirements.",
+            },
+            *conversation_history[1 + dropped :],
+        ]
+
     async def _continue_conversation(self, context: Dict) -> Dict[str, Any]:
         """Handle continuation of conversation with user response"""
         return await self._gather_requirements(context)
@@ -318,16 +577,18 @@ class RequirementsAgent(BaseAgent):
         """
         structured_requirements = requirements.copy()
 
-        # Convert inclusion/exclusion criteria to structured format with codes
+        # Convert inclusion/exclusion criteria to structured format with codes.
+        # The two lists are independent LLM-bound calls, so run them together;
+        # _criteria_to_structured returns [] for an empty list without a call.
+        inclusion, exclusion = await asyncio.gather(
+            self._criteria_to_structured(requirements.get("inclusion_criteria") or []),
+            self._criteria_to_structured(requirements.get("exclusion_criteria") or []),
+        )
         if requirements.get("inclusion_criteria"):
-            structured_requirements["inclusion_criteria"] = await self._criteria_to_structured(
-                requirements["inclusion_criteria"]
-            )
+            structured_requirements["inclusion_criteria"] = inclusion
 
         if requirements.get("exclusion_criteria"):
-            structured_requirements["exclusion_criteria"] = await self._criteria_to_structured(
-                requirements["exclusion_criteria"]
-            )
+            structured_requirements["exclusion_criteria"] = exclusion
 
         # Validate dates
         if requirements.get("time_period"):
@@ -385,29 +646,33 @@ class RequirementsAgent(BaseAgent):
         except Exception as e:
             logger.warning(f"Batch extraction failed: {str(e)}, falling back to individual calls")
 
-            # Fallback to individual extraction (original behavior)
-            structured_criteria = []
-            for criterion in criteria_list:
-                try:
-                    # Extract medical concepts
-                    concepts_data = await self.llm_client.extract_medical_concepts(criterion)
-
-                    criterion_structured = {
-                        "description": criterion,
-                        "concepts": concepts_data.get("concepts", []),
-                        "codes": [],  # Will be populated by terminology server
-                    }
+            # Fallback to individual extraction, overlapping the per-criterion calls
+            semaphore = asyncio.Semaphore(self.CONCEPT_EXTRACTION_CONCURRENCY)
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._structure_criterion(criterion, semaphore)
+                        for criterion in criteria_list
+                    )
+                )
+            )
 
-                    structured_criteria.append(criterion_structured)
+    async def _structure_criterion(self, criterion: str, semaphore: asyncio.Semaphore) -> Dict:
+        """Extract concepts for one criterion, falling back to a bare structure on error"""
+        try:
+            async with semaphore:
+                concepts_data = await self.llm_client.extract_medical_concepts(criterion)
 
-                except Exception as e:
-                    logger.warning(f"Could not structure criterion '{criterion}': {str(e)}")
-                    # Fallback to simple structure
-                    structured_criteria.append(
-                        {"description": criterion, "concepts": [], "codes": []}
-                    )
+            return {
+                "description": criterion,
+                "concepts": concepts_data.get("concepts", []),
+                "codes": [],  # Will be populated by terminology server
+            }
 
-            return structured_criteria
+        except Exception as e:
+            logger.warning(f"Could not structure criterion '{criterion}': {str(e)}")
+            # Fallback to simple structure
+            return {"description": criterion, "concepts": [], "codes": []}
 
     def _validate_dates(self, time_period: dict) -> dict:
         """Validate and normalize date strings"""
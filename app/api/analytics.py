@@ -9,19 +9,26 @@ Supports two runner types (configured via VIEWDEF_RUNNER env var):
 - 'in_memory': InMemoryRunner (slower, REST API-based)
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
+from contextlib import aclosing
+from decimal import Decimal
 from typing import Dict, List, Any, Optional
+import asyncio
 import logging
+import orjson
 import os
+import time
 
-from ..clients.fhir_client import create_fhir_client
+from ..clients.fhir_client import FHIRClient, create_fhir_client
 from ..clients.hapi_db_client import create_hapi_db_client, close_hapi_db_client
 from ..sql_on_fhir.view_definition_manager import ViewDefinitionManager
 from ..sql_on_fhir.runner.in_memory_runner import InMemoryRunner
 from ..sql_on_fhir.runner.materialized_view_runner import MaterializedViewRunner
 from ..sql_on_fhir.runner.hybrid_runner import HybridRunner
 from ..sql_on_fhir.runner import create_postgres_runner
+from ..sql_on_fhir.row_filters import filter_rows, row_predicate
 from ..schemas.analytics import (
     CountRequest,
     CreateViewDefinitionRequest,
@@ -30,7 +37,49 @@ from ..schemas.analytics import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+def _orjson_default(value: Any) -> Any:
+    """Serialize database values orjson doesn't handle natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+class AnalyticsJSONResponse(ORJSONResponse):
+    """
+    orjson-rendered response for analytics results
+
+    Row values come straight from the runners (asyncpg may return Decimal),
+    so unknown types fall back to float/str instead of failing.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+router = APIRouter(
+    prefix="/analytics", tags=["analytics"], default_response_class=AnalyticsJSONResponse
+)
+
+# One manager per process so its ViewDefinition cache is shared across requests
+VIEW_MANAGER = ViewDefinitionManager()
+
+
+def get_view_manager() -> ViewDefinitionManager:
+    """FastAPI dependency returning the shared ViewDefinitionManager"""
+    return VIEW_MANAGER
+
+
+# HAPI connection pool sizing for the long-lived analytics runner
+ANALYTICS_DB_POOL_OPTIONS = {"min_pool_size": 4, "max_pool_size": 32}
+
+# /analytics/execute.ndjson sends rows in chunks of about this many bytes
+NDJSON_FLUSH_BYTES = 64 * 1024
+_NDJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
+# /analytics/health answers from cache for this long, so frequent liveness
+# probes don't each open connections to the backends
+HEALTH_CACHE_TTL_SECONDS = 3.0
 
 
 async def create_runner():
@@ -57,7 +106,7 @@ async def create_runner():
         )
 
         # Create HAPI DB client
-        db_client = await create_hapi_db_client()
+        db_client = await create_hapi_db_client(**ANALYTICS_DB_POOL_OPTIONS)
 
         # Create HybridRunner
         runner = HybridRunner(db_client, enable_cache=enable_cache, cache_ttl_seconds=cache_ttl)
@@ -72,7 +121,7 @@ async def create_runner():
         logger.info(f"Using PostgresRunner (cache={enable_cache}, TTL={cache_ttl}s)")
 
         # Create HAPI DB client
-        db_client = await create_hapi_db_client()
+        db_client = await create_hapi_db_client(**ANALYTICS_DB_POOL_OPTIONS)
 
         # Create PostgresRunner
         runner = await create_postgres_runner(
@@ -89,7 +138,7 @@ async def create_runner():
         logger.info("Using MaterializedViewRunner (10-100x faster, queries pre-computed views)")
 
         # Create HAPI DB client
-        db_client = await create_hapi_db_client()
+        db_client = await create_hapi_db_client(**ANALYTICS_DB_POOL_OPTIONS)
 
         # Create MaterializedViewRunner
         runner = MaterializedViewRunner(db_client)
@@ -116,6 +165,58 @@ async def create_runner():
         return runner, cleanup
 
 
+async def open_analytics_runner(app) -> None:
+    """
+    Build the process-wide analytics runner and store it on app.state
+
+    Called from the application lifespan. Failures are logged rather than
+    raised so the API still starts when HAPI is unreachable; get_runner()
+    retries on the first request that needs a runner.
+    """
+    if getattr(app.state, "analytics_runner_lock", None) is None:
+        app.state.analytics_runner_lock = asyncio.Lock()
+    async with app.state.analytics_runner_lock:
+        if getattr(app.state, "analytics_runner", None) is not None:
+            return
+        try:
+            runner, cleanup = await create_runner()
+        except Exception as e:
+            logger.warning(f"Analytics runner unavailable at startup: {e}")
+            return
+        app.state.analytics_runner = runner
+        app.state.analytics_runner_cleanup = cleanup
+
+
+async def close_analytics_runner(app) -> None:
+    """Release the analytics runner's connection pool on shutdown"""
+    cleanup = getattr(app.state, "analytics_runner_cleanup", None)
+    app.state.analytics_runner = None
+    app.state.analytics_runner_cleanup = None
+    if cleanup is not None:
+        await cleanup()
+
+    fhir_client = getattr(app.state, "analytics_health_fhir_client", None)
+    app.state.analytics_health_fhir_client = None
+    if fhir_client is not None:
+        await fhir_client.close()
+
+
+async def get_runner(http_request: Request):
+    """
+    FastAPI dependency returning the shared analytics runner
+
+    Reuses the runner (and its DB pool / query cache) built at startup
+    instead of creating and tearing one down per request.
+    """
+    app = http_request.app
+    if getattr(app.state, "analytics_runner", None) is None:
+        await open_analytics_runner(app)
+    runner = getattr(app.state, "analytics_runner", None)
+    if runner is None:
+        raise HTTPException(status_code=503, detail="Analytics runner unavailable")
+    return runner
+
+
 # ViewDefinitionRequest migrated to app/schemas/analytics.py (Phase 2.3 Issue #5)
 
 
@@ -140,7 +241,7 @@ class ViewDefinitionListResponse(BaseModel):
 
 
 @router.get("/view-definitions", response_model=ViewDefinitionListResponse)
-async def list_view_definitions():
+async def list_view_definitions(manager: ViewDefinitionManager = Depends(get_view_manager)):
     """
     List all available ViewDefinitions
 
@@ -148,7 +249,6 @@ async def list_view_definitions():
         List of ViewDefinition names and their resource types
     """
     try:
-        manager = ViewDefinitionManager()
         view_defs = manager.load_all()
 
         view_list = [
@@ -170,7 +270,9 @@ async def list_view_definitions():
 
 
 @router.get("/view-definitions/{view_name}")
-async def get_view_definition(view_name: str):
+async def get_view_definition(
+    view_name: str, manager: ViewDefinitionManager = Depends(get_view_manager)
+):
     """
     Get a specific ViewDefinition by name
 
@@ -181,7 +283,6 @@ async def get_view_definition(view_name: str):
         ViewDefinition resource
     """
     try:
-        manager = ViewDefinitionManager()
         view_def = manager.load(view_name)
 
         logger.info(f"Retrieved ViewDefinition '{view_name}'")
@@ -195,7 +296,9 @@ async def get_view_definition(view_name: str):
 
 
 @router.post("/view-definitions")
-async def create_view_definition(request: CreateViewDefinitionRequest):
+async def create_view_definition(
+    request: CreateViewDefinitionRequest, manager: ViewDefinitionManager = Depends(get_view_manager)
+):
     """
     Create a new ViewDefinition
 
@@ -206,7 +309,6 @@ async def create_view_definition(request: CreateViewDefinitionRequest):
         Created ViewDefinition name
     """
     try:
-        manager = ViewDefinitionManager()
         name = manager.save(request.view_definition, request.name)
 
         logger.info(f"Created ViewDefinition '{name}'")
@@ -220,7 +322,9 @@ async def create_view_definition(request: CreateViewDefinitionRequest):
 
 
 @router.delete("/view-definitions/{view_name}")
-async def delete_view_definition(view_name: str):
+async def delete_view_definition(
+    view_name: str, manager: ViewDefinitionManager = Depends(get_view_manager)
+):
     """
     Delete a ViewDefinition
 
@@ -231,7 +335,6 @@ async def delete_view_definition(view_name: str):
         Success message
     """
     try:
-        manager = ViewDefinitionManager()
         deleted = manager.delete(view_name)
 
         if not deleted:
@@ -248,7 +351,11 @@ async def delete_view_definition(view_name: str):
 
 
 @router.post("/execute", response_model=ViewDefinitionResponse)
-async def execute_view_definition(request: ViewDefinitionRequest):
+async def execute_view_definition(
+    request: ViewDefinitionRequest,
+    manager: ViewDefinitionManager = Depends(get_view_manager),
+    runner=Depends(get_runner),
+):
     """
     Execute a ViewDefinition and return tabular results
 
@@ -269,48 +376,62 @@ async def execute_view_definition(request: ViewDefinitionRequest):
         {
             "view_name": "patient_demographics",
             "search_params": {"gender": "female"},
-            "max_resources": 100
+            "max_resources": 100,
+            "filters": [{"field": "birth_date", "value": "1970-01-01", "operator": "lt"}]
         }
     """
     try:
         # Load ViewDefinition
-        manager = ViewDefinitionManager()
         view_def = manager.load(request.view_name)
 
-        # Create runner based on environment configuration
-        runner, cleanup = await create_runner()
-
-        try:
-            logger.info(
-                f"Executing ViewDefinition '{request.view_name}' "
-                f"with params: {request.search_params}, max: {request.max_resources}"
-            )
-
-            rows = await runner.execute(
-                view_def, search_params=request.search_params, max_resources=request.max_resources
-            )
+        logger.info(
+            f"Executing ViewDefinition '{request.view_name}' "
+            f"with params: {request.search_params}, max: {request.max_resources}"
+        )
 
-            # Get schema
-            schema = runner.get_schema(view_def)
+        # Row filters go into the runner's SQL when it can take them, so
+        # unmatched rows never leave the database; otherwise they are
+        # applied here before serialization.
+        filters = [f.model_dump() for f in request.filters or []]
+        pushdown = bool(filters) and getattr(runner, "supports_filters", False) is True
+        options = {"filters": filters} if pushdown else {}
+
+        # The runner is shared across requests, so this call's SQL comes back
+        # through its own info dict rather than get_last_executed_sql()
+        info: Dict[str, Any] = {}
+        if getattr(runner, "reports_execution_info", False) is True:
+            options["info"] = info
+
+        rows = await runner.execute(
+            view_def,
+            search_params=request.search_params,
+            max_resources=request.max_resources,
+            **options,
+        )
+        if not pushdown:
+            rows = filter_rows(rows, filters)
 
-            # Get generated SQL (if PostgresRunner)
-            generated_sql = None
-            if hasattr(runner, "get_last_executed_sql"):
-                generated_sql = runner.get_last_executed_sql()
+        # Get schema
+        schema = runner.get_schema(view_def)
 
-            logger.info(f"ViewDefinition '{request.view_name}' returned {len(rows)} rows")
+        # Generated SQL (SQL-backed runners only)
+        generated_sql = info.get("sql")
 
-            return ViewDefinitionResponse(
-                view_name=request.view_name,
-                resource_type=view_def.get("resource"),
-                row_count=len(rows),
-                rows=rows,
-                column_schema=schema,
-                generated_sql=generated_sql,
-            )
+        logger.info(f"ViewDefinition '{request.view_name}' returned {len(rows)} rows")
 
-        finally:
-            await cleanup()
+        # Returned as a response object so the rows skip response_model
+        # validation; they come from the runner already shaped as row dicts.
+        # ViewDefinitionResponse still documents the body in the OpenAPI schema.
+        return AnalyticsJSONResponse(
+            {
+                "view_name": request.view_name,
+                "resource_type": view_def.get("resource"),
+                "row_count": len(rows),
+                "rows": rows,
+                "column_schema": schema,
+                "generated_sql": generated_sql,
+            }
+        )
 
     except FileNotFoundError:
         raise HTTPException(
@@ -321,10 +442,87 @@ async def execute_view_definition(request: ViewDefinitionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/execute.ndjson", response_class=StreamingResponse)
+async def execute_view_definition_ndjson(
+    request: ViewDefinitionRequest,
+    manager: ViewDefinitionManager = Depends(get_view_manager),
+    runner=Depends(get_runner),
+):
+    """
+    Execute a ViewDefinition and stream the rows as newline-delimited JSON
+
+    For large results: rows are serialized one at a time as the runner
+    produces them, so the response is never built in memory. Runners with
+    execute_stream() (postgres, materialized, in_memory) also never hold
+    the full result; others are executed normally and then streamed. Row
+    filters are checked per row as it streams. Small results are simpler to consume from
+    POST /analytics/execute.
+
+    Args:
+        request: ViewDefinition execution request
+
+    Returns:
+        application/x-ndjson body with one row object per line
+
+    Example:
+        POST /analytics/execute.ndjson
+        {"view_name": "patient_demographics", "max_resources": 100000}
+    """
+    try:
+        view_def = manager.load(request.view_name)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404, detail=f"ViewDefinition '{request.view_name}' not found"
+        )
+
+    logger.info(
+        f"Streaming ViewDefinition '{request.view_name}' "
+        f"with params: {request.search_params}, max: {request.max_resources}"
+    )
+
+    matches = row_predicate([f.model_dump() for f in request.filters]) if request.filters else None
+
+    async def ndjson():
+        buffer = bytearray()
+        if hasattr(runner, "execute_stream"):
+            rows = runner.execute_stream(
+                view_def, search_params=request.search_params, max_resources=request.max_resources
+            )
+        else:
+            rows = _iterate(
+                await runner.execute(
+                    view_def,
+                    search_params=request.search_params,
+                    max_resources=request.max_resources,
+                )
+            )
+
+        async with aclosing(rows):
+            async for row in rows:
+                if matches is not None and not matches(row):
+                    continue
+                buffer += orjson.dumps(row, default=_orjson_default, option=_NDJSON_OPTIONS)
+                if len(buffer) >= NDJSON_FLUSH_BYTES:
+                    yield bytes(buffer)
+                    buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+async def _iterate(rows: List[Dict[str, Any]]):
+    """Adapt an already-materialized row list to the streaming interface"""
+    for row in rows:
+        yield row
+
+
 @router.get("/execute/{view_name}", response_model=ViewDefinitionResponse)
 async def execute_view_definition_get(
     view_name: str,
     max_resources: Optional[int] = Query(None, description="Maximum resources to process"),
+    manager: ViewDefinitionManager = Depends(get_view_manager),
+    runner=Depends(get_runner),
 ):
     """
     Execute a ViewDefinition via GET request (simplified version)
@@ -343,7 +541,7 @@ async def execute_view_definition_get(
         view_name=view_name, search_params=None, max_resources=max_resources
     )
 
-    return await execute_view_definition(request)
+    return await execute_view_definition(request, manager, runner)
 
 
 # CountRequest migrated to app/schemas/analytics.py (Phase 2.3 Issue #5)
@@ -359,7 +557,11 @@ class CountResponse(BaseModel):
 
 
 @router.post("/count", response_model=CountResponse)
-async def count_resources(request: CountRequest):
+async def count_resources(
+    request: CountRequest,
+    manager: ViewDefinitionManager = Depends(get_view_manager),
+    runner=Depends(get_runner),
+):
     """
     Count resources matching a ViewDefinition without fetching data
 
@@ -387,37 +589,28 @@ async def count_resources(request: CountRequest):
     """
     try:
         # Load ViewDefinition
-        manager = ViewDefinitionManager()
         view_def = manager.load(request.view_name)
 
-        # Create runner based on environment configuration
-        runner, cleanup = await create_runner()
-
-        try:
-            logger.info(
-                f"Counting resources for ViewDefinition '{request.view_name}' "
-                f"with params: {request.search_params}"
-            )
-
-            # Use execute_count() method for accurate COUNT(*) queries
-            count = await runner.execute_count(view_def, search_params=request.search_params)
-
-            # Get generated SQL (if available)
-            generated_sql = None
-            if hasattr(runner, "get_last_executed_sql"):
-                generated_sql = runner.get_last_executed_sql()
+        logger.info(
+            f"Counting resources for ViewDefinition '{request.view_name}' "
+            f"with params: {request.search_params}"
+        )
 
-            logger.info(f"ViewDefinition '{request.view_name}' count: {count}")
+        # Use execute_count() method for accurate COUNT(*) queries; the
+        # generated SQL (if any) is reported per call through info
+        info: Dict[str, Any] = {}
+        options = {"info": info} if getattr(runner, "reports_execution_info", False) is True else {}
+        count = await runner.execute_count(view_def, search_params=request.search_params, **options)
+        generated_sql = info.get("sql")
 
-            return CountResponse(
-                view_name=request.view_name,
-                resource_type=view_def.get("resource"),
-                count=count,
-                generated_sql=generated_sql,
-            )
+        logger.info(f"ViewDefinition '{request.view_name}' count: {count}")
 
-        finally:
-            await cleanup()
+        return CountResponse(
+            view_name=request.view_name,
+            resource_type=view_def.get("resource"),
+            count=count,
+            generated_sql=generated_sql,
+        )
 
     except FileNotFoundError:
         raise HTTPException(
@@ -428,11 +621,43 @@ async def count_resources(request: CountRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _execute_batch_view(
+    runner,
+    manager: ViewDefinitionManager,
+    view_name: str,
+    search_params: Optional[Dict[str, Any]],
+    max_resources: Optional[int],
+    semaphore: asyncio.Semaphore,
+) -> Dict[str, Any]:
+    """Execute one ViewDefinition of a batch query, folding errors into the result"""
+    try:
+        view_def = manager.load(view_name)
+
+        logger.info(f"Executing ViewDefinition '{view_name}' in batch query")
+
+        async with semaphore:
+            rows = await runner.execute(
+                view_def, search_params=search_params, max_resources=max_resources
+            )
+
+        return {
+            "resource_type": view_def.get("resource"),
+            "row_count": len(rows),
+            "rows": rows,
+        }
+
+    except Exception as e:
+        logger.warning(f"Error executing ViewDefinition '{view_name}': {e}")
+        return {"error": str(e)}
+
+
 @router.post("/query")
 async def execute_custom_query(
     view_names: List[str] = Query(..., description="ViewDefinitions to execute"),
     search_params: Optional[Dict[str, Any]] = None,
     max_resources: Optional[int] = None,
+    manager: ViewDefinitionManager = Depends(get_view_manager),
+    runner=Depends(get_runner),
 ):
     """
     Execute multiple ViewDefinitions and return combined results
@@ -453,37 +678,21 @@ async def execute_custom_query(
         }
     """
     try:
-        manager = ViewDefinitionManager()
-        runner, cleanup = await create_runner()
-
-        results = {}
-
-        try:
-            for view_name in view_names:
-                try:
-                    view_def = manager.load(view_name)
-
-                    logger.info(f"Executing ViewDefinition '{view_name}' in batch query")
-
-                    rows = await runner.execute(
-                        view_def, search_params=search_params, max_resources=max_resources
-                    )
-
-                    results[view_name] = {
-                        "resource_type": view_def.get("resource"),
-                        "row_count": len(rows),
-                        "rows": rows,
-                    }
-
-                except Exception as e:
-                    logger.warning(f"Error executing ViewDefinition '{view_name}': {e}")
-                    results[view_name] = {"error": str(e)}
-
-            logger.info(f"Batch query complete: {len(view_names)} ViewDefinitions")
-            return results
+        semaphore = asyncio.Semaphore(int(os.getenv("VIEWDEF_MAX_PARALLEL", "8")))
+        unique_names = list(dict.fromkeys(view_names))
+
+        outputs = await asyncio.gather(
+            *(
+                _execute_batch_view(
+                    runner, manager, view_name, search_params, max_resources, semaphore
+                )
+                for view_name in unique_names
+            )
+        )
+        results = dict(zip(unique_names, outputs))
 
-        finally:
-            await cleanup()
+        logger.info(f"Batch query complete: {len(view_names)} ViewDefinitions")
+        return results
 
     except Exception as e:
         logger.error(f"Error executing batch query: {e}")
@@ -491,7 +700,11 @@ async def execute_custom_query(
 
 
 @router.get("/schema/{view_name}")
-async def get_view_schema(view_name: str):
+async def get_view_schema(
+    view_name: str,
+    manager: ViewDefinitionManager = Depends(get_view_manager),
+    runner=Depends(get_runner),
+):
     """
     Get the schema (column names and types) for a ViewDefinition
 
@@ -502,23 +715,16 @@ async def get_view_schema(view_name: str):
         Schema mapping column names to types
     """
     try:
-        manager = ViewDefinitionManager()
         view_def = manager.load(view_name)
 
-        # Create runner to extract schema
-        runner, cleanup = await create_runner()
-        try:
-            schema = runner.get_schema(view_def)
+        schema = runner.get_schema(view_def)
 
-            logger.info(f"Retrieved schema for ViewDefinition '{view_name}'")
-            return {
-                "view_name": view_name,
-                "resource_type": view_def.get("resource"),
-                "schema": schema,
-            }
-
-        finally:
-            await cleanup()
+        logger.info(f"Retrieved schema for ViewDefinition '{view_name}'")
+        return {
+            "view_name": view_name,
+            "resource_type": view_def.get("resource"),
+            "schema": schema,
+        }
 
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"ViewDefinition '{view_name}' not found")
@@ -528,28 +734,52 @@ async def get_view_schema(view_name: str):
 
 
 @router.get("/health")
-async def health_check():
+async def health_check(http_request: Request):
     """
     Health check endpoint for analytics service
 
+    The FHIR server and, for database-backed runners, the HAPI database are
+    probed concurrently; the result is cached for HEALTH_CACHE_TTL_SECONDS.
+
     Returns:
         Health status including FHIR server connectivity
     """
-    try:
-        # Test FHIR server connection
-        fhir_client = await create_fhir_client()
+    state = http_request.app.state
+    if getattr(state, "analytics_health_lock", None) is None:
+        state.analytics_health_lock = asyncio.Lock()
+
+    async with state.analytics_health_lock:
+        cached = getattr(state, "analytics_health", None)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
         try:
-            is_connected = await fhir_client.test_connection()
+            health = await _probe_health(state)
+        except Exception as e:
+            logger.error(f"Health check failed: {e}")
+            health = {"status": "unhealthy", "error": str(e)}
 
-            return {
-                "status": "healthy" if is_connected else "degraded",
-                "fhir_server_connected": is_connected,
-                "fhir_server_url": fhir_client.base_url,
-            }
+        state.analytics_health = (health, time.monotonic() + HEALTH_CACHE_TTL_SECONDS)
+        return health
 
-        finally:
-            await fhir_client.close()
 
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return {"status": "unhealthy", "error": str(e)}
+async def _probe_health(state) -> Dict[str, Any]:
+    """Probe the analytics backends concurrently and summarize the result"""
+    fhir_client = getattr(state, "analytics_health_fhir_client", None)
+    if fhir_client is None:
+        fhir_client = state.analytics_health_fhir_client = FHIRClient(
+            client=getattr(state, "http_client", None)
+        )
+
+    probes = {"fhir_server_connected": fhir_client.ping()}
+    db_client = getattr(getattr(state, "analytics_runner", None), "db_client", None)
+    if db_client is not None:
+        probes["database_connected"] = db_client.test_connection()
+
+    results = dict(zip(probes, await asyncio.gather(*probes.values())))
+
+    return {
+        "status": "healthy" if all(results.values()) else "degraded",
+        **results,
+        "fhir_server_url": fhir_client.base_url,
+    }
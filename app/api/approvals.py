@@ -5,40 +5,73 @@ Provides REST API for managing human approvals in the ResearchFlow workflow.
 Allows informaticians and admins to review and approve/reject requests.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse
+from typing import Any, Dict, Optional
 from datetime import datetime
+import asyncio
 import logging
+import os
 
 from ..database import get_db_session
-from ..services.approval_service import ApprovalService
+from ..database.workflow_states import WorkflowState
+from ..services.approval_service import ApprovalService, get_cached_pending_approvals
 from ..langchain_orchestrator.request_facade import LangGraphRequestFacade
+from .dependencies import get_optional_orchestrator, get_orchestrator
 from ..schemas.approvals import ApprovalResponse, ScopeChangeRequest
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/approvals", tags=["approvals"])
+# Approval payloads are encoded by orjson, which writes datetimes itself.
+# Routes that build large payloads return ORJSONResponse directly so they
+# also skip FastAPI's jsonable_encoder pass.
+router = APIRouter(prefix="/approvals", tags=["approvals"], default_response_class=ORJSONResponse)
+
+# Most request IDs accepted by one GET /approvals/request?ids=... call
+MAX_BATCH_REQUEST_IDS = 100
+
+# Workflow states in which a request's scope can no longer change
+_TERMINAL_STATES = frozenset(
+    {WorkflowState.COMPLETE.value, WorkflowState.FAILED.value, WorkflowState.DELIVERED.value}
+)
+
+# Interval between background approval-timeout sweeps; 0 disables the sweeper
+TIMEOUT_SWEEP_SECONDS = int(os.getenv("TIMEOUT_SWEEP_SEC", "3600"))
 
 
 # Schemas migrated to app/schemas/approvals.py (Sprint 6.1 Phase 2.3 Issue #5)
 
 
-# Global orchestrator instance (will be set by main.py).
-# Sprint 7.2 Phase 4: A2A's ResearchRequestOrchestrator deleted; now uses
-# LangGraphRequestFacade which exposes the same process_approval_response /
-# get_request_status surface this router relies on.
-orchestrator: Optional[LangGraphRequestFacade] = None
+async def approval_svc():
+    """
+    Dependency: ApprovalService bound to a request-scoped DB session
+
+    The session commits when the request finishes and rolls back if the
+    route raises; it only checks out a connection on first use.
+    """
+    async with get_db_session() as session:
+        yield ApprovalService(session)
 
 
-def set_orchestrator(orch: LangGraphRequestFacade):
-    """Set the orchestrator instance"""
-    global orchestrator
-    orchestrator = orch
+# ApprovalService call for each ApprovalResponse.decision (used without an orchestrator)
+_DECISION_HANDLERS = {
+    "approve": lambda svc, approval_id, r: svc.approve(
+        approval_id, r.reviewer, r.notes, r.modifications
+    ),
+    "reject": lambda svc, approval_id, r: svc.reject(
+        approval_id, r.reviewer, r.notes or "Rejected"
+    ),
+    "modify": lambda svc, approval_id, r: svc.modify(
+        approval_id, r.reviewer, r.modifications, r.notes
+    ),
+}
 
 
 @router.get("/pending")
 async def get_pending_approvals(
-    approval_type: Optional[str] = None, user_role: Optional[str] = None
+    approval_type: Optional[str] = None,
+    user_role: Optional[str] = None,
+    svc: ApprovalService = Depends(approval_svc),
 ):
     """
     Get all pending approvals
@@ -48,41 +81,62 @@ async def get_pending_approvals(
         user_role: Filter by user role (informatician, admin)
 
     Returns:
-        List of pending approvals
+        List of pending approvals (cached briefly; see get_cached_pending_approvals)
     """
-    try:
-        async with get_db_session() as session:
-            approval_service = ApprovalService(session)
 
-            approvals = await approval_service.get_pending_approvals(
-                user_role=user_role, approval_type=approval_type
-            )
+    async def load():
+        rows = await svc.get_pending_approvals_rows(approval_type=approval_type)
 
-            return {
-                "count": len(approvals),
-                "approvals": [
-                    {
-                        "id": approval.id,
-                        "request_id": approval.request_id,
-                        "approval_type": approval.approval_type,
-                        "submitted_at": approval.submitted_at.isoformat(),
-                        "submitted_by": approval.submitted_by,
-                        "timeout_at": (
-                            approval.timeout_at.isoformat() if approval.timeout_at else None
-                        ),
-                        "approval_data": approval.approval_data,
-                    }
-                    for approval in approvals
-                ],
-            }
+        return {"count": len(rows), "approvals": [dict(row._mapping) for row in rows]}
+
+    try:
+        return ORJSONResponse(await get_cached_pending_approvals(approval_type, load))
 
     except Exception as e:
         logger.error(f"Error retrieving pending approvals: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/request")
+async def get_approvals_for_requests(ids: str, svc: ApprovalService = Depends(approval_svc)):
+    """
+    Get approvals for several research requests in one query
+
+    Lets a dashboard showing N requests make one call instead of N calls
+    to /approvals/request/{request_id}. Declared before /{approval_id} so
+    the literal path wins.
+
+    Args:
+        ids: Comma-separated research request IDs
+
+    Returns:
+        Approvals grouped by request ID (every requested ID is present)
+    """
+    request_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not request_ids:
+        raise HTTPException(status_code=400, detail="ids must name at least one request")
+    if len(request_ids) > MAX_BATCH_REQUEST_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_REQUEST_IDS} request ids per call"
+        )
+
+    try:
+        rows = await svc.get_approvals_for_requests_rows(request_ids)
+
+        by_request = {request_id: [] for request_id in request_ids}
+        for row in rows:
+            approval = dict(row._mapping)
+            by_request[approval.pop("request_id")].append(approval)
+
+        return ORJSONResponse({"by_request": by_request})
+
+    except Exception as e:
+        logger.error(f"Error retrieving approvals for {len(request_ids)} requests: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{approval_id}")
-async def get_approval(approval_id: int):
+async def get_approval(approval_id: int, svc: ApprovalService = Depends(approval_svc)):
     """
     Get a specific approval by ID
 
@@ -93,29 +147,29 @@ async def get_approval(approval_id: int):
         Approval details
     """
     try:
-        async with get_db_session() as session:
-            approval_service = ApprovalService(session)
-            approval = await approval_service.get_approval(approval_id)
+        approval = await svc.get_approval(approval_id)
 
-            if not approval:
-                raise HTTPException(status_code=404, detail=f"Approval {approval_id} not found")
+        if not approval:
+            raise HTTPException(status_code=404, detail=f"Approval {approval_id} not found")
 
-            return {
+        return ORJSONResponse(
+            {
                 "id": approval.id,
                 "request_id": approval.request_id,
                 "approval_type": approval.approval_type,
                 "status": approval.status,
-                "submitted_at": approval.submitted_at.isoformat(),
+                "submitted_at": approval.submitted_at,
                 "submitted_by": approval.submitted_by,
                 "approval_data": approval.approval_data,
-                "reviewed_at": approval.reviewed_at.isoformat() if approval.reviewed_at else None,
+                "reviewed_at": approval.reviewed_at,
                 "reviewed_by": approval.reviewed_by,
                 "review_notes": approval.review_notes,
                 "modifications": approval.modifications,
-                "timeout_at": approval.timeout_at.isoformat() if approval.timeout_at else None,
+                "timeout_at": approval.timeout_at,
                 "timed_out": approval.timed_out,
                 "escalated": approval.escalated,
             }
+        )
 
     except HTTPException:
         raise
@@ -125,7 +179,12 @@ async def get_approval(approval_id: int):
 
 
 @router.post("/{approval_id}/respond")
-async def respond_to_approval(approval_id: int, response: ApprovalResponse):
+async def respond_to_approval(
+    approval_id: int,
+    response: ApprovalResponse,
+    svc: ApprovalService = Depends(approval_svc),
+    orchestrator: Optional[LangGraphRequestFacade] = Depends(get_optional_orchestrator),
+):
     """
     Respond to a pending approval
 
@@ -149,28 +208,15 @@ async def respond_to_approval(approval_id: int, response: ApprovalResponse):
         else:
             # Without orchestrator, just update the approval status
             # This is useful for testing the approval UI
-            async with get_db_session() as session:
-                approval_service = ApprovalService(session)
-
-                if response.decision == "approve":
-                    await approval_service.approve(
-                        approval_id, response.reviewer, response.notes, response.modifications
-                    )
-                elif response.decision == "reject":
-                    await approval_service.reject(
-                        approval_id, response.reviewer, response.notes or "Rejected"
-                    )
-                elif response.decision == "modify":
-                    await approval_service.modify(
-                        approval_id, response.reviewer, response.modifications, response.notes
-                    )
-                else:
-                    raise ValueError(f"Invalid decision: {response.decision}")
-
-                logger.info(
-                    f"Approval {approval_id} {response.decision}d by {response.reviewer} "
-                    "(without workflow continuation - orchestrator not available)"
-                )
+            apply_decision = _DECISION_HANDLERS.get(response.decision)
+            if apply_decision is None:
+                raise ValueError(f"Invalid decision: {response.decision}")
+            await apply_decision(svc, approval_id, response)
+
+            logger.info(
+                f"Approval {approval_id} {response.decision}d by {response.reviewer} "
+                "(without workflow continuation - orchestrator not available)"
+            )
 
         return {
             "success": True,
@@ -187,7 +233,7 @@ async def respond_to_approval(approval_id: int, response: ApprovalResponse):
 
 
 @router.get("/request/{request_id}")
-async def get_approvals_for_request(request_id: str):
+async def get_approvals_for_request(request_id: str, svc: ApprovalService = Depends(approval_svc)):
     """
     Get all approvals for a research request
 
@@ -198,41 +244,76 @@ async def get_approvals_for_request(request_id: str):
         List of approvals for the request
     """
     try:
-        async with get_db_session() as session:
-            approval_service = ApprovalService(session)
-            approvals = await approval_service.get_approvals_for_request(request_id)
+        rows = await svc.get_approvals_for_request_rows(request_id)
 
-            return {
+        return ORJSONResponse(
+            {
                 "request_id": request_id,
-                "count": len(approvals),
-                "approvals": [
-                    {
-                        "id": approval.id,
-                        "approval_type": approval.approval_type,
-                        "status": approval.status,
-                        "submitted_at": approval.submitted_at.isoformat(),
-                        "reviewed_at": (
-                            approval.reviewed_at.isoformat() if approval.reviewed_at else None
-                        ),
-                        "reviewed_by": approval.reviewed_by,
-                        "review_notes": approval.review_notes,
-                    }
-                    for approval in approvals
-                ],
+                "count": len(rows),
+                "approvals": [dict(row._mapping) for row in rows],
             }
+        )
 
     except Exception as e:
         logger.error(f"Error retrieving approvals for request {request_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _run_scope_analysis(coordinator, approval_id: int, context: Dict[str, Any]) -> None:
+    """
+    Background half of /scope-change: impact analysis, then notification
+
+    Stores the coordinator's impact analysis on the approval and releases
+    it to the pending queue. A failed analysis is recorded on the approval
+    and still released, so reviewers are never left without the request; if
+    the release itself is lost, the timeout sweep releases it later.
+    """
+    try:
+        result = await coordinator.handle_task(task="handle_scope_change", context=context)
+        impact_analysis = result.get("impact_analysis", {})
+    except Exception as e:
+        logger.error(f"Scope change analysis failed for approval {approval_id}: {e}")
+        impact_analysis = {"error": f"Impact analysis failed: {e}"}
+
+    try:
+        async with get_db_session() as session:
+            await ApprovalService(session).update_approval_data(
+                approval_id, {"impact_analysis": impact_analysis}, status="pending"
+            )
+    except Exception as e:
+        logger.error(f"Failed to store scope change analysis for approval {approval_id}: {e}")
+        return
+
+    try:
+        await coordinator.handle_task(
+            task="send_scope_change_notification",
+            context={
+                "request_id": context["request_id"],
+                "approval_id": approval_id,
+                "requested_by": context["requested_by"],
+                "current_state": context["current_state"],
+                "requested_changes": context["requested_changes"],
+                "impact_analysis": impact_analysis,
+            },
+        )
+    except Exception as e:
+        logger.error(f"Scope change notification failed for approval {approval_id}: {e}")
+
+
 @router.post("/scope-change")
-async def request_scope_change(request: ScopeChangeRequest):
+async def request_scope_change(
+    request: ScopeChangeRequest,
+    background: BackgroundTasks,
+    svc: ApprovalService = Depends(approval_svc),
+    orchestrator: LangGraphRequestFacade = Depends(get_orchestrator),
+):
     """
     Request a scope change for an active research request
 
     This allows researchers to modify their requirements mid-workflow without restarting.
-    The coordinator agent will analyze the impact and route for approval.
+    The approval is created in "analyzing" status and returned immediately; the
+    coordinator agent's impact analysis runs in the background and then moves it
+    to "pending". Poll GET /approvals/{approval_id} for the result.
 
     Args:
         request: Scope change request details
@@ -240,9 +321,6 @@ async def request_scope_change(request: ScopeChangeRequest):
     Returns:
         Approval ID for the scope change request
     """
-    if not orchestrator:
-        raise HTTPException(status_code=500, detail="Orchestrator not initialized")
-
     try:
         # Get current request state
         request_status = await orchestrator.get_request_status(request.request_id)
@@ -251,8 +329,7 @@ async def request_scope_change(request: ScopeChangeRequest):
             raise HTTPException(status_code=404, detail=f"Request {request.request_id} not found")
 
         # Check if request is in a state that allows scope changes
-        terminal_states = ["complete", "failed", "delivered"]
-        if request_status["current_state"] in terminal_states:
+        if request_status["current_state"] in _TERMINAL_STATES:
             raise HTTPException(
                 status_code=400,
                 detail=f"Cannot change scope for request in state: {request_status['current_state']}",
@@ -265,10 +342,26 @@ async def request_scope_change(request: ScopeChangeRequest):
         if not coordinator:
             raise HTTPException(status_code=500, detail="Coordinator agent not available")
 
-        # Execute scope change analysis
-        result = await coordinator.handle_task(
-            task="handle_scope_change",
-            context={
+        # Record the request now and run the (LLM-backed) impact analysis after
+        # the response; the approval joins the pending queue once it is done
+        approval = await svc.create_approval(
+            request_id=request.request_id,
+            approval_type="scope_change",
+            submitted_by=request.requested_by,
+            approval_data={
+                "requested_changes": request.requested_changes,
+                "reason": request.reason,
+                "impact_analysis": {},
+                "current_state": request_status["current_state"],
+            },
+            status="analyzing",
+        )
+
+        background.add_task(
+            _run_scope_analysis,
+            coordinator,
+            approval.id,
+            {
                 "request_id": request.request_id,
                 "current_state": request_status["current_state"],
                 "requested_changes": request.requested_changes,
@@ -278,42 +371,13 @@ async def request_scope_change(request: ScopeChangeRequest):
             },
         )
 
-        # Create approval for scope change
-        async with get_db_session() as session:
-            approval_service = ApprovalService(session)
-
-            approval = await approval_service.create_approval(
-                request_id=request.request_id,
-                approval_type="scope_change",
-                submitted_by=request.requested_by,
-                approval_data={
-                    "requested_changes": request.requested_changes,
-                    "reason": request.reason,
-                    "impact_analysis": result.get("impact_analysis", {}),
-                    "current_state": request_status["current_state"],
-                },
-            )
-
-            # Send notification to stakeholders
-            await coordinator.handle_task(
-                task="send_scope_change_notification",
-                context={
-                    "request_id": request.request_id,
-                    "approval_id": approval.id,
-                    "requested_by": request.requested_by,
-                    "current_state": request_status["current_state"],
-                    "requested_changes": request.requested_changes,
-                    "impact_analysis": result.get("impact_analysis", {}),
-                },
-            )
-
-            return {
-                "success": True,
-                "message": "Scope change request submitted for approval",
-                "approval_id": approval.id,
-                "request_id": request.request_id,
-                "impact_analysis": result.get("impact_analysis", {}),
-            }
+        return {
+            "success": True,
+            "message": "Scope change request submitted; impact analysis in progress",
+            "approval_id": approval.id,
+            "request_id": request.request_id,
+            "status": approval.status,
+        }
 
     except HTTPException:
         raise
@@ -322,35 +386,87 @@ async def request_scope_change(request: ScopeChangeRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def run_timeout_sweep() -> Dict[str, Any]:
+    """Time out overdue approvals (creating escalations) and summarize the sweep"""
+    async with get_db_session() as session:
+        timed_out = await ApprovalService(session).check_timeouts()
+
+        return {
+            "success": True,
+            "swept_at": datetime.now(),
+            "timed_out_count": len(timed_out),
+            "timed_out_approvals": [
+                {
+                    "id": approval.id,
+                    "request_id": approval.request_id,
+                    "approval_type": approval.approval_type,
+                    "timeout_at": approval.timeout_at,
+                    "escalation_id": approval.escalation_id,
+                }
+                for approval in timed_out
+            ],
+        }
+
+
+async def _timeout_sweep_loop(app, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            app.state.approval_timeout_sweep = await run_timeout_sweep()
+        except Exception:
+            logger.exception("Approval timeout sweep failed")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=TIMEOUT_SWEEP_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def start_timeout_sweeper(app) -> None:
+    """
+    Start the periodic approval-timeout sweep as a background task
+
+    Called from the application lifespan so the hourly scan runs off the
+    request path instead of waiting for an external cron to hit
+    /approvals/check-timeouts.
+    """
+    if TIMEOUT_SWEEP_SECONDS <= 0:
+        logger.info("Approval timeout sweeper disabled (TIMEOUT_SWEEP_SEC=0)")
+        return
+    app.state.approval_timeout_stop = asyncio.Event()
+    app.state.approval_timeout_task = asyncio.create_task(
+        _timeout_sweep_loop(app, app.state.approval_timeout_stop)
+    )
+
+
+async def stop_timeout_sweeper(app) -> None:
+    """Stop the background sweep, cancelling it if it is mid-scan"""
+    task = getattr(app.state, "approval_timeout_task", None)
+    if task is None:
+        return
+    app.state.approval_timeout_stop.set()
+    try:
+        await asyncio.wait_for(task, timeout=2.0)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        task.cancel()
+    app.state.approval_timeout_task = None
+
+
 @router.post("/check-timeouts")
-async def check_approval_timeouts():
+async def check_approval_timeouts(http_request: Request):
     """
-    Check for timed out approvals and create escalations
+    Report timed out approvals from the last background sweep
 
-    This should be called periodically (e.g., every hour) by a scheduler
+    The sweep runs every TIMEOUT_SWEEP_SEC from the application lifespan.
+    When no sweep has run in this process (sweeper disabled, or not yet
+    started), one is run now.
 
     Returns:
         List of timed out approvals
     """
     try:
-        async with get_db_session() as session:
-            approval_service = ApprovalService(session)
-            timed_out = await approval_service.check_timeouts()
-
-            return {
-                "success": True,
-                "timed_out_count": len(timed_out),
-                "timed_out_approvals": [
-                    {
-                        "id": approval.id,
-                        "request_id": approval.request_id,
-                        "approval_type": approval.approval_type,
-                        "timeout_at": approval.timeout_at.isoformat(),
-                        "escalation_id": approval.escalation_id,
-                    }
-                    for approval in timed_out
-                ],
-            }
+        last_sweep = getattr(http_request.app.state, "approval_timeout_sweep", None)
+        if last_sweep is None:
+            last_sweep = await run_timeout_sweep()
+        return ORJSONResponse(last_sweep)
 
     except Exception as e:
         logger.error(f"Error checking approval timeouts: {e}")
@@ -0,0 +1,58 @@
+"""
+Shared FastAPI dependencies for the API routers
+
+The LangGraph orchestrator, the shared HTTP client and the requirements
+agent are created in the application lifespan and stored on app.state;
+routers read them through
+these dependencies rather than module-level globals, so tests can set or
+override them per app.
+"""
+
+from typing import Optional
+
+import httpx
+from fastapi import HTTPException, Request
+
+from ..agents.requirements_agent import RequirementsAgent
+from ..clients.analytics_client import AnalyticsClient
+from ..clients.http_client import create_http_client
+from ..langchain_orchestrator.request_facade import LangGraphRequestFacade
+
+
+def get_optional_orchestrator(request: Request) -> Optional[LangGraphRequestFacade]:
+    """Orchestrator from app.state, or None in analytics-only mode"""
+    return getattr(request.app.state, "orchestrator", None)
+
+
+def get_orchestrator(request: Request) -> LangGraphRequestFacade:
+    """Orchestrator from app.state; 503 when it is not running"""
+    orchestrator = getattr(request.app.state, "orchestrator", None)
+    if orchestrator is None:
+        raise HTTPException(status_code=503, detail="Orchestrator not initialized")
+    return orchestrator
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Process-wide httpx.AsyncClient; created on first use without the lifespan"""
+    http_client = getattr(request.app.state, "http_client", None)
+    if http_client is None:
+        http_client = request.app.state.http_client = create_http_client()
+    return http_client
+
+
+def get_analytics_client(request: Request) -> AnalyticsClient:
+    """AnalyticsClient that sends through the shared HTTP client"""
+    return AnalyticsClient(client=get_http_client(request))
+
+
+def get_requirements_agent(request: Request) -> RequirementsAgent:
+    """
+    Process-wide RequirementsAgent; created on first use without the lifespan
+
+    It lives as long as the app so per-request conversation state survives
+    between turns of the streaming requirements route.
+    """
+    agent = getattr(request.app.state, "requirements_agent", None)
+    if agent is None:
+        agent = request.app.state.requirements_agent = RequirementsAgent()
+    return agent
@@ -2,16 +2,17 @@
 Health check endpoints for monitoring and status verification
 """
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
-from datetime import datetime
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import ORJSONResponse
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
+import asyncio
 import logging
 import os
 import time
 from sqlalchemy import select, func
 
-from app.database import get_db_session, ResearchRequest
+from app.database import get_db_session, get_engine, ResearchRequest
 from app.clients.fhir_client import FHIRClient
 from app.security import audit_middleware as audit_mw
 from app.security.audit_drain import (
@@ -26,6 +27,36 @@ logger = logging.getLogger(__name__)
 # Configuration
 FHIR_BASE_URL = os.getenv("FHIR_BASE_URL", "http://localhost:8081/fhir")
 
+# FHIR metadata is cached this many seconds, so probes within the window
+# don't each make a round trip to the FHIR server
+HEALTH_FHIR_TTL = float(os.getenv("HEALTH_FHIR_TTL", "15"))
+
+# Cache-Control for probe responses: proxies and sidecars may reuse liveness
+# and /health briefly; readiness is never cached since it must reflect a
+# check that actually ran
+LIVENESS_CACHE_CONTROL = "public, max-age=5"
+HEALTH_CACHE_CONTROL = "public, max-age=2"
+
+
+# Total and active (not completed) requests in one round trip. A Core select
+# over the table, built once: the probe skips ORM entity handling and
+# reuses SQLAlchemy's compiled-statement cache entry
+_requests_table = ResearchRequest.__table__
+_REQUEST_COUNTS_STMT = select(
+    func.count().label("total"),
+    func.count().filter(_requests_table.c.completed_at.is_(None)).label("active"),
+).select_from(_requests_table)
+
+
+def _utcnow() -> datetime:
+    """Probe timestamp; ORJSONResponse encodes it as RFC 3339 with the UTC offset"""
+    return datetime.now(timezone.utc)
+
+
+# Last /metadata fetch: when, for which base URL, and its result or error
+_metadata_cache: Dict[str, Any] = {"ts": None, "url": None, "value": None, "error": None}
+_metadata_lock = asyncio.Lock()
+
 # Sprint 6.1 Phase 2.2 Issue #3 — audit pipeline thresholds
 AUDIT_QUEUE_DEPTH_503_THRESHOLD = int(os.getenv("AUDIT_QUEUE_DEPTH_503_THRESHOLD", "10000"))
 AUDIT_DRAIN_STALENESS_503_SECONDS = int(os.getenv("AUDIT_DRAIN_STALENESS_503_SECONDS", "30"))
@@ -90,8 +121,51 @@ async def audit_health_check(
     }
 
 
+def get_fhir(request: Request) -> FHIRClient:
+    """FastAPI dependency returning the process-wide FHIRClient.
+
+    Created in the application lifespan; apps that mount this router without
+    that lifespan get one created on first use.
+    """
+    fhir_client = getattr(request.app.state, "fhir_client", None)
+    if fhir_client is None:
+        fhir_client = request.app.state.fhir_client = FHIRClient(
+            base_url=FHIR_BASE_URL, client=getattr(request.app.state, "http_client", None)
+        )
+    return fhir_client
+
+
+async def _get_cached_metadata(fhir_client: FHIRClient) -> Dict[str, Any]:
+    """FHIR server metadata, fetched at most once per HEALTH_FHIR_TTL.
+
+    Returns a copy of the cache entry. Failures are cached too, so an
+    unreachable server isn't retried on every probe. After a failure the
+    last good `value` is kept (served stale) alongside the `error`.
+    """
+    async with _metadata_lock:
+        cache = _metadata_cache
+        fresh = (
+            cache["ts"] is not None
+            and cache["url"] == fhir_client.base_url
+            and time.monotonic() - cache["ts"] < HEALTH_FHIR_TTL
+        )
+        if not fresh:
+            if cache["url"] != fhir_client.base_url:
+                cache["value"] = None
+            try:
+                # Bypass the client's own metadata cache: this probe's TTL
+                # decides how often the server is actually asked
+                cache["value"] = await fhir_client.get_metadata(refresh=True)
+                cache["error"] = None
+            except Exception as e:
+                cache["error"] = str(e)
+            cache["ts"] = time.monotonic()
+            cache["url"] = fhir_client.base_url
+        return dict(cache)
+
+
 @router.get("/health")
-async def health() -> Dict[str, Any]:
+async def health(request: Request, fhir_client: FHIRClient = Depends(get_fhir)):
     """
     Comprehensive health check endpoint
 
@@ -105,72 +179,54 @@ async def health() -> Dict[str, Any]:
     Returns:
         Health status with component checks
     """
-    health_status = {"status": "healthy", "timestamp": datetime.now().isoformat(), "components": {}}
-
-    overall_healthy = True
-
-    # Check database connectivity
-    try:
-        async with get_db_session() as session:
-            # Simple query to test connection
-            result = await session.execute(select(func.count(ResearchRequest.id)))
-            total_requests = result.scalar()
+    health_status = {"status": "healthy", "timestamp": _utcnow(), "components": {}}
 
-            # Count active requests
-            active_result = await session.execute(
-                select(func.count(ResearchRequest.id)).where(ResearchRequest.completed_at.is_(None))
-            )
-            active_requests = active_result.scalar()
-
-            health_status["components"]["database"] = {
+    async def _check_db() -> Dict[str, Any]:
+        try:
+            async with get_db_session() as session:
+                counts = (await session.execute(_REQUEST_COUNTS_STMT)).one()
+            return {
                 "status": "healthy",
-                "total_requests": total_requests,
-                "active_requests": active_requests,
+                "total_requests": counts.total,
+                "active_requests": counts.active,
+            }
+        except Exception as e:
+            logger.error(f"Database health check failed: {e}")
+            return {"status": "unhealthy", "error": str(e)}
+
+    async def _check_fhir() -> Dict[str, Any]:
+        # Metadata query, cached briefly
+        cached = await _get_cached_metadata(fhir_client)
+        metadata = cached["value"]
+        if cached["error"] is None:
+            return {
+                "status": "healthy",
+                "url": FHIR_BASE_URL,
+                "version": metadata.get("fhirVersion", "unknown") if metadata else "unknown",
             }
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
-        health_status["components"]["database"] = {"status": "unhealthy", "error": str(e)}
-        overall_healthy = False
-
-    # Check FHIR server connectivity
-    try:
-        fhir_client = FHIRClient(base_url=FHIR_BASE_URL)
-
-        # Try a simple metadata query
-        metadata = await fhir_client.get_metadata()
-
-        health_status["components"]["fhir_server"] = {
-            "status": "healthy",
-            "url": FHIR_BASE_URL,
-            "version": metadata.get("fhirVersion", "unknown") if metadata else "unknown",
-        }
-
-        await fhir_client.close()
-    except Exception as e:
-        logger.error(f"FHIR server health check failed: {e}")
-        health_status["components"]["fhir_server"] = {
-            "status": "unhealthy",
-            "url": FHIR_BASE_URL,
-            "error": str(e),
-        }
-        overall_healthy = False
 
-    # Check cache statistics (if InMemoryRunner is available)
+        logger.error(f"FHIR server health check failed: {cached['error']}")
+        result = {"status": "unhealthy", "url": FHIR_BASE_URL, "error": cached["error"]}
+        if metadata:
+            # Last successful response, served stale
+            result["version"] = metadata.get("fhirVersion", "unknown")
+        return result
+
+    # Database and FHIR checks overlap; /health takes the slower of the two
+    db_result, fhir_result = await asyncio.gather(_check_db(), _check_fhir())
+    health_status["components"]["database"] = db_result
+    health_status["components"]["fhir_server"] = fhir_result
+
+    # Cache statistics of the shared analytics runner (created in the lifespan).
+    # In-process counters only, so it doesn't count towards overall health.
+    runner = getattr(request.app.state, "analytics_runner", None)
+    stats_getter = getattr(runner, "get_cache_stats", None) or getattr(
+        runner, "get_statistics", None
+    )
     try:
-        # Import here to avoid circular dependencies
-        from app.sql_on_fhir.runner.in_memory_runner import InMemoryRunner
-
-        # Create temporary runner to get cache stats
-        # Note: This creates a new instance, so stats won't be accurate
-        # In production, you'd want to inject a shared runner instance
-        temp_runner = InMemoryRunner(
-            fhir_client=FHIRClient(base_url=FHIR_BASE_URL), enable_cache=True
-        )
-        cache_stats = temp_runner.get_cache_stats()
-
-        health_status["components"]["cache"] = {"status": "healthy", **cache_stats}
-
-        await temp_runner.fhir_client.close()
+        if stats_getter is None:
+            raise LookupError("no shared analytics runner")
+        health_status["components"]["cache"] = {"status": "healthy", **stats_getter()}
     except Exception as e:
         logger.warning(f"Cache health check failed: {e}")
         health_status["components"]["cache"] = {
@@ -179,13 +235,14 @@ async def health() -> Dict[str, Any]:
         }
 
     # Set overall status
+    overall_healthy = all(r["status"] == "healthy" for r in (db_result, fhir_result))
     health_status["status"] = "healthy" if overall_healthy else "unhealthy"
 
-    return health_status
+    return ORJSONResponse(health_status, headers={"Cache-Control": HEALTH_CACHE_CONTROL})
 
 
 @router.get("/health/live")
-async def liveness() -> Dict[str, str]:
+async def liveness():
     """
     Kubernetes liveness probe endpoint
 
@@ -195,7 +252,20 @@ async def liveness() -> Dict[str, str]:
     Returns:
         Simple status message
     """
-    return {"status": "alive", "timestamp": datetime.now().isoformat()}
+    return ORJSONResponse(
+        {"status": "alive", "timestamp": _utcnow()},
+        headers={"Cache-Control": LIVENESS_CACHE_CONTROL},
+    )
+
+
+async def _database_not_ready() -> Optional[str]:
+    """Run `SELECT 1`; returns None when the database answers, else the error."""
+    try:
+        async with get_db_session() as session:
+            await session.execute(select(1))
+        return None
+    except Exception as e:
+        return str(e)
 
 
 @router.get("/health/ready")
@@ -207,24 +277,17 @@ async def readiness():
     Internal state (queue depths, drain restart count) is auth-gated at
     `/health/ready/detailed` to avoid leaking pipeline-failure intel to attackers.
     """
-    ready = True
-    try:
-        async with get_db_session() as session:
-            await session.execute(select(1))
-    except Exception:
-        ready = False
 
-    audit = await audit_health_check()
-    if not audit["healthy"]:
-        ready = False
+    db_error, audit = await asyncio.gather(_database_not_ready(), audit_health_check())
+    ready = db_error is None and audit["healthy"]
 
     body = {
         "status": "ready" if ready else "not ready",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _utcnow(),
     }
-    if not ready:
-        return JSONResponse(body, status_code=503)
-    return body
+    return ORJSONResponse(
+        body, status_code=200 if ready else 503, headers={"Cache-Control": "no-store"}
+    )
 
 
 @router.get("/health/ready/detailed")
@@ -235,27 +298,31 @@ async def readiness_detailed():
     callers get 401 + UNAUTH_PHI_ATTEMPT. Authorized operators see component
     health and audit pipeline metrics.
     """
-    ready = True
-    components = {}
-
-    try:
-        async with get_db_session() as session:
-            await session.execute(select(1))
-            components["database"] = "ready"
-    except Exception as e:
-        components["database"] = f"not ready: {str(e)}"
-        ready = False
-
-    audit = await audit_health_check()
-    if not audit["healthy"]:
-        ready = False
+    db_error, audit = await asyncio.gather(_database_not_ready(), audit_health_check())
+    ready = db_error is None and audit["healthy"]
+    components = {"database": "ready" if db_error is None else f"not ready: {db_error}"}
 
     body = {
         "status": "ready" if ready else "not ready",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _utcnow(),
         "components": components,
         **{k: v for k, v in audit.items() if k != "healthy"},
     }
-    if not ready:
-        return JSONResponse(body, status_code=503)
+    return ORJSONResponse(
+        body, status_code=200 if ready else 503, headers={"Cache-Control": "no-store"}
+    )
+
+
+@router.get("/debug/pool")
+async def pool_status() -> Dict[str, Any]:
+    """Connection pool usage for this worker's app database engine.
+
+    Not on the public allowlist, so default-deny middleware keeps it
+    behind authentication like /health/ready/detailed.
+    """
+    pool = get_engine().pool
+    body: Dict[str, Any] = {"pool_class": type(pool).__name__, "status": pool.status()}
+    for stat in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, stat):
+            body[stat] = getattr(pool, stat)()
     return body
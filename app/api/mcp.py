@@ -1,20 +1,27 @@
-from fastapi import APIRouter
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 
 from ..mcp.store import FileContextStore
 from ..schemas.mcp import ContextRequest
 
-router = APIRouter(prefix="/mcp")
+router = APIRouter(prefix="/mcp", default_response_class=ORJSONResponse)
+
+
+@lru_cache(maxsize=1)
+def get_context_store() -> FileContextStore:
+    """Process-wide context store; its directory is created once, on first use"""
+    return FileContextStore()
 
 
 @router.post("/context")
-async def save_context(req: ContextRequest):
-    store = FileContextStore()
+async def save_context(req: ContextRequest, store: FileContextStore = Depends(get_context_store)):
     store.save(req.request_id, req.context)
     return {"status": "saved"}
 
 
 @router.get("/context/{request_id}")
-async def get_context(request_id: str):
-    store = FileContextStore()
+async def get_context(request_id: str, store: FileContextStore = Depends(get_context_store)):
     ctx = store.load(request_id)
     return {"context": ctx}
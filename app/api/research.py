@@ -4,49 +4,85 @@ Research Request API Endpoints
 Provides REST API for submitting and managing research data requests.
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from typing import Optional
-from datetime import datetime
+import asyncio
+import json
 import logging
-import uuid
 from pathlib import Path
 
-from ..database import get_db_session, ResearchRequest, DataDelivery
+from ..database import (
+    get_db_session,
+    new_request_id,
+    ResearchRequest,
+    StateTransition,
+    DataDelivery,
+)
+from .dependencies import get_optional_orchestrator, get_orchestrator, get_requirements_agent
+from ..agents.requirements_agent import RequirementsAgent
 from ..database.workflow_states import WorkflowState
 from ..services.file_storage import FileStorageService
-from ..schemas.research import ResearchRequestSubmission, RequestProcessingTrigger
+from ..schemas.research import (
+    ResearchRequestSubmission,
+    RequestProcessingTrigger,
+    RequirementsTurnRequest,
+)
 from sqlalchemy import select
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/research", tags=["research"])
-
-# Global orchestrator reference (set by main.py)
-orchestrator = None
-
-
-def set_orchestrator(orch):
-    """Set the orchestrator instance"""
-    global orchestrator
-    orchestrator = orch
+router = APIRouter(prefix="/research", tags=["research"], default_response_class=ORJSONResponse)
+
+
+# Columns the status and list routes return; projecting them skips ORM
+# hydration of the large requirement/SQL/result columns they never read.
+REQUEST_STATUS_COLUMNS = (
+    ResearchRequest.id,
+    ResearchRequest.researcher_name,
+    ResearchRequest.researcher_email,
+    ResearchRequest.irb_number,
+    ResearchRequest.current_state,
+    ResearchRequest.current_agent,
+    ResearchRequest.created_at,
+    ResearchRequest.updated_at,
+    ResearchRequest.agents_involved,
+)
+
+_ACTIVE_REQUESTS_STMT = (
+    select(
+        ResearchRequest.id,
+        ResearchRequest.researcher_name,
+        ResearchRequest.current_state,
+        ResearchRequest.current_agent,
+        ResearchRequest.created_at,
+    )
+    # IDs lead with their creation timestamp, so the PK index gives newest
+    # first (pre-timestamp IDs are ordered within their day by random suffix;
+    # see new_request_id)
+    .order_by(ResearchRequest.id.desc()).limit(50)
+)
+
+
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 # Schemas migrated to app/schemas/research.py (Sprint 6.1 Phase 2.3 Issue #5)
 
 
 @router.post("/submit")
-async def submit_research_request(submission: ResearchRequestSubmission):
+async def submit_research_request(
+    submission: ResearchRequestSubmission, orchestrator=Depends(get_optional_orchestrator)
+):
     """
     Submit a new research data request.
 
     Creates the request and triggers the orchestrator to begin processing.
     """
     try:
-        # Generate request ID
-        date_str = datetime.now().strftime("%Y%m%d")
-        unique_id = str(uuid.uuid4())[:8].upper()
-        request_id = f"REQ-{date_str}-{unique_id}"
+        request_id = new_request_id()
 
         # Create research request in database
         async with get_db_session() as session:
@@ -60,18 +96,17 @@ async def submit_research_request(submission: ResearchRequestSubmission):
                 current_state=WorkflowState.NEW_REQUEST.value,
                 current_agent="requirements_agent",
                 agents_involved=[],
-                state_history=[
-                    {
-                        "state": WorkflowState.NEW_REQUEST.value,
-                        "timestamp": datetime.now().isoformat(),
-                        "notes": "Request submitted",
-                    }
-                ],
             )
 
             session.add(research_request)
+            session.add(
+                StateTransition(
+                    request_id=request_id,
+                    state=WorkflowState.NEW_REQUEST.value,
+                    notes="Request submitted",
+                )
+            )
             await session.commit()
-            await session.refresh(research_request)
 
             logger.info(f"Created research request: {request_id}")
 
@@ -99,7 +134,9 @@ async def submit_research_request(submission: ResearchRequestSubmission):
 
 @router.post("/process/{request_id}")
 async def process_research_request(
-    request_id: str, trigger: Optional[RequestProcessingTrigger] = None
+    request_id: str,
+    trigger: Optional[RequestProcessingTrigger] = None,
+    orchestrator=Depends(get_orchestrator),
 ):
     """
     Trigger processing of a research request.
@@ -110,18 +147,15 @@ async def process_research_request(
         request_id: Research request ID
         trigger: Optional trigger with structured requirements and skip_conversation flag
     """
-    if not orchestrator:
-        raise HTTPException(
-            status_code=500, detail="Orchestrator not initialized. Please restart the API server."
-        )
-
     try:
         # Get the research request
         async with get_db_session() as session:
             result = await session.execute(
-                select(ResearchRequest).where(ResearchRequest.id == request_id)
+                select(ResearchRequest.initial_request, ResearchRequest.researcher_email).where(
+                    ResearchRequest.id == request_id
+                )
             )
-            request = result.scalar_one_or_none()
+            request = result.one_or_none()
 
             if not request:
                 raise HTTPException(status_code=404, detail=f"Request {request_id} not found")
@@ -167,6 +201,79 @@ async def process_research_request(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{request_id}/requirements/stream")
+async def stream_requirements_turn(
+    request_id: str,
+    turn: RequirementsTurnRequest,
+    requirements_agent: RequirementsAgent = Depends(get_requirements_agent),
+):
+    """
+    Run one requirements-conversation turn as a Server-Sent Events stream.
+
+    The next question is sent as `question` events while the model generates
+    it; a `reset` event means the text streamed so far was discarded and will
+    be sent again. The turn ends with a `final` event carrying the full
+    gather_requirements result (or an `error` event).
+
+    Args:
+        request_id: Research request ID
+        turn: The researcher's reply and the conversation so far
+    """
+    async with get_db_session() as session:
+        result = await session.execute(
+            select(ResearchRequest).where(ResearchRequest.id == request_id)
+        )
+        request = result.scalar_one_or_none()
+
+        if not request:
+            raise HTTPException(status_code=404, detail=f"Request {request_id} not found")
+
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def on_question_delta(text: str):
+        await queue.put(("question", {"delta": text}))
+
+    async def on_question_reset():
+        await queue.put(("reset", {}))
+
+    context = {
+        "request_id": request_id,
+        "initial_request": request.initial_request,
+        "researcher_email": request.researcher_email,
+        "conversation_history": list(turn.conversation_history),
+        "user_response": turn.user_response,
+        "current_requirements": turn.current_requirements,
+        "on_question_delta": on_question_delta,
+        "on_question_reset": on_question_reset,
+    }
+
+    async def run_turn():
+        try:
+            outcome = await requirements_agent.execute_task("gather_requirements", context)
+            await queue.put(("final", outcome))
+        except Exception as e:
+            logger.error(f"Error streaming requirements for {request_id}: {e}")
+            await queue.put(("error", {"detail": str(e)}))
+
+    async def events():
+        task = asyncio.create_task(run_turn())
+        try:
+            while True:
+                event, data = await queue.get()
+                yield _sse_event(event, data)
+                if event in ("final", "error"):
+                    break
+        finally:
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{request_id}")
 async def get_request_status(request_id: str):
     """
@@ -175,25 +282,35 @@ async def get_request_status(request_id: str):
     try:
         async with get_db_session() as session:
             result = await session.execute(
-                select(ResearchRequest).where(ResearchRequest.id == request_id)
+                select(*REQUEST_STATUS_COLUMNS).where(ResearchRequest.id == request_id)
             )
-            request = result.scalar_one_or_none()
+            request = result.one_or_none()
 
             if not request:
                 raise HTTPException(status_code=404, detail=f"Request {request_id} not found")
 
-            return {
-                "request_id": request.id,
-                "researcher_name": request.researcher_name,
-                "researcher_email": request.researcher_email,
-                "irb_number": request.irb_number,
-                "current_state": request.current_state,
-                "current_agent": request.current_agent,
-                "created_at": request.created_at.isoformat() if request.created_at else None,
-                "updated_at": request.updated_at.isoformat() if request.updated_at else None,
-                "agents_involved": request.agents_involved,
-                "state_history": request.state_history,
-            }
+            transitions = await session.scalars(
+                select(StateTransition)
+                .where(StateTransition.request_id == request_id)
+                .order_by(StateTransition.timestamp, StateTransition.id)
+            )
+
+            # Returned as ORJSONResponse so orjson encodes the datetimes
+            # directly, skipping FastAPI's jsonable_encoder pass
+            return ORJSONResponse(
+                {
+                    "request_id": request.id,
+                    "researcher_name": request.researcher_name,
+                    "researcher_email": request.researcher_email,
+                    "irb_number": request.irb_number,
+                    "current_state": request.current_state,
+                    "current_agent": request.current_agent,
+                    "created_at": request.created_at,
+                    "updated_at": request.updated_at,
+                    "agents_involved": request.agents_involved,
+                    "state_history": [t.to_history_entry() for t in transitions],
+                }
+            )
 
     except HTTPException:
         raise
@@ -209,24 +326,24 @@ async def list_active_requests():
     """
     try:
         async with get_db_session() as session:
-            result = await session.execute(
-                select(ResearchRequest).order_by(ResearchRequest.created_at.desc()).limit(50)
+            result = await session.execute(_ACTIVE_REQUESTS_STMT)
+            requests = result.all()
+
+            return ORJSONResponse(
+                {
+                    "count": len(requests),
+                    "requests": [
+                        {
+                            "request_id": req.id,
+                            "researcher_name": req.researcher_name,
+                            "current_state": req.current_state,
+                            "current_agent": req.current_agent,
+                            "created_at": req.created_at,
+                        }
+                        for req in requests
+                    ],
+                }
             )
-            requests = result.scalars().all()
-
-            return {
-                "count": len(requests),
-                "requests": [
-                    {
-                        "request_id": req.id,
-                        "researcher_name": req.researcher_name,
-                        "current_state": req.current_state,
-                        "current_agent": req.current_agent,
-                        "created_at": req.created_at.isoformat() if req.created_at else None,
-                    }
-                    for req in requests
-                ],
-            }
 
     except Exception as e:
         logger.error(f"Error listing requests: {e}")
@@ -258,9 +375,9 @@ async def get_delivery_info(request_id: str):
         async with get_db_session() as session:
             # Get research request
             result = await session.execute(
-                select(ResearchRequest).where(ResearchRequest.id == request_id)
+                select(*REQUEST_STATUS_COLUMNS).where(ResearchRequest.id == request_id)
             )
-            request = result.scalar_one_or_none()
+            request = result.one_or_none()
 
             if not request:
                 raise HTTPException(status_code=404, detail=f"Request {request_id} not found")
@@ -332,9 +449,9 @@ async def download_data_package(request_id: str):
         async with get_db_session() as session:
             # Verify request exists and is delivered
             result = await session.execute(
-                select(ResearchRequest).where(ResearchRequest.id == request_id)
+                select(*REQUEST_STATUS_COLUMNS).where(ResearchRequest.id == request_id)
             )
-            request = result.scalar_one_or_none()
+            request = result.one_or_none()
 
             if not request:
                 raise HTTPException(status_code=404, detail=f"Request {request_id} not found")
@@ -392,9 +509,9 @@ async def download_specific_file(request_id: str, filename: str):
         async with get_db_session() as session:
             # Verify request exists and is delivered
             result = await session.execute(
-                select(ResearchRequest).where(ResearchRequest.id == request_id)
+                select(*REQUEST_STATUS_COLUMNS).where(ResearchRequest.id == request_id)
             )
-            request = result.scalar_one_or_none()
+            request = result.one_or_none()
 
             if not request:
                 raise HTTPException(status_code=404, detail=f"Request {request_id} not found")
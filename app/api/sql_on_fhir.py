@@ -1,13 +1,21 @@
-from fastapi import APIRouter
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 
 from ..adapters.sql_on_fhir import SQLonFHIRAdapter
 from ..schemas.sql_on_fhir import SQLQueryRequest
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+@lru_cache(maxsize=1)
+def get_sql_adapter() -> SQLonFHIRAdapter:
+    """Process-wide adapter; it binds the shared HAPI engine lazily, on first query"""
+    return SQLonFHIRAdapter()
 
 
 @router.post("/sql_query")
-async def sql_query(req: SQLQueryRequest):
-    adapter = SQLonFHIRAdapter()
+async def sql_query(req: SQLQueryRequest, adapter: SQLonFHIRAdapter = Depends(get_sql_adapter)):
     rows = await adapter.execute_sql(req.sql)
     return {"rows": rows}
@@ -1,6 +1,6 @@
 """Redis cache module for Lambda speed layer."""
 
-from app.cache.redis_client import RedisClient
+from app.cache.redis_client import RedisClient, close_redis_client, get_redis_client
 from app.cache.cache_config import CacheConfig, cache_config
 
-__all__ = ["RedisClient", "CacheConfig", "cache_config"]
+__all__ = ["RedisClient", "get_redis_client", "close_redis_client", "CacheConfig", "cache_config"]
@@ -1,5 +1,6 @@
 """Cache configuration and policies."""
 
+import os
 from dataclasses import dataclass
 
 
@@ -13,9 +14,10 @@ class CacheConfig:
     condition_ttl_hours: int = 24
     observation_ttl_hours: int = 12  # Observations change more frequently
 
-    # Scan limits
-    scan_batch_size: int = 100
-    max_scan_results: int = 10000
+    # Scan limits: SCAN COUNT hint per round-trip, and the most resources one
+    # scan_recent_resources call returns
+    scan_batch_size: int = int(os.getenv("REDIS_SCAN_BATCH_SIZE", "1000"))
+    max_scan_results: int = int(os.getenv("REDIS_MAX_SCAN_RESULTS", "10000"))
 
     # Connection settings
     connection_timeout_seconds: int = 5
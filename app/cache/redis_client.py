@@ -1,10 +1,22 @@
 """Redis client for speed layer caching."""
 
 import os
-import json
+import orjson
 from typing import Any, Dict, List, Optional
 import redis.asyncio as redis
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+from .cache_config import cache_config
+
+# Keys per pipelined read when fetching resources listed by the recency index
+READ_BATCH_SIZE = 100
+
+
+def _utc_epoch(dt: datetime) -> float:
+    """Epoch seconds for a cached_at-style datetime (naive values are UTC)"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
 
 
 class RedisClient:
@@ -13,20 +25,41 @@ class RedisClient:
     def __init__(self, redis_url: Optional[str] = None):
         self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self._client: Optional[redis.Redis] = None
+        self._pool: Optional[redis.BlockingConnectionPool] = None
 
     async def connect(self):
-        """Establish Redis connection."""
+        """
+        Establish Redis connection.
+
+        Connections come from a BlockingConnectionPool capped at
+        cache_config.max_connections: a burst of scans waits up to
+        connection_timeout_seconds for a free connection instead of
+        opening sockets without bound.
+        """
         if not self._client:
-            self._client = await redis.from_url(
-                self.redis_url, encoding="utf-8", decode_responses=True, socket_timeout=5
+            self._pool = redis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=cache_config.max_connections,
+                timeout=cache_config.connection_timeout_seconds,
+                encoding="utf-8",
+                decode_responses=True,
+                socket_timeout=5,
             )
+            self._client = redis.Redis(connection_pool=self._pool)
         return self._client
 
     async def disconnect(self):
         """Close Redis connection."""
         if self._client:
-            await self._client.close()
+            await self._client.aclose()
+            await self._pool.disconnect()
             self._client = None
+            self._pool = None
+
+    @staticmethod
+    def _recency_index_key(resource_type: str) -> str:
+        """Sorted set of resource_id -> cached_at epoch for one resource type"""
+        return f"idx:fhir:{resource_type.lower()}"
 
     async def set_fhir_resource(
         self,
@@ -38,6 +71,11 @@ class RedisClient:
         """
         Cache a FHIR resource in Redis with TTL.
 
+        Also records the resource in its type's recency index so
+        scan_recent_resources(since=...) can skip older entries server-side,
+        and drops index entries cached more than ttl_hours ago: their
+        resources have expired (a type's resources share one TTL).
+
         Args:
             resource_type: FHIR resource type (Patient, Condition, etc.)
             resource_id: Resource ID
@@ -50,17 +88,28 @@ class RedisClient:
         client = await self.connect()
 
         key = f"fhir:{resource_type.lower()}:{resource_id}"
-        value = json.dumps(
-            {
-                "resource": resource_data,
-                "cached_at": datetime.utcnow().isoformat(),
-                "resource_type": resource_type,
-            }
-        )
-
+        index_key = self._recency_index_key(resource_type)
+        cached_at = _utc_epoch(datetime.utcnow())
         ttl_seconds = int(ttl_hours * 3600)
 
-        return await client.setex(key, ttl_seconds, value)
+        # A hash with the resource JSON in "data", so reads HGET the payload
+        # without an envelope to parse. DEL first replaces any value stored
+        # under the key (including pre-hash string entries) atomically.
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(
+                key,
+                mapping={
+                    "data": orjson.dumps(resource_data),
+                    "ts": int(cached_at),
+                    "type": resource_type,
+                },
+            )
+            pipe.expire(key, ttl_seconds)
+            pipe.zadd(index_key, {resource_id: cached_at})
+            pipe.zremrangebyscore(index_key, "-inf", f"({cached_at - ttl_seconds}")
+            results = await pipe.execute()
+        return bool(results[2])
 
     async def get_fhir_resource(
         self, resource_type: str, resource_id: str
@@ -69,12 +118,22 @@ class RedisClient:
         client = await self.connect()
 
         key = f"fhir:{resource_type.lower()}:{resource_id}"
-        value = await client.get(key)
+        (blob,) = await self._read_data(client, [key])
+        return orjson.loads(blob) if blob else None
+
+    @staticmethod
+    async def _read_data(client, keys: List[str]) -> List[Optional[str]]:
+        """
+        "data" field of each resource hash, in one pipelined round trip
 
-        if value:
-            data = json.loads(value)
-            return data["resource"]
-        return None
+        Missing keys, and keys that are not hashes (entries written before
+        resources were stored as hashes), read as None.
+        """
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hget(key, "data")
+            values = await pipe.execute(raise_on_error=False)
+        return [value if isinstance(value, str) else None for value in values]
 
     async def scan_recent_resources(
         self, resource_type: str, since: Optional[datetime] = None
@@ -82,6 +141,14 @@ class RedisClient:
         """
         Scan Redis for recent resources of a given type.
 
+        With since, only the ids the recency index lists at or after that
+        time are fetched; index entries whose resource has expired are
+        dropped along the way. Without since, every key of the type is
+        SCANned, cache_config.scan_batch_size keys per round-trip.
+
+        At most cache_config.max_scan_results resources are returned (with
+        since, the most recently cached ones).
+
         Args:
             resource_type: FHIR resource type
             since: Only return resources cached after this time
@@ -91,29 +158,57 @@ class RedisClient:
         """
         client = await self.connect()
 
+        if since is not None:
+            return await self._read_indexed_since(client, resource_type, since)
+
         pattern = f"fhir:{resource_type.lower()}:*"
         resources = []
 
+        limit = cache_config.max_scan_results
+
         cursor = 0
         while True:
-            cursor, keys = await client.scan(cursor=cursor, match=pattern, count=100)
+            cursor, keys = await client.scan(
+                cursor=cursor, match=pattern, count=cache_config.scan_batch_size
+            )
 
             if keys:
-                for key in keys:
-                    value = await client.get(key)
+                # One pipelined HGET batch per SCAN batch, not a round-trip per key
+                for value in await self._read_data(client, keys[: limit - len(resources)]):
                     if value:
-                        data = json.loads(value)
+                        resources.append(orjson.loads(value))
 
-                        # Filter by timestamp if requested
-                        if since:
-                            cached_at = datetime.fromisoformat(data["cached_at"])
-                            if cached_at < since:
-                                continue
+            if cursor == 0 or len(resources) >= limit:
+                break
 
-                        resources.append(data["resource"])
+        return resources
 
-            if cursor == 0:
-                break
+    async def _read_indexed_since(
+        self, client, resource_type: str, since: datetime
+    ) -> List[Dict[str, Any]]:
+        """Resources the recency index lists as cached at or after since"""
+        index_key = self._recency_index_key(resource_type)
+        # Newest max_scan_results entries, read back oldest first
+        ids = await client.zrevrangebyscore(
+            index_key, "+inf", _utc_epoch(since), start=0, num=cache_config.max_scan_results
+        )
+        ids.reverse()
+
+        resources = []
+        expired = []
+        for start in range(0, len(ids), READ_BATCH_SIZE):
+            batch = ids[start : start + READ_BATCH_SIZE]
+            values = await self._read_data(
+                client, [f"fhir:{resource_type.lower()}:{i}" for i in batch]
+            )
+            for resource_id, value in zip(batch, values):
+                if value:
+                    resources.append(orjson.loads(value))
+                else:
+                    expired.append(resource_id)
+
+        if expired:
+            await client.zrem(index_key, *expired)
 
         return resources
 
@@ -121,9 +216,61 @@ class RedisClient:
         """Delete a cached resource."""
         client = await self.connect()
         key = f"fhir:{resource_type.lower()}:{resource_id}"
+        await client.zrem(self._recency_index_key(resource_type), resource_id)
         return await client.delete(key) > 0
 
+    async def set_cohort_patient_ids(
+        self, cohort_key: str, patient_ids: List[str], ttl_seconds: int = 3600
+    ) -> bool:
+        """
+        Cache the patient ids of a generated cohort, keyed by requirements hash.
+
+        Lets later phases (extraction, QA) reuse the cohort feasibility already
+        generated instead of re-deriving it from the FHIR server.
+
+        Args:
+            cohort_key: Stable cohort identifier (e.g. a requirements hash)
+            patient_ids: Patient ids in the cohort
+            ttl_seconds: Time-to-live in seconds (default: 1 hour)
+
+        Returns:
+            True if successful
+        """
+        client = await self.connect()
+        return await client.setex(
+            f"cohort:{cohort_key}", ttl_seconds, orjson.dumps(patient_ids).decode()
+        )
+
+    async def get_cohort_patient_ids(self, cohort_key: str) -> Optional[List[str]]:
+        """Get cached cohort patient ids, or None if absent/expired."""
+        client = await self.connect()
+        value = await client.get(f"cohort:{cohort_key}")
+        return orjson.loads(value) if value else None
+
     async def flush_all(self) -> bool:
         """Flush all cached data (use with caution!)."""
         client = await self.connect()
         return await client.flushdb()
+
+
+# Process-wide client (and connection pool) shared by the hybrid runners and
+# agents; closed from the application lifespan.
+_redis_client: Optional[RedisClient] = None
+
+
+def get_redis_client() -> RedisClient:
+    """Return the shared speed-layer RedisClient, creating it on first use"""
+    global _redis_client
+
+    if _redis_client is None:
+        _redis_client = RedisClient()
+    return _redis_client
+
+
+async def close_redis_client():
+    """Close the shared client's connection pool if it was created"""
+    global _redis_client
+
+    if _redis_client:
+        await _redis_client.disconnect()
+        _redis_client = None
@@ -3,5 +3,6 @@ FHIR and external service clients
 """
 
 from .fhir_client import FHIRClient, create_fhir_client
+from .http_client import create_http_client
 
-__all__ = ["FHIRClient", "create_fhir_client"]
+__all__ = ["FHIRClient", "create_fhir_client", "create_http_client"]
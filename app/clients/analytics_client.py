@@ -4,13 +4,31 @@ Analytics API Client
 Wrapper for the SQL-on-FHIR v2 Analytics API
 """
 
+import asyncio
 import httpx
 import logging
-from typing import Dict, List, Any, Optional
+import os
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+import orjson
 from dataclasses import dataclass
 
+from ..sql_on_fhir.row_filters import SQL_FILTER_OPERATORS, filter_rows
+
 logger = logging.getLogger(__name__)
 
+# ViewDefinitions executed at once by execute_multiple_view_definitions; each
+# in-flight execution is one request against the analytics API.
+ANALYTICS_CLIENT_CONCURRENCY = int(os.getenv("ANALYTICS_CLIENT_CONCURRENCY", "4"))
+
+# The ViewDefinition list only changes on deploy, so list_view_definitions
+# serves it from a per-process cache keyed by URL for this many seconds.
+# Clients are built per request, hence module level rather than per instance.
+ANALYTICS_VIEW_DEFINITIONS_TTL = float(os.getenv("ANALYTICS_VIEW_DEFINITIONS_TTL", "60"))
+_view_definitions_cache: Dict[str, Tuple[float, bytes]] = {}
+_view_definitions_lock = asyncio.Lock()
+
 
 @dataclass
 class QueryResult:
@@ -31,14 +49,24 @@ class AnalyticsClient:
     Provides methods for executing ViewDefinitions and retrieving results.
     """
 
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(
+        self, base_url: str = "http://localhost:8000", client: Optional[httpx.AsyncClient] = None
+    ):
+        """
+        Args:
+            base_url: ResearchFlow API base URL
+            client: Shared httpx.AsyncClient (e.g. app.state.http_client);
+                    when omitted the client creates and owns its own
+        """
         self.base_url = base_url
         self.analytics_url = f"{base_url}/analytics"
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=30.0)
 
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """Close HTTP client (a shared client is left open for its owner)"""
+        if self._owns_client:
+            await self.client.aclose()
 
     async def health_check(self) -> bool:
         """Check if Analytics API is healthy"""
@@ -52,21 +80,40 @@ class AnalyticsClient:
             return False
 
     async def list_view_definitions(self) -> List[Dict[str, str]]:
-        """List all available ViewDefinitions"""
-        try:
-            response = await self.client.get(f"{self.analytics_url}/view-definitions")
-            response.raise_for_status()
-            data = response.json()
+        """
+        List all available ViewDefinitions
+
+        Cached for ANALYTICS_VIEW_DEFINITIONS_TTL seconds; concurrent misses
+        share one request and failures (an empty list) are not cached.
+        """
+        url = f"{self.analytics_url}/view-definitions"
+
+        cached = _view_definitions_cache.get(url)
+        if cached is not None and time.monotonic() - cached[0] < ANALYTICS_VIEW_DEFINITIONS_TTL:
+            return orjson.loads(cached[1]).get("view_definitions", [])
+
+        async with _view_definitions_lock:
+            cached = _view_definitions_cache.get(url)
+            if cached is not None and time.monotonic() - cached[0] < ANALYTICS_VIEW_DEFINITIONS_TTL:
+                return orjson.loads(cached[1]).get("view_definitions", [])
+
+            try:
+                response = await self.client.get(url)
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+            except Exception as e:
+                logger.error(f"Failed to list ViewDefinitions: {e}")
+                return []
+
+            _view_definitions_cache[url] = (time.monotonic(), response.content)
             return data.get("view_definitions", [])
-        except Exception as e:
-            logger.error(f"Failed to list ViewDefinitions: {e}")
-            return []
 
     async def execute_view_definition(
         self,
         view_name: str,
         search_params: Optional[Dict[str, Any]] = None,
         max_resources: Optional[int] = None,
+        filters: Optional[List[Dict[str, Any]]] = None,
     ) -> QueryResult:
         """
         Execute a ViewDefinition
@@ -75,6 +122,10 @@ class AnalyticsClient:
             view_name: Name of ViewDefinition to execute
             search_params: FHIR search parameters for filtering
             max_resources: Maximum resources to process
+            filters: Row filters, as for filter_rows. Those the server can
+                     evaluate in SQL are sent with the request so unmatched
+                     rows never leave the database; any others are applied
+                     here to the returned rows
 
         Returns:
             QueryResult with rows and metadata
@@ -83,12 +134,17 @@ class AnalyticsClient:
 
         start_time = time.time()
 
+        pushed = [f for f in filters or [] if f.get("operator", "eq") in SQL_FILTER_OPERATORS]
+        local = [f for f in filters or [] if f.get("operator", "eq") not in SQL_FILTER_OPERATORS]
+
         try:
             payload = {
                 "view_name": view_name,
                 "search_params": search_params or {},
                 "max_resources": max_resources,
             }
+            if pushed:
+                payload["filters"] = pushed
 
             response = await self.client.post(f"{self.analytics_url}/execute", json=payload)
             response.raise_for_status()
@@ -96,11 +152,12 @@ class AnalyticsClient:
 
             execution_time = (time.time() - start_time) * 1000  # Convert to ms
 
+            rows = filter_rows(data.get("rows", []), local)
             return QueryResult(
                 view_name=data.get("view_name"),
                 resource_type=data.get("resource_type"),
-                row_count=data.get("row_count", 0),
-                rows=data.get("rows", []),
+                row_count=len(rows) if local else data.get("row_count", 0),
+                rows=rows,
                 schema=data.get("column_schema", {}),
                 execution_time_ms=execution_time,
             )
@@ -116,7 +173,10 @@ class AnalyticsClient:
         max_resources: Optional[int] = None,
     ) -> Dict[str, QueryResult]:
         """
-        Execute multiple ViewDefinitions
+        Execute multiple ViewDefinitions concurrently
+
+        At most ANALYTICS_CLIENT_CONCURRENCY executions are in flight at once,
+        all sharing this client's connection pool.
 
         Args:
             view_names: List of ViewDefinition names
@@ -124,20 +184,28 @@ class AnalyticsClient:
             max_resources: Maximum resources per ViewDefinition
 
         Returns:
-            Dict mapping view_name to QueryResult
+            Dict mapping view_name to QueryResult, in view_names order;
+            ViewDefinitions that failed are logged and left out
         """
-        results = {}
+        semaphore = asyncio.Semaphore(ANALYTICS_CLIENT_CONCURRENCY)
 
-        for view_name in view_names:
-            try:
-                result = await self.execute_view_definition(
+        async def execute_one(view_name: str) -> QueryResult:
+            async with semaphore:
+                return await self.execute_view_definition(
                     view_name=view_name, search_params=search_params, max_resources=max_resources
                 )
-                results[view_name] = result
-            except Exception as e:
-                logger.error(f"Failed to execute {view_name}: {e}")
+
+        outcomes = await asyncio.gather(
+            *(execute_one(name) for name in view_names), return_exceptions=True
+        )
+
+        results = {}
+        for view_name, outcome in zip(view_names, outcomes):
+            if isinstance(outcome, Exception):
                 # Continue with other ViewDefinitions
-                continue
+                logger.error(f"Failed to execute {view_name}: {outcome}")
+            else:
+                results[view_name] = outcome
 
         return results
 
@@ -150,6 +218,11 @@ class AnalyticsClient:
         """
         Join two query results on a common key
 
+        Left outer join: every primary row appears, once per matching
+        secondary row or once unmatched. The hash index is built over
+        whichever side has fewer rows; output order is the same either way
+        (primary order, then secondary order within a primary row).
+
         Args:
             primary_result: Primary result set
             secondary_result: Secondary result set to join
@@ -158,24 +231,41 @@ class AnalyticsClient:
         Returns:
             List of joined rows
         """
-        # Create index on secondary result
-        secondary_index = {}
-        for row in secondary_result.rows:
-            key_value = row.get(join_key)
-            if key_value:
-                if key_value not in secondary_index:
-                    secondary_index[key_value] = []
-                secondary_index[key_value].append(row)
-
-        # Join
+        primary_rows = primary_result.rows
+        secondary_rows = secondary_result.rows
+
+        if len(secondary_rows) <= len(primary_rows):
+            # Index the secondary side, probe with primary rows
+            secondary_index: Dict[Any, List[Dict[str, Any]]] = {}
+            for row in secondary_rows:
+                key_value = row.get(join_key)
+                if key_value:
+                    secondary_index.setdefault(key_value, []).append(row)
+            matches = [
+                secondary_index.get(row.get(join_key) or row.get("id")) for row in primary_rows
+            ]
+        else:
+            # Index the primary side by position, probe with secondary rows
+            primary_index: Dict[Any, List[int]] = {}
+            for position, row in enumerate(primary_rows):
+                key_value = row.get(join_key) or row.get("id")
+                if key_value:
+                    primary_index.setdefault(key_value, []).append(position)
+            matches = [None] * len(primary_rows)
+            for row in secondary_rows:
+                key_value = row.get(join_key)
+                if key_value:
+                    for position in primary_index.get(key_value, ()):
+                        if matches[position] is None:
+                            matches[position] = []
+                        matches[position].append(row)
+
         joined_rows = []
-        for primary_row in primary_result.rows:
-            key_value = primary_row.get(join_key) or primary_row.get("id")
-            if key_value in secondary_index:
+        for primary_row, secondary_matches in zip(primary_rows, matches):
+            if secondary_matches:
                 # Multiple matches - create multiple joined rows
-                for secondary_row in secondary_index[key_value]:
-                    joined_row = {**primary_row, **secondary_row}
-                    joined_rows.append(joined_row)
+                for secondary_row in secondary_matches:
+                    joined_rows.append({**primary_row, **secondary_row})
             else:
                 # No match - include primary row only
                 joined_rows.append(primary_row)
@@ -188,6 +278,10 @@ class AnalyticsClient:
         """
         Apply post-filters to result rows
 
+        All filters are evaluated in one pass, stopping at the first one a
+        row fails. A row whose field is missing or None fails that filter,
+        as does any filter with an unknown operator.
+
         Args:
             rows: Result rows
             filters: List of filter conditions
@@ -196,35 +290,4 @@ class AnalyticsClient:
         Returns:
             Filtered rows
         """
-        filtered = rows
-
-        for filter_spec in filters:
-            field = filter_spec.get("field")
-            value = filter_spec.get("value")
-            operator = filter_spec.get("operator", "eq")
-
-            filtered = [
-                row for row in filtered if self._matches_filter(row, field, value, operator)
-            ]
-
-        return filtered
-
-    def _matches_filter(self, row: Dict[str, Any], field: str, value: Any, operator: str) -> bool:
-        """Check if row matches filter condition"""
-        row_value = row.get(field)
-
-        if row_value is None:
-            return False
-
-        if operator == "eq":
-            return row_value == value
-        elif operator == "ne":
-            return row_value != value
-        elif operator == "gt":
-            return row_value > value
-        elif operator == "lt":
-            return row_value < value
-        elif operator == "contains":
-            return value.lower() in str(row_value).lower()
-        else:
-            return False
+        return filter_rows(rows, filters)
@@ -8,14 +8,24 @@ Provides HTTP client functionality for:
 - Connection pooling and retry logic
 """
 
+import asyncio
 import os
 import logging
-from typing import Dict, List, Any, Optional
+import time
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 import httpx
+import orjson
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 logger = logging.getLogger(__name__)
 
+# CapabilityStatements rarely change, so get_metadata serves them from a
+# per-process cache keyed by URL for FHIR_METADATA_TTL seconds. The raw body
+# is stored and parsed per call, so callers never share a mutable dict.
+FHIR_METADATA_TTL = float(os.getenv("FHIR_METADATA_TTL", "60"))
+_metadata_cache: Dict[str, Tuple[float, bytes]] = {}
+_metadata_lock = asyncio.Lock()
+
 
 class FHIRClient:
     """
@@ -29,13 +39,26 @@ class FHIRClient:
     - Batch/transaction bundles
     """
 
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_expiry: float = 5.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
         """
         Initialize FHIR client
 
         Args:
             base_url: FHIR server base URL (e.g., http://localhost:8081/fhir)
                      If not provided, uses FHIR_SERVER_URL environment variable
+            max_connections: Connection pool size
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection stays in the pool
+            client: Shared httpx.AsyncClient (e.g. app.state.http_client) to
+                    send requests through; the pool options are then unused
+                    and close() leaves it open for its owner
         """
         self.base_url = base_url or os.getenv("FHIR_SERVER_URL", "http://localhost:8081/fhir")
 
@@ -43,15 +66,22 @@ class FHIRClient:
         self.base_url = self.base_url.rstrip("/")
 
         # Initialize HTTP client with connection pooling
-        self.client = httpx.AsyncClient(
-            timeout=30.0, limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=max_keepalive_connections,
+                max_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
         )
 
         logger.info(f"Initialized FHIR client with base URL: {self.base_url}")
 
     async def close(self):
-        """Close HTTP client and cleanup resources"""
-        await self.client.aclose()
+        """Close HTTP client and cleanup resources (a shared client is left open)"""
+        if self._owns_client:
+            await self.client.aclose()
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     async def search(
@@ -74,6 +104,39 @@ class FHIRClient:
         Example:
             patients = await client.search("Patient", {"gender": "female"}, max_results=100)
         """
+        all_resources = []
+        async for resources in self.search_pages(resource_type, params, max_results):
+            all_resources.extend(resources)
+
+        logger.info(f"Search complete: retrieved {len(all_resources)} {resource_type} resources")
+        return all_resources
+
+    async def search_pages(
+        self,
+        resource_type: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Search for FHIR resources, yielding one Bundle page at a time
+
+        Lets callers process (or stop after) each page instead of holding the
+        whole result set in memory. Follows `next` links until exhausted or
+        max_results resources have been yielded; each next page is fetched
+        in the background while the current one is being consumed.
+
+        Args:
+            resource_type: FHIR resource type (e.g., "Patient", "Observation")
+            params: Search parameters (e.g., {"name": "John", "gender": "male"})
+            max_results: Maximum number of resources to yield across all pages
+
+        Yields:
+            List of FHIR resources from each Bundle page
+
+        Example:
+            async for page in client.search_pages("Patient", {"gender": "female"}):
+                ...
+        """
         url = f"{self.base_url}/{resource_type}"
         search_params = params or {}
 
@@ -83,53 +146,96 @@ class FHIRClient:
 
         logger.debug(f"Searching {resource_type} with params: {search_params}")
 
-        all_resources = []
-        next_url = url
-
-        while next_url:
-            try:
-                response = await self.client.get(
-                    next_url, params=search_params if next_url == url else None
-                )
-                response.raise_for_status()
+        yielded = 0
+        # The next page is requested as soon as its link is known, so it
+        # downloads while the caller processes the current page
+        pending = asyncio.ensure_future(self.client.get(url, params=search_params))
 
-                bundle = response.json()
+        try:
+            while pending is not None:
+                try:
+                    response = await pending
+                    pending = None
+                    response.raise_for_status()
+
+                    bundle = orjson.loads(response.content)
+                except httpx.HTTPStatusError as e:
+                    logger.error(f"HTTP error searching {resource_type}: {e}")
+                    raise
+                except Exception as e:
+                    logger.error(f"Error searching {resource_type}: {e}")
+                    raise
 
                 # Extract resources from bundle
-                if bundle.get("resourceType") == "Bundle":
-                    entries = bundle.get("entry", [])
-                    resources = [entry.get("resource") for entry in entries if "resource" in entry]
-                    all_resources.extend(resources)
-
-                    logger.debug(f"Retrieved {len(resources)} {resource_type} resources")
-
-                    # Check if we've reached max_results
-                    if max_results and len(all_resources) >= max_results:
-                        all_resources = all_resources[:max_results]
-                        break
-
-                    # Get next page URL
-                    next_url = None
-                    for link in bundle.get("link", []):
-                        if link.get("relation") == "next":
-                            next_url = link.get("url")
-                            break
-                else:
+                if bundle.get("resourceType") != "Bundle":
                     logger.warning(f"Unexpected response type: {bundle.get('resourceType')}")
-                    break
+                    return
+
+                entries = bundle.get("entry", [])
+                resources = [entry["resource"] for entry in entries if "resource" in entry]
+
+                logger.debug(f"Retrieved {len(resources)} {resource_type} resources")
+
+                # Check if we've reached max_results; truncate in place
+                if max_results and yielded + len(resources) >= max_results:
+                    del resources[max_results - yielded :]
+                    yield resources
+                    return
+
+                # Prefetch the next page (its URL carries its own query)
+                next_url = next(
+                    (
+                        link.get("url")
+                        for link in bundle.get("link", [])
+                        if link.get("relation") == "next"
+                    ),
+                    None,
+                )
+                if next_url:
+                    pending = asyncio.ensure_future(self.client.get(next_url))
 
-                # Clear search_params for subsequent requests (use URL from next link)
-                search_params = None
+                yielded += len(resources)
+                yield resources
+        finally:
+            # Caller stopped early (or a page failed): drop the prefetch
+            if pending is not None:
+                pending.cancel()
 
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error searching {resource_type}: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"Error searching {resource_type}: {e}")
-                raise
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    async def count(self, resource_type: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Count matching FHIR resources without fetching them
 
-        logger.info(f"Search complete: retrieved {len(all_resources)} {resource_type} resources")
-        return all_resources
+        Uses ``_summary=count``, so the server returns only Bundle.total.
+
+        Args:
+            resource_type: FHIR resource type (e.g., "Patient")
+            params: Search parameters (e.g., {"gender": "female"})
+
+        Returns:
+            Number of matching resources
+
+        Example:
+            female_patients = await client.count("Patient", {"gender": "female"})
+        """
+        url = f"{self.base_url}/{resource_type}"
+        count_params = {**(params or {}), "_summary": "count"}
+
+        logger.debug(f"Counting {resource_type} with params: {count_params}")
+
+        try:
+            response = await self.client.get(url, params=count_params)
+            response.raise_for_status()
+
+            bundle = response.json()
+            return int(bundle.get("total", 0))
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error counting {resource_type}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error counting {resource_type}: {e}")
+            raise
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     async def read(self, resource_type: str, resource_id: str) -> Dict[str, Any]:
@@ -242,22 +348,45 @@ class FHIRClient:
             logger.error(f"Error executing batch: {e}")
             raise
 
-    async def get_metadata(self) -> Dict[str, Any]:
+    async def get_metadata(self, refresh: bool = False) -> Dict[str, Any]:
         """
         Get FHIR server capability statement (metadata)
 
+        Cached per server for FHIR_METADATA_TTL seconds; concurrent misses
+        share one request.
+
+        Args:
+            refresh: Always ask the server (for connectivity checks); the
+                     response still refreshes the cache
+
         Returns:
             CapabilityStatement resource
         """
         url = f"{self.base_url}/metadata"
 
+        if refresh:
+            return await self._fetch_metadata(url)
+
+        cached = _metadata_cache.get(url)
+        if cached is not None and time.monotonic() - cached[0] < FHIR_METADATA_TTL:
+            return orjson.loads(cached[1])
+
+        async with _metadata_lock:
+            cached = _metadata_cache.get(url)
+            if cached is not None and time.monotonic() - cached[0] < FHIR_METADATA_TTL:
+                return orjson.loads(cached[1])
+            return await self._fetch_metadata(url)
+
+    async def _fetch_metadata(self, url: str) -> Dict[str, Any]:
+        """GET url (a /metadata endpoint), cache the body and return it parsed"""
         logger.debug("Fetching server metadata")
 
         try:
             response = await self.client.get(url)
             response.raise_for_status()
 
-            metadata = response.json()
+            metadata = orjson.loads(response.content)
+            _metadata_cache[url] = (time.monotonic(), response.content)
             logger.info(f"Server: {metadata.get('software', {}).get('name', 'Unknown')}")
             return metadata
 
@@ -265,6 +394,26 @@ class FHIRClient:
             logger.error(f"Error fetching metadata: {e}")
             raise
 
+    async def ping(self, timeout: float = 1.0) -> bool:
+        """
+        Cheap reachability check for health probes
+
+        Sends HEAD /metadata on the pooled keep-alive client instead of
+        downloading and parsing the CapabilityStatement.
+
+        Args:
+            timeout: Seconds to wait for the server
+
+        Returns:
+            True if the server answers without a 5xx status, False otherwise
+        """
+        try:
+            response = await self.client.head(f"{self.base_url}/metadata", timeout=timeout)
+            return response.status_code < 500
+        except Exception as e:
+            logger.warning(f"FHIR server ping failed: {e}")
+            return False
+
     async def test_connection(self) -> bool:
         """
         Test if FHIR server is reachable
@@ -273,7 +422,7 @@ class FHIRClient:
             True if server responds, False otherwise
         """
         try:
-            await self.get_metadata()
+            await self.get_metadata(refresh=True)
             logger.info("FHIR server connection successful")
             return True
         except Exception as e:
@@ -282,17 +431,18 @@ class FHIRClient:
 
 
 # Convenience function to create a FHIR client
-async def create_fhir_client(base_url: Optional[str] = None) -> FHIRClient:
+async def create_fhir_client(base_url: Optional[str] = None, **pool_options) -> FHIRClient:
     """
     Create and test FHIR client connection
 
     Args:
         base_url: FHIR server base URL
+        **pool_options: Connection pool sizing forwarded to FHIRClient
 
     Returns:
         FHIRClient instance
     """
-    client = FHIRClient(base_url)
+    client = FHIRClient(base_url, **pool_options)
 
     # Test connection
     if not await client.test_connection():
@@ -14,9 +14,11 @@ HAPI FHIR stores resources in PostgreSQL with the following schema:
 import asyncio
 import logging
 import os
-import json
-from typing import List, Dict, Any, Optional
-from contextlib import asynccontextmanager
+import re
+from typing import AsyncIterator, List, Dict, Any, Optional
+from contextlib import asynccontextmanager, contextmanager
+
+import orjson
 
 # Try to import asyncpg, but make it optional for Python 3.13 compatibility
 try:
@@ -29,6 +31,45 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# execute_join interpolates these into SQL, so they are checked first
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_WORK_MEM_RE = re.compile(r"^\d+\s*(kB|MB|GB)$")
+
+# Hot lookups are module-level constants so every call sends identical text
+# and hits each connection's prepared-statement cache (parsed and planned once)
+RESOURCE_COUNT_SQL = """
+    SELECT COUNT(*)
+    FROM hfj_resource
+    WHERE res_type = $1
+      AND res_deleted_at IS NULL
+"""
+
+RESOURCE_TYPES_SQL = """
+    SELECT DISTINCT res_type
+    FROM hfj_resource
+    WHERE res_deleted_at IS NULL
+    ORDER BY res_type
+"""
+
+RESOURCE_BY_ID_SQL = """
+    SELECT v.res_text_vc AS resource
+    FROM hfj_resource r
+    JOIN hfj_res_ver v ON r.res_ver = v.pid
+    WHERE r.res_type = $1
+      AND r.res_id = $2
+      AND r.res_deleted_at IS NULL
+    LIMIT 1
+"""
+
+RESOURCES_BY_IDS_SQL = """
+    SELECT r.res_id, v.res_text_vc AS resource
+    FROM hfj_resource r
+    JOIN hfj_res_ver v ON r.res_ver = v.pid
+    WHERE r.res_type = $1
+      AND r.res_id = ANY($2::bigint[])
+      AND r.res_deleted_at IS NULL
+"""
+
 
 class HAPIDBClient:
     """
@@ -47,6 +88,8 @@ class HAPIDBClient:
         min_pool_size: int = 5,
         max_pool_size: int = 20,
         command_timeout: float = 30.0,
+        statement_cache_size: int = 512,
+        max_cached_statement_lifetime: int = 0,
     ):
         """
         Initialize HAPI DB client
@@ -56,6 +99,8 @@ class HAPIDBClient:
             min_pool_size: Minimum connections in pool
             max_pool_size: Maximum connections in pool
             command_timeout: Query timeout in seconds
+            statement_cache_size: Prepared statements cached per connection
+            max_cached_statement_lifetime: Seconds a cached statement lives (0 = no limit)
         """
         # Get raw connection URL from parameter or environment
         raw_url = connection_url or os.getenv(
@@ -69,10 +114,19 @@ class HAPIDBClient:
         self.min_pool_size = min_pool_size
         self.max_pool_size = max_pool_size
         self.command_timeout = command_timeout
+        self.statement_cache_size = statement_cache_size
+        self.max_cached_statement_lifetime = max_cached_statement_lifetime
         self.pool: Optional[asyncpg.Pool] = None
 
     async def connect(self):
-        """Establish connection pool"""
+        """
+        Establish connection pool
+
+        The pool is bound to the running event loop. Under uvloop (what
+        uvicorn[standard] runs the app on) asyncpg's C protocol reads
+        results with roughly half the per-query loop overhead of the stock
+        asyncio loop, which matters most for sub-millisecond lookups.
+        """
         if self.pool is None:
             try:
                 self.pool = await asyncpg.create_pool(
@@ -80,6 +134,10 @@ class HAPIDBClient:
                     min_size=self.min_pool_size,
                     max_size=self.max_pool_size,
                     command_timeout=self.command_timeout,
+                    # ViewDefinition SQL is templated with bound parameters, so
+                    # the same few statements recur; keep their plans cached.
+                    statement_cache_size=self.statement_cache_size,
+                    max_cached_statement_lifetime=self.max_cached_statement_lifetime,
                 )
                 logger.info(
                     f"Connected to HAPI database "
@@ -131,20 +189,124 @@ class HAPIDBClient:
         if not self.pool:
             await self.connect()
 
-        try:
+        with self._query_errors(sql, timeout):
             async with self.pool.acquire() as conn:
                 # Per-query timeout via asyncpg's native kwarg — NOT
                 # `SET statement_timeout`, which persists on the pooled
                 # connection and would silently cap the next borrower's query.
-                fetch_timeout = timeout if timeout else self.command_timeout
-                if params:
-                    rows = await conn.fetch(sql, *params, timeout=fetch_timeout)
-                else:
-                    rows = await conn.fetch(sql, timeout=fetch_timeout)
+                rows = await conn.fetch(
+                    sql, *(params or ()), timeout=timeout or self.command_timeout
+                )
 
                 # Convert to list of dicts
                 return [dict(row) for row in rows]
 
+    async def execute_query_columnar(
+        self, sql: str, params: Optional[List] = None, timeout: Optional[float] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Execute SELECT query and return results column-wise
+
+        Builds one list per column instead of one dict per row, which is far
+        cheaper for large scans consumed a column at a time (id sets, counts,
+        DataFrame construction). An empty result still carries its
+        columns, read from the statement's description.
+
+        Args:
+            sql: SQL query string
+            params: Query parameters for prepared statement
+            timeout: Override default command timeout
+
+        Returns:
+            Dict mapping column name to that column's values in row order
+        """
+        if not self.pool:
+            await self.connect()
+
+        with self._query_errors(sql, timeout):
+            async with self.pool.acquire() as conn:
+                return await self._fetch_columnar(conn, sql, params, timeout)
+
+    async def execute_join(
+        self,
+        left_sql: str,
+        right_sql: str,
+        on_key: str,
+        left_params: Optional[List] = None,
+        right_params: Optional[List] = None,
+        work_mem: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, List[Any]]:
+        """
+        Left-join two queries' results in PostgreSQL and return them column-wise
+
+        Runs `WITH a AS (left), b AS (right) SELECT * FROM a LEFT JOIN b
+        USING (on_key)` as one statement, so PostgreSQL picks the join
+        strategy (a hash join for large inputs) and the un-joined rows never
+        leave the database. right_sql's $n placeholders are renumbered after
+        left_sql's. Columns other than on_key that both sides produce should
+        be aliased apart; otherwise the right side's value wins.
+
+        Args:
+            left_sql: Query for every row to keep (e.g. a ViewDefinition's SQL)
+            right_sql: Query joined onto it
+            on_key: Column both queries produce to join on
+            left_params: Parameters for left_sql
+            right_params: Parameters for right_sql
+            work_mem: Per-join memory, e.g. "256MB", set with SET LOCAL so a
+                      large hash table stays in memory; only this statement's
+                      transaction sees it
+            timeout: Override default command timeout
+
+        Returns:
+            Dict mapping column name to that column's values in row order
+
+        Raises:
+            ValueError: on_key or work_mem is malformed
+        """
+        if not _IDENTIFIER_RE.match(on_key):
+            raise ValueError(f"Invalid join key: {on_key!r}")
+        if work_mem is not None and not _WORK_MEM_RE.match(work_mem):
+            raise ValueError(f"Invalid work_mem: {work_mem!r}")
+
+        left_params = list(left_params or [])
+        offset = len(left_params)
+        right_sql = re.sub(r"\$(\d+)", lambda m: f"${int(m.group(1)) + offset}", right_sql)
+        sql = (
+            f"WITH a AS (\n{left_sql}\n), b AS (\n{right_sql}\n)\n"
+            f'SELECT * FROM a LEFT JOIN b USING ("{on_key}")'
+        )
+        params = left_params + list(right_params or [])
+
+        if not self.pool:
+            await self.connect()
+
+        with self._query_errors(sql, timeout):
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    if work_mem is not None:
+                        await conn.execute(f"SET LOCAL work_mem = '{work_mem}'")
+                    return await self._fetch_columnar(conn, sql, params, timeout)
+
+    async def _fetch_columnar(
+        self, conn, sql: str, params: Optional[List], timeout: Optional[float]
+    ) -> Dict[str, List[Any]]:
+        """Run sql on conn and build one list per column (see execute_query_columnar)"""
+        # conn.fetch goes through asyncpg's per-connection statement cache;
+        # conn.prepare() would not, so it is only used to read the column
+        # names of an empty result
+        rows = await conn.fetch(sql, *(params or ()), timeout=timeout or self.command_timeout)
+        if rows:
+            return dict(zip(rows[0].keys(), map(list, zip(*rows))))
+
+        statement = await conn.prepare(sql)
+        return {attribute.name: [] for attribute in statement.get_attributes()}
+
+    @contextmanager
+    def _query_errors(self, sql: str, timeout: Optional[float]):
+        """Log query failures; surface asyncpg timeouts as TimeoutError"""
+        try:
+            yield
         except (asyncpg.QueryCanceledError, asyncio.TimeoutError):
             logger.error(
                 f"Query timed out after {timeout or self.command_timeout}s: {sql[:100]}..."
@@ -156,13 +318,48 @@ class HAPIDBClient:
             logger.error(f"Query execution failed: {e}\nSQL: {sql[:200]}...")
             raise
 
-    async def execute_scalar(self, sql: str, params: Optional[List] = None) -> Any:
+    async def stream_query(
+        self, sql: str, params: Optional[List] = None, prefetch: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute SELECT query and yield rows as dicts through a server-side cursor
+
+        Only `prefetch` rows are held in memory at a time. The connection
+        stays checked out until the generator is exhausted or closed. Use
+        this for bulk view scans; collecting it into a list
+        (`[row async for row in client.stream_query(...)]`) brings back the
+        full in-memory result and is slower than execute_query.
+
+        Args:
+            sql: SQL query string
+            params: Query parameters for prepared statement
+            prefetch: Rows fetched from the server per round trip
+
+        Yields:
+            Rows as dictionaries
+        """
+        if not self.pool:
+            await self.connect()
+
+        async with self.pool.acquire() as conn:
+            # asyncpg cursors only exist inside a transaction
+            async with conn.transaction():
+                cursor = conn.cursor(
+                    sql, *(params or []), prefetch=prefetch, timeout=self.command_timeout
+                )
+                async for row in cursor:
+                    yield dict(row)
+
+    async def execute_scalar(
+        self, sql: str, params: Optional[List] = None, timeout: Optional[float] = None
+    ) -> Any:
         """
         Execute query and return single scalar value
 
         Args:
             sql: SQL query string
             params: Query parameters
+            timeout: Override default command timeout
 
         Returns:
             Single value from first row, first column
@@ -170,11 +367,11 @@ class HAPIDBClient:
         if not self.pool:
             await self.connect()
 
-        async with self.pool.acquire() as conn:
-            if params:
-                return await conn.fetchval(sql, *params)
-            else:
-                return await conn.fetchval(sql)
+        with self._query_errors(sql, timeout):
+            async with self.pool.acquire() as conn:
+                return await conn.fetchval(
+                    sql, *(params or ()), timeout=timeout or self.command_timeout
+                )
 
     async def explain_query(self, sql: str, analyze: bool = False) -> str:
         """
@@ -224,13 +421,7 @@ class HAPIDBClient:
         Returns:
             Count of resources
         """
-        sql = """
-            SELECT COUNT(*)
-            FROM hfj_resource
-            WHERE res_type = $1
-              AND res_deleted_at IS NULL
-        """
-        return await self.execute_scalar(sql, [resource_type])
+        return await self.execute_scalar(RESOURCE_COUNT_SQL, [resource_type])
 
     async def get_available_resource_types(self) -> List[str]:
         """
@@ -239,14 +430,8 @@ class HAPIDBClient:
         Returns:
             List of resource type names
         """
-        sql = """
-            SELECT DISTINCT res_type
-            FROM hfj_resource
-            WHERE res_deleted_at IS NULL
-            ORDER BY res_type
-        """
-        rows = await self.execute_query(sql)
-        return [row["res_type"] for row in rows]
+        columns = await self.execute_query_columnar(RESOURCE_TYPES_SQL)
+        return columns["res_type"]
 
     async def get_resource_by_id(
         self, resource_type: str, resource_id: str
@@ -261,24 +446,44 @@ class HAPIDBClient:
         Returns:
             Resource as dict, or None if not found
         """
-        sql = """
-            SELECT v.res_text_vc AS resource
-            FROM hfj_resource r
-            JOIN hfj_res_ver v ON r.res_ver = v.pid
-            WHERE r.res_type = $1
-              AND r.res_id = $2
-              AND r.res_deleted_at IS NULL
-            LIMIT 1
+        resource_text = await self.execute_scalar(RESOURCE_BY_ID_SQL, [resource_type, resource_id])
+
+        # Parse JSON string to dict if needed
+        if isinstance(resource_text, str):
+            return orjson.loads(resource_text)
+        return resource_text
+
+    async def get_resources_by_ids(
+        self, resource_type: str, resource_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
         """
-        rows = await self.execute_query(sql, [resource_type, resource_id])
+        Fetch many resources by ID in one query
 
-        if rows:
-            resource_text = rows[0]["resource"]
-            # Parse JSON string to dict if needed
-            if isinstance(resource_text, str):
-                return json.loads(resource_text)
-            return resource_text
-        return None
+        One `res_id = ANY($2)` lookup instead of a get_resource_by_id round
+        trip per ID.
+
+        Args:
+            resource_type: FHIR resource type
+            resource_ids: Numeric res_ids (as strings or ints)
+
+        Returns:
+            Dict mapping res_id (as a string) to resource; IDs that are not
+            found (or are deleted) are absent
+        """
+        if not resource_ids:
+            return {}
+
+        rows = await self.execute_query(
+            RESOURCES_BY_IDS_SQL, [resource_type, [int(rid) for rid in resource_ids]]
+        )
+
+        resources = {}
+        for row in rows:
+            resource = row["resource"]
+            if isinstance(resource, str):
+                resource = orjson.loads(resource)
+            resources[str(row["res_id"])] = resource
+        return resources
 
     async def get_database_stats(self) -> Dict[str, Any]:
         """
@@ -323,17 +528,21 @@ class HAPIDBClient:
 _hapi_db_client: Optional[HAPIDBClient] = None
 
 
-async def create_hapi_db_client() -> HAPIDBClient:
+async def create_hapi_db_client(**pool_options) -> HAPIDBClient:
     """
     Create or return singleton HAPI DB client instance
 
+    Args:
+        **pool_options: HAPIDBClient options (e.g. min_pool_size, max_pool_size)
+                        applied when the singleton is first created
+
     Returns:
         Configured HAPIDBClient with connection pool
     """
     global _hapi_db_client
 
     if _hapi_db_client is None:
-        _hapi_db_client = HAPIDBClient()
+        _hapi_db_client = HAPIDBClient(**pool_options)
         await _hapi_db_client.connect()
 
     return _hapi_db_client
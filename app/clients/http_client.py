@@ -0,0 +1,35 @@
+"""
+Process-wide HTTP client
+
+One httpx.AsyncClient is created in the application lifespan and stored on
+app.state.http_client; FHIRClient and AnalyticsClient instances send their
+requests through it, so keepalive connections are reused across handlers
+instead of each client paying its own TCP/TLS setup.
+"""
+
+import os
+
+import httpx
+
+# Pool sizing for the shared client; it serves every outbound HTTP call
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build the shared httpx.AsyncClient
+
+    The caller owns it and must aclose() it on shutdown.
+
+    Returns:
+        httpx.AsyncClient with the HTTP_* pool limits
+    """
+    return httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
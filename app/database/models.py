@@ -4,22 +4,52 @@ Database Models for ResearchFlow
 SQLAlchemy models for request tracking, workflow state, and agent execution.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Float, ForeignKey, Text, Boolean
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    JSON,
+    Float,
+    ForeignKey,
+    Text,
+    Boolean,
+    Index,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import secrets
 
 from app.security.encryption import EncryptedJSON, EncryptedText
 
 Base = declarative_base()
 
 
+def new_request_id() -> str:
+    """
+    New research request ID: REQ-YYYYMMDD-HHMMSS-XXXXXXXX
+
+    The timestamp prefix makes IDs sort by creation time (to the second),
+    so listings can ORDER BY the primary key instead of created_at.
+
+    IDs issued before this format (REQ-YYYYMMDD-XXXXXXXX) still sort by
+    day, but within their day they are ordered by the random suffix: a
+    suffix starting with a letter sorts after every HHMMSS of that day,
+    one starting with a digit interleaves with them as if it were a time.
+    Only the days before the format change are affected, so listings
+    accept that mixed ordering rather than adding a created_at sort.
+    """
+    now = datetime.now()
+    return f"REQ-{now:%Y%m%d-%H%M%S}-{secrets.token_hex(4).upper()}"
+
+
 class ResearchRequest(Base):
     """Main research data request tracking"""
 
     __tablename__ = "research_requests"
 
-    id = Column(String, primary_key=True)  # REQ-YYYYMMDD-XXXXXXXX
+    id = Column(String, primary_key=True)  # new_request_id(): REQ-YYYYMMDD-HHMMSS-XXXXXXXX
     created_at = Column(DateTime, default=datetime.now, nullable=False)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     completed_at = Column(DateTime, nullable=True)
@@ -41,7 +71,9 @@ class ResearchRequest(Base):
     # Workflow tracking
     current_agent = Column(String, nullable=True)
     agents_involved = Column(JSON, default=[])  # List of agents and tasks
-    state_history = Column(JSON, default=[])  # State transition history
+    # Legacy JSON copy of the history, no longer written: transitions are rows
+    # in state_transitions (migrations/003_state_transitions.sql backfills it)
+    state_history = Column(JSON, default=[])
 
     # Relationships
     requirements = relationship("RequirementsData", back_populates="request", uselist=False)
@@ -50,6 +82,48 @@ class ResearchRequest(Base):
     escalations = relationship("Escalation", back_populates="request")
     approvals = relationship("Approval", back_populates="request")
     delivery = relationship("DataDelivery", back_populates="request", uselist=False)
+    state_transitions = relationship("StateTransition", back_populates="request")
+
+    # Covers the GET /research/ listing (ORDER BY id DESC LIMIT 50) so PostgreSQL
+    # can answer it with an index-only scan; see migrations/002_research_requests_listing_index.sql
+    __table_args__ = (
+        Index(
+            "ix_research_requests_listing",
+            id.desc(),
+            postgresql_include=["researcher_name", "current_state", "current_agent", "created_at"],
+        ),
+    )
+
+
+class StateTransition(Base):
+    """
+    One workflow state change of a research request
+
+    Append-only: each transition is a single INSERT, instead of rewriting the
+    whole history array on the request row.
+    """
+
+    __tablename__ = "state_transitions"
+
+    id = Column(Integer, primary_key=True)
+    request_id = Column(String, ForeignKey("research_requests.id"), nullable=False)
+    state = Column(String, nullable=False)
+    timestamp = Column(DateTime, default=datetime.now, nullable=False)
+    notes = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+
+    request = relationship("ResearchRequest", back_populates="state_transitions")
+
+    __table_args__ = (Index("ix_state_transitions_request_ts", "request_id", "timestamp"),)
+
+    def to_history_entry(self) -> dict:
+        """The {"state", "timestamp", "notes"/"error"} dict status APIs return"""
+        entry = {"state": self.state, "timestamp": self.timestamp.isoformat()}
+        if self.notes is not None:
+            entry["notes"] = self.notes
+        if self.error is not None:
+            entry["error"] = self.error
+        return entry
 
 
 class RequirementsData(Base):
@@ -219,7 +293,7 @@ class Approval(Base):
     # Review status
     status = Column(
         String, default="pending", nullable=False
-    )  # pending, approved, rejected, modified, timeout
+    )  # analyzing, pending, approved, rejected, modified, timeout
     reviewed_at = Column(DateTime, nullable=True)
     reviewed_by = Column(String, nullable=True)  # user_id or email of reviewer
     review_notes = Column(Text, nullable=True)
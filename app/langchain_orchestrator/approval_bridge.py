@@ -28,7 +28,7 @@ Database Approval Types:
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
@@ -370,28 +370,52 @@ class ApprovalBridge:
             )
             ```
         """
+        decided = await self.record_approval_decision(
+            approval_id, status, reviewed_by, review_notes, modifications
+        )
+        return decided is not None
+
+    async def record_approval_decision(
+        self,
+        approval_id: int,
+        status: str,
+        reviewed_by: str,
+        review_notes: Optional[str] = None,
+        modifications: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Record a review decision in one session and one commit.
+
+        Same update as update_approval_status(), but returns what the caller
+        needs to resume the workflow, so it doesn't re-read the approval.
+
+        Returns:
+            (request_id, approval_type) of the updated approval, or None if
+            the approval does not exist
+        """
         async with self.async_session_maker() as session:
             result = await session.execute(select(Approval).where(Approval.id == approval_id))
             approval = result.scalar_one_or_none()
 
             if not approval:
                 logger.error(f"[ApprovalBridge] Approval not found: {approval_id}")
-                return False
+                return None
 
             approval.status = status
             approval.reviewed_at = datetime.now()
             approval.reviewed_by = reviewed_by
             approval.review_notes = review_notes
             approval.modifications = modifications
+            decided = (approval.request_id, approval.approval_type)
 
             await session.commit()
 
             logger.info(
                 f"[ApprovalBridge] Updated approval {approval_id}: "
-                f"{approval.approval_type} → {status} (by {reviewed_by})"
+                f"{decided[1]} → {status} (by {reviewed_by})"
             )
 
-            return True
+            return decided
 
     async def get_pending_approvals(self, request_id: Optional[str] = None) -> list[Dict[str, Any]]:
         """
@@ -21,12 +21,17 @@ import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
 import asyncio
-import uuid
 
 from app.langchain_orchestrator.langgraph_workflow import FullWorkflow
 from app.langchain_orchestrator.persistence import get_checkpointer
 from app.langchain_orchestrator.approval_bridge import ApprovalBridge
-from app.database import get_db_session, ResearchRequest, AuditLog
+from app.database import (
+    get_db_session,
+    new_request_id,
+    ResearchRequest,
+    StateTransition,
+    AuditLog,
+)
 from sqlalchemy import select
 
 logger = logging.getLogger(__name__)
@@ -193,9 +198,9 @@ class LangGraphRequestFacade:
                 current_state="new_request",
                 current_agent=None,
                 agents_involved=[],
-                state_history=[{"state": "new_request", "timestamp": datetime.now().isoformat()}],
             )
             session.add(research_request)
+            session.add(StateTransition(request_id=request_id, state="new_request"))
             await session.flush()
 
             # Log to audit trail
@@ -497,15 +502,7 @@ class LangGraphRequestFacade:
                     req.agents_involved = agents_involved
 
                     # Update state history
-                    state_history = req.state_history or []
-                    state_history.append(
-                        {
-                            "state": "error",
-                            "timestamp": datetime.now().isoformat(),
-                            "error": str(e),
-                        }
-                    )
-                    req.state_history = state_history
+                    session.add(StateTransition(request_id=request_id, state="error", error=str(e)))
 
                     await session.commit()
 
@@ -568,17 +565,15 @@ class LangGraphRequestFacade:
             req = result.scalar_one_or_none()
 
             if req:
-                req.current_state = state.get("current_state", req.current_state)
-                req.current_agent = self._get_agent_for_state(state.get("current_state"))
-                req.updated_at = datetime.now()
-
                 # Update state history if changed
                 if state.get("current_state") and state["current_state"] != req.current_state:
-                    state_history = req.state_history or []
-                    state_history.append(
-                        {"state": state["current_state"], "timestamp": datetime.now().isoformat()}
+                    session.add(
+                        StateTransition(request_id=request_id, state=state["current_state"])
                     )
-                    req.state_history = state_history
+
+                req.current_state = state.get("current_state", req.current_state)
+                req.current_agent = self._get_agent_for_state(state.get("current_state"))
+                req.updated_at = datetime.now()
 
                 await session.commit()
             else:
@@ -687,8 +682,9 @@ class LangGraphRequestFacade:
         status_map = {"approve": "approved", "reject": "rejected", "modify": "modified"}
         status = status_map.get(decision, "approved")
 
-        # Update approval in database using approval bridge
-        success = await self.approval_bridge.update_approval_status(
+        # Update approval in database using approval bridge; the same session
+        # read tells us which workflow to resume, so there is a single commit
+        decided = await self.approval_bridge.record_approval_decision(
             approval_id=approval_id,
             status=status,
             reviewed_by=reviewer,
@@ -696,23 +692,11 @@ class LangGraphRequestFacade:
             modifications=modifications,
         )
 
-        if not success:
+        if decided is None:
             logger.error(f"[LangGraphRequestFacade] Failed to update approval {approval_id}")
             return
 
-        # Get approval to find request_id
-        async with get_db_session() as session:
-            from app.database.models import Approval
-
-            result = await session.execute(select(Approval).where(Approval.id == approval_id))
-            approval = result.scalar_one_or_none()
-
-            if not approval:
-                logger.error(f"[LangGraphRequestFacade] Approval {approval_id} not found")
-                return
-
-            request_id = approval.request_id
-            approval_type = approval.approval_type
+        request_id, approval_type = decided
 
         logger.info(
             f"[LangGraphRequestFacade] Approval {approval_id} for {request_id} "
@@ -847,6 +831,12 @@ class LangGraphRequestFacade:
             if not research_request:
                 return None
 
+            transitions = await session.scalars(
+                select(StateTransition)
+                .where(StateTransition.request_id == request_id)
+                .order_by(StateTransition.timestamp, StateTransition.id)
+            )
+
             return {
                 "request_id": request_id,
                 "current_state": research_request.current_state,
@@ -858,7 +848,7 @@ class LangGraphRequestFacade:
                     else None
                 ),
                 "agents_involved": research_request.agents_involved,
-                "state_history": research_request.state_history,
+                "state_history": [t.to_history_entry() for t in transitions],
                 "researcher_info": {
                     "name": research_request.researcher_name,
                     "email": research_request.researcher_email,
@@ -1031,7 +1021,7 @@ class LangGraphRequestFacade:
 
     def _generate_request_id(self) -> str:
         """Generate unique request ID"""
-        return f"REQ-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+        return new_request_id()
 
     async def close(self):
         """Cleanup resources"""
@@ -10,17 +10,29 @@ import redis.asyncio as redis_async
 # Load environment variables from .env file
 load_dotenv()
 
-from .api.health import router as health_router
+from .api.health import router as health_router, FHIR_BASE_URL
 from .api.sql_on_fhir import router as sql_router
 from .api.mcp import router as mcp_router
 from .api.a2a import router as a2a_router
 from .api.auth import router as auth_router
 from .api.users import router as users_router
-from .api.analytics import router as analytics_router
+from .api.analytics import (
+    router as analytics_router,
+    open_analytics_runner,
+    close_analytics_runner,
+)
 from .api.materialized_views import router as materialized_views_router
-from .api.approvals import router as approvals_router, set_orchestrator as set_approvals_orch
-from .api.research import router as research_router, set_orchestrator as set_research_orch
+from .api.approvals import (
+    router as approvals_router,
+    start_timeout_sweeper,
+    stop_timeout_sweeper,
+)
+from .api.research import router as research_router
+from .agents.requirements_agent import RequirementsAgent
 from .langchain_orchestrator.request_facade import LangGraphRequestFacade
+from .clients.fhir_client import FHIRClient
+from .clients.http_client import create_http_client
+from .cache.redis_client import close_redis_client
 from .database import init_db
 from .security.rate_limit import setup_rate_limiting
 from .security import audit_middleware as audit_mw
@@ -38,9 +50,6 @@ from fastapi.exceptions import RequestValidationError
 
 logger = logging.getLogger(__name__)
 
-# Global orchestrator instance
-orchestrator = None
-
 # Audit pipeline state (Sprint 6.1 Phase 2.2 Issue #1)
 _audit_drain_task = None
 _audit_drain_stop = None
@@ -50,7 +59,7 @@ _audit_redis_client = None
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize resources on startup and cleanup on shutdown."""
-    global orchestrator, _audit_drain_task, _audit_drain_stop, _audit_redis_client
+    global _audit_drain_task, _audit_drain_stop, _audit_redis_client
 
     # Startup
     logger.info("Initializing ResearchFlow application...")
@@ -108,20 +117,40 @@ async def lifespan(app: FastAPI):
             "LangGraph orchestrator initialized (use_real_agents=True, use_persistence=True)"
         )
 
-        # Set orchestrator in API routers
-        set_approvals_orch(orchestrator)
-        set_research_orch(orchestrator)
         logger.info("Orchestrator connected to API endpoints")
     else:
         logger.info("Orchestrator disabled - running in analytics-only mode")
         orchestrator = None
 
+    # Routers read it through app.api.dependencies.get_orchestrator
+    app.state.orchestrator = orchestrator
+
+    # Long-lived analytics runner + HAPI pool shared by all analytics requests
+    await open_analytics_runner(app)
+
+    # One HTTP connection pool for all outbound calls; FHIR and analytics
+    # clients borrow it rather than opening their own
+    app.state.http_client = create_http_client()
+    app.state.fhir_client = FHIRClient(base_url=FHIR_BASE_URL, client=app.state.http_client)
+
+    # One RequirementsAgent for the streaming conversation route, so its
+    # per-request conversation state survives between turns
+    app.state.requirements_agent = RequirementsAgent()
+
+    # Periodic approval-timeout sweep (replaces cron hitting /approvals/check-timeouts)
+    start_timeout_sweeper(app)
+
     logger.info("ResearchFlow application ready")
 
     yield
 
     # Shutdown
     logger.info("Shutting down ResearchFlow application...")
+    await stop_timeout_sweeper(app)
+    await close_analytics_runner(app)
+    await close_redis_client()
+    await app.state.fhir_client.close()
+    await app.state.http_client.aclose()
     if _audit_drain_stop is not None:
         _audit_drain_stop.set()
     if _audit_drain_task is not None:
@@ -183,7 +212,7 @@ async def root():
         "name": "ResearchFlow",
         "version": "2.0.0",
         "status": "operational",
-        "orchestrator_initialized": orchestrator is not None,
+        "orchestrator_initialized": getattr(app.state, "orchestrator", None) is not None,
         "documentation": "/docs",
         "health": "/health",
     }
@@ -1,16 +1,27 @@
 """Schemas for /analytics router — Sprint 6.1 Phase 2.3 Issue #5 (Tier 1)."""
 
-from typing import Optional
+from typing import List, Literal, Optional, Union
+
+from pydantic import Field
 
 from app.schemas import BoundedDict, PHIInputModel, ShortText
 
 
+class RowFilter(PHIInputModel):
+    """One output-column filter, applied in SQL by runners that support it."""
+
+    field: str = Field(pattern=r"^[A-Za-z_][A-Za-z0-9_]*$", max_length=63)
+    value: Union[bool, int, float, ShortText]
+    operator: Literal["eq", "ne", "gt", "lt", "contains"] = "eq"
+
+
 class ViewDefinitionRequest(PHIInputModel):
     """Body for POST /analytics/execute."""
 
     view_name: ShortText
     search_params: Optional[BoundedDict] = None
     max_resources: Optional[int] = None
+    filters: Optional[List[RowFilter]] = Field(default=None, max_length=20)
 
 
 class CreateViewDefinitionRequest(PHIInputModel):
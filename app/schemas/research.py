@@ -1,6 +1,8 @@
 """Schemas for /research router — Sprint 6.1 Phase 2.3 Issue #5 (Tier 1)."""
 
-from typing import Optional
+from typing import List, Optional
+
+from pydantic import Field
 
 from app.schemas import (
     BoundedDict,
@@ -28,3 +30,11 @@ class RequestProcessingTrigger(PHIInputModel):
 
     structured_requirements: Optional[BoundedDict] = None
     skip_conversation: bool = False
+
+
+class RequirementsTurnRequest(PHIInputModel):
+    """Body for POST /research/{request_id}/requirements/stream."""
+
+    user_response: Optional[LongText] = None
+    conversation_history: List[BoundedDict] = Field(default_factory=list, max_length=200)
+    current_requirements: Optional[BoundedDict] = None
@@ -4,11 +4,15 @@ Approval Service for Human-in-Loop Workflow
 Manages approval creation, retrieval, and processing for critical decision points.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import event, select, and_
+from sqlalchemy.orm import Session
+import asyncio
+import copy
 import logging
+import time
 
 from ..database.models import Approval, ResearchRequest, Escalation
 
@@ -33,6 +37,83 @@ def get_approval_timeout_hours(approval_type: str) -> int:
     return _APPROVAL_TIMEOUT_HOURS.get(approval_type, 24)
 
 
+# Approvals still "analyzing" this long after submission lost their
+# background analysis (it failed before releasing them, or the process
+# restarted); the timeout sweep releases them to the pending queue.
+ANALYSIS_STALE_AFTER = timedelta(minutes=30)
+
+
+# Short-lived cache of the /approvals/pending payload. The approvals
+# dashboard polls that endpoint every few seconds, so reviewers hitting it
+# together would otherwise each run the same query. Entries are keyed by
+# approval_type (user_role does not filter the query) and dropped whenever
+# a transaction that inserted, updated or deleted an Approval row commits in
+# this process; the TTL bounds staleness for writes made by other workers.
+PENDING_APPROVALS_CACHE_TTL_SECONDS = 5.0
+_pending_approvals_cache: Dict[Optional[str], Tuple[float, Dict[str, Any]]] = {}
+_pending_approvals_state = {"generation": 0}
+_pending_approvals_lock = asyncio.Lock()
+
+# session.info flag set when a flush writes Approval rows
+_APPROVALS_WRITTEN = "approvals_written"
+
+
+def invalidate_pending_approvals_cache() -> None:
+    """Drop cached pending-approval payloads (called when Approval writes commit)."""
+    _pending_approvals_state["generation"] += 1
+    _pending_approvals_cache.clear()
+
+
+def _on_flush(session: Session, flush_context) -> None:
+    # Flushed rows are not visible to other connections until COMMIT, so a
+    # load started now would still read the old ones; only note the write
+    if any(isinstance(obj, Approval) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_APPROVALS_WRITTEN] = True
+
+
+def _on_commit(session: Session) -> None:
+    if session.info.pop(_APPROVALS_WRITTEN, False):
+        invalidate_pending_approvals_cache()
+
+
+def _on_rollback(session: Session) -> None:
+    session.info.pop(_APPROVALS_WRITTEN, None)
+
+
+event.listen(Session, "after_flush", _on_flush)
+event.listen(Session, "after_commit", _on_commit)
+event.listen(Session, "after_rollback", _on_rollback)
+
+
+async def get_cached_pending_approvals(
+    approval_type: Optional[str], load: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Return the pending-approvals payload for approval_type, calling load() on a miss
+
+    Concurrent misses wait on one load. A result is only stored if no
+    Approval write committed while it was loading, so an invalidation is
+    never overwritten by data read before it.
+    """
+    entry = _pending_approvals_cache.get(approval_type)
+    if entry and entry[0] > time.monotonic():
+        return copy.deepcopy(entry[1])
+
+    async with _pending_approvals_lock:
+        entry = _pending_approvals_cache.get(approval_type)
+        if entry and entry[0] > time.monotonic():
+            return copy.deepcopy(entry[1])
+
+        generation = _pending_approvals_state["generation"]
+        payload = await load()
+        if generation == _pending_approvals_state["generation"]:
+            _pending_approvals_cache[approval_type] = (
+                time.monotonic() + PENDING_APPROVALS_CACHE_TTL_SECONDS,
+                copy.deepcopy(payload),
+            )
+        return payload
+
+
 class ApprovalService:
     """
     Service for managing human approvals in the workflow
@@ -44,11 +125,36 @@ class ApprovalService:
     - Timeout handling and escalation
     """
 
+    # Columns returned by the list queries (*_rows methods)
+    PENDING_LIST_COLUMNS = (
+        Approval.id,
+        Approval.request_id,
+        Approval.approval_type,
+        Approval.submitted_at,
+        Approval.submitted_by,
+        Approval.timeout_at,
+        Approval.approval_data,
+    )
+    REQUEST_LIST_COLUMNS = (
+        Approval.id,
+        Approval.approval_type,
+        Approval.status,
+        Approval.submitted_at,
+        Approval.reviewed_at,
+        Approval.reviewed_by,
+        Approval.review_notes,
+    )
+
     def __init__(self, db_session: AsyncSession):
         self.db = db_session
 
     async def create_approval(
-        self, request_id: str, approval_type: str, submitted_by: str, approval_data: Dict[str, Any]
+        self,
+        request_id: str,
+        approval_type: str,
+        submitted_by: str,
+        approval_data: Dict[str, Any],
+        status: str = "pending",
     ) -> Approval:
         """
         Create a new approval request
@@ -58,6 +164,8 @@ class ApprovalService:
             approval_type: Type of approval (requirements, phenotype_sql, extraction, qa, scope_change)
             submitted_by: Agent ID that submitted for approval
             approval_data: Data to be approved (SQL, requirements, etc.)
+            status: Initial status; "analyzing" keeps it out of the pending
+                queue until update_approval_data() releases it
 
         Returns:
             Created Approval object
@@ -73,7 +181,7 @@ class ApprovalService:
             approval_data=approval_data,
             submitted_at=datetime.now(),
             timeout_at=timeout_at,
-            status="pending",
+            status=status,
         )
 
         self.db.add(approval)
@@ -114,12 +222,65 @@ class ApprovalService:
         logger.info(f"Retrieved {len(approvals)} pending approvals")
         return approvals
 
+    async def get_pending_approvals_rows(self, approval_type: Optional[str] = None) -> List[Any]:
+        """
+        Get pending approvals as rows of the columns the approvals list shows
+
+        Same filter and order as get_pending_approvals, but selects columns
+        rather than entities, so no Approval instances are built.
+
+        Args:
+            approval_type: Filter by approval type
+
+        Returns:
+            List of Row objects (use row._mapping for a dict view)
+        """
+        query = select(*self.PENDING_LIST_COLUMNS).where(Approval.status == "pending")
+
+        if approval_type:
+            query = query.where(Approval.approval_type == approval_type)
+
+        query = query.order_by(Approval.submitted_at.desc())
+
+        rows = (await self.db.execute(query)).all()
+
+        logger.info(f"Retrieved {len(rows)} pending approvals")
+        return rows
+
     async def get_approval(self, approval_id: int) -> Optional[Approval]:
         """Get a specific approval by ID"""
         query = select(Approval).where(Approval.id == approval_id)
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def update_approval_data(
+        self, approval_id: int, updates: Dict[str, Any], status: Optional[str] = None
+    ) -> Optional[Approval]:
+        """
+        Merge updates into an approval's approval_data, optionally setting its status
+
+        Args:
+            approval_id: Approval ID
+            updates: Keys to set in approval_data
+            status: New status (e.g. "pending" once background analysis is done)
+
+        Returns:
+            Updated Approval object, or None if it does not exist
+        """
+        approval = await self.get_approval(approval_id)
+        if not approval:
+            return None
+
+        # Assign a new dict so the JSON column is flagged as changed
+        approval.approval_data = {**(approval.approval_data or {}), **updates}
+        if status:
+            approval.status = status
+
+        await self.db.commit()
+        await self.db.refresh(approval)
+
+        return approval
+
     async def approve(
         self,
         approval_id: int,
@@ -155,8 +316,9 @@ class ApprovalService:
         approval.review_notes = notes
         approval.modifications = modifications
 
+        # One commit per decision; sessions from get_db_session keep attributes
+        # loaded across commit, so no refresh round trip is needed
         await self.db.commit()
-        await self.db.refresh(approval)
 
         logger.info(
             f"Approved {approval.approval_type} for request {approval.request_id} "
@@ -190,7 +352,6 @@ class ApprovalService:
         approval.review_notes = reason
 
         await self.db.commit()
-        await self.db.refresh(approval)
 
         logger.info(
             f"Rejected {approval.approval_type} for request {approval.request_id} "
@@ -402,11 +563,16 @@ class ApprovalService:
         """
         Check for timed out approvals and create escalations
 
+        Approvals left in "analyzing" past ANALYSIS_STALE_AFTER are first
+        released to the pending queue.
+
         Returns:
             List of timed out approvals
         """
         now = datetime.now()
 
+        await self._release_stale_analyses(now)
+
         # Find pending approvals that have timed out
         query = select(Approval).where(
             and_(
@@ -457,6 +623,41 @@ class ApprovalService:
         logger.info(f"Checked timeouts: {len(timed_out_approvals)} approvals timed out")
         return timed_out_approvals
 
+    async def _release_stale_analyses(self, now: datetime) -> List[Approval]:
+        """
+        Move approvals stuck in "analyzing" to the pending queue
+
+        Their analysis is recorded as not finished so reviewers can tell it
+        is missing. Released approvals keep their original timeout_at, so an
+        overdue one is timed out by the same sweep.
+        """
+        result = await self.db.execute(
+            select(Approval).where(
+                and_(
+                    Approval.status == "analyzing",
+                    Approval.submitted_at < now - ANALYSIS_STALE_AFTER,
+                )
+            )
+        )
+        stale = result.scalars().all()
+
+        for approval in stale:
+            approval_data = approval.approval_data or {}
+            if not approval_data.get("impact_analysis"):
+                approval.approval_data = {
+                    **approval_data,
+                    "impact_analysis": {"error": "Impact analysis did not finish"},
+                }
+            approval.status = "pending"
+            logger.warning(
+                f"Approval {approval.id} for request {approval.request_id} was still "
+                f"analyzing after {ANALYSIS_STALE_AFTER}; released to the pending queue"
+            )
+
+        if stale:
+            await self.db.flush()
+        return stale
+
     async def get_approval_status(self, request_id: str, approval_type: str) -> Optional[str]:
         """
         Get the status of the most recent approval for a request
@@ -498,3 +699,43 @@ class ApprovalService:
 
         result = await self.db.execute(query)
         return result.scalars().all()
+
+    async def get_approvals_for_request_rows(self, request_id: str) -> List[Any]:
+        """
+        Get all approvals for a research request as rows of REQUEST_LIST_COLUMNS
+
+        Args:
+            request_id: Research request ID
+
+        Returns:
+            List of Row objects, oldest first
+        """
+        query = (
+            select(*self.REQUEST_LIST_COLUMNS)
+            .where(Approval.request_id == request_id)
+            .order_by(Approval.submitted_at)
+        )
+
+        return (await self.db.execute(query)).all()
+
+    async def get_approvals_for_requests_rows(self, request_ids: List[str]) -> List[Any]:
+        """
+        Get approvals for several research requests in one query
+
+        Args:
+            request_ids: Research request IDs
+
+        Returns:
+            List of Row objects of request_id plus REQUEST_LIST_COLUMNS,
+            ordered by request then submission time
+        """
+        if not request_ids:
+            return []
+
+        query = (
+            select(Approval.request_id, *self.REQUEST_LIST_COLUMNS)
+            .where(Approval.request_id.in_(request_ids))
+            .order_by(Approval.request_id, Approval.submitted_at)
+        )
+
+        return (await self.db.execute(query)).all()
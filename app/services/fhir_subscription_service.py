@@ -1,11 +1,12 @@
 """Speed-layer poller for the Lambda Architecture's near-real-time tier."""
 
 import asyncio
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
+import orjson
+
 from app.cache.redis_client import RedisClient
 from app.clients.hapi_db_client import HAPIDBClient
 
@@ -151,7 +152,7 @@ class FHIRSubscriptionService:
 
             raw = row.get("res_text_vc")
             try:
-                resource_data = json.loads(raw) if isinstance(raw, str) else raw
+                resource_data = orjson.loads(raw) if isinstance(raw, str) else raw
             except (TypeError, ValueError) as e:
                 logger.warning("Failed to parse %s/%s JSON: %s", resource_type, fhir_id, e)
                 continue
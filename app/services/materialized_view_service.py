@@ -12,11 +12,16 @@ Responsibilities:
 """
 
 import asyncio
+import hashlib
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+import orjson
+
 from app.clients.hapi_db_client import HAPIDBClient, create_hapi_db_client
 from app.database.models import MaterializedViewMetadata
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -25,6 +30,27 @@ from sqlalchemy import select
 
 logger = logging.getLogger(__name__)
 
+# Views refreshed at once by refresh_all_views / check_and_refresh_stale_views;
+# each in-flight REFRESH holds one HAPI pool connection.
+MV_REFRESH_CONCURRENCY = int(os.getenv("MV_REFRESH_CONCURRENCY", "4"))
+
+# view_exists() answers (found or not) are reused for this many seconds, so
+# repeated status polls and 404s cost no pg_matviews lookup. Dropping or
+# creating views through the API clears the cache; views created out of band
+# (scripts/) show up once the entry expires.
+MV_EXISTS_TTL = float(os.getenv("MV_EXISTS_TTL", "60"))
+MAX_EXISTS_ENTRIES = 256
+
+_view_exists_cache: Dict[str, Tuple[float, bool]] = {}
+
+
+def invalidate_view_exists_cache(view_name: Optional[str] = None) -> None:
+    """Forget cached view_exists() answers for one view, or for all views"""
+    if view_name is None:
+        _view_exists_cache.clear()
+    else:
+        _view_exists_cache.pop(view_name, None)
+
 
 class MaterializedViewService:
     """
@@ -47,6 +73,9 @@ class MaterializedViewService:
         """
         self.db_client = hapi_db_client
         self.session = session
+        # Refreshes run concurrently on separate pool connections, but the
+        # metadata session is one AsyncSession; writes to it take turns.
+        self._metadata_lock = asyncio.Lock()
 
     @classmethod
     async def create(cls, database_url: str):
@@ -81,51 +110,7 @@ class MaterializedViewService:
             List of view metadata dictionaries
         """
         try:
-            # Query PostgreSQL for materialized views
-            sql = f"""
-                SELECT
-                    matviewname as view_name,
-                    pg_size_pretty(pg_total_relation_size(schemaname||'.'||matviewname)) as size,
-                    pg_total_relation_size(schemaname||'.'||matviewname) as size_bytes
-                FROM pg_matviews
-                WHERE schemaname = '{self.SCHEMA_NAME}'
-                ORDER BY matviewname
-            """
-
-            pg_views = await self.db_client.execute_query(sql)
-
-            # Get metadata from our tracking table
-            result = await self.session.execute(select(MaterializedViewMetadata))
-            metadata_map = {m.view_name: m for m in result.scalars().all()}
-
-            # Combine PostgreSQL data with our metadata
-            views = []
-            for pg_view in pg_views:
-                view_name = pg_view["view_name"]
-                metadata = metadata_map.get(view_name)
-
-                # Get row count
-                count_sql = f"SELECT COUNT(*) as count FROM {self.SCHEMA_NAME}.{view_name}"
-                count_result = await self.db_client.execute_query(count_sql)
-                row_count = count_result[0]["count"] if count_result else 0
-
-                view_info = {
-                    "view_name": view_name,
-                    "row_count": row_count,
-                    "size": pg_view.get("size"),
-                    "size_bytes": pg_view.get("size_bytes"),
-                    "status": metadata.status if metadata else "unknown",
-                    "last_refreshed_at": (
-                        metadata.last_refreshed_at.isoformat()
-                        if metadata and metadata.last_refreshed_at
-                        else None
-                    ),
-                    "is_stale": metadata.is_stale if metadata else False,
-                    "staleness_hours": metadata.staleness_hours if metadata else None,
-                    "resource_type": metadata.resource_type if metadata else None,
-                }
-
-                views.append(view_info)
+            views = [view async for view in self.iter_views()]
 
             logger.info(f"Listed {len(views)} materialized views")
             return views
@@ -134,6 +119,118 @@ class MaterializedViewService:
             logger.error(f"Failed to list views: {e}")
             raise
 
+    async def iter_views(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield materialized views with metadata one at a time
+
+        Each view's row count is queried just before it is yielded, so a
+        streaming caller can send a view before the next COUNT(*) runs.
+
+        Yields:
+            View metadata dictionaries in view_name order
+        """
+        # Query PostgreSQL for materialized views
+        sql = f"""
+            SELECT
+                matviewname as view_name,
+                pg_size_pretty(pg_total_relation_size(schemaname||'.'||matviewname)) as size,
+                pg_total_relation_size(schemaname||'.'||matviewname) as size_bytes
+            FROM pg_matviews
+            WHERE schemaname = '{self.SCHEMA_NAME}'
+            ORDER BY matviewname
+        """
+
+        pg_views = await self.db_client.execute_query(sql)
+
+        # Get metadata from our tracking table
+        result = await self.session.execute(select(MaterializedViewMetadata))
+        metadata_map = {m.view_name: m for m in result.scalars().all()}
+
+        # Combine PostgreSQL data with our metadata
+        for pg_view in pg_views:
+            view_name = pg_view["view_name"]
+            metadata = metadata_map.get(view_name)
+
+            # Get row count
+            count_sql = f"SELECT COUNT(*) as count FROM {self.SCHEMA_NAME}.{view_name}"
+            count_result = await self.db_client.execute_query(count_sql)
+            row_count = count_result[0]["count"] if count_result else 0
+
+            yield {
+                "view_name": view_name,
+                "row_count": row_count,
+                "size": pg_view.get("size"),
+                "size_bytes": pg_view.get("size_bytes"),
+                "status": metadata.status if metadata else "unknown",
+                "last_refreshed_at": (
+                    metadata.last_refreshed_at.isoformat()
+                    if metadata and metadata.last_refreshed_at
+                    else None
+                ),
+                "is_stale": metadata.is_stale if metadata else False,
+                "staleness_hours": metadata.staleness_hours if metadata else None,
+                "resource_type": metadata.resource_type if metadata else None,
+            }
+
+    async def view_exists(self, view_name: str) -> bool:
+        """
+        Whether the view exists in the schema: one indexed pg_matviews lookup
+
+        Answers are cached per name for MV_EXISTS_TTL seconds.
+        """
+        cached = _view_exists_cache.get(view_name)
+        if cached is not None and time.monotonic() - cached[0] < MV_EXISTS_TTL:
+            return cached[1]
+
+        rows = await self.db_client.execute_query(
+            "SELECT 1 FROM pg_matviews WHERE schemaname = $1 AND matviewname = $2",
+            [self.SCHEMA_NAME, view_name],
+        )
+        exists = bool(rows)
+
+        _view_exists_cache.pop(view_name, None)
+        _view_exists_cache[view_name] = (time.monotonic(), exists)
+        while len(_view_exists_cache) > MAX_EXISTS_ENTRIES:
+            del _view_exists_cache[next(iter(_view_exists_cache))]
+        return exists
+
+    async def views_etag(self, view_name: Optional[str] = None) -> str:
+        """
+        Weak HTTP validator for list_views(), or get_view_status(view_name)
+
+        Built from the cheap inputs only: which views exist and their metadata
+        rows. A client whose copy matches skips the COUNT(*) and size queries.
+        Row counts and sizes of a materialized view only change when it is
+        refreshed, which moves last_refreshed_at.
+        """
+        if view_name is None:
+            rows = await self.db_client.execute_query(
+                "SELECT matviewname FROM pg_matviews WHERE schemaname = $1 ORDER BY matviewname",
+                [self.SCHEMA_NAME],
+            )
+            view_names = [row["matviewname"] for row in rows]
+        else:
+            view_names = [view_name]
+
+        result = await self.session.execute(
+            select(
+                MaterializedViewMetadata.view_name,
+                MaterializedViewMetadata.status,
+                MaterializedViewMetadata.created_at,
+                MaterializedViewMetadata.last_refreshed_at,
+                MaterializedViewMetadata.is_stale,
+                MaterializedViewMetadata.staleness_hours,
+                MaterializedViewMetadata.auto_refresh_enabled,
+                MaterializedViewMetadata.refresh_interval_hours,
+                MaterializedViewMetadata.resource_type,
+            )
+            .where(MaterializedViewMetadata.view_name.in_(view_names))
+            .order_by(MaterializedViewMetadata.view_name)
+        )
+        state = [view_names, [tuple(row) for row in result]]
+        digest = hashlib.blake2b(orjson.dumps(state, default=str), digest_size=8)
+        return f'W/"{digest.hexdigest()}"'
+
     async def get_view_status(self, view_name: str) -> Dict[str, Any]:
         """
         Get detailed status for a specific view
@@ -145,20 +242,7 @@ class MaterializedViewService:
             View status dictionary
         """
         try:
-            # Check if view exists in PostgreSQL
-            exists_sql = f"""
-                SELECT EXISTS (
-                    SELECT 1
-                    FROM pg_matviews
-                    WHERE schemaname = '{self.SCHEMA_NAME}'
-                      AND matviewname = '{view_name}'
-                ) as exists
-            """
-
-            result = await self.db_client.execute_query(exists_sql)
-            exists = result[0]["exists"] if result else False
-
-            if not exists:
+            if not await self.view_exists(view_name):
                 return {"view_name": view_name, "exists": False, "status": "not_found"}
 
             # Get metadata
@@ -232,8 +316,19 @@ class MaterializedViewService:
             # exclusive lock that blocks every reader for the full refresh
             # duration — for the 229k-row observation_labs view that's 30+ seconds
             # of cohort-query downtime. With CONCURRENTLY, readers see the old
-            # view until the new one swaps in atomically.
-            refresh_sql = f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self.SCHEMA_NAME}.{view_name}"
+            # view until the new one swaps in atomically. Views that cannot be
+            # refreshed concurrently fall back to a plain (blocking) refresh
+            # rather than failing outright.
+            concurrent = await self._can_refresh_concurrently(view_name)
+            if not concurrent:
+                logger.warning(
+                    f"View '{view_name}' has no usable unique index or is unpopulated; "
+                    f"refreshing without CONCURRENTLY (readers block until it finishes)"
+                )
+            refresh_sql = (
+                f"REFRESH MATERIALIZED VIEW {'CONCURRENTLY ' if concurrent else ''}"
+                f"{self.SCHEMA_NAME}.{view_name}"
+            )
             await self.db_client.execute_query(refresh_sql)
 
             # Calculate refresh duration
@@ -274,6 +369,7 @@ class MaterializedViewService:
             return {
                 "view_name": view_name,
                 "success": True,
+                "concurrent": concurrent,
                 "refresh_duration_ms": refresh_duration_ms,
                 "row_count": row_count,
                 "size_bytes": size_bytes,
@@ -288,17 +384,44 @@ class MaterializedViewService:
 
             return {"view_name": view_name, "success": False, "error": error_msg}
 
+    async def _can_refresh_concurrently(self, view_name: str) -> bool:
+        """
+        Whether REFRESH ... CONCURRENTLY will work for the view
+
+        PostgreSQL requires the view to be populated and to have a unique
+        index on plain columns with no WHERE clause.
+        """
+        rows = await self.db_client.execute_query(
+            """
+            SELECT m.ispopulated,
+                   EXISTS (
+                       SELECT 1
+                       FROM pg_index i
+                       WHERE i.indrelid = format('%I.%I', m.schemaname, m.matviewname)::regclass
+                         AND i.indisunique
+                         AND i.indpred IS NULL
+                         AND i.indexprs IS NULL
+                   ) AS has_unique_index
+            FROM pg_matviews m
+            WHERE m.schemaname = $1 AND m.matviewname = $2
+            """,
+            [self.SCHEMA_NAME, view_name],
+        )
+        row = rows[0] if rows else {}
+        return bool(row.get("ispopulated") and row.get("has_unique_index"))
+
     async def refresh_all_views(self) -> Dict[str, Any]:
         """
-        Refresh all materialized views in parallel via asyncio.gather.
+        Refresh all materialized views in parallel (see iter_refresh_views),
+        at most MV_REFRESH_CONCURRENCY at a time.
 
         Issue #18: previously looped sequentially, so 7 views took 7x as long
         as the slowest one. Now runs concurrently — total time ~max(per-view)
         instead of sum(per-view). Combined with Postgres CONCURRENTLY semantics
         (added in refresh_view), readers see the old views during refresh.
 
-        Per-view error isolation: `return_exceptions=True` ensures one failed
-        view (e.g., a lock timeout, schema drift) doesn't abort the others.
+        Per-view error isolation: iter_refresh_views catches per task, so one
+        failed view (e.g., a lock timeout, schema drift) doesn't abort the others.
         Failures are converted into the same {success: False, error: ...}
         shape that refresh_view's try/except produces, so the response shape
         is uniform across both paths.
@@ -306,37 +429,11 @@ class MaterializedViewService:
         Returns:
             Summary with totals + per-view results
         """
-        import asyncio
-
         views_list = await self.list_views()
-        view_names = [v["view_name"] for v in views_list]
+        results = await self._refresh_views([v["view_name"] for v in views_list])
 
-        raw_results = await asyncio.gather(
-            *(self.refresh_view(name) for name in view_names),
-            return_exceptions=True,
-        )
-
-        results = []
-        success_count = 0
-        fail_count = 0
-
-        for view_name, raw in zip(view_names, raw_results):
-            if isinstance(raw, Exception):
-                # An exception escaped refresh_view's own try/except — treat as
-                # per-view failure rather than aborting the whole batch.
-                result = {
-                    "view_name": view_name,
-                    "success": False,
-                    "error": str(raw),
-                }
-                fail_count += 1
-            else:
-                result = raw
-                if result.get("success"):
-                    success_count += 1
-                else:
-                    fail_count += 1
-            results.append(result)
+        success_count = sum(1 for r in results if r.get("success"))
+        fail_count = len(results) - success_count
 
         summary = {
             "total_views": len(views_list),
@@ -380,11 +477,7 @@ class MaterializedViewService:
 
         logger.info(f"Found {len(stale_views)} stale views to refresh")
 
-        # Refresh each stale view
-        results = []
-        for metadata in stale_views:
-            result = await self.refresh_view(metadata.view_name)
-            results.append(result)
+        results = await self._refresh_views([m.view_name for m in stale_views])
 
         success_count = sum(1 for r in results if r["success"])
 
@@ -400,37 +493,88 @@ class MaterializedViewService:
 
     # Private helper methods
 
-    async def _update_metadata(self, view_name: str, updates: Dict[str, Any]):
+    async def _refresh_views(self, view_names: List[str]) -> List[Dict[str, Any]]:
         """
-        Update metadata for a view
+        Refresh views concurrently, bounded by MV_REFRESH_CONCURRENCY
 
         Args:
-            view_name: Name of the view
-            updates: Dictionary of fields to update
+            view_names: Views to refresh
+
+        Returns:
+            refresh_view results in view_names order; an exception that
+            escapes refresh_view becomes a {success: False, error} result
         """
-        try:
-            # Get or create metadata
-            stmt = select(MaterializedViewMetadata).where(
-                MaterializedViewMetadata.view_name == view_name
-            )
-            result = await self.session.execute(stmt)
-            metadata = result.scalar_one_or_none()
+        by_name = {r["view_name"]: r async for r in self.iter_refresh_views(view_names)}
+        return [by_name[name] for name in view_names]
+
+    async def iter_refresh_views(self, view_names: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Refresh views concurrently and yield each result as it completes
 
-            if metadata is None:
-                # Create new metadata
-                metadata = MaterializedViewMetadata(view_name=view_name)
-                self.session.add(metadata)
+        Same bounds and per-view error isolation as _refresh_views, but in
+        completion order, so a streaming caller can report fast views while
+        slow ones are still refreshing.
 
-            # Apply updates
-            for key, value in updates.items():
-                setattr(metadata, key, value)
+        Args:
+            view_names: Views to refresh
 
-            await self.session.commit()
+        Yields:
+            refresh_view results; an exception that escapes refresh_view
+            becomes a {success: False, error} result
+        """
+        semaphore = asyncio.Semaphore(MV_REFRESH_CONCURRENCY)
 
-        except Exception as e:
-            await self.session.rollback()
-            logger.error(f"Failed to update metadata for '{view_name}': {e}")
-            raise
+        async def refresh_one(view_name: str) -> Dict[str, Any]:
+            try:
+                async with semaphore:
+                    return await self.refresh_view(view_name)
+            except Exception as e:
+                # An exception escaped refresh_view's own try/except — treat as
+                # per-view failure rather than aborting the whole batch.
+                return {"view_name": view_name, "success": False, "error": str(e)}
+
+        tasks = [asyncio.ensure_future(refresh_one(name)) for name in view_names]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # A consumer that stops early (e.g. a dropped NDJSON client) must
+            # not leave refreshes running against a closed session.
+            for task in tasks:
+                task.cancel()
+
+    async def _update_metadata(self, view_name: str, updates: Dict[str, Any]):
+        """
+        Update metadata for a view
+
+        Args:
+            view_name: Name of the view
+            updates: Dictionary of fields to update
+        """
+        async with self._metadata_lock:
+            try:
+                # Get or create metadata
+                stmt = select(MaterializedViewMetadata).where(
+                    MaterializedViewMetadata.view_name == view_name
+                )
+                result = await self.session.execute(stmt)
+                metadata = result.scalar_one_or_none()
+
+                if metadata is None:
+                    # Create new metadata
+                    metadata = MaterializedViewMetadata(view_name=view_name)
+                    self.session.add(metadata)
+
+                # Apply updates
+                for key, value in updates.items():
+                    setattr(metadata, key, value)
+
+                await self.session.commit()
+
+            except Exception as e:
+                await self.session.rollback()
+                logger.error(f"Failed to update metadata for '{view_name}': {e}")
+                raise
 
     async def _update_staleness_for_all(self, metadata_list: List[MaterializedViewMetadata]):
         """
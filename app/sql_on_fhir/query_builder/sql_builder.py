@@ -8,11 +8,15 @@ Combines:
 - HAPI schema knowledge (FROM clause with JOIN)
 - Search parameter filtering (WHERE clause)
 - FHIR search params (additional filtering)
+
+Search parameter values (and LIMIT) are bound as $n parameters rather than
+interpolated, so a ViewDefinition produces the same SQL text whatever the
+values and asyncpg's per-connection statement cache can reuse its plan.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
 
 from app.sql_on_fhir.transpiler import FHIRPathTranspiler, ColumnExtractor
 
@@ -29,6 +33,7 @@ class SQLQuery:
     column_count: int
     has_lateral_joins: bool
     has_where_clause: bool
+    params: List[Any] = field(default_factory=list)  # values for $1, $2, ... in sql
 
 
 class SQLQueryBuilder:
@@ -49,6 +54,9 @@ class SQLQueryBuilder:
         self.transpiler = transpiler
         self.extractor = extractor
 
+    # FHIR date search prefixes and the SQL comparison each maps to
+    _DATE_PREFIX_OPERATORS = {"ge": ">=", "le": "<=", "gt": ">", "lt": "<", "eq": "="}
+
     def build_query(
         self,
         view_definition: Dict[str, Any],
@@ -83,6 +91,7 @@ class SQLQueryBuilder:
 
         # Build WHERE clause
         where_conditions = []
+        params: List[Any] = []
 
         # Add ViewDefinition where clauses
         if where_elements:
@@ -93,7 +102,7 @@ class SQLQueryBuilder:
 
         # Add search parameter filters
         if search_params:
-            search_where = self._build_search_param_where(search_params, resource_type)
+            search_where = self._build_search_param_where(search_params, resource_type, params)
             if search_where:
                 where_conditions.append(search_where)
 
@@ -113,7 +122,8 @@ class SQLQueryBuilder:
 
         # Add LIMIT if specified
         if limit:
-            query_parts.append(f"LIMIT {limit}")
+            params.append(int(limit))
+            query_parts.append(f"LIMIT ${len(params)}")
 
         sql = "\n".join(part for part in query_parts if part)
 
@@ -124,6 +134,7 @@ class SQLQueryBuilder:
             column_count=len(select_clause.columns),
             has_lateral_joins=bool(select_clause.lateral_joins),
             has_where_clause=bool(where_elements or search_params),
+            params=params,
         )
 
     def _build_from_clause(self, resource_type: str) -> str:
@@ -143,27 +154,34 @@ JOIN hfj_res_ver v ON r.res_id = v.res_id AND r.res_ver = v.res_ver"""
 
         return from_clause
 
-    def _build_search_param_where(self, search_params: Dict[str, Any], resource_type: str) -> str:
+    def _build_search_param_where(
+        self, search_params: Dict[str, Any], resource_type: str, params: List[Any]
+    ) -> str:
         """
         Build WHERE conditions from FHIR search parameters
 
         Args:
             search_params: FHIR search parameters
             resource_type: Resource type
+            params: Bound parameter list; values are appended and referenced as $n
 
         Returns:
             WHERE conditions SQL
         """
         conditions = []
 
+        def bind(value: Any) -> str:
+            params.append(str(value))
+            return f"${len(params)}"
+
         for param_name, param_value in search_params.items():
             # Handle common search parameters
             if param_name == "_id":
-                conditions.append(f"r.res_id = '{param_value}'")
+                conditions.append(f"r.res_id = {bind(param_value)}::text::bigint")
 
             elif param_name == "gender":
                 # Use JSONB path for simple fields
-                conditions.append(f"v.res_text_vc::jsonb->>'gender' = '{param_value}'")
+                conditions.append(f"v.res_text_vc::jsonb->>'gender' = {bind(param_value)}")
 
             elif (
                 param_name == "birthdate"
@@ -175,47 +193,35 @@ JOIN hfj_res_ver v ON r.res_id = v.res_id AND r.res_ver = v.res_ver"""
                 #           "le2005-12-31" means <= 2005-12-31
                 # birthdate_min and birthdate_max allow separate min/max constraints
                 if isinstance(param_value, str):
-                    if param_value.startswith("ge"):
-                        # Greater than or equal
-                        date_val = param_value[2:]
-                        conditions.append(f"v.res_text_vc::jsonb->>'birthDate' >= '{date_val}'")
-                    elif param_value.startswith("le"):
-                        # Less than or equal
-                        date_val = param_value[2:]
-                        conditions.append(f"v.res_text_vc::jsonb->>'birthDate' <= '{date_val}'")
-                    elif param_value.startswith("gt"):
-                        # Greater than
+                    operator = self._DATE_PREFIX_OPERATORS.get(param_value[:2])
+                    if operator:
                         date_val = param_value[2:]
-                        conditions.append(f"v.res_text_vc::jsonb->>'birthDate' > '{date_val}'")
-                    elif param_value.startswith("lt"):
-                        # Less than
-                        date_val = param_value[2:]
-                        conditions.append(f"v.res_text_vc::jsonb->>'birthDate' < '{date_val}'")
-                    elif param_value.startswith("eq"):
-                        # Equal
-                        date_val = param_value[2:]
-                        conditions.append(f"v.res_text_vc::jsonb->>'birthDate' = '{date_val}'")
                     else:
                         # No prefix - exact match
-                        conditions.append(f"v.res_text_vc::jsonb->>'birthDate' = '{param_value}'")
+                        operator, date_val = "=", param_value
+                    conditions.append(
+                        f"v.res_text_vc::jsonb->>'birthDate' {operator} {bind(date_val)}"
+                    )
 
             elif param_name == "family":
                 # Name search - check in name array
                 conditions.append(
                     f"EXISTS (SELECT 1 FROM jsonb_array_elements(v.res_text_vc::jsonb->'name') AS name_elem "
-                    f"WHERE name_elem->>'family' = '{param_value}')"
+                    f"WHERE name_elem->>'family' = {bind(param_value)})"
                 )
 
             else:
                 # Generic parameter - try JSONB path
                 logger.warning(f"Unknown search parameter: {param_name}, using generic JSONB match")
-                conditions.append(f"v.res_text_vc::jsonb->>'{param_name}' = '{param_value}'")
+                conditions.append(
+                    f"v.res_text_vc::jsonb->>{bind(param_name)} = {bind(param_value)}"
+                )
 
         return " AND ".join(conditions) if conditions else ""
 
     def build_count_query(
         self, view_definition: Dict[str, Any], search_params: Optional[Dict[str, Any]] = None
-    ) -> str:
+    ) -> Tuple[str, List[Any]]:
         """
         Build COUNT query for feasibility checks
 
@@ -224,13 +230,14 @@ JOIN hfj_res_ver v ON r.res_id = v.res_id AND r.res_ver = v.res_ver"""
             search_params: FHIR search parameters
 
         Returns:
-            SQL COUNT query
+            Tuple of (SQL COUNT query, bound parameter values)
         """
         resource_type = view_definition.get("resource", "Unknown")
         where_elements = view_definition.get("where", [])
 
         # Build WHERE clause (same logic as full query)
         where_conditions = []
+        params: List[Any] = []
 
         if where_elements:
             vd_where = self.extractor.extract_where_clause(where_elements)
@@ -238,7 +245,7 @@ JOIN hfj_res_ver v ON r.res_id = v.res_id AND r.res_ver = v.res_ver"""
                 where_conditions.append(vd_where.replace("WHERE\n    ", ""))
 
         if search_params:
-            search_where = self._build_search_param_where(search_params, resource_type)
+            search_where = self._build_search_param_where(search_params, resource_type, params)
             if search_where:
                 where_conditions.append(search_where)
 
@@ -253,7 +260,7 @@ FROM hfj_resource r
 JOIN hfj_res_ver v ON r.res_id = v.res_id AND r.res_ver = v.res_ver
 {where_clause}"""
 
-        return count_sql
+        return count_sql, params
 
 
 def create_sql_query_builder(
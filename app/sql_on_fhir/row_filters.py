@@ -0,0 +1,141 @@
+"""
+Row filters for ViewDefinition results
+
+A filter is {"field": str, "value": Any, "operator": "eq|ne|gt|lt|contains"}
+over one output column. The same filters can be applied two ways with the
+same meaning:
+
+- apply_sql_filters() wraps a runner's query so PostgreSQL drops
+  non-matching rows before they are serialized and sent back
+- filter_rows() evaluates them in Python, for runners without SQL
+
+Either way a NULL/missing field fails the filter, "contains" is a
+case-insensitive substring match on the value's text, and an unknown
+operator matches nothing.
+"""
+
+import operator
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Python comparison per operator; "contains" is compiled separately so the
+# filter value is lowercased once rather than per row.
+FILTER_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "lt": operator.lt,
+}
+
+# SQL spelling of the same comparisons
+_SQL_OPERATORS = {"eq": "=", "ne": "<>", "gt": ">", "lt": "<"}
+
+# Operators apply_sql_filters can push into PostgreSQL
+SQL_FILTER_OPERATORS = frozenset(_SQL_OPERATORS) | {"contains"}
+
+# Output column names are quoted identifiers in the wrapped query; anything
+# else is refused rather than interpolated.
+_FIELD_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def compile_filter(filter_spec: Dict[str, Any]) -> Tuple[str, Callable[[Any], bool]]:
+    """Turn a filter spec into (field, predicate on a non-None row value)"""
+    field = filter_spec.get("field")
+    value = filter_spec.get("value")
+    op_name = filter_spec.get("operator", "eq")
+
+    if op_name == "contains":
+        needle = value.lower()
+        return field, lambda row_value: needle in str(row_value).lower()
+
+    compare = FILTER_OPERATORS.get(op_name)
+    if compare is None:
+        return field, lambda row_value: False
+    return field, lambda row_value: compare(row_value, value)
+
+
+def row_predicate(filters: List[Dict[str, Any]]) -> Callable[[Dict[str, Any]], bool]:
+    """Compile filters once into a row -> bool check, for rows seen one at a time"""
+    compiled = [compile_filter(spec) for spec in filters]
+
+    def matches_all(row: Dict[str, Any]) -> bool:
+        return all(
+            (row_value := row.get(field)) is not None and matches(row_value)
+            for field, matches in compiled
+        )
+
+    return matches_all
+
+
+def filter_rows(rows: List[Dict[str, Any]], filters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Keep the rows that pass every filter, in one pass
+
+    Args:
+        rows: Result rows
+        filters: Filter specs
+
+    Returns:
+        Matching rows (rows itself when there are no filters)
+    """
+    if not filters:
+        return rows
+
+    compiled = [compile_filter(spec) for spec in filters]
+
+    return [
+        row
+        for row in rows
+        if all(
+            (row_value := row.get(field)) is not None and matches(row_value)
+            for field, matches in compiled
+        )
+    ]
+
+
+def apply_sql_filters(
+    sql: str, params: Optional[List[Any]], filters: List[Dict[str, Any]]
+) -> Tuple[str, List[Any]]:
+    """
+    Wrap a query so PostgreSQL applies the filters to its output rows
+
+    The original query (including its LIMIT) runs as a subquery, so results
+    are exactly what filter_rows would keep from its rows. Filter values are
+    bound as parameters numbered after the query's own.
+
+    Args:
+        sql: Query whose output columns the filters name
+        params: Values for the query's $n placeholders
+        filters: Filter specs
+
+    Returns:
+        (wrapped SQL, extended params)
+
+    Raises:
+        ValueError: A filter names a field that is not a plain column name
+    """
+    params = list(params or [])
+    clauses = []
+
+    for spec in filters:
+        field = spec.get("field") or ""
+        if not _FIELD_RE.match(field):
+            raise ValueError(f"Invalid filter field: {field!r}")
+        column = f'filtered."{field}"'
+        op_name = spec.get("operator", "eq")
+
+        if op_name == "contains":
+            # Escape LIKE wildcards so the value matches literally
+            needle = re.sub(r"([\\%_])", r"\\\1", str(spec.get("value")))
+            params.append(needle)
+            clauses.append(f"{column}::text ILIKE '%' || ${len(params)} || '%'")
+        elif op_name in _SQL_OPERATORS:
+            params.append(spec.get("value"))
+            clauses.append(f"{column} {_SQL_OPERATORS[op_name]} ${len(params)}")
+        else:
+            clauses.append("FALSE")
+
+    wrapped = f"SELECT * FROM (\n{sql.rstrip().rstrip(';')}\n) AS filtered"
+    if clauses:
+        wrapped += "\nWHERE " + " AND ".join(clauses)
+    return wrapped, params
@@ -31,10 +31,10 @@ function, not the whole materializer flow.
 
 from __future__ import annotations
 
-import json
 from typing import Any, Dict, List
 
 import asyncpg
+import orjson
 
 
 async def fetch_fhir_resources_for_view(
@@ -65,7 +65,7 @@ async def fetch_fhir_resources_for_view(
     )
     resources: List[Dict[str, Any]] = []
     for row in rows:
-        parsed: Dict[str, Any] = json.loads(row["res_text_vc"])
+        parsed: Dict[str, Any] = orjson.loads(row["res_text_vc"])
         parsed["id"] = row["fhir_id"]  # canonical id merge — load-bearing
         resources.append(parsed)
     return resources
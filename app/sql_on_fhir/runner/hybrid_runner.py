@@ -36,9 +36,10 @@ from app.clients.hapi_db_client import HAPIDBClient
 from app.sql_on_fhir.runner.materialized_view_runner import MaterializedViewRunner
 from app.sql_on_fhir.transpiler import create_fhirpath_transpiler, create_column_extractor
 from app.sql_on_fhir.query_builder import create_sql_query_builder
-from app.cache.redis_client import RedisClient
+from app.cache.redis_client import RedisClient, get_redis_client
 from app.sql_on_fhir.runner.speed_layer_runner import SpeedLayerRunner
 from app.sql_on_fhir.runner.freshness import FreshnessAnnotation
+from app.sql_on_fhir.row_filters import filter_rows
 
 logger = logging.getLogger(__name__)
 
@@ -127,6 +128,12 @@ class HybridRunner:
 
     SCHEMA_NAME = "sqlonfhir"
 
+    # execute() accepts row filters; the batch layer applies them in SQL
+    supports_filters = True
+
+    # execute()/execute_count() report per-call SQL and batch anchor in info=
+    reports_execution_info = True
+
     def __init__(
         self,
         db_client: HAPIDBClient,
@@ -152,7 +159,7 @@ class HybridRunner:
         self._postgres_runner = None  # Lazy initialization
 
         # Speed layer integration
-        self.redis_client = redis_client or RedisClient()
+        self.redis_client = redis_client or get_redis_client()
         self.speed_layer_runner = SpeedLayerRunner(self.redis_client)
         self.use_speed_layer = os.getenv("USE_SPEED_LAYER", "true").lower() == "true"
 
@@ -190,6 +197,8 @@ class HybridRunner:
         mode: Optional[FreshnessAnnotation] = None,
         suppress_metrics: bool = False,
         caller: str = "direct",
+        filters: Optional[List[Dict[str, Any]]] = None,
+        info: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Execute ViewDefinition using best available method with speed layer merge
@@ -203,6 +212,13 @@ class HybridRunner:
                 pre-Sprint-6.5 callers; EXPLORATORY preserves the existing
                 speed-merged behavior. Cycle 2 only introduces the
                 parameter; cycles 3-4 specialize behavior per mode.
+            filters: Output-row filters (see app.sql_on_fhir.row_filters).
+                The batch layer evaluates them in SQL; rows merged in from
+                the speed layer are filtered in Python.
+            info: Optional dict this call fills with "sql" (the batch-layer
+                query) and, for FORMAL_* modes, "batch_anchor_ts". The
+                get_last_* getters describe whichever call finished last,
+                so callers sharing this runner should read these instead.
 
         Returns:
             List of rows (each row is a dict with column values)
@@ -227,6 +243,14 @@ class HybridRunner:
 
         # Step 1: Query batch layer
         view_exists = await self._check_view_exists(view_name)
+        batch_options: Dict[str, Any] = {
+            "search_params": search_params,
+            "max_resources": max_resources,
+        }
+        if filters:
+            batch_options["filters"] = filters
+        if info is not None:
+            batch_options["info"] = info
 
         if view_exists:
             # Fast path: Use materialized view
@@ -235,7 +259,7 @@ class HybridRunner:
 
             try:
                 batch_result = await self.materialized_runner.execute(
-                    view_definition, search_params=search_params, max_resources=max_resources
+                    view_definition, **batch_options
                 )
             except Exception as e:
                 logger.warning(
@@ -245,24 +269,24 @@ class HybridRunner:
                 # Fall back to PostgresRunner
                 postgres_runner = await self._get_postgres_runner()
                 self._postgres_queries += 1
-                batch_result = await postgres_runner.execute(
-                    view_definition, search_params=search_params, max_resources=max_resources
-                )
+                batch_result = await postgres_runner.execute(view_definition, **batch_options)
         else:
             # Fallback to PostgresRunner
             logger.debug(f"Using PostgresRunner for '{view_name}' (batch layer fallback)")
             self._postgres_queries += 1
             postgres_runner = await self._get_postgres_runner()
-            batch_result = await postgres_runner.execute(
-                view_definition, search_params=search_params, max_resources=max_resources
-            )
+            batch_result = await postgres_runner.execute(view_definition, **batch_options)
 
         # Sprint 6.5 cycle 3+4+6 (#69): populate batch_anchor_ts for both
         # FORMAL_* modes via the multi-view helper (single-element list
         # today; Sprint 6.5b will pass multi-view lists for feasibility
         # JOIN queries).
+        anchor = None
         if mode in (FreshnessAnnotation.FORMAL_DRAFT, FreshnessAnnotation.FORMAL_EXTRACTION):
-            self._last_batch_anchor_ts = await self.get_batch_anchor_ts_for_views([view_name])
+            anchor = await self.get_batch_anchor_ts_for_views([view_name])
+            self._last_batch_anchor_ts = anchor
+            if info is not None:
+                info["batch_anchor_ts"] = anchor
 
         # Sprint 6.5 cycle 4 (#69): FORMAL_EXTRACTION skips speed-layer
         # merge entirely. The citability contract requires batch-only
@@ -294,6 +318,7 @@ class HybridRunner:
                         final_result = self._merge_batch_and_speed_results(
                             batch_result, speed_result, view_definition
                         )
+                        final_result = filter_rows(final_result, filters)
 
                 except Exception as e:
                     logger.warning(
@@ -308,7 +333,8 @@ class HybridRunner:
         if mode == FreshnessAnnotation.FORMAL_DRAFT and not suppress_metrics:
             latency_ms = int((time.perf_counter() - t_start) * 1000)
 
-            anchor = self._last_batch_anchor_ts
+            # This call's anchor, not self._last_batch_anchor_ts, which a
+            # concurrent execute() may have overwritten meanwhile
             if anchor is not None:
                 now = datetime.now(anchor.tzinfo or timezone.utc)
                 freshness_delta_seconds = int((now - anchor).total_seconds())
@@ -350,7 +376,10 @@ class HybridRunner:
 
     @traceable(tags=["hybrid-runner", "count"])
     async def execute_count(
-        self, view_definition: Dict[str, Any], search_params: Optional[Dict[str, Any]] = None
+        self,
+        view_definition: Dict[str, Any],
+        search_params: Optional[Dict[str, Any]] = None,
+        info: Optional[Dict[str, Any]] = None,
     ) -> int:
         """
         Execute COUNT query using best available method
@@ -358,6 +387,7 @@ class HybridRunner:
         Args:
             view_definition: ViewDefinition resource
             search_params: Optional FHIR search parameters
+            info: Optional dict this call fills with "sql", the COUNT query
 
         Returns:
             Count of matching resources/rows
@@ -373,7 +403,7 @@ class HybridRunner:
 
             try:
                 return await self.materialized_runner.execute_count(
-                    view_definition, search_params=search_params
+                    view_definition, search_params=search_params, info=info
                 )
             except Exception as e:
                 logger.warning(
@@ -387,7 +417,9 @@ class HybridRunner:
 
         postgres_runner = await self._get_postgres_runner()
 
-        return await postgres_runner.execute_count(view_definition, search_params=search_params)
+        return await postgres_runner.execute_count(
+            view_definition, search_params=search_params, info=info
+        )
 
     def get_schema(self, view_definition: Dict[str, Any]) -> Dict[str, str]:
         """
@@ -404,6 +436,9 @@ class HybridRunner:
     def get_last_batch_anchor_ts(self) -> Optional[datetime]:
         """Citation anchor for the last execute() call's batch state.
 
+        Whichever call finished last on this instance; a runner shared by
+        concurrent requests should pass info= to execute() instead.
+
         Sprint 6.5 Phase 2A cycle 3 (#69). Populated from
         sqlonfhir.mv_refresh_metadata after each FORMAL_* mode execute().
         Returns None when no qualifying execute() has run, or when the
@@ -530,6 +565,9 @@ class HybridRunner:
         """
         Get the last executed SQL query (for debugging)
 
+        Concurrent callers of a shared runner should pass info= to
+        execute()/execute_count() instead.
+
         Returns:
             SQL query string or None
         """
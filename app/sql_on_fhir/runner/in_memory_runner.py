@@ -18,12 +18,32 @@ import hashlib
 import json
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Tuple
-from fhirpathpy import evaluate as fhirpath_eval
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Tuple
+from fhirpathpy import compile as fhirpath_compile
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=512)
+def compile_fhirpath(path: str) -> Callable[..., List[Any]]:
+    """
+    Parse a FHIRPath expression once and return a reusable evaluator
+
+    fhirpathpy.evaluate() re-parses the expression on every call, which
+    dominates transform time since each ViewDefinition applies the same
+    handful of paths to every resource. Compiled evaluators are shared
+    process-wide, so runners created per request still hit the cache.
+
+    Args:
+        path: FHIRPath expression
+
+    Returns:
+        Callable taking (resource, context) and returning the result list
+    """
+    return fhirpath_compile(path)
+
+
 class InMemoryRunner:
     """
     In-memory runner for SQL-on-FHIR v2 ViewDefinitions
@@ -151,6 +171,88 @@ class InMemoryRunner:
 
         return rows
 
+    async def execute_stream(
+        self,
+        view_definition: Dict[str, Any],
+        search_params: Optional[Dict[str, Any]] = None,
+        max_resources: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a ViewDefinition, yielding rows one FHIR page at a time
+
+        Unlike execute(), only one Bundle page of resources and its rows are
+        held at once, and the caller can stop early (e.g. once a count is
+        large enough). Results bypass the cache since they are never fully
+        materialized.
+
+        Args:
+            view_definition: ViewDefinition resource
+            search_params: Optional FHIR search parameters to filter resources
+            max_resources: Maximum number of resources to process
+
+        Yields:
+            Rows (each row is a dict with column values)
+
+        Example:
+            async with contextlib.aclosing(runner.execute_stream(view_def)) as rows:
+                async for row in rows:
+                    ...
+        """
+        resource_type = view_definition.get("resource")
+        where_clauses = view_definition.get("where", [])
+
+        logger.info(f"Streaming ViewDefinition '{view_definition.get('name')}' for {resource_type}")
+
+        async for resources in self.fhir_client.search_pages(
+            resource_type, params=search_params or {}, max_results=max_resources
+        ):
+            if where_clauses:
+                resources = self._apply_where_clauses(resources, where_clauses)
+
+            if self.parallel_processing and len(resources) > 1:
+                rows = await self._transform_resources_parallel(resources, view_definition)
+            else:
+                rows = await self._transform_resources_sequential(resources, view_definition)
+
+            for row in rows:
+                yield row
+
+    async def count(
+        self,
+        view_definition: Dict[str, Any],
+        search_params: Optional[Dict[str, Any]] = None,
+        max_resources: Optional[int] = None,
+    ) -> int:
+        """
+        Count the resources a ViewDefinition would read, without building rows
+
+        Without where clauses the count is pushed to the FHIR server
+        (``_summary=count``) and no resources are transferred. Where clauses
+        can only be evaluated locally, so resources are then streamed page by
+        page and filtered, but never transformed into rows.
+
+        Args:
+            view_definition: ViewDefinition resource
+            search_params: Optional FHIR search parameters to filter resources
+            max_resources: Maximum number of resources to consider
+
+        Returns:
+            Number of matching resources (capped at max_resources)
+        """
+        resource_type = view_definition.get("resource")
+        where_clauses = view_definition.get("where", [])
+
+        if not where_clauses:
+            total = await self.fhir_client.count(resource_type, params=search_params)
+            return min(total, max_resources) if max_resources else total
+
+        total = 0
+        async for resources in self.fhir_client.search_pages(
+            resource_type, params=dict(search_params or {}), max_results=max_resources
+        ):
+            total += len(self._apply_where_clauses(resources, where_clauses))
+        return total
+
     async def _fetch_resources(
         self,
         resource_type: str,
@@ -213,7 +315,7 @@ class InMemoryRunner:
 
                 try:
                     # Evaluate FHIRPath expression
-                    result = fhirpath_eval(resource, path, [])
+                    result = compile_fhirpath(path)(resource, {})
 
                     # Where clause must evaluate to true
                     if not result or result == [False]:
@@ -394,7 +496,7 @@ class InMemoryRunner:
 
         try:
             # Evaluate forEach expression
-            collection = fhirpath_eval(resource, for_each_path, [])
+            collection = compile_fhirpath(for_each_path)(resource, {})
 
             if not collection:
                 # No items in collection
@@ -453,7 +555,7 @@ class InMemoryRunner:
                 # If in forEach context, evaluate against current item
                 eval_resource = current_item if current_item is not None else resource
 
-                result = fhirpath_eval(eval_resource, column_path, context)
+                result = compile_fhirpath(column_path)(eval_resource, context)
 
                 # Extract scalar value
                 if result:
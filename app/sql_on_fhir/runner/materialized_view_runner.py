@@ -29,10 +29,11 @@ Performance:
 
 import logging
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 from langsmith import traceable
 
 from app.clients.hapi_db_client import HAPIDBClient
+from app.sql_on_fhir.row_filters import apply_sql_filters
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,12 @@ class MaterializedViewRunner:
 
     SCHEMA_NAME = "sqlonfhir"
 
+    # execute() accepts row filters and applies them in SQL
+    supports_filters = True
+
+    # execute()/execute_count() record the SQL each call ran in info=
+    reports_execution_info = True
+
     # Mapping of common search params to column names
     # ViewDefinitions use different column naming conventions
     #
@@ -102,6 +109,8 @@ class MaterializedViewRunner:
         view_definition: Dict[str, Any],
         search_params: Optional[Dict[str, Any]] = None,
         max_resources: Optional[int] = None,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        info: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Execute query against materialized view
@@ -110,6 +119,10 @@ class MaterializedViewRunner:
             view_definition: ViewDefinition resource
             search_params: Optional FHIR search parameters to filter results
             max_resources: Maximum number of rows to return (LIMIT clause)
+            filters: Output-row filters (see app.sql_on_fhir.row_filters), bound
+                as parameters; without max_resources PostgreSQL folds them into
+                the view scan, so the view's indexes apply
+            info: Optional dict this call fills with "sql", the query it ran
 
         Returns:
             List of rows (each row is a dict with column values)
@@ -137,6 +150,9 @@ class MaterializedViewRunner:
 
         # Step 2: Build SQL query
         sql = self._build_query(view_name, search_params, max_resources)
+        params = None
+        if filters:
+            sql, params = apply_sql_filters(sql, params, filters)
 
         logger.debug(f"Built SQL query: {len(sql)} characters")
         logger.debug(f"SQL:\n{sql}")
@@ -144,9 +160,11 @@ class MaterializedViewRunner:
         # Step 3: Execute query
         start_time = datetime.now()
         self._last_executed_sql = sql
+        if info is not None:
+            info["sql"] = sql
 
         try:
-            rows = await self.db_client.execute_query(sql)
+            rows = await self.db_client.execute_query(sql, params)
 
             execution_time = (datetime.now() - start_time).total_seconds() * 1000
             self._total_queries += 1
@@ -164,9 +182,58 @@ class MaterializedViewRunner:
             logger.debug(f"Failed SQL:\n{sql}")
             raise RuntimeError(f"Materialized view query failed: {e}")
 
+    async def execute_stream(
+        self,
+        view_definition: Dict[str, Any],
+        search_params: Optional[Dict[str, Any]] = None,
+        max_resources: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Query a materialized view, yielding rows as the database returns them
+
+        Rows are read through a server-side cursor, so a full-view export
+        holds one prefetch batch in memory rather than the whole view.
+
+        Args:
+            view_definition: ViewDefinition resource
+            search_params: Optional FHIR search parameters to filter results
+            max_resources: Maximum number of rows to return (LIMIT clause)
+
+        Yields:
+            Rows (each row is a dict with column values)
+        """
+        view_name = view_definition.get("name")
+
+        if not await self._check_view_exists(view_name):
+            raise ValueError(
+                f"Materialized view '{self.SCHEMA_NAME}.{view_name}' does not exist. "
+                f"Run 'python scripts/create_materialized_views.py' to create it."
+            )
+
+        sql = self._build_query(view_name, search_params, max_resources)
+        logger.info(f"Streaming materialized view '{view_name}' (MaterializedViewRunner)")
+        self._last_executed_sql = sql
+        start_time = datetime.now()
+        row_count = 0
+
+        async for row in self.db_client.stream_query(sql):
+            row_count += 1
+            yield row
+
+        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        self._total_queries += 1
+        self._total_execution_time_ms += execution_time
+        logger.info(
+            f"✓ Materialized view '{view_name}' streamed {row_count} rows "
+            f"in {execution_time:.1f}ms"
+        )
+
     @traceable(tags=["materialized-view-runner", "count"])
     async def execute_count(
-        self, view_definition: Dict[str, Any], search_params: Optional[Dict[str, Any]] = None
+        self,
+        view_definition: Dict[str, Any],
+        search_params: Optional[Dict[str, Any]] = None,
+        info: Optional[Dict[str, Any]] = None,
     ) -> int:
         """
         Execute COUNT query against materialized view
@@ -174,6 +241,7 @@ class MaterializedViewRunner:
         Args:
             view_definition: ViewDefinition resource
             search_params: Optional FHIR search parameters
+            info: Optional dict this call fills with "sql", the COUNT query
 
         Returns:
             Count of matching rows
@@ -190,6 +258,8 @@ class MaterializedViewRunner:
 
         # Build COUNT query
         sql = self._build_count_query(view_name, search_params)
+        if info is not None:
+            info["sql"] = sql
 
         try:
             result = await self.db_client.execute_query(sql)
@@ -247,7 +317,10 @@ class MaterializedViewRunner:
 
     def get_last_executed_sql(self) -> Optional[str]:
         """
-        Get the last executed SQL query (for debugging)
+        Get the last SQL any caller ran on this runner (for debugging)
+
+        Concurrent callers of a shared runner should pass info= to
+        execute()/execute_count() instead.
 
         Returns:
             SQL query string or None
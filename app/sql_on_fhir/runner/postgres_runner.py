@@ -20,11 +20,12 @@ import logging
 import hashlib
 import json
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 
 from app.clients.hapi_db_client import HAPIDBClient
 from app.sql_on_fhir.transpiler import create_fhirpath_transpiler, create_column_extractor
 from app.sql_on_fhir.query_builder import create_sql_query_builder
+from app.sql_on_fhir.row_filters import apply_sql_filters
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,13 @@ class PostgresRunner:
     Implements same interface as InMemoryRunner for drop-in replacement.
     """
 
+    # execute() accepts row filters and applies them in SQL
+    supports_filters = True
+
+    # execute()/execute_count() record the SQL each call ran in info=, so
+    # callers sharing this runner never read another call's query
+    reports_execution_info = True
+
     def __init__(
         self, db_client: HAPIDBClient, enable_cache: bool = True, cache_ttl_seconds: int = 300
     ):
@@ -60,7 +68,7 @@ class PostgresRunner:
         self.builder = create_sql_query_builder(self.transpiler, self.extractor)
 
         # Simple in-memory cache
-        self._cache: Dict[str, Tuple[datetime, List[Dict[str, Any]]]] = {}
+        self._cache: Dict[str, Tuple[datetime, List[Dict[str, Any]], str]] = {}
 
         # Cache statistics
         self._cache_hits = 0
@@ -83,6 +91,8 @@ class PostgresRunner:
         view_definition: Dict[str, Any],
         search_params: Optional[Dict[str, Any]] = None,
         max_resources: Optional[int] = None,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        info: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Execute a ViewDefinition and return tabular results
@@ -91,6 +101,10 @@ class PostgresRunner:
             view_definition: ViewDefinition resource
             search_params: Optional FHIR search parameters to filter resources
             max_resources: Maximum number of resources to process
+            filters: Output-row filters (see app.sql_on_fhir.row_filters),
+                evaluated in the database around the generated query
+            info: Optional dict this call fills with "sql", the query it ran
+                (or whose cached result it returned)
 
         Returns:
             List of rows (each row is a dict with column values)
@@ -107,10 +121,15 @@ class PostgresRunner:
 
         # Step 0: Check cache
         if self.enable_cache:
-            cache_key = self._generate_cache_key(view_definition, search_params, max_resources)
-            cached_result = self._get_from_cache(cache_key)
+            cache_key = self._generate_cache_key(
+                view_definition, search_params, max_resources, filters
+            )
+            cached = self._get_from_cache(cache_key)
 
-            if cached_result is not None:
+            if cached is not None:
+                cached_result, cached_sql = cached
+                if info is not None:
+                    info["sql"] = cached_sql
                 self._cache_hits += 1
                 logger.info(
                     f"✓ Cache HIT for '{view_name}' ({len(cached_result)} rows) "
@@ -131,11 +150,12 @@ class PostgresRunner:
             query = self.builder.build_query(
                 view_definition, search_params=search_params, limit=max_resources
             )
+            sql, params = query.sql, query.params
+            if filters:
+                sql, params = apply_sql_filters(sql, params, filters)
 
-            logger.debug(
-                f"Built SQL query: {len(query.sql)} characters, {query.column_count} columns"
-            )
-            logger.debug(f"Generated SQL:\n{query.sql}")
+            logger.debug(f"Built SQL query: {len(sql)} characters, {query.column_count} columns")
+            logger.debug(f"Generated SQL:\n{sql}")
 
         except Exception as e:
             logger.error(f"Failed to build SQL query for '{view_name}': {e}")
@@ -145,10 +165,12 @@ class PostgresRunner:
         start_time = datetime.now()
 
         # Store SQL for retrieval
-        self._last_executed_sql = query.sql
+        self._last_executed_sql = sql
+        if info is not None:
+            info["sql"] = sql
 
         try:
-            rows = await self.db_client.execute_query(query.sql)
+            rows = await self.db_client.execute_query(sql, params)
 
             execution_time = (datetime.now() - start_time).total_seconds() * 1000
             self._total_queries += 1
@@ -161,17 +183,68 @@ class PostgresRunner:
 
         except Exception as e:
             logger.error(f"SQL execution failed for '{view_name}': {e}")
-            logger.debug(f"Failed SQL:\n{query.sql}")
+            logger.debug(f"Failed SQL:\n{sql}")
             raise RuntimeError(f"Query execution failed: {e}")
 
         # Step 3: Store in cache
         if self.enable_cache:
-            self._put_in_cache(cache_key, rows)
+            self._put_in_cache(cache_key, rows, sql)
 
         return rows
 
+    async def execute_stream(
+        self,
+        view_definition: Dict[str, Any],
+        search_params: Optional[Dict[str, Any]] = None,
+        max_resources: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a ViewDefinition, yielding rows as the database returns them
+
+        Rows are read through a server-side cursor, so memory stays bounded
+        however large the result. Results bypass the cache since they are
+        never fully materialized.
+
+        Args:
+            view_definition: ViewDefinition resource
+            search_params: Optional FHIR search parameters to filter resources
+            max_resources: Maximum number of resources to process
+
+        Yields:
+            Rows (each row is a dict with column values)
+        """
+        view_name = view_definition.get("name")
+
+        try:
+            query = self.builder.build_query(
+                view_definition, search_params=search_params, limit=max_resources
+            )
+        except Exception as e:
+            logger.error(f"Failed to build SQL query for '{view_name}': {e}")
+            raise ValueError(f"SQL generation failed: {e}")
+
+        logger.info(f"Streaming ViewDefinition '{view_name}' (PostgreSQL)")
+        self._last_executed_sql = query.sql
+        start_time = datetime.now()
+        row_count = 0
+
+        async for row in self.db_client.stream_query(query.sql, query.params):
+            row_count += 1
+            yield row
+
+        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        self._total_queries += 1
+        self._total_execution_time_ms += execution_time
+        logger.info(
+            f"✓ ViewDefinition '{view_name}' streamed {row_count} rows "
+            f"in {execution_time:.1f}ms (PostgreSQL)"
+        )
+
     async def execute_count(
-        self, view_definition: Dict[str, Any], search_params: Optional[Dict[str, Any]] = None
+        self,
+        view_definition: Dict[str, Any],
+        search_params: Optional[Dict[str, Any]] = None,
+        info: Optional[Dict[str, Any]] = None,
     ) -> int:
         """
         Execute COUNT query for feasibility checks
@@ -179,6 +252,7 @@ class PostgresRunner:
         Args:
             view_definition: ViewDefinition resource
             search_params: Optional FHIR search parameters
+            info: Optional dict this call fills with "sql", the COUNT query
 
         Returns:
             Count of matching resources
@@ -189,16 +263,19 @@ class PostgresRunner:
 
         # Build COUNT query
         try:
-            count_sql = self.builder.build_count_query(view_definition, search_params)
+            count_sql, count_params = self.builder.build_count_query(view_definition, search_params)
         except Exception as e:
             logger.error(f"Failed to build COUNT query for '{view_name}': {e}")
             raise ValueError(f"COUNT query generation failed: {e}")
 
+        if info is not None:
+            info["sql"] = count_sql
+
         # Execute
         start_time = datetime.now()
 
         try:
-            rows = await self.db_client.execute_query(count_sql)
+            rows = await self.db_client.execute_query(count_sql, count_params)
             count = rows[0]["count"]
 
             execution_time = (datetime.now() - start_time).total_seconds() * 1000
@@ -272,6 +349,7 @@ class PostgresRunner:
         view_definition: Dict[str, Any],
         search_params: Optional[Dict[str, Any]],
         max_resources: Optional[int],
+        filters: Optional[List[Dict[str, Any]]] = None,
     ) -> str:
         """
         Generate cache key from query parameters
@@ -280,6 +358,7 @@ class PostgresRunner:
             view_definition: ViewDefinition resource
             search_params: Search parameters
             max_resources: Max resources limit
+            filters: Output-row filters, if any
 
         Returns:
             Cache key (MD5 hash)
@@ -304,6 +383,8 @@ class PostgresRunner:
                 json.dumps(view_definition.get("select", []), sort_keys=True).encode()
             ).hexdigest(),
         }
+        if filters:
+            key_components["filters"] = filters
 
         key_string = json.dumps(key_components, sort_keys=True)
         # MD5 for cache key generation only (non-cryptographic use)
@@ -311,7 +392,7 @@ class PostgresRunner:
 
         return cache_key
 
-    def _get_from_cache(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+    def _get_from_cache(self, cache_key: str) -> Optional[Tuple[List[Dict[str, Any]], str]]:
         """
         Retrieve results from cache
 
@@ -319,12 +400,13 @@ class PostgresRunner:
             cache_key: Cache key
 
         Returns:
-            Cached results or None if not found/expired
+            (cached results, the SQL that produced them), or None if not
+            found/expired
         """
         if cache_key not in self._cache:
             return None
 
-        timestamp, results = self._cache[cache_key]
+        timestamp, results, sql = self._cache[cache_key]
 
         # Check if expired
         age = (datetime.now() - timestamp).total_seconds()
@@ -334,17 +416,18 @@ class PostgresRunner:
             logger.debug(f"Cache entry expired (age: {age:.1f}s > TTL: {self.cache_ttl_seconds}s)")
             return None
 
-        return results
+        return results, sql
 
-    def _put_in_cache(self, cache_key: str, results: List[Dict[str, Any]]):
+    def _put_in_cache(self, cache_key: str, results: List[Dict[str, Any]], sql: str):
         """
         Store results in cache
 
         Args:
             cache_key: Cache key
             results: Query results to cache
+            sql: The query that produced them
         """
-        self._cache[cache_key] = (datetime.now(), results)
+        self._cache[cache_key] = (datetime.now(), results, sql)
         logger.debug(f"Cached {len(results)} rows (cache size: {len(self._cache)} entries)")
 
     def clear_cache(self):
@@ -396,7 +479,10 @@ class PostgresRunner:
 
     def get_last_executed_sql(self) -> Optional[str]:
         """
-        Get the last executed SQL query
+        Get the last SQL any caller ran on this runner (for debugging)
+
+        Concurrent callers of a shared runner should pass info= to
+        execute()/execute_count() instead.
 
         Returns:
             Last executed SQL string, or None if no queries executed yet
@@ -11,7 +11,9 @@ Manages SQL-on-FHIR v2 ViewDefinition resources:
 import json
 import os
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -28,6 +30,13 @@ class ViewDefinitionManager:
     - Manage ViewDefinition library
     """
 
+    # Bounded LRU of loaded ViewDefinitions
+    CACHE_MAX_ENTRIES = 512
+    # How long a cached ViewDefinition is trusted before its file mtime is re-checked
+    CACHE_STAT_TTL_SECONDS = 60.0
+    # How long load_all() reuses its last directory scan
+    LOAD_ALL_TTL_SECONDS = 30.0
+
     def __init__(self, view_definitions_dir: Optional[str] = None):
         """
         Initialize ViewDefinition manager
@@ -44,8 +53,10 @@ class ViewDefinitionManager:
         self.view_definitions_dir = Path(view_definitions_dir)
         self.view_definitions_dir.mkdir(parents=True, exist_ok=True)
 
-        # In-memory cache of loaded ViewDefinitions
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        # In-memory LRU of loaded ViewDefinitions: name -> (mtime_ns, checked_at, view_def)
+        self._cache: "OrderedDict[str, Tuple[int, float, Dict[str, Any]]]" = OrderedDict()
+        # Last load_all() result and when it was built
+        self._all_cache: Optional[Tuple[float, Dict[str, Dict[str, Any]]]] = None
 
         logger.info(
             f"Initialized ViewDefinitionManager with directory: {self.view_definitions_dir}"
@@ -65,20 +76,34 @@ class ViewDefinitionManager:
             FileNotFoundError: If ViewDefinition file not found
             ValueError: If ViewDefinition is invalid
         """
-        # Check cache first
-        if name in self._cache:
-            logger.debug(f"Loading ViewDefinition '{name}' from cache")
-            return self._cache[name]
-
-        # Load from file
         file_path = self.view_definitions_dir / f"{name}.json"
+        now = time.monotonic()
+
+        # Check cache first; re-stat the file at most once per CACHE_STAT_TTL_SECONDS
+        cached = self._cache.get(name)
+        if cached is not None:
+            mtime_ns, checked_at, view_def = cached
+            if now - checked_at < self.CACHE_STAT_TTL_SECONDS:
+                self._cache.move_to_end(name)
+                return view_def
+            try:
+                current_mtime_ns = file_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                self._evict(name)
+                raise FileNotFoundError(f"ViewDefinition file not found: {file_path}")
+            if current_mtime_ns == mtime_ns:
+                logger.debug(f"Loading ViewDefinition '{name}' from cache")
+                self._remember(name, mtime_ns, view_def, now)
+                return view_def
 
+        # Load from file
         if not file_path.exists():
             raise FileNotFoundError(f"ViewDefinition file not found: {file_path}")
 
         logger.debug(f"Loading ViewDefinition from file: {file_path}")
 
         try:
+            mtime_ns = file_path.stat().st_mtime_ns
             with open(file_path, "r") as f:
                 view_def = json.load(f)
 
@@ -86,7 +111,7 @@ class ViewDefinitionManager:
             self.validate(view_def)
 
             # Cache
-            self._cache[name] = view_def
+            self._remember(name, mtime_ns, view_def, now)
 
             logger.info(
                 f"Loaded ViewDefinition '{name}' for resource type '{view_def.get('resource')}'"
@@ -96,6 +121,20 @@ class ViewDefinitionManager:
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in ViewDefinition file: {e}")
 
+    def _remember(
+        self, name: str, mtime_ns: int, view_def: Dict[str, Any], checked_at: float
+    ) -> None:
+        """Store a ViewDefinition in the LRU, evicting the oldest beyond the bound"""
+        self._cache[name] = (mtime_ns, checked_at, view_def)
+        self._cache.move_to_end(name)
+        while len(self._cache) > self.CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    def _evict(self, name: str) -> None:
+        """Drop a ViewDefinition and the load_all() snapshot that may contain it"""
+        self._cache.pop(name, None)
+        self._all_cache = None
+
     def save(self, view_definition: Dict[str, Any], name: Optional[str] = None) -> str:
         """
         Save a ViewDefinition to file
@@ -128,7 +167,8 @@ class ViewDefinitionManager:
                 json.dump(view_definition, f, indent=2)
 
             # Update cache
-            self._cache[name] = view_definition
+            self._evict(name)
+            self._remember(name, file_path.stat().st_mtime_ns, view_definition, time.monotonic())
 
             logger.info(f"Saved ViewDefinition '{name}'")
             return name
@@ -157,7 +197,7 @@ class ViewDefinitionManager:
             file_path.unlink()
 
             # Remove from cache
-            self._cache.pop(name, None)
+            self._evict(name)
 
             logger.info(f"Deleted ViewDefinition '{name}'")
             return True
@@ -183,9 +223,16 @@ class ViewDefinitionManager:
         """
         Load all ViewDefinitions in directory
 
+        The result is reused for LOAD_ALL_TTL_SECONDS, or until save/delete.
+        Callers must not mutate the returned dict.
+
         Returns:
             Dict mapping names to ViewDefinition resources
         """
+        now = time.monotonic()
+        if self._all_cache is not None and now - self._all_cache[0] < self.LOAD_ALL_TTL_SECONDS:
+            return self._all_cache[1]
+
         names = self.list()
         view_defs = {}
 
@@ -196,6 +243,7 @@ class ViewDefinitionManager:
                 logger.warning(f"Failed to load ViewDefinition '{name}': {e}")
 
         logger.info(f"Loaded {len(view_defs)} ViewDefinitions")
+        self._all_cache = (now, view_defs)
         return view_defs
 
     def validate(self, view_definition: Dict[str, Any]) -> bool:
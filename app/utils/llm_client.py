@@ -6,9 +6,15 @@ Now uses LangChain's ChatAnthropic for automatic LangSmith tracing.
 """
 
 import os
+import copy
+import hashlib
 import json
 import logging
-from typing import Dict, Any, Optional
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from dotenv import load_dotenv
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
@@ -93,6 +99,63 @@ def _chat_anthropic_kwargs(
     return kwargs
 
 
+# Whitespace runs, and hyphens/underscores joining two word characters ("type-2")
+_CRITERION_SEPARATORS = re.compile(r"\s+|(?<=\w)[-_](?=\w)")
+
+
+def _normalize_criterion(criterion: str) -> str:
+    """Cache key for a criterion, folding case, separators and edge punctuation.
+
+    "Type-2 Diabetes." and "type 2 diabetes" share a key; anything that could
+    change meaning (digits, negation, units, word order) is left intact, so a
+    near-miss costs an LLM call rather than returning another cohort's concepts.
+    """
+    folded = _CRITERION_SEPARATORS.sub(" ", criterion.casefold())
+    return " ".join(folded.strip(" .,;:'\"").split())
+
+
+class _StringFieldStreamer:
+    """Incrementally decode one top-level string field from streamed JSON text.
+
+    feed() returns the newly decoded part of the field's value; escape
+    sequences split across chunks are held back until complete.
+    """
+
+    def __init__(self, field: str):
+        self._opening = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._pos: Optional[int] = None
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        if self._done:
+            return ""
+        if self._pos is None:
+            match = self._opening.search(self._buffer)
+            if match is None:
+                return ""
+            self._pos = match.end()
+
+        buffer, i, end = self._buffer, self._pos, self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self._done = True
+                break
+            if char == "\\":
+                width = 6 if buffer[i + 1 : i + 2] == "u" else 2
+                if i + width > len(buffer):
+                    break
+                i += width
+            else:
+                i += 1
+            end = i
+
+        raw, self._pos = buffer[self._pos : end], end
+        return json.loads(f'"{raw}"') if raw else ""
+
+
 # ---------------------------------------------------------------------------
 # Module-level system prompts (Sprint 8.2 Task 2)
 #
@@ -512,6 +575,10 @@ class LLMClient:
     and medical terminology mapping.
     """
 
+    # Exact-match cache of extraction results (requirements, medical concepts)
+    EXTRACTION_CACHE_TTL_SECONDS = 3600
+    EXTRACTION_CACHE_MAX_ENTRIES = 1024
+
     def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4-6"):
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         self.model = model
@@ -536,9 +603,56 @@ class LLMClient:
                 f"LLM client initialized with model={self.model} (LangSmith tracing enabled)"
             )
 
+        self._chat_clients: Dict[Tuple[str, float, int], ChatAnthropic] = {}
+        # prompt digest -> (cached_at, parsed JSON), oldest first (LRU)
+        self._extraction_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def _chat_client(self, model: str, temperature: float, max_tokens: int) -> ChatAnthropic:
+        """Return the ChatAnthropic for these sampling params, creating it once."""
+        key = (model, temperature, max_tokens)
+        client = self._chat_clients.get(key)
+        if client is None:
+            client = ChatAnthropic(
+                **_chat_anthropic_kwargs(
+                    model=model,
+                    api_key=self.api_key,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+            )
+            self._chat_clients[key] = client
+        return client
+
+    @staticmethod
+    def _build_messages(
+        prompt: Union[str, List[Dict[str, Any]]], system: Optional[str]
+    ) -> List[Union[SystemMessage, HumanMessage]]:
+        """
+        Build the LangChain message list for a call
+
+        Sprint 8.2 Task 2 fix: langchain-anthropic 1.0.1's _format_messages
+        discards `SystemMessage.additional_kwargs` when content is a plain
+        string — only the content-block-array form preserves cache_control
+        for transmission to Anthropic's API. We always emit the content-block
+        form so cache_control actually reaches the wire.
+        """
+        system_text = system if system else "You are a helpful clinical research data specialist."
+        return [
+            SystemMessage(
+                content=[
+                    {
+                        "type": "text",
+                        "text": system_text,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
+            ),
+            HumanMessage(content=prompt),
+        ]
+
     async def complete(
         self,
-        prompt: str,
+        prompt: Union[str, List[Dict[str, Any]]],
         model: Optional[str] = None,
         max_tokens: int = 4096,
         temperature: float = 0.7,
@@ -550,7 +664,7 @@ class LLMClient:
         All calls are automatically traced to LangSmith when tracing is enabled.
 
         Args:
-            prompt: User prompt
+            prompt: User prompt, as text or as Anthropic content blocks
             model: Model identifier (optional, uses instance default)
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature
@@ -561,46 +675,19 @@ class LLMClient:
         """
         if not self.client:
             logger.warning("LLM client not initialized - returning dummy response")
+            if not isinstance(prompt, str):
+                prompt = "\n".join(block.get("text", "") for block in prompt)
             return self._dummy_response(prompt)
 
         try:
-            # Create a new client instance if model/params differ from default.
+            # Reuse a client per (model, temperature, max_tokens) so its HTTP
+            # connection pool survives across calls.
             # _chat_anthropic_kwargs omits temperature for models that reject it
             # (Opus 4.7+, Sonnet 5, Fable 5) so the same call works across models.
             target_model = model if (model and model != self.model) else self.model
-            client = ChatAnthropic(
-                **_chat_anthropic_kwargs(
-                    model=target_model,
-                    api_key=self.api_key,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
-            )
-
-            # Build messages in LangChain format.
-            #
-            # Sprint 8.2 Task 2 fix: langchain-anthropic 1.0.1's _format_messages
-            # discards `SystemMessage.additional_kwargs` when content is a plain
-            # string — only the content-block-array form preserves cache_control
-            # for transmission to Anthropic's API. We always emit the content-block
-            # form so cache_control actually reaches the wire.
-            messages = []
-            system_text = (
-                system if system else "You are a helpful clinical research data specialist."
-            )
-            messages.append(
-                SystemMessage(
-                    content=[
-                        {
-                            "type": "text",
-                            "text": system_text,
-                            "cache_control": {"type": "ephemeral"},
-                        }
-                    ]
-                )
-            )
+            client = self._chat_client(target_model, temperature, max_tokens)
 
-            messages.append(HumanMessage(content=prompt))
+            messages = self._build_messages(prompt, system)
 
             # Invoke with async - automatically traced to LangSmith!
             response = await client.ainvoke(messages)
@@ -613,9 +700,39 @@ class LLMClient:
             logger.error(f"LLM API error: {str(e)}")
             raise
 
+    async def stream_complete(
+        self,
+        prompt: Union[str, List[Dict[str, Any]]],
+        model: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion from Claude as text chunks
+
+        Same arguments as complete(); yields text as it is decoded instead of
+        waiting for the whole response.
+        """
+        if not self.client:
+            yield await self.complete(prompt, model, max_tokens, temperature, system)
+            return
+
+        target_model = model if (model and model != self.model) else self.model
+        client = self._chat_client(target_model, temperature, max_tokens)
+
+        async for chunk in client.astream(self._build_messages(prompt, system)):
+            content = chunk.content
+            if isinstance(content, list):
+                content = "".join(
+                    block.get("text", "") for block in content if isinstance(block, dict)
+                )
+            if content:
+                yield content
+
     async def extract_structured_json(
         self,
-        prompt: str,
+        prompt: Union[str, List[Dict[str, Any]]],
         schema_description: str,
         model: Optional[str] = None,
         system: Optional[str] = None,
@@ -624,7 +741,7 @@ class LLMClient:
         Extract structured JSON from text using LLM
 
         Args:
-            prompt: Input text to parse
+            prompt: Input text to parse, or Anthropic content blocks
             schema_description: Description of expected JSON schema
             model: Model to use (optional)
             system: Optional system prompt
@@ -632,17 +749,61 @@ class LLMClient:
         Returns:
             Parsed JSON object
         """
-        full_prompt = f"""{prompt}
-
-{schema_description}
+        response = await self.complete(
+            self._with_json_instructions(prompt, schema_description),
+            model=model or self.model,
+            temperature=0.3,
+            system=system,
+        )
+        return self._parse_json_response(response)
 
-Return ONLY valid JSON, no other text."""
+    async def stream_structured_json(
+        self,
+        prompt: Union[str, List[Dict[str, Any]]],
+        schema_description: str,
+        on_question_delta: Callable[[str], Awaitable[None]],
+        model: Optional[str] = None,
+        system: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        extract_structured_json() that streams the next_question field
 
-        response = await self.complete(
-            full_prompt, model=model or self.model, temperature=0.3, system=system
+        The model is asked to emit next_question first; its text is passed to
+        on_question_delta as it decodes, and the parsed JSON is returned once
+        the response is complete.
+        """
+        instructions = (
+            f"{schema_description}\n\nEmit next_question as the FIRST key of the JSON object."
         )
+        question = _StringFieldStreamer("next_question")
+        chunks = []
+        async for chunk in self.stream_complete(
+            self._with_json_instructions(prompt, instructions),
+            model=model or self.model,
+            temperature=0.3,
+            system=system,
+        ):
+            chunks.append(chunk)
+            delta = question.feed(chunk)
+            if delta:
+                await on_question_delta(delta)
+        return self._parse_json_response("".join(chunks))
+
+    @staticmethod
+    def _with_json_instructions(
+        prompt: Union[str, List[Dict[str, Any]]], schema_description: str
+    ) -> Union[str, List[Dict[str, Any]]]:
+        """Append the schema description and JSON-only instruction to a prompt"""
+        instructions = f"""{schema_description}
+
+Return ONLY valid JSON, no other text."""
+        if isinstance(prompt, str):
+            return f"{prompt}\n\n{instructions}"
+        return [*prompt, {"type": "text", "text": instructions}]
 
-        # Extract JSON from response (handle markdown code blocks)
+    @staticmethod
+    def _parse_json_response(response: str) -> Dict[str, Any]:
+        """Parse a JSON response, tolerating markdown code fences"""
         response = response.strip()
         if response.startswith("```json"):
             response = response[7:]
@@ -658,8 +819,60 @@ Return ONLY valid JSON, no other text."""
             logger.debug(f"Response: {response}")
             raise
 
+    async def _cached_structured_json(
+        self,
+        prompt: Union[str, List[Dict[str, Any]]],
+        model: Optional[str] = None,
+        system: Optional[str] = None,
+        cache_input: Any = None,
+        on_question_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        extract_structured_json() behind an exact-match LRU/TTL cache
+
+        The prompt carries the whole call input (conversation history, current
+        requirements, criteria), so identical state such as a retried or
+        reloaded turn is answered without another LLM round-trip. Callers may
+        pass ``cache_input`` to key on a normalized form of the input instead
+        of the literal prompt. Callers get a copy they are free to mutate.
+
+        With ``on_question_delta`` the call is streamed and the next_question
+        text is reported as it decodes (all at once on a cache hit).
+        """
+        key_input = prompt if cache_input is None else cache_input
+        key = hashlib.blake2b(
+            json.dumps([model or self.model, system, key_input]).encode(), digest_size=16
+        ).hexdigest()
+        now = time.monotonic()
+
+        cached = self._extraction_cache.get(key)
+        if cached is not None:
+            cached_at, result = cached
+            if now - cached_at < self.EXTRACTION_CACHE_TTL_SECONDS:
+                self._extraction_cache.move_to_end(key)
+                logger.debug("LLM extraction cache hit")
+                if on_question_delta is not None and result.get("next_question"):
+                    await on_question_delta(result["next_question"])
+                return copy.deepcopy(result)
+            del self._extraction_cache[key]
+
+        if on_question_delta is not None:
+            result = await self.stream_structured_json(
+                prompt, "", on_question_delta, model=model, system=system
+            )
+        else:
+            result = await self.extract_structured_json(prompt, "", model=model, system=system)
+
+        self._extraction_cache[key] = (now, copy.deepcopy(result))
+        while len(self._extraction_cache) > self.EXTRACTION_CACHE_MAX_ENTRIES:
+            self._extraction_cache.popitem(last=False)
+        return result
+
     async def extract_requirements(
-        self, conversation_history: list, current_requirements: Dict[str, Any]
+        self,
+        conversation_history: list,
+        current_requirements: Dict[str, Any],
+        on_question_delta: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> Dict[str, Any]:
         """
         Extract structured requirements from conversation
@@ -667,6 +880,7 @@ Return ONLY valid JSON, no other text."""
         Args:
             conversation_history: List of conversation turns
             current_requirements: Current extracted requirements
+            on_question_delta: Optional async callback streamed next_question text
 
         Returns:
             Dict with:
@@ -680,16 +894,86 @@ Return ONLY valid JSON, no other text."""
         # _REQUIREMENTS_SYSTEM_PROMPT (must clear
         # _ANTHROPIC_CACHE_THRESHOLDS["sonnet"] tokens for Sonnet caching).
         # Only dynamic per-call content stays in the user message.
-        prompt = f"""Conversation history:
-{json.dumps(conversation_history, indent=2)}
+        #
+        # Each history turn is its own content block with a cache breakpoint
+        # on the newest one. Turn N+1 repeats turn N's blocks verbatim, so
+        # Anthropic's prefix lookback serves system prompt + prior history from
+        # cache and only the new turns and current requirements are billed in full.
+        prompt: List[Dict[str, Any]] = [{"type": "text", "text": "Conversation history:"}]
+        prompt.extend(
+            {"type": "text", "text": json.dumps(turn, indent=2)} for turn in conversation_history
+        )
+        if conversation_history:
+            prompt[-1]["cache_control"] = {"type": "ephemeral"}
+        prompt.append(
+            {
+                "type": "text",
+                "text": f"""Current extracted requirements:
+{json.dumps(current_requirements, indent=2)}
+
+Apply the extraction workflow described in your system instructions and return the JSON object per the schema.""",
+            }
+        )
+
+        # Turns carry the time they were sent, which differs on a retried or
+        # reloaded turn; the cache keys on what the model reads from them
+        cache_input = [
+            "requirements",
+            [[turn.get("role"), turn.get("content")] for turn in conversation_history],
+            current_requirements,
+        ]
+        return await self._cached_structured_json(
+            prompt,
+            system=_REQUIREMENTS_SYSTEM_PROMPT,
+            cache_input=cache_input,
+            on_question_delta=on_question_delta,
+        )
+
+    async def extract_requirements_delta(
+        self,
+        last_user_message: str,
+        current_requirements: Dict[str, Any],
+        last_question: Optional[str] = None,
+        on_question_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Extract only what the researcher's latest reply changes
+
+        Sends the latest reply (and the question it answers) instead of the
+        whole conversation, so per-turn input stays roughly constant.
+
+        Args:
+            last_user_message: The researcher's newest message
+            current_requirements: Requirements accumulated so far
+            last_question: The assistant question the message answers (optional)
+            on_question_delta: Optional async callback streamed next_question text
+
+        Returns:
+            Dict with the extract_requirements keys, where extracted_requirements
+            is a patch holding only added or corrected fields, plus:
+            - confidence: 0.0-1.0, how safely the reply was read without the
+              earlier conversation
+        """
+        # Same byte-stable system prompt as extract_requirements, so both
+        # paths share the provider's prompt cache.
+        prompt = f"""DELTA UPDATE — extract only what the researcher's latest reply adds or corrects.
+
+Assistant's previous question:
+{json.dumps(last_question or "")}
+
+Researcher's latest reply:
+{json.dumps(last_user_message)}
 
 Current extracted requirements:
 {json.dumps(current_requirements, indent=2)}
 
-Apply the extraction workflow described in your system instructions and return the JSON object per the schema."""
+Return the JSON object per the schema, with two differences:
+- extracted_requirements holds ONLY fields the reply adds or corrects. Omit unchanged fields. For list fields, include only the new entries.
+- Add "confidence": 0.0-1.0 for how reliably the reply can be applied without the earlier conversation. Use 0.0 if the reply removes or replaces existing list entries, or refers to something you cannot see.
+missing_fields, next_question, completeness_score and ready_for_submission describe the requirements AFTER the patch is applied."""
 
-        return await self.extract_structured_json(
-            prompt, schema_description="", system=_REQUIREMENTS_SYSTEM_PROMPT
+        return await self._cached_structured_json(
+            prompt, system=_REQUIREMENTS_SYSTEM_PROMPT, on_question_delta=on_question_delta
         )
 
     async def extract_medical_concepts(self, criterion: str) -> Dict[str, Any]:
@@ -717,11 +1001,11 @@ Apply the extraction workflow described in your system instructions and return t
 Return the {{"concepts": [...]}} JSON object per the schema in your system instructions."""
 
         # Sprint 8 Optimization 2: Use Haiku for simple classification (10x cheaper)
-        return await self.extract_structured_json(
+        return await self._cached_structured_json(
             prompt,
-            "",
             model="claude-haiku-4-5-20251001",
             system=_MEDICAL_CONCEPTS_SYSTEM_PROMPT,
+            cache_input=["concepts", _normalize_criterion(criterion)],
         )
 
     async def extract_medical_concepts_batch(
@@ -755,11 +1039,11 @@ Return the {{"concepts": [...]}} JSON object per the schema in your system instr
 {criteria_text}
 Return the {{"results": [...]}} JSON array per the schema in your system instructions, with one entry per criterion in the same order."""
 
-        result = await self.extract_structured_json(
+        result = await self._cached_structured_json(
             prompt,
-            "",
             model="claude-haiku-4-5-20251001",
             system=_MEDICAL_CONCEPTS_SYSTEM_PROMPT,
+            cache_input=["concepts_batch", [_normalize_criterion(c) for c in criteria_list]],
         )
 
         # Extract results array
@@ -796,3 +1080,14 @@ Return the {{"results": [...]}} JSON array per the schema in your system instruc
                 }
             )
         return "Dummy LLM response"
+
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> LLMClient:
+    """
+    Process-wide LLMClient shared by agents and request handlers
+
+    Reusing one instance keeps its ChatAnthropic clients (and their HTTP
+    connection pools) warm instead of rebuilding them per agent or request.
+    """
+    return LLMClient()
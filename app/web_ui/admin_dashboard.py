@@ -50,7 +50,7 @@ assert_encryption_key_present_if_production()
 
 from app.langchain_orchestrator.request_facade import LangGraphRequestFacade
 from app.database import get_db_session, get_engine
-from app.database.models import AgentExecution, ResearchRequest
+from app.database.models import AgentExecution, ResearchRequest, StateTransition
 from app.services.approval_service import ApprovalService
 
 
@@ -490,17 +490,17 @@ def show_preview_data_section(request_id: str, status: dict):
                                 request.current_state = "data_extraction"
                                 request.current_agent = "extraction_agent"
 
-                                # Update state history
-                                state_history = request.state_history or []
-                                state_history.append(
-                                    {
-                                        "state": "data_extraction",
-                                        "timestamp": datetime.now().isoformat(),
-                                        "approved_by": "admin_dashboard",
-                                        "notes": "Preview approved - proceeding to full data extraction",
-                                    }
+                                # Record the transition
+                                session.add(
+                                    StateTransition(
+                                        request_id=request_id,
+                                        state="data_extraction",
+                                        notes=(
+                                            "Preview approved by admin_dashboard - "
+                                            "proceeding to full data extraction"
+                                        ),
+                                    )
                                 )
-                                request.state_history = state_history
 
                                 await session.commit()
 
@@ -2029,7 +2029,8 @@ def show_materialized_views():
     """Issue #18: admin tab for managing the Lambda Architecture's batch layer.
 
     Triggers POST /analytics/materialized-views/refresh-all (CONCURRENTLY +
-    parallel via asyncio.gather, per #18). Renders per-view results.
+    parallel via asyncio.gather, per #18), polls the returned job until it
+    finishes, and renders per-view results.
 
     NOTE on auth: admin endpoint requires admin-role JWT (Sprint 6.1 audit
     middleware enforces auth on this route). The dashboard-from-streamlit
@@ -2052,8 +2053,25 @@ def show_materialized_views():
             try:
                 response = httpx.post(
                     f"{api_url}/analytics/materialized-views/refresh-all",
-                    timeout=120.0,
+                    timeout=30.0,
                 )
+                if response.status_code == 202:
+                    # The refresh runs as a background job; poll until it finishes
+                    status_url = f"{api_url}{response.json()['status_url']}"
+                    deadline = time.monotonic() + 120.0
+                    while True:
+                        response = httpx.get(status_url, timeout=30.0)
+                        job = response.json() if response.status_code == 200 else {}
+                        if job.get("status") != "running":
+                            break
+                        if time.monotonic() > deadline:
+                            raise httpx.TimeoutException("refresh job still running")
+                        time.sleep(1.0)
+                    if job.get("status") == "failed":
+                        response = httpx.Response(500, text=job.get("error") or "")
+                    elif job.get("status") == "completed":
+                        response = httpx.Response(200, json=job["result"])
+
                 if response.status_code == 401:
                     st.error(
                         "Authentication required. Streamlit→API auth flow not yet "
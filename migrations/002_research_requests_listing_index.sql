@@ -0,0 +1,19 @@
+-- Migration: Covering index for the active research request listing
+-- Date: 2026-10-18
+-- Description: GET /research/ (list_active_requests) selects
+--   id, researcher_name, current_state, current_agent, created_at
+--   FROM research_requests ORDER BY id DESC LIMIT 50
+-- Request IDs lead with their creation timestamp, so id DESC is newest first.
+-- INCLUDE carries the remaining listed columns in the index leaf pages, which
+-- lets PostgreSQL (11+) answer the listing with an index-only scan.
+--
+-- CONCURRENTLY does not block writes while the index builds, but cannot run
+-- inside a transaction block: apply this file on its own (psql -f), not
+-- wrapped in BEGIN/COMMIT.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_requests_listing
+    ON research_requests (id DESC)
+    INCLUDE (researcher_name, current_state, current_agent, created_at);
+
+-- Index-only scans depend on the visibility map; refresh it after the build
+VACUUM (ANALYZE) research_requests;
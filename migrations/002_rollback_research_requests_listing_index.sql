@@ -0,0 +1,6 @@
+-- Rollback Migration: Drop the active research request listing index
+-- Date: 2026-10-18
+-- Description: Removes ix_research_requests_listing. No data is lost;
+--   GET /research/ falls back to the primary key index plus heap fetches.
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_research_requests_listing;
@@ -0,0 +1,8 @@
+-- Rollback Migration: Drop the state_transitions table
+-- Date: 2026-10-18
+-- Description: Removes state_transitions and its index.
+-- WARNING: Transitions recorded after migration 003 exist only in this table
+--   (research_requests.state_history is no longer written). Back them up first
+--   if needed.
+
+DROP TABLE IF EXISTS state_transitions;
@@ -0,0 +1,40 @@
+-- Migration: Append-only state_transitions table
+-- Date: 2026-10-18
+-- Description: Moves research request state history out of the
+--   research_requests.state_history JSON array into one row per transition,
+--   so each transition is a single INSERT instead of an UPDATE rewriting the
+--   whole array. Existing histories are copied over; the JSON column is left
+--   in place (no longer written) so nothing is lost.
+
+CREATE TABLE IF NOT EXISTS state_transitions (
+    id SERIAL PRIMARY KEY,
+    request_id VARCHAR NOT NULL REFERENCES research_requests(id),
+    state VARCHAR NOT NULL,
+    timestamp TIMESTAMP NOT NULL DEFAULT now(),
+    notes TEXT,
+    error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS ix_state_transitions_request_ts
+    ON state_transitions (request_id, timestamp);
+
+-- Backfill from the JSON history of requests that have no rows yet
+INSERT INTO state_transitions (request_id, state, timestamp, notes, error)
+SELECT r.id,
+       entry->>'state',
+       COALESCE((entry->>'timestamp')::timestamp, r.created_at),
+       entry->>'notes',
+       entry->>'error'
+FROM research_requests r
+CROSS JOIN LATERAL jsonb_array_elements(COALESCE(r.state_history::jsonb, '[]'::jsonb)) AS entry
+WHERE entry->>'state' IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM state_transitions t WHERE t.request_id = r.id);
+
+-- Verify migration
+DO $$
+DECLARE
+    transition_count INTEGER;
+BEGIN
+    SELECT COUNT(*) INTO transition_count FROM state_transitions;
+    RAISE NOTICE '✓ Migration successful: state_transitions holds % rows', transition_count;
+END $$;
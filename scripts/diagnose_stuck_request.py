@@ -28,6 +28,7 @@ from app.database.models import (
     FeasibilityReport,
     DataDelivery,
     AuditLog,
+    StateTransition,
 )
 
 
@@ -65,8 +66,14 @@ async def diagnose_request(request_id: str):
         # 2. State history
         print("[2] STATE HISTORY")
         print("-" * 80)
-        if request.state_history:
-            for idx, entry in enumerate(request.state_history):
+        transitions = await session.scalars(
+            select(StateTransition)
+            .where(StateTransition.request_id == request_id)
+            .order_by(StateTransition.timestamp, StateTransition.id)
+        )
+        state_history = [t.to_history_entry() for t in transitions]
+        if state_history:
+            for idx, entry in enumerate(state_history):
                 timestamp = entry.get("timestamp", "N/A")
                 state = entry.get("state", "N/A")
                 approval_id = entry.get("approval_id", "")
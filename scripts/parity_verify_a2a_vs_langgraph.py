@@ -12,7 +12,7 @@ One-shot tool. Deleted at sprint close per the migration-helper pattern
 (precedent: scripts/migrate_to_langgraph.py deleted in Phase 6c).
 
 Per D4a, five structural-parity dimensions:
-  1. state_sequence       — research_requests.state_history JSON
+  1. state_sequence       — state_transitions rows
   2. agent_execution_order — LangSmith trace (per-orchestrator branch)
   3. approval_gate_triggers — approvals table join
   4. final_state          — research_requests.current_state + final_state
@@ -196,18 +196,17 @@ def write_jsonl_row(row: ParityRow, log_path: Path) -> None:
 
 
 async def fetch_state_sequence(thread_id: str, db_session) -> List[str]:
-    """Return ordered state names from `research_requests.state_history` for the
-    row identified by `thread_id`.
+    """Return ordered state names from the `state_transitions` rows of the
+    request identified by `thread_id`.
 
     LangGraph's checkpointer sets `thread_id == request_id` per workflow
     invocation; `ResearchRequest.id` (String PK, `REQ-YYYYMMDD-XXXXXXXX`
     format) is the lookup key for both orchestrators.
 
-    `state_history` is a JSON list of `{"state": <name>, "timestamp": <ISO>}`
-    entries persisted chronologically as the workflow progresses. This
-    fetcher sorts by `timestamp` ascending defensively (don't rely on file
-    order — clock skew, backfill scripts, or future code paths could append
-    out of order).
+    Each transition is one row inserted as the workflow progresses. This
+    fetcher orders by `timestamp` ascending (then insertion id) rather than
+    relying on insertion order alone — clock skew or backfill scripts could
+    insert out of order.
 
     Returns `[]` if no row matches `thread_id`. The caller (compare_pair)
     decides whether `[]` is a parity-row signal (orchestrator never
@@ -215,17 +214,14 @@ async def fetch_state_sequence(thread_id: str, db_session) -> List[str]:
     """
     from sqlalchemy import select
 
-    from app.database.models import ResearchRequest
+    from app.database.models import StateTransition
 
     result = await db_session.execute(
-        select(ResearchRequest.state_history).where(ResearchRequest.id == thread_id)
+        select(StateTransition.state)
+        .where(StateTransition.request_id == thread_id)
+        .order_by(StateTransition.timestamp, StateTransition.id)
     )
-    row = result.scalar_one_or_none()
-    if row is None:
-        return []
-    entries = row if isinstance(row, list) else json.loads(row)
-    entries = sorted(entries, key=lambda e: e.get("timestamp", ""))
-    return [e["state"] for e in entries]
+    return list(result.scalars())
 
 
 # ---------------------------------------------------------------------------
@@ -15,7 +15,7 @@ os.environ["DATABASE_URL"] = (
 
 from app.langchain_orchestrator.request_facade import LangGraphRequestFacade
 from app.database import get_db_session
-from app.database.models import Approval, ResearchRequest
+from app.database.models import Approval, ResearchRequest, StateTransition
 from sqlalchemy import select
 
 # Set up logging
@@ -86,7 +86,12 @@ async def test_approval():
             print(f"📊 Request state AFTER approval:")
             print(f"   Current state: {request.current_state}")
             print(f"   Current agent: {request.current_agent}")
-            print(f"   State history: {request.state_history}")
+            transitions = await session.scalars(
+                select(StateTransition.state)
+                .where(StateTransition.request_id == request.id)
+                .order_by(StateTransition.timestamp, StateTransition.id)
+            )
+            print(f"   State history: {list(transitions)}")
             print()
 
             if request.current_state != "phenotype_review":
@@ -67,7 +67,7 @@ async def main():
 
         # Execute query
         print(f"\n✓ Executing query against HAPI database...")
-        rows = await client.execute_query(query.sql)
+        rows = await client.execute_query(query.sql, query.params)
 
         print(f"✓✓✓ SUCCESS! Query executed successfully!")
         print(f"  Returned {len(rows)} patients")
@@ -89,14 +89,14 @@ async def main():
         print(f"\n✓ Testing with search parameters (gender=male)...")
         query_male = builder.build_query(view_def, search_params={"gender": "male"}, limit=5)
 
-        rows_male = await client.execute_query(query_male.sql)
+        rows_male = await client.execute_query(query_male.sql, query_male.params)
         print(f"✓ Found {len(rows_male)} male patients")
 
         # Test COUNT query
         print(f"\n✓ Testing COUNT query...")
-        count_sql = builder.build_count_query(view_def)
+        count_sql, count_params = builder.build_count_query(view_def)
 
-        count_rows = await client.execute_query(count_sql)
+        count_rows = await client.execute_query(count_sql, count_params)
         total = count_rows[0]["count"]
         print(f"✓ Total patients in database: {total}")
 
@@ -55,66 +55,68 @@ class IntegrityReport:
     results: List[ValidationResult]
     summary: Dict[str, any] = field(default_factory=dict)
 
-    def print_summary(self):
-        """Print formatted summary"""
-        print(f"\n{'='*70}")
-        print(f"REFERENTIAL INTEGRITY VALIDATION REPORT")
-        print(f"{'='*70}")
-        print(f"Schema: {self.schema_name}")
-        print(f"Timestamp: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Overall Status: {'✅ PASSED' if self.overall_passed else '❌ FAILED'}")
-        print(f"{'='*70}\n")
+    def print_summary(self, out=None):
+        """Print formatted summary to out (default: stdout)"""
+        print(f"\n{'='*70}", file=out)
+        print(f"REFERENTIAL INTEGRITY VALIDATION REPORT", file=out)
+        print(f"{'='*70}", file=out)
+        print(f"Schema: {self.schema_name}", file=out)
+        print(f"Timestamp: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}", file=out)
+        print(f"Overall Status: {'✅ PASSED' if self.overall_passed else '❌ FAILED'}", file=out)
+        print(f"{'='*70}\n", file=out)
 
         for result in self.results:
             status = "✅ PASS" if result.passed else "❌ FAIL"
-            print(f"{status} {result.test_name}")
-            print(f"  Total: {result.total_count:,}")
-            print(f"  Valid: {result.valid_count:,} ({result.success_rate():.2f}%)")
+            print(f"{status} {result.test_name}", file=out)
+            print(f"  Total: {result.total_count:,}", file=out)
+            print(f"  Valid: {result.valid_count:,} ({result.success_rate():.2f}%)", file=out)
 
             if result.invalid_count > 0:
-                print(f"  ⚠️  Invalid: {result.invalid_count:,}")
+                print(f"  ⚠️  Invalid: {result.invalid_count:,}", file=out)
 
             if result.orphaned_count > 0:
-                print(f"  ⚠️  Orphaned: {result.orphaned_count:,}")
+                print(f"  ⚠️  Orphaned: {result.orphaned_count:,}", file=out)
 
             if result.execution_time_ms > 0:
-                print(f"  Time: {result.execution_time_ms:.2f}ms")
+                print(f"  Time: {result.execution_time_ms:.2f}ms", file=out)
 
             if result.errors:
-                print(f"  Errors:")
+                print(f"  Errors:", file=out)
                 for error in result.errors[:3]:  # Show first 3 errors
-                    print(f"    - {error}")
+                    print(f"    - {error}", file=out)
                 if len(result.errors) > 3:
-                    print(f"    ... and {len(result.errors) - 3} more")
+                    print(f"    ... and {len(result.errors) - 3} more", file=out)
 
             if result.warnings:
-                print(f"  Warnings:")
+                print(f"  Warnings:", file=out)
                 for warning in result.warnings[:2]:
-                    print(f"    - {warning}")
+                    print(f"    - {warning}", file=out)
 
-            print()
+            print(file=out)
 
         # Summary statistics
         total_tests = len(self.results)
         passed_tests = sum(1 for r in self.results if r.passed)
-        print(f"{'='*70}")
-        print(f"SUMMARY: {passed_tests}/{total_tests} tests passed")
-        print(f"{'='*70}\n")
+        print(f"{'='*70}", file=out)
+        print(f"SUMMARY: {passed_tests}/{total_tests} tests passed", file=out)
+        print(f"{'='*70}\n", file=out)
 
 
 class ReferentialIntegrityValidator:
     """Validator for materialized view referential integrity"""
 
-    def __init__(self, conn: asyncpg.Connection, schema_name: str = "sqlonfhir"):
+    def __init__(self, conn: asyncpg.Connection, schema_name: str = "sqlonfhir", out=None):
         """
         Initialize validator
 
         Args:
             conn: Database connection
             schema_name: Schema containing materialized views
+            out: Text stream for progress output (default: stdout)
         """
         self.conn = conn
         self.schema_name = schema_name
+        self.out = out
         self.results: List[ValidationResult] = []
 
     async def validate_all(self) -> IntegrityReport:
@@ -124,10 +126,10 @@ class ReferentialIntegrityValidator:
         Returns:
             Complete integrity report
         """
-        print(f"\n{'='*70}")
-        print(f"Starting Referential Integrity Validation")
-        print(f"Schema: {self.schema_name}")
-        print(f"{'='*70}\n")
+        print(f"\n{'='*70}", file=self.out)
+        print(f"Starting Referential Integrity Validation", file=self.out)
+        print(f"Schema: {self.schema_name}", file=self.out)
+        print(f"{'='*70}\n", file=self.out)
 
         timestamp = datetime.now()
 
@@ -158,7 +160,7 @@ class ReferentialIntegrityValidator:
 
     async def _validate_patient_references_in_conditions(self):
         """Validate that all condition.patient_id values exist in patient_demographics"""
-        print("Test 1: Validating patient references in condition_simple...")
+        print("Test 1: Validating patient references in condition_simple...", file=self.out)
 
         start_time = asyncio.get_event_loop().time()
 
@@ -246,18 +248,18 @@ class ReferentialIntegrityValidator:
             )
 
             self.results.append(result)
-            print(f"  ✓ Completed ({execution_time_ms:.2f}ms)\n")
+            print(f"  ✓ Completed ({execution_time_ms:.2f}ms)\n", file=self.out)
 
         except Exception as e:
             result = ValidationResult(
                 test_name="Patient References in Conditions", passed=False, errors=[str(e)]
             )
             self.results.append(result)
-            print(f"  ✗ Failed: {e}\n")
+            print(f"  ✗ Failed: {e}\n", file=self.out)
 
     async def _validate_patient_references_in_observations(self):
         """Validate that all observation.patient_id values exist in patient_demographics"""
-        print("Test 2: Validating patient references in observation_labs...")
+        print("Test 2: Validating patient references in observation_labs...", file=self.out)
 
         start_time = asyncio.get_event_loop().time()
 
@@ -323,18 +325,18 @@ class ReferentialIntegrityValidator:
             )
 
             self.results.append(result)
-            print(f"  ✓ Completed ({execution_time_ms:.2f}ms)\n")
+            print(f"  ✓ Completed ({execution_time_ms:.2f}ms)\n", file=self.out)
 
         except Exception as e:
             result = ValidationResult(
                 test_name="Patient References in Observations", passed=False, errors=[str(e)]
             )
             self.results.append(result)
-            print(f"  ✗ Failed: {e}\n")
+            print(f"  ✗ Failed: {e}\n", file=self.out)
 
     async def _validate_reference_format_consistency(self):
         """Validate that all FHIR references follow correct format"""
-        print("Test 3: Validating FHIR reference format consistency...")
+        print("Test 3: Validating FHIR reference format consistency...", file=self.out)
 
         start_time = asyncio.get_event_loop().time()
 
@@ -385,18 +387,21 @@ class ReferentialIntegrityValidator:
             )
 
             self.results.append(result)
-            print(f"  ✓ Completed ({execution_time_ms:.2f}ms)\n")
+            print(f"  ✓ Completed ({execution_time_ms:.2f}ms)\n", file=self.out)
 
         except Exception as e:
             result = ValidationResult(
                 test_name="FHIR Reference Format Consistency", passed=False, errors=[str(e)]
             )
             self.results.append(result)
-            print(f"  ✗ Failed: {e}\n")
+            print(f"  ✗ Failed: {e}\n", file=self.out)
 
     async def _validate_dual_column_consistency(self):
         """Validate that patient_id matches extracted ID from patient_ref"""
-        print("Test 4: Validating dual column consistency (patient_ref vs patient_id)...")
+        print(
+            "Test 4: Validating dual column consistency (patient_ref vs patient_id)...",
+            file=self.out,
+        )
 
         start_time = asyncio.get_event_loop().time()
 
@@ -453,18 +458,18 @@ class ReferentialIntegrityValidator:
             )
 
             self.results.append(result)
-            print(f"  ✓ Completed ({execution_time_ms:.2f}ms)\n")
+            print(f"  ✓ Completed ({execution_time_ms:.2f}ms)\n", file=self.out)
 
         except Exception as e:
             result = ValidationResult(
                 test_name="Dual Column Consistency", passed=False, errors=[str(e)]
             )
             self.results.append(result)
-            print(f"  ✗ Failed: {e}\n")
+            print(f"  ✗ Failed: {e}\n", file=self.out)
 
     async def _validate_join_performance(self):
         """Validate that JOINs execute efficiently"""
-        print("Test 5: Validating JOIN performance...")
+        print("Test 5: Validating JOIN performance...", file=self.out)
 
         start_time = asyncio.get_event_loop().time()
 
@@ -501,16 +506,16 @@ class ReferentialIntegrityValidator:
             )
 
             self.results.append(result_obj)
-            print(f"  ✓ Completed (JOIN time: {join_time_ms:.2f}ms)\n")
+            print(f"  ✓ Completed (JOIN time: {join_time_ms:.2f}ms)\n", file=self.out)
 
         except Exception as e:
             result = ValidationResult(test_name="JOIN Performance", passed=False, errors=[str(e)])
             self.results.append(result)
-            print(f"  ✗ Failed: {e}\n")
+            print(f"  ✗ Failed: {e}\n", file=self.out)
 
     async def _validate_cardinality(self):
         """Validate relationship cardinality (1:N for Patient → Conditions)"""
-        print("Test 6: Validating relationship cardinality...")
+        print("Test 6: Validating relationship cardinality...", file=self.out)
 
         start_time = asyncio.get_event_loop().time()
 
@@ -562,14 +567,14 @@ class ReferentialIntegrityValidator:
             )
 
             self.results.append(result)
-            print(f"  ✓ Completed ({execution_time_ms:.2f}ms)\n")
+            print(f"  ✓ Completed ({execution_time_ms:.2f}ms)\n", file=self.out)
 
         except Exception as e:
             result = ValidationResult(
                 test_name="Relationship Cardinality", passed=False, errors=[str(e)]
             )
             self.results.append(result)
-            print(f"  ✗ Failed: {e}\n")
+            print(f"  ✗ Failed: {e}\n", file=self.out)
 
     async def _check_view_exists(self, view_name: str) -> bool:
         """Check if materialized view exists"""
@@ -28,6 +28,9 @@ from app.agents.phenotype_agent import PhenotypeValidationAgent
 def phenotype_agent():
     """Create PhenotypeValidationAgent with mock dependencies"""
     agent = PhenotypeValidationAgent(database_url="sqlite+aiosqlite:///:memory:")
+    # Keep the cross-phase cohort cache off any real Redis
+    agent.redis_client = AsyncMock()
+    agent.redis_client.get_cohort_patient_ids.return_value = None
     return agent
 
 
@@ -469,6 +472,350 @@ async def test_complex_criteria_sql_generation(phenotype_agent):
         print("✅ Complex criteria SQL generation validated")
 
 
+# ============================================================================
+# Test: FHIR Search Pushdown
+# ============================================================================
+
+
+def _requirements_with(*concepts):
+    return {"inclusion_criteria": [{"description": "c", "concepts": list(concepts)}]}
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_fhir_search_params_push_age_range_into_birthdate(phenotype_agent):
+    """Age range becomes an inclusive birthdate window evaluated by the FHIR server"""
+    reqs = _requirements_with(
+        {"term": "female", "type": "demographic", "details": ""},
+        {"term": "age", "type": "demographic", "details": "between 20 and 30"},
+    )
+
+    params = phenotype_agent._build_fhir_search_params_from_requirements(
+        reqs, today=datetime(2026, 6, 15).date()
+    )
+
+    assert params["gender"] == "female"
+    assert params["birthdate"] == ["le2006-06-15", "gt1995-06-15"]
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_fhir_search_params_over_and_under(phenotype_agent):
+    """'over N' means age >= N+1; 'under N' means born after today minus N years"""
+    today = datetime(2024, 2, 29).date()
+
+    over = phenotype_agent._build_fhir_search_params_from_requirements(
+        _requirements_with({"term": "age", "type": "demographic", "details": "over 18"}), today
+    )
+    under = phenotype_agent._build_fhir_search_params_from_requirements(
+        _requirements_with({"term": "age", "type": "demographic", "details": "under 5"}), today
+    )
+
+    assert over["birthdate"] == ["le2005-02-28"]
+    assert under["birthdate"] == ["gt2019-02-28"]
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_fhir_search_params_chain_conditions_and_observations(phenotype_agent):
+    """Coded concepts become _has chains; uncoded ones fall back to :text"""
+    reqs = _requirements_with(
+        {
+            "term": "diabetes",
+            "type": "condition",
+            "codes": [{"system": "http://snomed.info/sct", "code": "44054006"}],
+        },
+        {"term": "HbA1c", "type": "observation"},
+    )
+
+    params = phenotype_agent._build_fhir_search_params_from_requirements(reqs)
+
+    assert params["_has:Condition:patient:code"] == ["http://snomed.info/sct|44054006"]
+    assert params["_has:Observation:patient:code:text"] == ["HbA1c"]
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_runner_search_params_stay_runner_agnostic(phenotype_agent):
+    """HybridRunner params must not carry FHIR-only syntax into MV WHERE clauses"""
+    reqs = _requirements_with(
+        {"term": "male", "type": "demographic", "details": ""},
+        {"term": "age", "type": "demographic", "details": "> 18"},
+        {"term": "diabetes", "type": "condition"},
+    )
+
+    assert phenotype_agent._build_search_params_from_requirements(reqs) == {"gender": "male"}
+
+
+# ============================================================================
+# Test: Concurrent FHIR Fan-out
+# ============================================================================
+
+
+class _RecordingRunner:
+    """InMemoryRunner stand-in that tracks peak concurrency per execute call"""
+
+    def __init__(self, rows_by_code):
+        self.rows_by_code = rows_by_code
+        self.calls = []
+        self.rows_yielded = 0
+        self.counted = False
+        self.in_flight = 0
+        self.peak = 0
+
+    async def execute(self, view_definition, search_params=None, max_resources=None):
+        import asyncio
+
+        self.calls.append((view_definition.get("name"), search_params))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        code = (search_params.get("_has:Condition:patient:code") or ["*"])[0]
+        return self.rows_by_code.get(code, [])
+
+    async def execute_stream(self, view_definition, search_params=None, max_resources=None):
+        for row in await self.execute(view_definition, search_params, max_resources):
+            self.rows_yielded += 1
+            yield row
+
+    async def count(self, view_definition, search_params=None, max_resources=None):
+        self.counted = True
+        rows = await self.execute(view_definition, search_params, max_resources)
+        return len({row["id"] for row in rows})
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_shard_search_params_splits_single_or_list(phenotype_agent):
+    """Only a single-valued OR list is split; AND-ed repeats stay together"""
+    params = {"gender": "female", "_has:Condition:patient:code": ["a,b"]}
+    assert phenotype_agent._shard_search_params(params) == [
+        {"gender": "female", "_has:Condition:patient:code": ["a"]},
+        {"gender": "female", "_has:Condition:patient:code": ["b"]},
+    ]
+
+    anded = {"_has:Condition:patient:code": ["a,b", "c"]}
+    assert phenotype_agent._shard_search_params(anded) == [anded]
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_estimate_with_view_definitions_unions_concurrent_shards(phenotype_agent):
+    """Per-code shards run concurrently and overlapping patients count once"""
+    runner = _RecordingRunner(
+        {"a": [{"id": "p1"}, {"id": "p2"}], "b": [{"id": "p2"}, {"id": "p3"}]}
+    )
+    reqs = _requirements_with({"type": "condition", "term": "x", "codes": ["a", "b"]})
+    client = AsyncMock()
+
+    with (
+        patch("app.agents.phenotype_agent.create_fhir_client", AsyncMock(return_value=client)),
+        patch("app.agents.phenotype_agent.InMemoryRunner", return_value=runner),
+    ):
+        count = await phenotype_agent._estimate_cohort_size_with_view_definitions(reqs)
+
+    assert count == 3
+    assert len(runner.calls) == 2
+    assert runner.peak == 2
+    client.close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_estimate_counts_patient_demographics_rows_by_resource_id(phenotype_agent):
+    """forEach rows carry no id, so they must not add a None "patient" to the cohort"""
+    from app.sql_on_fhir.runner.in_memory_runner import InMemoryRunner
+
+    patients = {
+        "a": [
+            {"resourceType": "Patient", "id": "p1", "name": [{"use": "official", "family": "A"}]},
+            {"resourceType": "Patient", "id": "p2"},
+        ],
+        "b": [{"resourceType": "Patient", "id": "p2"}],
+    }
+
+    class Client:
+        async def search_pages(self, resource_type, params=None, max_results=None):
+            yield patients[params["_has:Condition:patient:code"][0]]
+
+    runner = InMemoryRunner(Client(), parallel_processing=False)
+    reqs = _requirements_with({"type": "condition", "term": "x", "codes": ["a", "b"]})
+    phenotype_agent._store_cohort_patient_ids = AsyncMock()
+
+    with (
+        patch("app.agents.phenotype_agent.create_fhir_client", AsyncMock(return_value=Client())),
+        patch("app.agents.phenotype_agent.InMemoryRunner", return_value=runner),
+    ):
+        count = await phenotype_agent._estimate_cohort_size_with_view_definitions(reqs)
+
+    stored = phenotype_agent._store_cohort_patient_ids.await_args.args[1]
+    assert count == 2
+    assert stored == {"p1", "p2"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_estimate_stops_streaming_past_count_limit(phenotype_agent):
+    """A count limit ends the scan early and the lower-bound result is not cached"""
+    runner = _RecordingRunner({"*": [{"id": f"p{i}"} for i in range(100)]})
+    reqs = _requirements_with({"term": "male", "type": "demographic"})
+
+    with (
+        patch("app.agents.phenotype_agent.create_fhir_client", AsyncMock(return_value=AsyncMock())),
+        patch("app.agents.phenotype_agent.InMemoryRunner", return_value=runner),
+    ):
+        count = await phenotype_agent._estimate_cohort_size_with_view_definitions(
+            reqs, count_limit=10
+        )
+
+    assert count == 11
+    assert runner.rows_yielded == 12
+    assert phenotype_agent._cohort_estimate_cache == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_execute_view_definitions_scopes_params_per_resource(phenotype_agent):
+    """Non-Patient views get patient-chained params and no _has reverse chains"""
+    runner = _RecordingRunner({"*": [{"id": "r1"}]})
+    reqs = _requirements_with(
+        {"term": "female", "type": "demographic"},
+        {"term": "diabetes", "type": "condition"},
+    )
+
+    with (
+        patch("app.agents.phenotype_agent.create_fhir_client", AsyncMock(return_value=AsyncMock())),
+        patch("app.agents.phenotype_agent.InMemoryRunner", return_value=runner),
+    ):
+        results = await phenotype_agent.execute_view_definitions_for_phenotype(
+            ["patient_demographics", "condition_diagnoses"], reqs
+        )
+
+    assert set(results) == {"patient_demographics", "condition_diagnoses"}
+    params = dict(runner.calls)
+    assert params["patient_demographics"]["_has:Condition:patient:code:text"] == ["diabetes"]
+    assert params["condition_diagnoses"] == {"patient.gender": "female"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_fhir_client_is_pooled_across_calls(phenotype_agent):
+    """One FHIR client is created for the agent's lifetime and closed only by close()"""
+    runner = _RecordingRunner({"*": [{"id": "p1"}]})
+    client = AsyncMock()
+    factory = AsyncMock(return_value=client)
+    reqs = _requirements_with({"term": "male", "type": "demographic"})
+
+    with (
+        patch("app.agents.phenotype_agent.create_fhir_client", factory),
+        patch("app.agents.phenotype_agent.InMemoryRunner", return_value=runner),
+    ):
+        await phenotype_agent._estimate_cohort_size_with_view_definitions(reqs)
+        await phenotype_agent.execute_view_definition_for_phenotype("patient_simple", reqs)
+
+    factory.assert_awaited_once_with(**PhenotypeValidationAgent.FHIR_POOL_OPTIONS)
+    client.close.assert_not_awaited()
+
+    await phenotype_agent.close()
+    client.close.assert_awaited_once()
+    # The Redis client is shared process-wide; the agent leaves it connected
+    phenotype_agent.redis_client.disconnect.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_identical_concurrent_view_queries_share_one_search(phenotype_agent):
+    """Concurrent identical requests coalesce; different params still run separately"""
+    import asyncio
+
+    runner = _RecordingRunner({"*": [{"id": "p1"}]})
+    male = _requirements_with({"term": "male", "type": "demographic"})
+    female = _requirements_with({"term": "female", "type": "demographic"})
+
+    with (
+        patch("app.agents.phenotype_agent.create_fhir_client", AsyncMock(return_value=AsyncMock())),
+        patch("app.agents.phenotype_agent.InMemoryRunner", return_value=runner),
+    ):
+        results = await asyncio.gather(
+            phenotype_agent.execute_view_definition_for_phenotype("patient_simple", male),
+            phenotype_agent.execute_view_definition_for_phenotype("patient_simple", male),
+            phenotype_agent.execute_view_definition_for_phenotype("patient_simple", female),
+        )
+        await phenotype_agent.execute_view_definition_for_phenotype("patient_simple", male)
+
+    assert results == [[{"id": "p1"}]] * 3
+    assert [params for _, params in runner.calls] == [
+        {"gender": "male"},
+        {"gender": "female"},
+        {"gender": "male"},
+    ]
+    assert phenotype_agent._inflight_view_queries == {}
+
+
+# ============================================================================
+# Test: Cohort Estimate Cache
+# ============================================================================
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_requirements_hash_ignores_key_order(phenotype_agent):
+    """Re-submitted requirements hash identically regardless of dict ordering"""
+    a = {"inclusion_criteria": [], "time_period": {"start": "2024", "end": "2025"}}
+    b = {"time_period": {"end": "2025", "start": "2024"}, "inclusion_criteria": []}
+
+    assert phenotype_agent.requirements_hash(a) == phenotype_agent.requirements_hash(b)
+    assert len(phenotype_agent.requirements_hash(a)) == 32
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_cohort_estimate_cached_by_requirements(phenotype_agent):
+    """Identical requirements reuse the estimate until the cache is cleared"""
+    runner = _RecordingRunner({"*": [{"id": "p1"}, {"id": "p2"}]})
+    reqs = _requirements_with({"term": "female", "type": "demographic"})
+
+    with (
+        patch("app.agents.phenotype_agent.create_fhir_client", AsyncMock(return_value=AsyncMock())),
+        patch("app.agents.phenotype_agent.InMemoryRunner", return_value=runner),
+    ):
+        first = await phenotype_agent._estimate_cohort_size_with_view_definitions(reqs)
+        second = await phenotype_agent._estimate_cohort_size_with_view_definitions(dict(reqs))
+        assert len(runner.calls) == 1
+
+        phenotype_agent.clear_cohort_estimate_cache()
+        await phenotype_agent._estimate_cohort_size_with_view_definitions(reqs)
+
+    assert first == second == 2
+    assert len(runner.calls) == 2
+    assert runner.counted and runner.rows_yielded == 0
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_cohort_estimate_cache_expires_and_evicts(phenotype_agent, monkeypatch):
+    """Expired entries miss; the least recently used entry is evicted when full"""
+    monkeypatch.setattr(PhenotypeValidationAgent, "COHORT_ESTIMATE_CACHE_MAX_ENTRIES", 2)
+    phenotype_agent._put_cached_cohort_estimate("a", 1)
+    phenotype_agent._put_cached_cohort_estimate("b", 2)
+    phenotype_agent._get_cached_cohort_estimate("a")
+    phenotype_agent._put_cached_cohort_estimate("c", 3)
+
+    assert phenotype_agent._get_cached_cohort_estimate("b") is None
+    assert phenotype_agent._get_cached_cohort_estimate("a") == 1
+
+    monkeypatch.setattr(PhenotypeValidationAgent, "COHORT_ESTIMATE_CACHE_TTL_SECONDS", -1)
+    assert phenotype_agent._get_cached_cohort_estimate("c") is None
+
+
 # ============================================================================
 # Summary
 # ============================================================================
@@ -503,3 +850,67 @@ def test_phenotype_agent_coverage_summary():
     print("✅ Addresses Gap #2 (Agent Unit Tests) from TEST_SUITE_ORGANIZATION.md")
     print("=" * 80)
     assert True
+
+
+# ============================================================================
+# Test: Generated Cohort Reuse
+# ============================================================================
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_streamed_estimate_publishes_cohort_ids(phenotype_agent):
+    """Sharded estimates store their distinct patient ids under the requirements hash"""
+    runner = _RecordingRunner({"a": [{"id": "p2"}, {"id": "p1"}], "b": [{"id": "p2"}]})
+    reqs = _requirements_with({"type": "condition", "term": "x", "codes": ["a", "b"]})
+
+    with (
+        patch("app.agents.phenotype_agent.create_fhir_client", AsyncMock(return_value=AsyncMock())),
+        patch("app.agents.phenotype_agent.InMemoryRunner", return_value=runner),
+    ):
+        await phenotype_agent._estimate_cohort_size_with_view_definitions(reqs)
+
+    phenotype_agent.redis_client.set_cohort_patient_ids.assert_awaited_once_with(
+        phenotype_agent.requirements_hash(reqs),
+        ["p1", "p2"],
+        ttl_seconds=PhenotypeValidationAgent.COHORT_IDS_CACHE_TTL_SECONDS,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_generated_cohort_is_reused_and_pinned(phenotype_agent):
+    """A cached cohort answers the estimate and narrows later ViewDefinition searches"""
+    runner = _RecordingRunner({"*": [{"id": "p1"}]})
+    reqs = _requirements_with({"term": "male", "type": "demographic"})
+    phenotype_agent.redis_client.get_cohort_patient_ids.return_value = ["p1", "p7"]
+
+    with (
+        patch("app.agents.phenotype_agent.create_fhir_client", AsyncMock(return_value=AsyncMock())),
+        patch("app.agents.phenotype_agent.InMemoryRunner", return_value=runner),
+    ):
+        count = await phenotype_agent._estimate_cohort_size_with_view_definitions(reqs)
+        await phenotype_agent.execute_view_definitions_for_phenotype(
+            ["patient_simple", "condition_simple"], reqs
+        )
+
+    assert count == 2
+    params = dict(runner.calls)
+    assert params["patient_simple"] == {"gender": "male", "_id": "p1,p7"}
+    assert params["condition_simple"] == {
+        "patient.gender": "male",
+        "patient": "Patient/p1,Patient/p7",
+    }
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_large_or_unknown_cohorts_are_not_pinned(phenotype_agent, monkeypatch):
+    monkeypatch.setattr(PhenotypeValidationAgent, "COHORT_ID_PUSHDOWN_MAX", 2)
+    params = {"gender": "male"}
+
+    assert phenotype_agent._pin_to_cohort(params, "Patient", None) == params
+    assert phenotype_agent._pin_to_cohort(params, "Patient", []) == params
+    assert phenotype_agent._pin_to_cohort(params, "Patient", ["a", "b", "c"]) == params
@@ -0,0 +1,284 @@
+"""
+Test QA Agent - Data Quality Validation
+
+Tests the QualityAssuranceAgent including:
+- Missing-rate calculation
+- Data quality checks on extracted data packages
+"""
+
+import pytest
+
+from app.agents.qa_agent import QualityAssuranceAgent
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+
+@pytest.fixture
+def qa_agent():
+    """Create QualityAssuranceAgent"""
+    return QualityAssuranceAgent()
+
+
+# ============================================================================
+# Test: Missing Rate
+# ============================================================================
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_missing_rate_counts_none_and_empty_strings(qa_agent):
+    """None and '' are missing; 0 and False are real values"""
+    records = [
+        {"patient_id": "p1", "value": None, "unit": ""},
+        {"patient_id": "p2", "value": 0, "unit": "mg"},
+        {"patient_id": "p3", "value": False, "unit": "mg"},
+    ]
+
+    assert qa_agent._calculate_missing_rate(records) == pytest.approx(2 / 9)
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_missing_rate_ignores_keys_absent_from_a_record(qa_agent):
+    """Ragged records only count the fields each record actually has"""
+    records = [{"a": 1, "b": None}, {"a": 2}, {"c": ""}]
+
+    assert qa_agent._calculate_missing_rate(records) == pytest.approx(2 / 4)
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_missing_rate_tolerates_non_string_keys(qa_agent):
+    """Integer keys are counted as fields and never treated as date columns"""
+    records = [{1: None, "date": "2024-01-01"}, {1: "x", "date": ""}]
+
+    assert qa_agent._calculate_missing_rate(records) == pytest.approx(2 / 4)
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_missing_rate_empty_inputs(qa_agent):
+    assert qa_agent._calculate_missing_rate([]) == 0.0
+    assert qa_agent._calculate_missing_rate([{}, {}]) == 0.0
+
+
+# ============================================================================
+# Test: Duplicates
+# ============================================================================
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_check_duplicates_reports_each_repeat_in_order(qa_agent):
+    """Every occurrence after the first is reported, per element"""
+    package = {
+        "data_elements": {
+            "labs": [
+                {"patient_id": "p1", "date": "2024-01-01"},
+                {"patient_id": "p2", "date": "2024-01-01"},
+                {"patient_id": "p1", "date": "2024-01-01"},
+                {"patient_id": "p1", "date": "2024-01-01"},
+            ],
+            "meds": [{"patient_id": "p1", "date": "2024-01-01"}],
+        }
+    }
+
+    duplicates = qa_agent._check_duplicates(package)
+
+    assert duplicates == [
+        {"element": "labs", "fingerprint": "p12024-01-01"},
+        {"element": "labs", "fingerprint": "p12024-01-01"},
+    ]
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_check_duplicates_does_not_collide_on_concatenation(qa_agent):
+    """('1', '23') and ('12', '3') are different records"""
+    package = {
+        "data_elements": {
+            "labs": [
+                {"patient_id": "1", "date": "23"},
+                {"patient_id": "12", "date": "3"},
+                {"patient_id": "p", "date": {"nested": True}},
+            ]
+        }
+    }
+
+    assert qa_agent._check_duplicates(package) == []
+
+
+# ============================================================================
+# Test: De-identification
+# ============================================================================
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.deidentification
+async def test_deidentification_passes_when_prohibited_fields_empty(qa_agent):
+    """Prohibited keys holding falsy values are not PHI leaks"""
+    package = {
+        "data_elements": {
+            "demographics": [
+                {"patient_id": "p1", "ssn": None, "phone": "", "mrn": 0, "address": []},
+                {"patient_id": "p2", "notes": {"ssn": ""}},
+            ]
+        }
+    }
+
+    result = await qa_agent._validate_deidentification(package, "de-identified")
+
+    assert result["passed"] is True
+    assert result["issues"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.deidentification
+async def test_deidentification_flags_one_issue_per_leaking_record(qa_agent):
+    """The first prohibited field per record is reported; levels differ in scope"""
+    package = {
+        "data_elements": {
+            "demographics": [
+                {"patient_id": "p1", "mrn": "MRN-1", "ssn": "123-45-6789"},
+                {"patient_id": "p2", "mrn": "MRN-2"},
+            ]
+        }
+    }
+
+    deid = await qa_agent._validate_deidentification(package, "de-identified")
+    limited = await qa_agent._validate_deidentification(package, "limited_dataset")
+
+    assert [i["field"] for i in deid["issues"]] == ["ssn", "mrn"]
+    assert deid["passed"] is False
+    assert [i["field"] for i in limited["issues"]] == ["ssn"]
+
+
+# ============================================================================
+# Test: Fused Data Quality Check
+# ============================================================================
+
+
+@pytest.mark.agents
+@pytest.mark.unit
+def test_profile_records_flags_future_and_implausible_dates(qa_agent):
+    """Only date-named fields are checked; unparseable values are ignored"""
+    from datetime import date
+
+    records = [
+        {"patient_id": "p1", "date": "2030-01-01", "birth_date": "1850-06-01"},
+        {"patient_id": "p2", "date": "2024-01-01T10:00:00Z", "onset_date": "not a date"},
+        {"patient_id": "p3", "note": "2099-01-01", "date": date(1899, 12, 31)},
+    ]
+
+    profile = qa_agent._profile_records(records, today=date(2025, 1, 1))
+
+    assert profile["future_dates"] == 1
+    assert profile["implausible_dates"] == 2
+    assert profile["repeat_indices"].tolist() == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_check_data_quality_walks_each_element_once(qa_agent, monkeypatch):
+    """Missing rate, duplicates and dates all come from one profile per element"""
+    package = {
+        "data_elements": {
+            "labs": [
+                {"patient_id": "p1", "date": "2024-01-01", "value": None},
+                {"patient_id": "p1", "date": "2024-01-01", "value": None},
+                {"patient_id": "p2", "date": "3024-01-01", "value": ""},
+            ],
+            "empty": [],
+        }
+    }
+    calls = []
+    profile = qa_agent._profile_records
+    monkeypatch.setattr(qa_agent, "_profile_records", lambda r: calls.append(r) or profile(r))
+
+    result = await qa_agent._check_data_quality(package)
+
+    assert len(calls) == 1
+    assert [i["issue"] for i in result["issues"]] == [
+        "high_missing_rate",
+        "duplicate_records",
+        "future_dates",
+    ]
+    assert result["issues"][1]["count"] == 1
+    assert result["passed"] is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_check_data_quality_counts_all_duplicates_but_lists_ten(qa_agent):
+    """The duplicate count is exact; only the first few repeats are materialized"""
+    row = {"patient_id": "p1", "date": "2024-01-01"}
+    package = {"data_elements": {"labs": [dict(row) for _ in range(8)], "vitals": [row] * 6}}
+
+    result = await qa_agent._check_data_quality(package)
+
+    (duplicates,) = [i for i in result["issues"] if i["issue"] == "duplicate_records"]
+    assert duplicates["count"] == 12
+    assert [d["element"] for d in duplicates["details"]] == ["labs"] * 7 + ["vitals"] * 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.deidentification
+async def test_deidentification_scans_past_the_first_hundred_records(qa_agent, monkeypatch):
+    """A leak deep in the element is found; a fully leaking element stops early"""
+    monkeypatch.setattr(qa_agent, "DEIDENTIFICATION_SCAN_CHUNK", 50)
+    clean = [{"patient_id": f"p{i}", "ssn": None} for i in range(500)]
+    package = {
+        "data_elements": {
+            "labs": clean + [{"patient_id": "leak", "ssn": "123-45-6789"}],
+            "notes": [{"patient_id": f"p{i}", "mrn": f"M{i}"} for i in range(1000)],
+        }
+    }
+
+    result = await qa_agent._validate_deidentification(package, "de-identified")
+
+    by_element = [i["element"] for i in result["issues"]]
+    assert by_element.count("labs") == 1
+    assert by_element.count("notes") == qa_agent.DEIDENTIFICATION_ISSUES_PER_ELEMENT
+    assert result["passed"] is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_check_completeness_reports_missing_elements_sorted(qa_agent):
+    package = {"data_elements": {"labs": [], "meds": [{"id": 1}]}}
+    requirements = {"data_elements": ["vitals", "labs", "notes", "labs"]}
+
+    result = await qa_agent._check_completeness(package, requirements)
+
+    assert result["passed"] is False
+    assert result["details"] == {
+        "requested_count": 3,
+        "extracted_count": 2,
+        "missing_elements": ["notes", "vitals"],
+    }
+    assert (await qa_agent._check_completeness(package, {"data_elements": None}))["passed"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.agents
+@pytest.mark.unit
+async def test_cohort_characteristics_use_recorded_cohort_size(qa_agent):
+    """metadata.cohort_size is trusted over measuring the cohort list"""
+    requirements = {"feasibility_report": {"estimated_cohort_size": 100}}
+
+    counted = await qa_agent._validate_cohort_characteristics(
+        {"cohort": [], "metadata": {"cohort_size": 95}}, requirements
+    )
+    measured = await qa_agent._validate_cohort_characteristics({"cohort": [1] * 50}, requirements)
+
+    assert counted["details"]["actual_size"] == 95 and counted["passed"]
+    assert measured["details"]["actual_size"] == 50 and not measured["passed"]
@@ -0,0 +1,338 @@
+"""
+Test Requirements Agent - Criteria Structuring
+
+Tests RequirementsAgent's conversion of natural-language criteria into
+structured criteria, including the per-criterion fallback used when batch
+concept extraction fails.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.agents.requirements_agent import RequirementsAgent
+
+
+@pytest.fixture
+def requirements_agent():
+    """Create RequirementsAgent with a mock LLM client"""
+    agent = RequirementsAgent()
+    agent.llm_client = Mock()
+    agent.llm_client.extract_medical_concepts_batch = AsyncMock(
+        side_effect=RuntimeError("batch failed")
+    )
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_fallback_extraction_overlaps_calls_within_limit(requirements_agent):
+    """Per-criterion fallback runs concurrently, bounded, and keeps input order"""
+    in_flight = 0
+    peak = 0
+
+    async def extract(criterion):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if criterion == "c3":
+            raise ValueError("unparseable")
+        return {"concepts": [{"term": criterion}]}
+
+    requirements_agent.llm_client.extract_medical_concepts = extract
+    criteria = [f"c{i}" for i in range(20)]
+
+    structured = await requirements_agent._criteria_to_structured(criteria)
+
+    assert [c["description"] for c in structured] == criteria
+    assert structured[0]["concepts"] == [{"term": "c0"}]
+    assert structured[3] == {"description": "c3", "concepts": [], "codes": []}
+    assert 1 < peak <= RequirementsAgent.CONCEPT_EXTRACTION_CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_inclusion_and_exclusion_are_structured_concurrently(requirements_agent):
+    """Both criteria lists are in flight at once; empty lists make no LLM call"""
+    started = asyncio.Event()
+    calls = []
+
+    async def batch(criteria):
+        calls.append(criteria)
+        if len(calls) == 1:
+            await asyncio.wait_for(started.wait(), timeout=1)
+        else:
+            started.set()
+        return [{"concepts": []} for _ in criteria]
+
+    requirements_agent.llm_client.extract_medical_concepts_batch = batch
+
+    structured = await requirements_agent._validate_and_structure_requirements(
+        {"inclusion_criteria": ["diabetes"], "exclusion_criteria": ["pregnant"]}
+    )
+
+    assert structured["inclusion_criteria"][0]["description"] == "diabetes"
+    assert structured["exclusion_criteria"][0]["description"] == "pregnant"
+
+    calls.clear()
+    structured = await requirements_agent._validate_and_structure_requirements(
+        {"inclusion_criteria": [], "exclusion_criteria": None}
+    )
+    assert calls == []
+    assert structured["inclusion_criteria"] == []
+    assert structured["exclusion_criteria"] is None
+
+
+def test_history_window_keeps_initial_request_and_stepped_tail():
+    """Short conversations pass through; long ones keep the initial request and a tail
+    whose start only moves in whole windows, so consecutive prompts share a prefix"""
+    window = RequirementsAgent.HISTORY_WINDOW_TURNS
+    history = [{"role": "user", "content": f"turn {i}"} for i in range(40)]
+
+    assert RequirementsAgent._history_window(history[: 2 * window]) == history[: 2 * window]
+
+    previous = None
+    for length in range(2 * window + 1, 40):
+        sent = RequirementsAgent._history_window(history[:length])
+        tail = sent[2:]
+
+        assert sent[0] == history[0]
+        assert sent[1]["role"] == "system"
+        assert window <= len(tail) < 2 * window
+        assert tail[-1] == history[length - 1]
+        if previous is not None and previous[1] == sent[1]:
+            assert sent[: len(previous)] == previous
+        previous = sent
+
+
+def _analysis(requirements, ready=False):
+    return {
+        "extracted_requirements": requirements,
+        "missing_fields": ["irb_number"],
+        "next_question": "What is your IRB number?",
+        "completeness_score": 0.5,
+        "ready_for_submission": ready,
+    }
+
+
+@pytest.mark.asyncio
+async def test_follow_up_replies_are_applied_as_delta(requirements_agent):
+    """Only the newest reply goes to the LLM; the patch merges into state"""
+    llm = requirements_agent.llm_client
+    llm.extract_requirements = AsyncMock(
+        return_value=_analysis({"inclusion_criteria": ["diabetes"], "irb_number": None})
+    )
+    first = await requirements_agent._gather_requirements(
+        {"request_id": "r1", "initial_request": "diabetic patients"}
+    )
+
+    llm.extract_requirements_delta = AsyncMock(
+        return_value={
+            **_analysis({"inclusion_criteria": ["age >= 18"], "irb_number": "IRB-1"}),
+            "confidence": 0.9,
+        }
+    )
+    second = await requirements_agent._gather_requirements(
+        {
+            "request_id": "r1",
+            "conversation_history": first["conversation_history"],
+            "user_response": "IRB-1, adults only",
+        }
+    )
+
+    llm.extract_requirements.assert_awaited_once()
+    args = llm.extract_requirements_delta.await_args
+    assert args.args[0] == "IRB-1, adults only"
+    assert args.kwargs["last_question"] == "What is your IRB number?"
+    assert second["current_requirements"] == {
+        "inclusion_criteria": ["diabetes", "age >= 18"],
+        "irb_number": "IRB-1",
+    }
+
+
+@pytest.mark.asyncio
+async def test_low_confidence_delta_falls_back_to_full_extraction(requirements_agent):
+    llm = requirements_agent.llm_client
+    llm.extract_requirements = AsyncMock(return_value=_analysis({"inclusion_criteria": ["x"]}))
+    first = await requirements_agent._gather_requirements(
+        {"request_id": "r2", "initial_request": "x"}
+    )
+    llm.extract_requirements_delta = AsyncMock(
+        return_value={**_analysis({"inclusion_criteria": ["y"]}), "confidence": 0.2}
+    )
+
+    await requirements_agent._gather_requirements(
+        {
+            "request_id": "r2",
+            "conversation_history": first["conversation_history"],
+            "user_response": "replace x with y",
+        }
+    )
+
+    assert llm.extract_requirements.await_count == 2
+
+
+def test_merge_requirements_patch():
+    merged = RequirementsAgent._merge_requirements_patch(
+        {"data_elements": ["Labs"], "time_period": {"start": "2020-01-01", "end": None}},
+        {
+            "data_elements": ["Labs", "Medications"],
+            "time_period": {"start": None, "end": "2024-12-31"},
+            "phi_level": "de-identified",
+            "irb_number": None,
+        },
+    )
+
+    assert merged == {
+        "data_elements": ["Labs", "Medications"],
+        "time_period": {"start": "2020-01-01", "end": "2024-12-31"},
+        "phi_level": "de-identified",
+    }
+
+
+@pytest.mark.asyncio
+async def test_conversation_state_is_dropped_on_completion_and_bounded(
+    requirements_agent, monkeypatch
+):
+    llm = requirements_agent.llm_client
+    llm.extract_requirements = AsyncMock(return_value=_analysis({"inclusion_criteria": []}))
+    monkeypatch.setattr(RequirementsAgent, "CONVERSATION_STATE_MAX_ENTRIES", 2)
+
+    for request_id in ("a", "b", "c"):
+        await requirements_agent._gather_requirements(
+            {"request_id": request_id, "initial_request": "x"}
+        )
+    assert list(requirements_agent.conversation_state) == ["b", "c"]
+
+    monkeypatch.setattr(RequirementsAgent, "CONVERSATION_STATE_TTL_SECONDS", -1)
+    llm.extract_requirements.return_value = _analysis({"inclusion_criteria": []}, ready=True)
+    requirements_agent._validate_and_structure_requirements = AsyncMock(return_value={})
+    requirements_agent._save_requirements = AsyncMock()
+
+    result = await requirements_agent._gather_requirements(
+        {"request_id": "d", "initial_request": "x"}
+    )
+
+    assert result["requirements_complete"] is True
+    assert dict(requirements_agent.conversation_state) == {}
+
+
+@pytest.mark.asyncio
+async def test_evicted_conversation_resumes_from_caller_history(requirements_agent):
+    """A turn whose state was evicted keeps its history instead of restarting"""
+    llm = requirements_agent.llm_client
+    llm.extract_requirements = AsyncMock(return_value=_analysis({"inclusion_criteria": ["x"]}))
+    llm.extract_requirements_delta = AsyncMock(
+        return_value={**_analysis({"irb_number": "IRB-1"}), "confidence": 0.9}
+    )
+    history = [{"role": "user", "content": "diabetic patients"}]
+    for turn in range(20):
+        history += [
+            {"role": "assistant", "content": f"question {turn}"},
+            {"role": "user", "content": f"answer {turn}"},
+        ]
+    history.append({"role": "assistant", "content": "What is your IRB number?"})
+
+    # No requirements echoed back: a full extraction over the whole history
+    result = await requirements_agent._gather_requirements(
+        {"request_id": "r6", "conversation_history": history, "user_response": "IRB-1"}
+    )
+
+    sent = llm.extract_requirements.await_args.kwargs["conversation_history"]
+    contents = [message["content"] for message in history] + ["IRB-1"]
+    assert [message["content"] for message in sent[: len(contents)]] == contents
+    assert result["conversation_history"][: len(history)] == history
+    llm.extract_requirements_delta.assert_not_awaited()
+
+    # Requirements echoed back: the reply is applied as a delta on top of them
+    requirements_agent.conversation_state.clear()
+    result = await requirements_agent._gather_requirements(
+        {
+            "request_id": "r6",
+            "conversation_history": history,
+            "user_response": "IRB-1",
+            "current_requirements": {"inclusion_criteria": ["diabetes"]},
+        }
+    )
+
+    args = llm.extract_requirements_delta.await_args
+    assert args.kwargs["last_question"] == "What is your IRB number?"
+    assert result["current_requirements"]["inclusion_criteria"] == ["diabetes"]
+    assert result["current_requirements"]["irb_number"] == "IRB-1"
+    assert llm.extract_requirements.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_turns_without_new_text_skip_the_llm(requirements_agent):
+    """An empty reply re-asks the last question; an empty request asks the first one"""
+    llm = requirements_agent.llm_client
+    llm.extract_requirements = AsyncMock(return_value=_analysis({"inclusion_criteria": ["x"]}))
+    llm.extract_requirements_delta = AsyncMock()
+    first = await requirements_agent._gather_requirements(
+        {"request_id": "r3", "initial_request": "diabetic patients"}
+    )
+
+    repeat = await requirements_agent._gather_requirements(
+        {
+            "request_id": "r3",
+            "conversation_history": first["conversation_history"],
+            "user_response": "   ",
+        }
+    )
+    blank = await requirements_agent._gather_requirements(
+        {"request_id": "r4", "initial_request": ""}
+    )
+
+    llm.extract_requirements.assert_awaited_once()
+    llm.extract_requirements_delta.assert_not_awaited()
+    assert repeat["next_question"] == first["next_question"]
+    assert repeat["current_requirements"] == {"inclusion_criteria": ["x"]}
+    assert [turn["role"] for turn in repeat["conversation_history"]] == ["user"] + ["assistant"] * 2
+    assert blank["next_question"] == RequirementsAgent.FIRST_QUESTION
+    assert blank["completeness_score"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_messages_in_one_turn_share_a_timestamp(requirements_agent):
+    llm = requirements_agent.llm_client
+    llm.extract_requirements = AsyncMock(return_value=_analysis({"inclusion_criteria": []}))
+
+    result = await requirements_agent._gather_requirements(
+        {"request_id": "r5", "initial_request": "diabetic patients"}
+    )
+
+    user, assistant = result["conversation_history"]
+    assert user["timestamp"] == assistant["timestamp"]
+
+
+@pytest.mark.asyncio
+async def test_repeated_turns_are_answered_from_the_extraction_cache(monkeypatch):
+    """Turn timestamps differ between retries but do not defeat the LLM cache"""
+    from app.utils.llm_client import LLMClient
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    agent = RequirementsAgent()
+    agent.llm_client = LLMClient()
+    agent.llm_client.extract_structured_json = AsyncMock(
+        return_value=_analysis({"inclusion_criteria": ["diabetes"]})
+    )
+    calls = agent.llm_client.extract_structured_json
+
+    first = await agent._gather_requirements(
+        {"request_id": "r7", "initial_request": "diabetic patients"}
+    )
+    await agent._gather_requirements({"request_id": "r8", "initial_request": "diabetic patients"})
+    assert calls.await_count == 1
+
+    # A resumed turn (no state, no echoed requirements) retried after a reload
+    for _ in range(2):
+        agent.conversation_state.clear()
+        await agent._gather_requirements(
+            {
+                "request_id": "r7",
+                "conversation_history": first["conversation_history"],
+                "user_response": "IRB-1",
+            }
+        )
+    assert calls.await_count == 2
@@ -0,0 +1,92 @@
+"""
+Tests for InMemoryRunner's FHIRPath handling.
+
+Pins that each FHIRPath expression in a ViewDefinition is parsed once and
+reused across resources (and across runner instances), and that compiled
+evaluation produces the same rows as before.
+"""
+
+import pytest
+
+from app.sql_on_fhir.runner.in_memory_runner import InMemoryRunner, compile_fhirpath
+
+VIEW_DEF = {
+    "resourceType": "ViewDefinition",
+    "name": "patient_names",
+    "resource": "Patient",
+    "where": [{"path": "active = true"}],
+    "select": [
+        {"column": [{"name": "id", "path": "id"}, {"name": "gender", "path": "gender"}]},
+        {"forEach": "name", "column": [{"name": "family", "path": "family"}]},
+    ],
+}
+
+PATIENTS = [
+    {"resourceType": "Patient", "id": "p1", "active": True, "gender": "female",
+     "name": [{"family": "Ng"}, {"family": "Lee"}]},
+    {"resourceType": "Patient", "id": "p2", "active": False, "gender": "male",
+     "name": [{"family": "Roe"}]},
+]  # fmt: skip
+
+
+@pytest.fixture(autouse=True)
+def fresh_compile_cache():
+    compile_fhirpath.cache_clear()
+    yield
+    compile_fhirpath.cache_clear()
+
+
+@pytest.mark.unit
+async def test_transform_reuses_compiled_paths_across_resources_and_runners():
+    resources = [dict(PATIENTS[0], id=f"p{i}") for i in range(20)]
+
+    for runner in (InMemoryRunner(None), InMemoryRunner(None)):
+        filtered = runner._apply_where_clauses(resources, VIEW_DEF["where"])
+        await runner._transform_resources_sequential(filtered, VIEW_DEF)
+
+    info = compile_fhirpath.cache_info()
+    assert info.misses == 5  # where, id, gender, forEach name, family
+    assert info.hits > 100
+
+
+@pytest.mark.unit
+async def test_compiled_paths_produce_expected_rows():
+    runner = InMemoryRunner(None, parallel_processing=False)
+
+    filtered = runner._apply_where_clauses(PATIENTS, VIEW_DEF["where"])
+    rows = await runner._transform_resources_sequential(filtered, VIEW_DEF)
+
+    assert rows == [
+        {"id": "p1", "gender": "female"},
+        {"family": "Ng"},
+        {"family": "Lee"},
+    ]
+
+
+@pytest.mark.unit
+async def test_count_pushes_down_without_where_clauses():
+    from unittest.mock import AsyncMock, MagicMock
+
+    client = MagicMock()
+    client.count = AsyncMock(return_value=1234)
+    view_def = dict(VIEW_DEF, where=[])
+
+    assert await InMemoryRunner(client).count(view_def, {"gender": "female"}) == 1234
+    assert await InMemoryRunner(client).count(view_def, max_resources=1000) == 1000
+    client.count.assert_awaited_with("Patient", params=None)
+
+
+@pytest.mark.unit
+async def test_count_filters_pages_locally_with_where_clauses():
+    from unittest.mock import MagicMock
+
+    async def pages(resource_type, params=None, max_results=None):
+        yield PATIENTS
+        yield [dict(PATIENTS[0], id="p3")]
+
+    client = MagicMock()
+    client.search_pages = pages
+    runner = InMemoryRunner(client)
+
+    assert await runner.count(VIEW_DEF) == 2
+    client.count.assert_not_called()
@@ -0,0 +1,52 @@
+"""
+Tests for MaterializedViewRunner streaming.
+
+execute_stream reads the view through HAPIDBClient.stream_query (a
+server-side cursor) instead of materializing it with execute_query, and
+refuses views that have not been created.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.sql_on_fhir.runner.materialized_view_runner import MaterializedViewRunner
+
+VIEW_DEF = {"resourceType": "ViewDefinition", "name": "patient_demographics"}
+
+
+@pytest.fixture
+def db_client():
+    db_client = MagicMock()
+    db_client.execute_query = AsyncMock(return_value=[{"exists": True}])
+    return db_client
+
+
+@pytest.mark.unit
+async def test_execute_stream_reads_view_through_cursor(db_client):
+    seen = []
+
+    async def stream_query(sql):
+        seen.append(sql)
+        for i in range(3):
+            yield {"id": f"p{i}"}
+
+    db_client.stream_query = stream_query
+    runner = MaterializedViewRunner(db_client)
+
+    rows = [row async for row in runner.execute_stream(VIEW_DEF, {"gender": "female"}, 3)]
+
+    assert rows == [{"id": "p0"}, {"id": "p1"}, {"id": "p2"}]
+    assert "FROM sqlonfhir.patient_demographics" in seen[0]
+    assert runner.get_last_executed_sql() == seen[0]
+    assert db_client.execute_query.await_count == 1  # only the existence check
+
+
+@pytest.mark.unit
+async def test_execute_stream_rejects_missing_view(db_client):
+    db_client.execute_query.return_value = [{"exists": False}]
+    runner = MaterializedViewRunner(db_client)
+
+    with pytest.raises(ValueError, match="does not exist"):
+        async for _ in runner.execute_stream(VIEW_DEF):
+            pass
@@ -0,0 +1,114 @@
+"""
+Tests for PostgresRunner's bound-parameter SQL.
+
+Pins that search parameter values and LIMIT are passed to the database as
+$n parameters, so the same ViewDefinition always yields the same SQL text
+(and asyncpg can reuse the prepared statement) whatever the values, and
+that each call reports the SQL it ran through its own info dict.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.sql_on_fhir.runner.postgres_runner import PostgresRunner
+
+VIEW_DEF = {
+    "resourceType": "ViewDefinition",
+    "name": "patient_demographics",
+    "resource": "Patient",
+    "select": [{"column": [{"name": "id", "path": "id"}, {"name": "gender", "path": "gender"}]}],
+}
+
+
+@pytest.fixture
+def db_client():
+    db_client = MagicMock()
+    db_client.execute_query = AsyncMock(return_value=[{"count": 3}])
+    return db_client
+
+
+@pytest.mark.unit
+async def test_execute_binds_search_values_and_reuses_sql_text(db_client):
+    runner = PostgresRunner(db_client, enable_cache=False)
+
+    await runner.execute(VIEW_DEF, {"gender": "female", "birthdate": "ge1990-01-01"}, 10)
+    await runner.execute(VIEW_DEF, {"gender": "male", "birthdate": "ge1975-06-30"}, 50)
+
+    (first_sql, first_params), (second_sql, second_params) = (
+        call.args for call in db_client.execute_query.await_args_list
+    )
+    assert first_sql == second_sql
+    assert "female" not in first_sql and "1990" not in first_sql
+    assert first_params == ["female", "1990-01-01", 10]
+    assert second_params == ["male", "1975-06-30", 50]
+    assert "'birthDate' >= $2" in first_sql
+    assert first_sql.endswith("LIMIT $3")
+
+
+@pytest.mark.unit
+async def test_execute_count_binds_search_values(db_client):
+    runner = PostgresRunner(db_client)
+
+    assert await runner.execute_count(VIEW_DEF, {"_id": "42", "family": "O'Brien"}) == 3
+
+    sql, params = db_client.execute_query.await_args.args
+    assert params == ["42", "O'Brien"]
+    assert "r.res_id = $1::text::bigint" in sql
+    assert "name_elem->>'family' = $2" in sql
+
+
+@pytest.mark.unit
+async def test_execute_stream_reads_rows_through_cursor(db_client):
+    seen = []
+
+    async def stream_query(sql, params):
+        seen.append((sql, params))
+        for i in range(3):
+            yield {"id": f"p{i}"}
+
+    db_client.stream_query = stream_query
+    runner = PostgresRunner(db_client)
+
+    rows = [row async for row in runner.execute_stream(VIEW_DEF, {"gender": "female"}, 3)]
+
+    assert rows == [{"id": "p0"}, {"id": "p1"}, {"id": "p2"}]
+    assert seen[0][1] == ["female", 3]
+    assert runner.get_last_executed_sql() == seen[0][0]
+    db_client.execute_query.assert_not_awaited()
+
+
+@pytest.mark.unit
+async def test_execute_wraps_query_with_bound_row_filters(db_client):
+    runner = PostgresRunner(db_client)
+    filters = [
+        {"field": "gender", "value": "female", "operator": "eq"},
+        {"field": "id", "value": "5_%", "operator": "contains"},
+    ]
+
+    await runner.execute(VIEW_DEF, {"gender": "female"}, 10, filters=filters)
+    await runner.execute(VIEW_DEF, {"gender": "female"}, 10)
+
+    (filtered_sql, filtered_params), (plain_sql, _) = (
+        call.args for call in db_client.execute_query.await_args_list
+    )
+    assert filtered_sql.startswith("SELECT * FROM (\n" + plain_sql + "\n) AS filtered")
+    assert filtered_sql.endswith(
+        "WHERE filtered.\"gender\" = $3 AND filtered.\"id\"::text ILIKE '%' || $4 || '%'"
+    )
+    assert filtered_params == ["female", 10, "female", r"5\_\%"]
+
+
+@pytest.mark.unit
+async def test_info_reports_each_calls_sql_including_cache_hits_and_counts(db_client):
+    runner = PostgresRunner(db_client)
+
+    first, cached, counted = {}, {}, {}
+    await runner.execute(VIEW_DEF, {"gender": "female"}, 10, info=first)
+    await runner.execute(VIEW_DEF, {"gender": "female"}, 10, info=cached)
+    await runner.execute_count(VIEW_DEF, {"gender": "female"}, info=counted)
+
+    assert db_client.execute_query.await_count == 2  # the second execute hit the cache
+    assert first["sql"] == cached["sql"] == db_client.execute_query.await_args_list[0].args[0]
+    assert counted["sql"] == db_client.execute_query.await_args.args[0]
+    assert "COUNT" in counted["sql"].upper()
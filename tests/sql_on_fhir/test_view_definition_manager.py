@@ -0,0 +1,83 @@
+"""
+Tests for ViewDefinitionManager caching.
+
+Pins that loads are served from memory, that on-disk edits are picked up
+once the stat TTL lapses, that save/delete invalidate, and that the LRU and
+load_all() snapshot stay bounded.
+"""
+
+import json
+import os
+
+import pytest
+
+from app.sql_on_fhir.view_definition_manager import ViewDefinitionManager
+
+
+def _view(name, resource="Patient"):
+    return {
+        "resourceType": "ViewDefinition",
+        "name": name,
+        "resource": resource,
+        "select": [{"column": [{"name": "id", "path": "id"}]}],
+    }
+
+
+def _write(directory, name, view_def, mtime_ns=None):
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps(view_def))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ViewDefinitionManager(str(tmp_path))
+
+
+@pytest.mark.unit
+def test_load_is_cached_until_file_changes(manager, tmp_path, monkeypatch):
+    _write(tmp_path, "demo", _view("demo"), mtime_ns=1_000_000_000)
+    assert manager.load("demo")["resource"] == "Patient"
+
+    # Edited on disk: hidden while the stat TTL holds, visible once it lapses
+    _write(tmp_path, "demo", _view("demo", "Condition"), mtime_ns=2_000_000_000)
+    assert manager.load("demo")["resource"] == "Patient"
+
+    monkeypatch.setattr(ViewDefinitionManager, "CACHE_STAT_TTL_SECONDS", 0.0)
+    assert manager.load("demo")["resource"] == "Condition"
+
+
+@pytest.mark.unit
+def test_save_and_delete_invalidate_load_all(manager):
+    manager.save(_view("first"))
+    assert list(manager.load_all()) == ["first"]
+
+    manager.save(_view("second"))
+    assert list(manager.load_all()) == ["first", "second"]
+
+    manager.delete("first")
+    assert list(manager.load_all()) == ["second"]
+    with pytest.raises(FileNotFoundError):
+        manager.load("first")
+
+
+@pytest.mark.unit
+def test_load_all_reuses_directory_scan_within_ttl(manager, tmp_path):
+    manager.save(_view("first"))
+    snapshot = manager.load_all()
+
+    _write(tmp_path, "external", _view("external"))
+
+    assert manager.load_all() is snapshot
+
+
+@pytest.mark.unit
+def test_cache_is_bounded(manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(ViewDefinitionManager, "CACHE_MAX_ENTRIES", 2)
+    for name in ("a", "b", "c"):
+        _write(tmp_path, name, _view(name))
+        manager.load(name)
+
+    assert list(manager._cache) == ["b", "c"]
@@ -0,0 +1,304 @@
+"""
+Tests for the analytics router's shared per-process resources.
+
+Mounts only app.api.analytics.router on a bare FastAPI app and swaps the
+ViewDefinitionManager and runner dependencies, so no FHIR server or database
+is needed.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import analytics
+from app.api.analytics import (
+    VIEW_MANAGER,
+    close_analytics_runner,
+    get_runner,
+    get_view_manager,
+    router,
+)
+
+
+@pytest.fixture
+def manager():
+    manager = MagicMock()
+    manager.load_all.return_value = {
+        "patient_demographics": {"resource": "Patient", "title": "Demographics"}
+    }
+    manager.load.side_effect = FileNotFoundError
+    return manager
+
+
+@pytest.fixture
+def runner():
+    runner = MagicMock(spec=["execute", "execute_count", "get_schema"])
+    runner.execute = AsyncMock(return_value=[{"id": "p1"}])
+    runner.get_schema.return_value = {"id": "string"}
+    return runner
+
+
+@pytest.fixture
+def client(manager, runner):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_view_manager] = lambda: manager
+    app.dependency_overrides[get_runner] = lambda: runner
+    return TestClient(app)
+
+
+@pytest.mark.unit
+def test_view_manager_dependency_is_process_wide():
+    assert get_view_manager() is VIEW_MANAGER
+    assert get_view_manager() is get_view_manager()
+
+
+@pytest.mark.unit
+def test_routes_use_injected_view_manager(client, manager):
+    response = client.get("/analytics/view-definitions")
+
+    assert response.status_code == 200
+    assert response.json()["view_definitions"][0]["name"] == "patient_demographics"
+    manager.load_all.assert_called_once()
+
+
+@pytest.mark.unit
+def test_execute_get_forwards_injected_dependencies(client, manager, runner):
+    manager.load.side_effect = None
+    manager.load.return_value = {"resource": "Patient"}
+
+    response = client.get("/analytics/execute/patient_demographics")
+
+    assert response.status_code == 200
+    assert response.json()["rows"] == [{"id": "p1"}]
+    manager.load.assert_called_once_with("patient_demographics")
+    runner.execute.assert_awaited_once()
+
+
+@pytest.mark.unit
+def test_runner_is_built_once_and_reused_across_requests(manager, runner, monkeypatch):
+    cleanup = AsyncMock()
+    create_runner = AsyncMock(return_value=(runner, cleanup))
+    monkeypatch.setattr(analytics, "create_runner", create_runner)
+    manager.load.side_effect = None
+    manager.load.return_value = {"resource": "Patient"}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_view_manager] = lambda: manager
+    client = TestClient(app)
+
+    for _ in range(3):
+        assert client.get("/analytics/schema/patient_demographics").status_code == 200
+
+    create_runner.assert_awaited_once()
+    cleanup.assert_not_awaited()
+
+    asyncio.run(close_analytics_runner(app))
+    cleanup.assert_awaited_once()
+    assert app.state.analytics_runner is None
+
+
+@pytest.mark.unit
+def test_unavailable_runner_returns_503(manager, monkeypatch):
+    monkeypatch.setattr(
+        analytics, "create_runner", AsyncMock(side_effect=ConnectionRefusedError("down"))
+    )
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_view_manager] = lambda: manager
+
+    response = TestClient(app).get("/analytics/schema/patient_demographics")
+
+    assert response.status_code == 503
+
+
+@pytest.mark.unit
+def test_batch_query_runs_views_concurrently_and_folds_errors(client, manager, runner):
+    in_flight = 0
+    peak = 0
+
+    async def execute(view_def, search_params=None, max_resources=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [{"resource": view_def["resource"]}]
+
+    def load(name):
+        if name == "missing":
+            raise FileNotFoundError(name)
+        return {"resource": name.title()}
+
+    runner.execute = execute
+    manager.load.side_effect = load
+
+    response = client.post(
+        "/analytics/query?view_names=patient&view_names=condition"
+        "&view_names=missing&view_names=patient"
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body) == ["patient", "condition", "missing"]
+    assert body["condition"]["rows"] == [{"resource": "Condition"}]
+    assert "error" in body["missing"]
+    assert peak == 2
+
+
+@pytest.mark.unit
+def test_health_probes_backends_concurrently_and_caches_result(client, runner):
+    both_started = asyncio.Event()
+    started = 0
+
+    async def probe():
+        nonlocal started
+        started += 1
+        if started == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+        return True
+
+    fhir_client = MagicMock(base_url="http://fhir.test/fhir")
+    fhir_client.ping = AsyncMock(side_effect=probe)
+    runner.db_client = MagicMock()
+    runner.db_client.test_connection = AsyncMock(side_effect=probe)
+    client.app.state.analytics_health_fhir_client = fhir_client
+    client.app.state.analytics_runner = runner
+
+    first = client.get("/analytics/health").json()
+    second = client.get("/analytics/health").json()
+
+    assert (
+        first
+        == second
+        == {
+            "status": "healthy",
+            "fhir_server_connected": True,
+            "database_connected": True,
+            "fhir_server_url": "http://fhir.test/fhir",
+        }
+    )
+    assert fhir_client.ping.await_count == 1
+    assert runner.db_client.test_connection.await_count == 1
+
+
+@pytest.mark.unit
+def test_execute_serializes_database_row_values_with_orjson(client, manager, runner):
+    from datetime import date
+    from decimal import Decimal
+
+    manager.load.side_effect = None
+    manager.load.return_value = {"resource": "Observation"}
+    runner.execute = AsyncMock(
+        return_value=[{"id": "o1", "value": Decimal("7.25"), "effective": date(2024, 3, 1)}]
+    )
+
+    response = client.post("/analytics/execute", json={"view_name": "labs"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["rows"] == [{"id": "o1", "value": 7.25, "effective": "2024-03-01"}]
+    assert response.json()["row_count"] == 1
+
+
+@pytest.mark.unit
+def test_execute_ndjson_streams_one_row_per_line(client, manager, runner):
+    from decimal import Decimal
+
+    manager.load.side_effect = None
+    manager.load.return_value = {"resource": "Observation"}
+    runner.execute = AsyncMock(return_value=[{"id": "o1", "value": Decimal("1.5")}, {"id": "o2"}])
+
+    response = client.post("/analytics/execute.ndjson", json={"view_name": "labs"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text == '{"id":"o1","value":1.5}\n{"id":"o2"}\n'
+
+
+@pytest.mark.unit
+def test_execute_ndjson_prefers_runner_stream(client, manager, runner):
+    manager.load.side_effect = None
+    manager.load.return_value = {"resource": "Patient"}
+    closed = []
+
+    async def execute_stream(view_def, search_params=None, max_resources=None):
+        try:
+            for i in range(max_resources):
+                yield {"id": f"p{i}"}
+        finally:
+            closed.append(True)
+
+    runner.execute_stream = execute_stream
+
+    response = client.post("/analytics/execute.ndjson", json={"view_name": "p", "max_resources": 3})
+
+    assert response.content.splitlines() == [b'{"id":"p0"}', b'{"id":"p1"}', b'{"id":"p2"}']
+    assert closed == [True]
+    runner.execute.assert_not_awaited()
+
+
+@pytest.mark.unit
+def test_execute_pushes_filters_to_runner_or_applies_them(client, manager, runner):
+    manager.load.side_effect = None
+    manager.load.return_value = {"resource": "Patient"}
+    runner.execute = AsyncMock(return_value=[{"id": "p1", "age": 70}, {"id": "p2", "age": 30}])
+    body = {"view_name": "p", "filters": [{"field": "age", "value": 40, "operator": "gt"}]}
+
+    fallback = client.post("/analytics/execute", json=body).json()
+    assert [row["id"] for row in fallback["rows"]] == ["p1"]
+    assert "filters" not in runner.execute.await_args.kwargs
+
+    runner.supports_filters = True
+    pushed = client.post("/analytics/execute", json=body).json()
+    assert runner.execute.await_args.kwargs["filters"] == [
+        {"field": "age", "value": 40, "operator": "gt"}
+    ]
+    assert pushed["row_count"] == 2  # runner's rows are taken as already filtered
+
+    bad = {"view_name": "p", "filters": [{"field": "age; DROP", "value": 1}]}
+    assert client.post("/analytics/execute", json=bad).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_concurrent_executes_on_shared_runner_report_their_own_sql(manager):
+    import httpx
+
+    from app.sql_on_fhir.runner.postgres_runner import PostgresRunner
+
+    views = {
+        name: {
+            "name": name,
+            "resource": resource,
+            "select": [{"column": [{"name": "id", "path": "id"}]}],
+        }
+        for name, resource in [("patients", "Patient"), ("conditions", "Condition")]
+    }
+    manager.load.side_effect = views.__getitem__
+
+    async def execute_query(sql, params=None):
+        # The Patient query finishes last, after the Condition query has run
+        await asyncio.sleep(0.05 if "'Patient'" in sql else 0)
+        return [{"id": "r1"}]
+
+    shared = PostgresRunner(MagicMock(execute_query=execute_query), enable_cache=False)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_view_manager] = lambda: manager
+    app.dependency_overrides[get_runner] = lambda: shared
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as http:
+        patients, conditions = await asyncio.gather(
+            http.post("/analytics/execute", json={"view_name": "patients"}),
+            http.post("/analytics/execute", json={"view_name": "conditions"}),
+        )
+
+    assert "'Patient'" in patients.json()["generated_sql"]
+    assert "'Condition'" in conditions.json()["generated_sql"]
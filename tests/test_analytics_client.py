@@ -0,0 +1,165 @@
+"""
+Tests for AnalyticsClient.
+
+execute_multiple_view_definitions runs its ViewDefinitions concurrently,
+at most ANALYTICS_CLIENT_CONCURRENCY at a time, and drops (after logging)
+the ones that fail instead of aborting the batch. join_results gives the
+same left outer join whichever side it builds its hash index over, and
+filter_rows applies all of its filters in a single pass. Clients built by
+get_analytics_client share the app's httpx.AsyncClient, and the
+ViewDefinition list is cached across clients for a short TTL.
+"""
+
+import asyncio
+
+import pytest
+
+from app.clients import analytics_client
+from app.clients.analytics_client import AnalyticsClient, QueryResult
+
+
+@pytest.mark.asyncio
+async def test_multiple_view_definitions_run_concurrently_and_isolate_failures(monkeypatch):
+    monkeypatch.setattr(analytics_client, "ANALYTICS_CLIENT_CONCURRENCY", 2)
+    in_flight = {"now": 0, "peak": 0}
+
+    async def execute_view_definition(view_name, search_params=None, max_resources=None):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        if view_name == "broken_view":
+            raise RuntimeError("502 Bad Gateway")
+        return QueryResult(view_name, "Patient", 0, [], {})
+
+    client = AnalyticsClient()
+    client.execute_view_definition = execute_view_definition
+    names = ["patient_demographics", "broken_view", "condition_simple", "observation_labs"]
+
+    results = await client.execute_multiple_view_definitions(names, max_resources=10)
+    await client.close()
+
+    assert list(results) == ["patient_demographics", "condition_simple", "observation_labs"]
+    assert in_flight["peak"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("secondary_size", [2, 6])
+async def test_join_results_is_left_outer_whichever_side_is_indexed(secondary_size):
+    primary = QueryResult(
+        "patients",
+        "Patient",
+        3,
+        [{"id": "p1"}, {"patient_id": "p2", "id": "x"}, {"id": "p3"}],
+        {},
+    )
+    secondary_rows = [{"patient_id": "p1", "code": f"c{i}"} for i in range(secondary_size - 1)]
+    secondary_rows.append({"patient_id": "p2", "code": "z"})
+    secondary = QueryResult("conditions", "Condition", secondary_size, secondary_rows, {})
+    client = AnalyticsClient()
+
+    joined = await client.join_results(primary, secondary)
+    await client.close()
+
+    expected = [{"id": "p1", **row} for row in secondary_rows[:-1]]
+    expected += [{"patient_id": "p2", "id": "x", "code": "z"}, {"id": "p3"}]
+    assert joined == expected
+
+
+@pytest.mark.asyncio
+async def test_filter_rows_applies_all_filters_in_one_pass():
+    rows = [
+        {"id": "p1", "age": 70, "city": "Boston"},
+        {"id": "p2", "age": 30, "city": "boston"},
+        {"id": "p3", "age": None, "city": "Boston"},
+        {"id": "p4", "age": 80, "city": "Austin"},
+    ]
+    client = AnalyticsClient()
+
+    kept = await client.filter_rows(
+        rows,
+        [
+            {"field": "age", "value": 40, "operator": "gt"},
+            {"field": "city", "value": "BOST", "operator": "contains"},
+        ],
+    )
+    unknown = await client.filter_rows(rows, [{"field": "age", "value": 1, "operator": "gte"}])
+    await client.close()
+
+    assert [row["id"] for row in kept] == ["p1"]
+    assert unknown == []
+    assert await client.filter_rows(rows, []) is rows
+
+
+@pytest.mark.unit
+def test_dependency_reuses_app_http_client():
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.dependencies import get_analytics_client
+
+    app = FastAPI()
+    seen = []
+
+    @app.get("/probe")
+    async def probe(client: AnalyticsClient = Depends(get_analytics_client)):
+        seen.append(client.client)
+        await client.close()
+        return {}
+
+    http = TestClient(app)
+    http.get("/probe")
+    http.get("/probe")
+
+    assert seen[0] is seen[1] is app.state.http_client
+    assert not app.state.http_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_execute_view_definition_sends_sql_filters_and_applies_the_rest():
+    import httpx
+    import orjson
+
+    sent = []
+
+    def handler(request):
+        sent.append(orjson.loads(request.content))
+        rows = [{"id": "p1", "age": 70}, {"id": "p2", "age": 80}]
+        return httpx.Response(200, json={"view_name": "p", "row_count": 2, "rows": rows})
+
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = AnalyticsClient(client=shared)
+    pushed = {"field": "age", "value": 40, "operator": "gt"}
+
+    result = await client.execute_view_definition(
+        "p", filters=[pushed, {"field": "age", "value": 80, "operator": "between"}]
+    )
+    await shared.aclose()
+
+    assert sent[0]["filters"] == [pushed]
+    assert (result.row_count, result.rows) == (0, [])  # unknown operators match nothing
+
+
+@pytest.mark.asyncio
+async def test_list_view_definitions_is_cached_across_clients(monkeypatch):
+    import httpx
+
+    monkeypatch.setattr(analytics_client, "_view_definitions_cache", {})
+    responses = [
+        httpx.Response(503),
+        httpx.Response(200, json={"view_definitions": [{"name": "p"}]}),
+    ]
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return responses.pop(0)
+
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    assert await AnalyticsClient(client=shared).list_view_definitions() == []  # not cached
+    assert await AnalyticsClient(client=shared).list_view_definitions() == [{"name": "p"}]
+    assert await AnalyticsClient(client=shared).list_view_definitions() == [{"name": "p"}]
+    await shared.aclose()
+
+    assert len(sent) == 2
@@ -0,0 +1,63 @@
+"""
+Tests for the background approval-timeout sweep.
+
+Pins that the lifespan sweeper stores each sweep on app.state, survives a
+failing sweep, stops cleanly, and that /approvals/check-timeouts serves
+the stored sweep instead of scanning again.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import approvals
+
+
+@pytest.mark.asyncio
+async def test_sweeper_records_sweeps_and_survives_failures(monkeypatch):
+    calls = []
+
+    async def sweep():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+        return {"success": True, "timed_out_count": len(calls)}
+
+    monkeypatch.setattr(approvals, "run_timeout_sweep", sweep)
+    monkeypatch.setattr(approvals, "TIMEOUT_SWEEP_SECONDS", 0.01)
+    app = FastAPI()
+
+    approvals.start_timeout_sweeper(app)
+    while len(calls) < 3:
+        await asyncio.sleep(0.01)
+    await approvals.stop_timeout_sweeper(app)
+
+    assert app.state.approval_timeout_sweep["timed_out_count"] >= 2
+    assert app.state.approval_timeout_task is None
+
+
+@pytest.mark.unit
+def test_sweeper_disabled_when_interval_is_zero(monkeypatch):
+    monkeypatch.setattr(approvals, "TIMEOUT_SWEEP_SECONDS", 0)
+    app = FastAPI()
+
+    approvals.start_timeout_sweeper(app)
+
+    assert getattr(app.state, "approval_timeout_task", None) is None
+
+
+@pytest.mark.unit
+def test_check_timeouts_route_serves_last_sweep(monkeypatch):
+    async def sweep():
+        raise AssertionError("route should not rescan")
+
+    monkeypatch.setattr(approvals, "run_timeout_sweep", sweep)
+    app = FastAPI()
+    app.include_router(approvals.router)
+    app.state.approval_timeout_sweep = {"success": True, "timed_out_count": 0}
+
+    response = TestClient(app).post("/approvals/check-timeouts")
+
+    assert response.json() == {"success": True, "timed_out_count": 0}
@@ -48,6 +48,7 @@ async def _create_test_data():
         await session.execute(text("DELETE FROM data_deliveries"))
         await session.execute(text("DELETE FROM requirements_data"))
         await session.execute(text("DELETE FROM feasibility_reports"))
+        await session.execute(text("DELETE FROM state_transitions"))
         await session.execute(text("DELETE FROM research_requests"))
         await session.commit()
 
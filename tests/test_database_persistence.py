@@ -514,6 +514,46 @@ async def test_multiple_concurrent_sessions():
         assert "REQ-CONCURRENT-3" in ids
 
 
+@pytest.mark.asyncio
+async def test_agent_execution_persists_data_package_with_native_types():
+    """
+    Test that JSON columns accept extracted records holding dates and numpy scalars
+    """
+    import numpy as np
+    from datetime import date
+    from app.database import AgentExecution
+
+    data_package = {
+        "data_elements": {
+            "labs": [{"patient_id": "p1", "date": date(2024, 1, 2), "value": np.float64(7.5)}]
+        }
+    }
+
+    async with get_db_session() as session:
+        session.add(
+            AgentExecution(
+                request_id="REQ-TEST-JSON",
+                agent_id="extraction_agent",
+                task="extract_data",
+                started_at=datetime.now(),
+                status="completed",
+                context={"request_id": "REQ-TEST-JSON"},
+                result={"data_package": data_package},
+            )
+        )
+        await session.commit()
+
+    async with get_db_session() as session:
+        result = await session.execute(
+            select(AgentExecution).where(AgentExecution.request_id == "REQ-TEST-JSON")
+        )
+        execution = result.scalar_one()
+
+    assert execution.result["data_package"]["data_elements"]["labs"] == [
+        {"patient_id": "p1", "date": "2024-01-02", "value": 7.5}
+    ]
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,169 @@
+"""
+Tests for FHIRClient pagination.
+
+Drives the client against an httpx.MockTransport that serves a paged
+Patient Bundle, so search()/search_pages() are exercised at the wire layer,
+including the background prefetch of each next page. get_metadata is
+served from a per-process TTL cache unless a refresh is asked for.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.clients import fhir_client
+from app.clients.fhir_client import FHIRClient
+
+BASE_URL = "http://fhir.test/fhir"
+
+
+def _paged_transport(pages):
+    """Serve `pages` (lists of ids) as Bundles chained by `next` links."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        page = int(request.url.params.get("page", 0))
+        bundle = {
+            "resourceType": "Bundle",
+            "entry": [{"resource": {"resourceType": "Patient", "id": i}} for i in pages[page]],
+            "link": [],
+        }
+        if page + 1 < len(pages):
+            bundle["link"].append(
+                {"relation": "next", "url": f"{BASE_URL}/Patient?page={page + 1}"}
+            )
+        return httpx.Response(200, json=bundle)
+
+    return httpx.MockTransport(handler), requests
+
+
+@pytest.fixture
+def make_client():
+    clients = []
+
+    def _make(pages):
+        client = FHIRClient(base_url=BASE_URL)
+        transport, requests = _paged_transport(pages)
+        client.client = httpx.AsyncClient(transport=transport)
+        clients.append(client)
+        return client, requests
+
+    yield _make
+
+
+@pytest.mark.unit
+async def test_search_pages_yields_each_bundle_page(make_client):
+    client, requests = make_client([["a", "b"], ["c"], ["d"]])
+
+    pages = [page async for page in client.search_pages("Patient", {"gender": "female"})]
+
+    assert [[r["id"] for r in page] for page in pages] == [["a", "b"], ["c"], ["d"]]
+    assert requests[0].url.params["gender"] == "female"
+    assert "gender" not in requests[1].url.params  # next links carry their own query
+    await client.close()
+
+
+@pytest.mark.unit
+async def test_search_pages_prefetches_next_page_while_caller_works(make_client):
+    client, requests = make_client([["a"], ["b"], ["c"]])
+    pages = client.search_pages("Patient")
+
+    first = await pages.__anext__()
+    await asyncio.sleep(0.01)  # caller busy with page one
+    assert [r["id"] for r in first] == ["a"] and len(requests) == 2
+
+    await pages.aclose()  # stopping early drops the in-flight prefetch
+    assert len(requests) == 2
+    await client.close()
+
+
+@pytest.mark.unit
+async def test_search_truncates_at_max_results_without_fetching_more(make_client):
+    client, requests = make_client([["a", "b"], ["c", "d"], ["e"]])
+
+    resources = await client.search("Patient", max_results=3)
+
+    assert [r["id"] for r in resources] == ["a", "b", "c"]
+    assert len(requests) == 2
+    assert requests[0].url.params["_count"] == "3"
+    await client.close()
+
+
+@pytest.mark.unit
+async def test_count_requests_summary_count_only():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"resourceType": "Bundle", "total": 42})
+
+    client = FHIRClient(base_url=BASE_URL)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    params = {"gender": "male"}
+
+    assert await client.count("Patient", params) == 42
+    assert seen[0].url.params["_summary"] == "count"
+    assert seen[0].url.params["gender"] == "male"
+    assert params == {"gender": "male"}
+    await client.close()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("status, reachable", [(200, True), (405, True), (503, False)])
+async def test_ping_sends_head_metadata(status, reachable):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(status)
+
+    client = FHIRClient(base_url=BASE_URL)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    assert await client.ping() is reachable
+    assert [(r.method, str(r.url)) for r in requests] == [("HEAD", f"{BASE_URL}/metadata")]
+    await client.close()
+
+
+@pytest.mark.unit
+async def test_shared_http_client_is_used_and_left_open():
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200)))
+    first = FHIRClient(base_url=BASE_URL, client=shared)
+    second = FHIRClient(base_url="http://other.test/fhir", client=shared)
+
+    assert await first.ping() and await second.ping()
+    await first.close()
+    await second.close()
+
+    assert not shared.is_closed
+    await shared.aclose()
+
+
+@pytest.mark.unit
+async def test_get_metadata_is_cached_per_server_until_refresh(monkeypatch):
+    monkeypatch.setattr(fhir_client, "_metadata_cache", {})
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"resourceType": "CapabilityStatement"})
+
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = FHIRClient(base_url=BASE_URL, client=shared)
+
+    first, second = await asyncio.gather(client.get_metadata(), client.get_metadata())
+    first["mutated"] = True
+    third = await FHIRClient(base_url=BASE_URL, client=shared).get_metadata()
+    assert len(requests) == 1
+    assert second == third == {"resourceType": "CapabilityStatement"}
+
+    assert await client.test_connection()
+    assert len(requests) == 2
+
+    monkeypatch.setattr(fhir_client, "FHIR_METADATA_TTL", 0)
+    await client.get_metadata()
+    assert len(requests) == 3
+    await shared.aclose()
@@ -0,0 +1,157 @@
+"""
+Tests for HAPIDBClient result shapes.
+
+execute_query_columnar returns one list per column, keyed by the result's
+column names, and empty results keep their columns; asyncpg timeouts
+surface as TimeoutError like execute_query's. execute_join runs both sides
+as CTEs in one statement with their parameters renumbered. Scalar and row
+lookups go through conn.fetch/fetchval (asyncpg's statement cache), never
+an uncached conn.prepare(), and get_resources_by_ids fetches a batch of IDs
+in one ANY($2) query. Timeouts are asyncpg's per-call timeout, never a SET
+on the pooled connection.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.clients.hapi_db_client import (
+    RESOURCE_BY_ID_SQL,
+    RESOURCE_COUNT_SQL,
+    RESOURCES_BY_IDS_SQL,
+    HAPIDBClient,
+)
+
+
+class _Record(tuple):
+    """Stands in for asyncpg.Record: iterates values, keys() gives columns"""
+
+    def __new__(cls, columns, values):
+        record = super().__new__(cls, values)
+        record.columns = columns
+        return record
+
+    def keys(self):
+        return iter(self.columns)
+
+
+def _client_returning(rows, columns):
+    statement = MagicMock()
+    attributes = [MagicMock() for _ in columns]
+    for attribute, column in zip(attributes, columns):
+        attribute.name = column  # name= in the constructor names the mock itself
+    statement.get_attributes.return_value = attributes
+    conn = MagicMock(
+        fetch=AsyncMock(return_value=[_Record(columns, row) for row in rows]),
+        fetchval=AsyncMock(),
+        prepare=AsyncMock(return_value=statement),
+        execute=AsyncMock(),
+    )
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    client = HAPIDBClient(connection_url="postgresql://test@localhost/test")
+    client.pool = MagicMock(acquire=acquire)
+    return client, conn
+
+
+@pytest.mark.asyncio
+async def test_execute_query_columnar_builds_one_list_per_column():
+    client, conn = _client_returning([("p1", 70), ("p2", 30)], ["patient_id", "age"])
+
+    columns = await client.execute_query_columnar("SELECT ...", [40], timeout=5)
+
+    conn.fetch.assert_awaited_once_with("SELECT ...", 40, timeout=5)
+    conn.prepare.assert_not_awaited()
+    assert columns == {"patient_id": ["p1", "p2"], "age": [70, 30]}
+
+
+@pytest.mark.asyncio
+async def test_execute_query_columnar_keeps_columns_and_maps_timeouts():
+    client, conn = _client_returning([], ["res_type"])
+
+    assert await client.get_available_resource_types() == []
+
+    conn.fetch.side_effect = asyncio.TimeoutError
+    with pytest.raises(TimeoutError, match="exceeded 30.0 seconds"):
+        await client.execute_query_columnar("SELECT pg_sleep(60)")
+
+
+@pytest.mark.asyncio
+async def test_execute_join_runs_one_left_join_with_renumbered_params():
+    client, conn = _client_returning(
+        [("p1", "F", "E11"), ("p2", "M", None)], ["patient_id", "gender", "code"]
+    )
+
+    columns = await client.execute_join(
+        "SELECT id AS patient_id, gender FROM p WHERE gender = $1 LIMIT $2",
+        "SELECT patient_id, code FROM c WHERE code = $1",
+        "patient_id",
+        left_params=["female", 10],
+        right_params=["E11"],
+        work_mem="256MB",
+    )
+
+    sql, *params = conn.fetch.await_args.args
+    assert "WHERE code = $3" in sql and sql.endswith('LEFT JOIN b USING ("patient_id")')
+    assert params == ["female", 10, "E11"]
+    conn.execute.assert_awaited_once_with("SET LOCAL work_mem = '256MB'")
+    assert columns["code"] == ["E11", None]
+
+    with pytest.raises(ValueError):
+        await client.execute_join("SELECT 1", "SELECT 1", "id", work_mem="1GB; DROP")
+
+
+@pytest.mark.asyncio
+async def test_hot_lookups_use_cached_fetchval_with_per_call_timeout():
+    client, conn = _client_returning([], [])
+    conn.fetchval.side_effect = [42, '{"resourceType": "Patient", "id": "7"}', None]
+
+    assert await client.get_resource_count("Patient") == 42
+    assert await client.get_resource_by_id("Patient", "7") == {"resourceType": "Patient", "id": "7"}
+    assert await client.get_resource_by_id("Patient", "8") is None
+
+    sent = [call.args[0] for call in conn.fetchval.await_args_list]
+    assert sent == [RESOURCE_COUNT_SQL, RESOURCE_BY_ID_SQL, RESOURCE_BY_ID_SQL]
+    conn.fetchval.assert_awaited_with(RESOURCE_BY_ID_SQL, "Patient", "8", timeout=30.0)
+    conn.prepare.assert_not_awaited()  # prepare() bypasses the statement cache
+    conn.execute.assert_not_awaited()  # no SET statement_timeout round trip
+
+
+@pytest.mark.asyncio
+async def test_execute_query_passes_timeout_per_call_without_session_set():
+    client, conn = _client_returning([], [])
+    conn.fetch = AsyncMock(return_value=[{"id": "p1"}])
+
+    assert await client.execute_query("SELECT id FROM p") == [{"id": "p1"}]
+    await client.execute_query("SELECT id FROM p WHERE id = $1", ["p1"], timeout=2)
+
+    assert conn.fetch.await_args_list[0].args == ("SELECT id FROM p",)
+    assert conn.fetch.await_args_list[0].kwargs == {"timeout": 30.0}
+    conn.fetch.assert_awaited_with("SELECT id FROM p WHERE id = $1", "p1", timeout=2)
+    conn.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_resources_by_ids_fetches_batch_in_one_query():
+    client, conn = _client_returning([], [])
+    conn.fetch = AsyncMock(
+        return_value=[
+            {"res_id": 7, "resource": '{"resourceType": "Patient"}'},
+            {"res_id": 9, "resource": {"resourceType": "Patient", "active": True}},
+        ]
+    )
+
+    resources = await client.get_resources_by_ids("Patient", ["7", "8", 9])
+
+    assert resources == {
+        "7": {"resourceType": "Patient"},
+        "9": {"resourceType": "Patient", "active": True},
+    }
+    conn.fetch.assert_awaited_once_with(RESOURCES_BY_IDS_SQL, "Patient", [7, 8, 9], timeout=30.0)
+    assert await client.get_resources_by_ids("Patient", []) == {}
+    assert conn.fetch.await_count == 1
@@ -0,0 +1,173 @@
+"""
+Tests for /health probe costs.
+
+Concurrent and repeated probes within HEALTH_FHIR_TTL must share one
+upstream /metadata fetch; after a failure the last good metadata is kept
+alongside the error. The endpoint reuses the app's FHIR client and runs
+its database and FHIR checks concurrently. /debug/pool exposes the app
+engine's connection pool; probe responses carry Cache-Control headers.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api import health
+
+
+@pytest.fixture(autouse=True)
+def reset_metadata_cache():
+    saved = dict(health._metadata_cache)
+    health._metadata_cache.update(ts=None, url=None, value=None, error=None)
+    yield
+    health._metadata_cache.clear()
+    health._metadata_cache.update(saved)
+
+
+@pytest.fixture
+def fhir_client():
+    client = MagicMock(base_url="http://fhir.test/fhir")
+
+    async def get_metadata(refresh=False):
+        await asyncio.sleep(0.01)
+        return {"fhirVersion": "4.0.1"}
+
+    client.get_metadata = AsyncMock(side_effect=get_metadata)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_probes_share_one_metadata_fetch(fhir_client):
+    results = await asyncio.gather(*(health._get_cached_metadata(fhir_client) for _ in range(5)))
+    await health._get_cached_metadata(fhir_client)
+
+    assert all(r["value"] == {"fhirVersion": "4.0.1"} and r["error"] is None for r in results)
+    fhir_client.get_metadata.assert_awaited_once()
+
+
+@pytest.mark.unit
+def test_health_endpoint_reuses_app_fhir_client(fhir_client, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(health, "FHIRClient", MagicMock(side_effect=AssertionError("new client")))
+    session = MagicMock()
+    session.execute = AsyncMock(
+        return_value=MagicMock(one=MagicMock(return_value=MagicMock(total=7, active=2)))
+    )
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    monkeypatch.setattr(health, "get_db_session", fake_session)
+    app = FastAPI()
+    app.include_router(health.router)
+    app.state.fhir_client = fhir_client
+    app.state.analytics_runner = MagicMock(spec=["get_cache_stats"])
+    app.state.analytics_runner.get_cache_stats.return_value = {"cache_hits": 3}
+
+    body = TestClient(app).get("/health").json()
+
+    assert body["components"]["fhir_server"]["version"] == "4.0.1"
+    fhir_client.close.assert_not_called()
+    database = body["components"]["database"]
+    assert (database["total_requests"], database["active_requests"]) == (7, 2)
+    session.execute.assert_awaited_once_with(health._REQUEST_COUNTS_STMT)  # one prebuilt query
+    assert body["components"]["cache"] == {"status": "healthy", "cache_hits": 3}
+
+
+@pytest.mark.asyncio
+async def test_failure_is_cached_and_keeps_last_good_metadata(fhir_client, monkeypatch):
+    await health._get_cached_metadata(fhir_client)
+    monkeypatch.setattr(health, "HEALTH_FHIR_TTL", 0)
+    fhir_client.get_metadata.side_effect = ConnectionError("refused")
+
+    result = await health._get_cached_metadata(fhir_client)
+
+    assert result["error"] == "refused"
+    assert result["value"] == {"fhirVersion": "4.0.1"}
+
+    monkeypatch.setattr(health, "HEALTH_FHIR_TTL", 60)
+    await health._get_cached_metadata(fhir_client)
+    assert fhir_client.get_metadata.await_count == 2
+
+
+@pytest.mark.unit
+def test_health_checks_database_and_fhir_concurrently(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    both_started = asyncio.Event()
+    started = 0
+
+    async def wait_for_both():
+        nonlocal started
+        started += 1
+        if started == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+
+    async def execute(statement):
+        await wait_for_both()
+        return MagicMock(one=MagicMock(return_value=MagicMock(total=1, active=0)))
+
+    async def get_metadata(refresh=False):
+        await wait_for_both()
+        return {"fhirVersion": "4.0.1"}
+
+    session = MagicMock(execute=execute)
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    monkeypatch.setattr(health, "get_db_session", fake_session)
+    app = FastAPI()
+    app.include_router(health.router)
+    app.state.fhir_client = MagicMock(base_url="http://fhir.test/fhir", get_metadata=get_metadata)
+
+    body = TestClient(app).get("/health").json()
+
+    assert body["status"] == "healthy"
+    assert body["components"]["cache"]["status"] == "unavailable"
+
+
+@pytest.mark.unit
+def test_debug_pool_reports_queue_pool_usage():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    app.include_router(health.router)
+
+    body = TestClient(app).get("/debug/pool").json()
+
+    assert body["pool_class"] == "AsyncAdaptedQueuePool"
+    assert body["size"] == 15
+    assert "Pool size: 15" in body["status"]
+
+
+@pytest.mark.unit
+def test_probe_cache_control_headers(fhir_client, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    async def not_ready():
+        return "connection refused"
+
+    monkeypatch.setattr(health, "_database_not_ready", not_ready)
+    monkeypatch.setattr(health, "audit_health_check", AsyncMock(return_value={"healthy": True}))
+    app = FastAPI()
+    app.include_router(health.router)
+    app.state.fhir_client = fhir_client
+    client = TestClient(app)
+
+    live = client.get("/health/live")
+    assert live.headers["cache-control"] == "public, max-age=5"
+    assert live.json()["timestamp"].endswith("+00:00")
+    assert client.get("/health").headers["cache-control"] == "public, max-age=2"
+    ready = client.get("/health/ready")
+    assert (ready.status_code, ready.headers["cache-control"]) == (503, "no-store")
@@ -0,0 +1,105 @@
+"""
+Tests for LLMClient reuse.
+
+Pins that the process-wide client is shared, that ChatAnthropic instances
+(and the HTTP pools they own) are reused per sampling configuration instead
+of being rebuilt on every complete() call, and that identical extraction
+calls are answered from the result cache.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.utils import llm_client as llm_client_module
+from app.utils.llm_client import LLMClient, get_llm_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_singleton():
+    get_llm_client.cache_clear()
+    yield
+    get_llm_client.cache_clear()
+
+
+@pytest.mark.unit
+def test_get_llm_client_returns_shared_instance(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    assert get_llm_client() is get_llm_client()
+    assert get_llm_client.cache_info().misses == 1
+
+
+@pytest.mark.unit
+def test_requirements_agent_uses_shared_client(monkeypatch):
+    from app.agents.requirements_agent import RequirementsAgent
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    assert RequirementsAgent().llm_client is RequirementsAgent().llm_client
+
+
+@pytest.mark.unit
+async def test_complete_reuses_chat_client_per_sampling_params(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    chat_cls = MagicMock()
+    chat_cls.return_value.ainvoke = AsyncMock(return_value=MagicMock(content="ok"))
+
+    with patch.object(llm_client_module, "ChatAnthropic", chat_cls):
+        client = LLMClient()
+        constructed = chat_cls.call_count
+        await client.complete("a")
+        await client.complete("b")
+        await client.complete("c", temperature=0.3)
+
+    assert chat_cls.call_count - constructed == 2
+
+
+@pytest.mark.unit
+async def test_identical_extractions_are_served_from_cache(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    client = LLMClient()
+    client.extract_structured_json = AsyncMock(return_value={"concepts": [{"term": "diabetes"}]})
+
+    first = await client.extract_medical_concepts("patients with diabetes")
+    first["concepts"].clear()  # callers may mutate their copy
+    second = await client.extract_medical_concepts("patients with diabetes")
+    await client.extract_medical_concepts("patients with asthma")
+    await client.extract_requirements([{"role": "user", "content": "hi"}], {})
+    await client.extract_requirements([{"role": "user", "content": "hi"}], {})
+
+    assert second == {"concepts": [{"term": "diabetes"}]}
+    assert client.extract_structured_json.await_count == 3
+
+
+@pytest.mark.unit
+async def test_extraction_cache_expires_and_stays_bounded(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(LLMClient, "EXTRACTION_CACHE_MAX_ENTRIES", 2)
+    client = LLMClient()
+    client.extract_structured_json = AsyncMock(return_value={"concepts": []})
+
+    for criterion in ("a", "b", "c"):
+        await client.extract_medical_concepts(criterion)
+    assert len(client._extraction_cache) == 2
+
+    monkeypatch.setattr(LLMClient, "EXTRACTION_CACHE_TTL_SECONDS", 0)
+    await client.extract_medical_concepts("c")
+    assert client.extract_structured_json.await_count == 4
+
+
+@pytest.mark.unit
+async def test_concept_cache_folds_case_and_separators_only(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    client = LLMClient()
+    client.extract_structured_json = AsyncMock(return_value={"concepts": []})
+
+    await client.extract_medical_concepts("Type-2 Diabetes.")
+    await client.extract_medical_concepts("type 2  diabetes")
+    assert client.extract_structured_json.await_count == 1
+
+    # Meaningful differences still reach the LLM
+    await client.extract_medical_concepts("type 1 diabetes")
+    await client.extract_medical_concepts("HER2- breast cancer")
+    await client.extract_medical_concepts("HER2 breast cancer")
+    assert client.extract_structured_json.await_count == 4
@@ -15,12 +15,12 @@ All tests use FastAPI dependency_overrides to swap require_role + the
 service factory, so no real Postgres / Redis / HAPI is needed.
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
 
-from app.api.materialized_views import router, _validate_view_name
+from app.api.materialized_views import get_service, router, _validate_view_name
 from app.security.dependencies import get_current_active_user
 
 
@@ -145,25 +145,26 @@ def test_view_name_injection_rejected_with_404(app_with_admin, view_name):
     """
     client = TestClient(app_with_admin)
 
-    with patch("app.api.materialized_views.get_service") as mock_get_service:
-        # If we ever reach get_service(), the test should fail loudly
-        mock_get_service.side_effect = AssertionError(
-            "INJECTION REACHED SQL LAYER — _validate_view_name did not block "
-            f"view_name={view_name!r}"
-        )
+    mock_get_service = MagicMock()
+    app_with_admin.dependency_overrides[get_service] = lambda: mock_get_service()
+    # If we ever reach get_service(), the test should fail loudly
+    mock_get_service.side_effect = AssertionError(
+        "INJECTION REACHED SQL LAYER — _validate_view_name did not block "
+        f"view_name={view_name!r}"
+    )
 
-        # URL-encode the path segment so FastAPI routes correctly
-        from urllib.parse import quote
+    # URL-encode the path segment so FastAPI routes correctly
+    from urllib.parse import quote
 
-        path = f"/analytics/materialized-views/{quote(view_name, safe='')}"
-        response = client.request("DELETE", path)
+    path = f"/analytics/materialized-views/{quote(view_name, safe='')}"
+    response = client.request("DELETE", path)
 
-        assert response.status_code == 404, (
-            f"DELETE {path} should return 404 for view_name={view_name!r}; "
-            f"got {response.status_code}: {response.text}"
-        )
-        # And get_service was never called — proves the SQL layer wasn't reached
-        mock_get_service.assert_not_called()
+    assert response.status_code == 404, (
+        f"DELETE {path} should return 404 for view_name={view_name!r}; "
+        f"got {response.status_code}: {response.text}"
+    )
+    # And get_service was never called — proves the SQL layer wasn't reached
+    mock_get_service.assert_not_called()
 
 
 # ----- Test 4: refresh path also rejects injection -----
@@ -173,16 +174,17 @@ def test_refresh_view_injection_rejected_with_404(app_with_admin):
     """POST /{view_name}/refresh must also block injection payloads."""
     client = TestClient(app_with_admin)
 
-    with patch("app.api.materialized_views.get_service") as mock_get_service:
-        mock_get_service.side_effect = AssertionError("INJECTION REACHED SQL LAYER")
-        from urllib.parse import quote
+    mock_get_service = MagicMock()
+    app_with_admin.dependency_overrides[get_service] = lambda: mock_get_service()
+    mock_get_service.side_effect = AssertionError("INJECTION REACHED SQL LAYER")
+    from urllib.parse import quote
 
-        payload = "x;DROP TABLE users;--"
-        path = f"/analytics/materialized-views/{quote(payload, safe='')}/refresh"
-        response = client.request("POST", path)
+    payload = "x;DROP TABLE users;--"
+    path = f"/analytics/materialized-views/{quote(payload, safe='')}/refresh"
+    response = client.request("POST", path)
 
-        assert response.status_code == 404
-        mock_get_service.assert_not_called()
+    assert response.status_code == 404
+    mock_get_service.assert_not_called()
 
 
 # ----- Test 5: _validate_view_name unit-level smoke test -----
@@ -213,3 +215,239 @@ def test_validate_view_name_rejects_injection_via_regex():
         with pytest.raises(HTTPException) as exc:
             _validate_view_name(bad)
         assert exc.value.status_code == 404, f"Expected 404 for {bad!r}"
+
+
+# ----- Test 6: service comes from the get_service dependency -----
+
+
+def test_refresh_uses_service_dependency(app_with_admin):
+    service = MagicMock()
+    service.refresh_view = AsyncMock(
+        return_value={"view_name": "patient_demographics", "success": True}
+    )
+    app_with_admin.dependency_overrides[get_service] = lambda: service
+
+    response = TestClient(app_with_admin).post(
+        "/analytics/materialized-views/patient_demographics/refresh"
+    )
+
+    assert response.status_code == 200
+    service.refresh_view.assert_awaited_once_with("patient_demographics")
+
+
+@pytest.mark.asyncio
+async def test_get_service_shares_hapi_client_and_closes_session(monkeypatch):
+    from app.api import materialized_views
+
+    hapi_db_client = MagicMock()
+    session = MagicMock(__aenter__=AsyncMock(), __aexit__=AsyncMock(return_value=False))
+    session.__aenter__.return_value = session
+    monkeypatch.setattr(
+        materialized_views, "create_hapi_db_client", AsyncMock(return_value=hapi_db_client)
+    )
+    monkeypatch.setattr(materialized_views, "get_hapi_session_factory", lambda: lambda: session)
+
+    dependency = get_service()
+    service = await dependency.__anext__()
+    assert (service.db_client, service.session) == (hapi_db_client, session)
+    session.__aexit__.assert_not_awaited()
+
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+    session.__aexit__.assert_awaited_once()
+
+
+# ----- Test 7: long operations run as background jobs -----
+
+
+def test_create_all_runs_script_in_process_as_job(app_with_admin, monkeypatch):
+    import scripts.create_materialized_views as create_views
+
+    async def run(out=None):
+        print("Creating view: patient_simple", file=out)
+        return {"success": True, "views_created": 4, "total_views": 4}
+
+    monkeypatch.setattr(create_views, "run", run)
+    client = TestClient(app_with_admin)
+
+    response = client.post("/analytics/materialized-views/create-all")
+
+    assert response.status_code == 202
+    job = client.get(response.json()["status_url"]).json()
+    assert job["status"] == "completed"
+    assert job["result"]["output"] == "Creating view: patient_simple\n"
+
+    async def failing_run(out=None):
+        return {"success": False, "views_created": 4, "total_views": 4}
+
+    monkeypatch.setattr(create_views, "run", failing_run)
+    failed = client.post("/analytics/materialized-views/create-all").json()
+    job = client.get(failed["status_url"]).json()
+    assert job["status"] == "failed"
+    assert "validation failed" in job["error"]
+
+
+def test_create_all_refuses_a_second_running_job(app_with_admin, monkeypatch):
+    from app.api import materialized_views
+
+    monkeypatch.setattr(materialized_views, "_view_jobs", {})
+    client = TestClient(app_with_admin)
+    materialized_views._view_jobs["j1"] = {
+        "job_id": "j1",
+        "kind": "create_all",
+        "status": "running",
+    }
+
+    response = client.post("/analytics/materialized-views/create-all")
+
+    assert response.status_code == 409
+    assert "j1" in response.json()["detail"]
+    assert list(materialized_views._view_jobs) == ["j1"]
+
+
+def test_refresh_all_returns_job_and_records_summary(app_with_admin, monkeypatch):
+    from app.api import materialized_views
+
+    service = MagicMock()
+    service.refresh_all_views = AsyncMock(
+        return_value={
+            "total_views": 1,
+            "success": 1,
+            "failed": 0,
+            "results": [{"view_name": "patient_simple", "success": True}],
+        }
+    )
+
+    async def fake_get_service():
+        yield service
+
+    monkeypatch.setattr(materialized_views, "get_service", fake_get_service)
+    client = TestClient(app_with_admin)
+
+    started = client.post("/analytics/materialized-views/refresh-all")
+
+    assert started.status_code == 202
+    job_id = started.json()["job_id"]
+    assert started.json()["status_url"] == f"/analytics/materialized-views/jobs/{job_id}"
+    job = client.get(started.json()["status_url"]).json()
+    assert (job["kind"], job["status"]) == ("refresh_all", "completed")
+    assert job["result"]["success"] == 1
+    assert client.get("/analytics/materialized-views/jobs/unknown").status_code == 404
+
+
+def test_refresh_all_streams_ndjson_when_asked(app_with_admin, monkeypatch):
+    import orjson
+
+    from app.api import materialized_views
+
+    async def iter_refresh_views(view_names):
+        for name in reversed(view_names):
+            yield {"view_name": name, "success": name != "b_view", "error": None}
+
+    service = MagicMock()
+    service.list_views = AsyncMock(return_value=[{"view_name": "a_view"}, {"view_name": "b_view"}])
+    service.iter_refresh_views = iter_refresh_views
+
+    async def fake_get_service():
+        yield service
+
+    monkeypatch.setattr(materialized_views, "get_service", fake_get_service)
+
+    response = TestClient(app_with_admin).post(
+        "/analytics/materialized-views/refresh-all", headers={"Accept": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [orjson.loads(line) for line in response.text.splitlines()]
+    assert [line.get("view_name") for line in lines[:2]] == ["b_view", "a_view"]
+    assert lines[2] == {"total_views": 2, "success": 1, "failed": 1}
+
+
+def test_list_streams_ndjson_when_asked(app_with_admin):
+    async def iter_views():
+        yield {"view_name": "a_view", "row_count": 1}
+        yield {"view_name": "b_view", "row_count": 2}
+
+    service = MagicMock()
+    service.views_etag = AsyncMock(return_value='W/"v1"')
+    service.iter_views = iter_views
+    service.list_views = AsyncMock()
+    app_with_admin.dependency_overrides[get_service] = lambda: service
+
+    response = TestClient(app_with_admin).get(
+        "/analytics/materialized-views/", headers={"Accept": "application/x-ndjson"}
+    )
+
+    assert (
+        response.text
+        == '{"view_name":"a_view","row_count":1}\n{"view_name":"b_view","row_count":2}\n'
+    )
+    assert response.headers["etag"] == 'W/"v1"'
+    service.list_views.assert_not_awaited()
+
+
+def test_status_404_skips_detailed_queries(app_with_admin):
+    service = MagicMock()
+    service.view_exists = AsyncMock(return_value=False)
+    service.get_view_status = AsyncMock()
+    app_with_admin.dependency_overrides[get_service] = lambda: service
+
+    response = TestClient(app_with_admin).get("/analytics/materialized-views/no_such_view/status")
+
+    assert response.status_code == 404
+    service.view_exists.assert_awaited_once_with("no_such_view")
+    service.get_view_status.assert_not_awaited()
+
+
+def test_status_wraps_service_result_without_revalidating(app_with_admin):
+    service = MagicMock()
+    service.view_exists = AsyncMock(return_value=True)
+    service.views_etag = AsyncMock(return_value='W/"v1"')
+    service.get_view_status = AsyncMock(
+        return_value={
+            "view_name": "patient_demographics",
+            "exists": True,
+            "status": "active",
+            "row_count": 10,
+            "is_stale": False,
+            "needs_refresh": False,
+            "auto_refresh_enabled": True,  # not part of ViewStatusResponse
+        }
+    )
+    app_with_admin.dependency_overrides[get_service] = lambda: service
+
+    body = (
+        TestClient(app_with_admin)
+        .get("/analytics/materialized-views/patient_demographics/status")
+        .json()
+    )
+
+    assert body["row_count"] == 10 and body["size"] is None
+    assert "auto_refresh_enabled" not in body
+    schema = app_with_admin.openapi()["paths"]["/analytics/materialized-views/{view_name}/status"]
+    assert schema["get"]["responses"]["200"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/ViewStatusResponse"
+    }
+
+
+def test_read_routes_answer_matching_etag_with_304(app_with_admin):
+    service = MagicMock()
+    service.view_exists = AsyncMock(return_value=True)
+    service.views_etag = AsyncMock(return_value='W/"v1"')
+    service.list_views = AsyncMock()
+    service.get_view_status = AsyncMock()
+    app_with_admin.dependency_overrides[get_service] = lambda: service
+    client = TestClient(app_with_admin)
+    headers = {"If-None-Match": '"v0", W/"v1"'}
+
+    listing = client.get("/analytics/materialized-views/", headers=headers)
+    status = client.get(
+        "/analytics/materialized-views/patient_demographics/status", headers=headers
+    )
+
+    assert (listing.status_code, status.status_code) == (304, 304)
+    assert listing.headers["etag"] == 'W/"v1"'
+    service.views_etag.assert_any_await("patient_demographics")
+    service.list_views.assert_not_awaited()
+    service.get_view_status.assert_not_awaited()
@@ -0,0 +1,97 @@
+"""
+Tests for the cached /analytics/materialized-views/health summary.
+
+Pins that polls within MV_HEALTH_TTL (including concurrent ones) share one
+list_views() scan, and that failures are reported as unhealthy and cached
+like any other summary. The route answers unchanged polls with a 304.
+"""
+
+import asyncio
+
+import pytest
+
+from app.api import materialized_views
+
+
+@pytest.fixture(autouse=True)
+def empty_health_cache():
+    materialized_views._health_cache.update(ts=None, value=None)
+    yield
+    materialized_views._health_cache.update(ts=None, value=None)
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    calls = []
+
+    class Service:
+        async def list_views(self):
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return [{"view_name": "patient_simple", "is_stale": True}, {"view_name": "x"}]
+
+    async def get_service():
+        yield Service()
+
+    monkeypatch.setattr(materialized_views, "get_service", get_service)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_polls_within_ttl_share_one_scan(scans):
+    results = await asyncio.gather(*(materialized_views._cached_health() for _ in range(5)))
+    results[0]["status"] = "mutated"  # callers get their own copy
+    again = await materialized_views._cached_health()
+
+    assert len(scans) == 1
+    assert again == {
+        "status": "degraded",
+        "total_views": 2,
+        "healthy_views": 1,
+        "stale_views": 1,
+        "schema": "sqlonfhir",
+    }
+
+
+@pytest.mark.asyncio
+async def test_expired_summary_is_recomputed(scans, monkeypatch):
+    await materialized_views._cached_health()
+    monkeypatch.setattr(materialized_views, "MV_HEALTH_TTL", 0)
+
+    await materialized_views._cached_health()
+
+    assert len(scans) == 2
+
+
+@pytest.mark.asyncio
+async def test_unavailable_service_is_reported_unhealthy(monkeypatch):
+    async def get_service():
+        raise materialized_views.HTTPException(status_code=503, detail="pool down")
+        yield
+
+    monkeypatch.setattr(materialized_views, "get_service", get_service)
+
+    assert await materialized_views._cached_health() == {
+        "status": "unhealthy",
+        "error": "pool down",
+    }
+
+
+@pytest.mark.unit
+def test_route_returns_304_for_matching_etag(scans):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    app.include_router(materialized_views.router)
+    client = TestClient(app)
+
+    first = client.get("/analytics/materialized-views/health")
+    again = client.get(
+        "/analytics/materialized-views/health",
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+
+    assert first.json()["status"] == "degraded"
+    assert (again.status_code, again.content) == (304, b"")
+    assert len(scans) == 1
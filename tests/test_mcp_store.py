@@ -6,3 +6,24 @@ def test_mcp_save_load(tmp_path):
     store.save("r1", {"k": "v"})
     loaded = store.load("r1")
     assert loaded["k"] == "v"
+
+
+def test_mcp_routes_share_one_store(tmp_path, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api import mcp
+
+    monkeypatch.chdir(tmp_path)
+    mcp.get_context_store.cache_clear()
+    assert mcp.get_context_store() is mcp.get_context_store()
+    mcp.get_context_store.cache_clear()
+
+    app = FastAPI()
+    app.include_router(mcp.router)
+    app.dependency_overrides[mcp.get_context_store] = lambda: FileContextStore(str(tmp_path))
+    client = TestClient(app)
+
+    client.post("/mcp/context", json={"request_id": "r1", "context": {"k": "v"}})
+
+    assert client.get("/mcp/context/r1").json() == {"context": {"k": "v"}}
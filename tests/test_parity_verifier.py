@@ -84,22 +84,37 @@ def test_compare_pair_emits_jsonl_row_for_matching_state_sequence(tmp_path):
 
 
 # ---------------------------------------------------------------------------
-# Cycle 2 — dimension 1: state_sequence query against research_requests.state_history
+# Cycle 2 — dimension 1: state_sequence query against state_transitions
 # ---------------------------------------------------------------------------
 
 
+def _transitions(request_id, state_history):
+    """state_transitions rows for a list of {state, timestamp} history entries"""
+    from datetime import datetime
+
+    from app.database.models import StateTransition
+
+    return [
+        StateTransition(
+            request_id=request_id,
+            state=entry["state"],
+            timestamp=datetime.fromisoformat(entry["timestamp"]),
+        )
+        for entry in state_history
+    ]
+
+
 async def test_dimension_1_state_sequence_returns_ordered_state_names(clean_database):
     """fetch_state_sequence(thread_id, db_session) returns ordered state names
-    from research_requests.state_history for the given row.
+    from the state_transitions rows of the given request.
 
     The harness uses LangGraph thread_id as the lookup key. ResearchRequest.id
     is the canonical thread_id surface (REQ-YYYYMMDD-XXXXXXXX); the LangGraph
     checkpointer sets thread_id = request_id per workflow invocation.
 
-    state_history is a JSON list of {state, timestamp} entries persisted
-    chronologically as the workflow progresses. fetch_state_sequence sorts
-    by timestamp defensively (don't rely on file order) and returns the
-    `state` string from each entry.
+    Each transition is a {state, timestamp} row inserted as the workflow
+    progresses. fetch_state_sequence orders by timestamp defensively (don't
+    rely on insertion order) and returns the `state` string from each row.
     """
     import sys
     from datetime import datetime, timedelta
@@ -133,9 +148,9 @@ async def test_dimension_1_state_sequence_returns_ordered_state_names(clean_data
                 researcher_email="cycle2@parity.test",
                 initial_request="parity-harness synthetic row",
                 current_state="complete",
-                state_history=state_history,
             )
         )
+        session.add_all(_transitions(request_id, state_history))
         await session.commit()
 
         result = await fetch_state_sequence(thread_id=request_id, db_session=session)
@@ -145,7 +160,7 @@ async def test_dimension_1_state_sequence_returns_ordered_state_names(clean_data
         "requirements_gathering",
         "feasibility_validation",
         "complete",
-    ], "ordered state names must be lifted directly from state_history"
+    ], "ordered state names must be lifted directly from state_transitions"
 
 
 async def test_dimension_1_state_sequence_returns_empty_list_for_unknown_thread_id(clean_database):
@@ -168,7 +183,7 @@ async def test_dimension_1_state_sequence_returns_empty_list_for_unknown_thread_
 
 
 async def test_dimension_1_state_sequence_sorts_out_of_order_timestamps(clean_database):
-    """state_history is sorted by timestamp ascending before extracting names.
+    """Transitions are ordered by timestamp ascending before extracting names.
 
     Defensive sort: even if a future code path appends out-of-order (e.g., a
     backfill script or a clock-skew event), the harness produces deterministic
@@ -207,9 +222,9 @@ async def test_dimension_1_state_sequence_sorts_out_of_order_timestamps(clean_da
                 researcher_email="cycle2sort@parity.test",
                 initial_request="parity-harness synthetic out-of-order row",
                 current_state="complete",
-                state_history=state_history,
             )
         )
+        session.add_all(_transitions(request_id, state_history))
         await session.commit()
 
         result = await fetch_state_sequence(thread_id=request_id, db_session=session)
@@ -1033,9 +1048,9 @@ async def test_run_parity_verification_emits_5_rows_per_pair_all_matching(clean_
                     researcher_email="cycle8@parity.test",
                     initial_request="parity-harness cycle 8 synthetic row",
                     current_state="complete",
-                    state_history=state_history,
                 )
             )
+            session.add_all(_transitions(rid, state_history))
         await session.commit()
 
         # Mock LangSmith returning no runs → dim 2 [] vs [] → matches
@@ -1122,9 +1137,9 @@ async def test_run_parity_verification_aggregates_mixed_outcomes_across_pairs(
                 researcher_email="cycle8b@parity.test",
                 initial_request="cycle 8b pair 1 lg",
                 current_state="complete",
-                state_history=pair1_history,
             )
         )
+        session.add_all(_transitions("REQ-LG-CYCLE8B-P1", pair1_history))
         session.add(
             ResearchRequest(
                 id="REQ-A2A-CYCLE8B-P1",
@@ -1132,9 +1147,9 @@ async def test_run_parity_verification_aggregates_mixed_outcomes_across_pairs(
                 researcher_email="cycle8b@parity.test",
                 initial_request="cycle 8b pair 1 a2a",
                 current_state="complete",
-                state_history=pair1_history,
             )
         )
+        session.add_all(_transitions("REQ-A2A-CYCLE8B-P1", pair1_history))
         session.add(
             ResearchRequest(
                 id="REQ-LG-CYCLE8B-P2",
@@ -1142,9 +1157,9 @@ async def test_run_parity_verification_aggregates_mixed_outcomes_across_pairs(
                 researcher_email="cycle8b@parity.test",
                 initial_request="cycle 8b pair 2 lg",
                 current_state="complete",
-                state_history=pair2_lg_history,
             )
         )
+        session.add_all(_transitions("REQ-LG-CYCLE8B-P2", pair2_lg_history))
         session.add(
             ResearchRequest(
                 id="REQ-A2A-CYCLE8B-P2",
@@ -1152,9 +1167,9 @@ async def test_run_parity_verification_aggregates_mixed_outcomes_across_pairs(
                 researcher_email="cycle8b@parity.test",
                 initial_request="cycle 8b pair 2 a2a",
                 current_state="qa_failed",
-                state_history=pair2_a2a_history,
             )
         )
+        session.add_all(_transitions("REQ-A2A-CYCLE8B-P2", pair2_a2a_history))
         await session.commit()
 
         mock_client = MagicMock()
@@ -0,0 +1,393 @@
+"""
+Tests for the /approvals/pending cache.
+
+Pins that concurrent dashboard polls share one query, that any committed
+Approval write drops the cached payload, and that a load racing a write does not
+store what it read. The routes get their ApprovalService from the
+approval_svc dependency, so tests can override it; scope-change impact
+analysis and notification run after the response as a background task.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import approvals
+from app.database.models import Base, ResearchRequest
+from app.services import approval_service
+from app.services.approval_service import ApprovalService, get_cached_pending_approvals
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    approval_service.invalidate_pending_approvals_cache()
+    yield
+    approval_service.invalidate_pending_approvals_cache()
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        session.add(
+            ResearchRequest(
+                id="REQ-1",
+                researcher_name="Dr. Test",
+                researcher_email="test@example.org",
+                initial_request="diabetes cohort",
+                current_state="requirements_review",
+            )
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def counting_loader(payload):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"count": len(payload), "approvals": list(payload)}
+
+    return load, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_polls_share_one_load():
+    load, calls = counting_loader([{"id": 1}])
+
+    results = await asyncio.gather(*(get_cached_pending_approvals(None, load) for _ in range(5)))
+    results[0]["approvals"].append({"id": 2})  # callers get their own copy
+    again = await get_cached_pending_approvals(None, load)
+
+    assert len(calls) == 1
+    assert again == {"count": 1, "approvals": [{"id": 1}]}
+
+
+@pytest.mark.asyncio
+async def test_approval_writes_invalidate_cache(session):
+    service = ApprovalService(session)
+    load, calls = counting_loader([])
+    await get_cached_pending_approvals("requirements", load)
+
+    approval = await service.create_approval("REQ-1", "requirements", "requirements_agent", {})
+    await get_cached_pending_approvals("requirements", load)
+    await service.approve(approval.id, "reviewer@example.org")
+    await get_cached_pending_approvals("requirements", load)
+
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_load_between_flush_and_commit_is_dropped_at_commit(session):
+    service = ApprovalService(session)
+    approval = await service.create_approval("REQ-1", "requirements", "requirements_agent", {})
+    load, calls = counting_loader([{"id": approval.id}])
+
+    approval.status = "approved"
+    await session.flush()
+    # Still reads the committed (pending) row: the update is not committed yet
+    await get_cached_pending_approvals("requirements", load)
+    await session.commit()
+    await get_cached_pending_approvals("requirements", load)
+
+    assert len(calls) == 2
+
+    # A rolled-back write changes nothing and leaves no flag for the next commit
+    approval.status = "rejected"
+    await session.flush()
+    await session.rollback()
+    await session.commit()
+    await get_cached_pending_approvals("requirements", load)
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_row_queries_project_list_columns(session):
+    service = ApprovalService(session)
+    sql = await service.create_approval("REQ-1", "phenotype_sql", "phenotype_agent", {"sql": "x"})
+    await service.create_approval("REQ-1", "requirements", "requirements_agent", {})
+
+    pending = await service.get_pending_approvals_rows(approval_type="phenotype_sql")
+    for_request = await service.get_approvals_for_request_rows("REQ-1")
+
+    assert [dict(row._mapping) for row in pending] == [
+        {
+            "id": sql.id,
+            "request_id": "REQ-1",
+            "approval_type": "phenotype_sql",
+            "submitted_at": sql.submitted_at,
+            "submitted_by": "phenotype_agent",
+            "timeout_at": sql.timeout_at,
+            "approval_data": {"sql": "x"},
+        }
+    ]
+    assert [row.approval_type for row in for_request] == ["phenotype_sql", "requirements"]
+    assert set(for_request[0]._mapping) == {
+        "id",
+        "approval_type",
+        "status",
+        "submitted_at",
+        "reviewed_at",
+        "reviewed_by",
+        "review_notes",
+    }
+
+
+@pytest.mark.asyncio
+async def test_load_racing_a_write_is_not_stored():
+    async def load():
+        approval_service.invalidate_pending_approvals_cache()  # write lands mid-load
+        return {"count": 0, "approvals": []}
+
+    await get_cached_pending_approvals(None, load)
+
+    assert approval_service._pending_approvals_cache == {}
+
+
+@pytest.mark.unit
+def test_routes_use_approval_service_dependency(monkeypatch):
+    pending = MagicMock(
+        _mapping={
+            "id": 7,
+            "request_id": "REQ-1",
+            "approval_type": "requirements",
+            "submitted_at": datetime(2026, 1, 1),
+            "submitted_by": "requirements_agent",
+            "timeout_at": None,
+            "approval_data": {},
+        }
+    )
+    svc = MagicMock()
+    svc.get_pending_approvals_rows = AsyncMock(return_value=[pending])
+    svc.approve = AsyncMock()
+    app = FastAPI()
+    app.include_router(approvals.router)
+    app.dependency_overrides[approvals.approval_svc] = lambda: svc
+    client = TestClient(app)
+
+    first = client.get("/approvals/pending").json()
+    second = client.get("/approvals/pending").json()
+    client.post("/approvals/7/respond", json={"decision": "approve", "reviewer": "alice"})
+
+    assert first == second and first["approvals"][0]["id"] == 7
+    assert first["approvals"][0]["submitted_at"] == "2026-01-01T00:00:00"  # orjson encodes
+    svc.get_pending_approvals_rows.assert_awaited_once()
+    svc.approve.assert_awaited_once_with(7, "alice", None, None)
+
+
+@pytest.mark.unit
+def test_scope_change_analyzes_after_responding(monkeypatch):
+    order = []
+    coordinator = MagicMock()
+
+    async def handle_task(task, context):
+        order.append(task)
+        if task == "send_scope_change_notification":
+            raise RuntimeError("smtp down")  # logged, not surfaced
+        return {"impact_analysis": {"timeline": "+1 week"}}
+
+    coordinator.handle_task = handle_task
+    orch = MagicMock(agents={"coordinator_agent": coordinator})
+    orch.get_request_status = AsyncMock(return_value={"current_state": "phenotype_review"})
+    svc = MagicMock()
+
+    async def create_approval(**kwargs):
+        order.append(f"create_approval:{kwargs['status']}")
+        return MagicMock(id=11, status=kwargs["status"])
+
+    async def update_approval_data(self, approval_id, updates, status=None):
+        order.append(f"update_approval_data:{status}")
+        assert (approval_id, updates) == (11, {"impact_analysis": {"timeline": "+1 week"}})
+
+    @asynccontextmanager
+    async def fake_session():
+        yield MagicMock()
+
+    svc.create_approval = create_approval
+    monkeypatch.setattr(approvals, "get_db_session", fake_session)
+    monkeypatch.setattr(ApprovalService, "update_approval_data", update_approval_data)
+    app = FastAPI()
+    app.state.orchestrator = orch
+    app.include_router(approvals.router)
+    app.dependency_overrides[approvals.approval_svc] = lambda: svc
+
+    response = TestClient(app).post(
+        "/approvals/scope-change",
+        json={
+            "request_id": "REQ-1",
+            "requested_changes": {"age_min": 40},
+            "requested_by": "pi@example.org",
+            "reason": "narrow cohort",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["approval_id"] == 11 and response.json()["status"] == "analyzing"
+    assert order == [
+        "create_approval:analyzing",
+        "handle_scope_change",
+        "update_approval_data:pending",
+        "send_scope_change_notification",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_approval_data_releases_analyzing_approval(session):
+    service = ApprovalService(session)
+    approval = await service.create_approval(
+        "REQ-1", "scope_change", "pi@example.org", {"impact_analysis": {}}, status="analyzing"
+    )
+    assert await service.get_pending_approvals_rows() == []
+
+    await service.update_approval_data(approval.id, {"impact_analysis": {"cost": "low"}}, "pending")
+
+    (row,) = await service.get_pending_approvals_rows()
+    assert row.approval_data == {"impact_analysis": {"cost": "low"}}
+
+
+@pytest.mark.asyncio
+async def test_timeout_sweep_releases_stale_analyzing_approvals(session):
+    service = ApprovalService(session)
+    stale = await service.create_approval(
+        "REQ-1", "scope_change", "pi@example.org", {"impact_analysis": {}}, status="analyzing"
+    )
+    fresh = await service.create_approval(
+        "REQ-1", "scope_change", "pi@example.org", {"impact_analysis": {}}, status="analyzing"
+    )
+    stale.submitted_at = datetime.now() - approval_service.ANALYSIS_STALE_AFTER * 2
+    await session.commit()
+
+    assert await service.check_timeouts() == []
+
+    (row,) = await service.get_pending_approvals_rows()
+    assert row.id == stale.id
+    assert row.approval_data["impact_analysis"] == {"error": "Impact analysis did not finish"}
+    assert (await service.get_approval(fresh.id)).status == "analyzing"
+
+
+@pytest.mark.asyncio
+async def test_batched_request_listing_uses_one_query(session):
+    session.add(
+        ResearchRequest(
+            id="REQ-2",
+            researcher_name="Dr. Test",
+            researcher_email="test@example.org",
+            initial_request="asthma cohort",
+            current_state="requirements_review",
+        )
+    )
+    service = ApprovalService(session)
+    await service.create_approval("REQ-2", "requirements", "requirements_agent", {})
+    await service.create_approval("REQ-1", "requirements", "requirements_agent", {})
+    await service.create_approval("REQ-1", "phenotype_sql", "phenotype_agent", {})
+
+    rows = await service.get_approvals_for_requests_rows(["REQ-1", "REQ-2", "REQ-3"])
+
+    assert [(row.request_id, row.approval_type) for row in rows] == [
+        ("REQ-1", "requirements"),
+        ("REQ-1", "phenotype_sql"),
+        ("REQ-2", "requirements"),
+    ]
+
+
+@pytest.mark.unit
+def test_batched_request_route_groups_by_request():
+    svc = MagicMock()
+    svc.get_approvals_for_requests_rows = AsyncMock(
+        return_value=[
+            MagicMock(_mapping={"request_id": "REQ-1", "id": 1, "status": "pending"}),
+            MagicMock(_mapping={"request_id": "REQ-1", "id": 2, "status": "approved"}),
+        ]
+    )
+    app = FastAPI()
+    app.include_router(approvals.router)
+    app.dependency_overrides[approvals.approval_svc] = lambda: svc
+    client = TestClient(app)
+
+    body = client.get("/approvals/request", params={"ids": "REQ-1, REQ-2,REQ-1"}).json()
+
+    svc.get_approvals_for_requests_rows.assert_awaited_once_with(["REQ-1", "REQ-2"])
+    assert body == {
+        "by_request": {
+            "REQ-1": [{"id": 1, "status": "pending"}, {"id": 2, "status": "approved"}],
+            "REQ-2": [],
+        }
+    }
+    assert client.get("/approvals/request", params={"ids": " , "}).status_code == 400
+
+
+@pytest.mark.unit
+def test_scope_change_is_503_without_orchestrator():
+    app = FastAPI()
+    app.include_router(approvals.router)
+    app.dependency_overrides[approvals.approval_svc] = lambda: MagicMock()
+
+    response = TestClient(app).post(
+        "/approvals/scope-change",
+        json={
+            "request_id": "REQ-1",
+            "requested_changes": {"age_min": 40},
+            "requested_by": "pi@example.org",
+        },
+    )
+
+    assert response.status_code == 503
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "body, method, args",
+    [
+        ({"decision": "reject", "reviewer": "bob"}, "reject", (3, "bob", "Rejected")),
+        (
+            {"decision": "modify", "reviewer": "bob", "modifications": {"limit": 5}},
+            "modify",
+            (3, "bob", {"limit": 5}, None),
+        ),
+    ],
+)
+def test_respond_dispatches_decision_without_orchestrator(body, method, args):
+    svc = MagicMock(**{f"{method}": AsyncMock()})
+    app = FastAPI()
+    app.include_router(approvals.router)
+    app.dependency_overrides[approvals.approval_svc] = lambda: svc
+
+    assert TestClient(app).post("/approvals/3/respond", json=body).status_code == 200
+    getattr(svc, method).assert_awaited_once_with(*args)
+
+
+@pytest.mark.asyncio
+async def test_orchestrated_response_records_decision_once():
+    from app.langchain_orchestrator.request_facade import LangGraphRequestFacade
+
+    facade = LangGraphRequestFacade.__new__(LangGraphRequestFacade)
+    facade._ensure_initialized = AsyncMock()
+    facade._resume_workflow_after_approval = AsyncMock()
+    facade.approval_bridge = MagicMock()
+    facade.approval_bridge.record_approval_decision = AsyncMock(
+        return_value=("REQ-1", "phenotype_sql")
+    )
+
+    await facade.process_approval_response(5, "alice", "reject", notes="too broad")
+
+    facade.approval_bridge.record_approval_decision.assert_awaited_once_with(
+        approval_id=5,
+        status="rejected",
+        reviewed_by="alice",
+        review_notes="too broad",
+        modifications=None,
+    )
+    facade._resume_workflow_after_approval.assert_awaited_once_with("REQ-1", "phenotype_sql")
@@ -2,16 +2,32 @@
 
 Verifies the production behavior the refresh endpoint needs to provide:
 - Admin-role gate (Sprint 6.1 contract)
-- REFRESH MATERIALIZED VIEW CONCURRENTLY (no reader downtime)
-- Parallel execution via asyncio.gather (7 views in ~max(per-view), not sum)
+- REFRESH MATERIALIZED VIEW CONCURRENTLY (no reader downtime), falling back
+  to a plain refresh for views without a unique index
+- Parallel execution via asyncio.gather (7 views in ~max(per-view), not sum),
+  capped at MV_REFRESH_CONCURRENCY with metadata writes serialized
+- iter_refresh_views(): results in completion order, for streaming callers
 - Per-view error isolation (one bad view doesn't abort the others)
+- view_exists(): one cached pg_matviews probe per name
+- views_etag(): changes with the metadata rows, not with live counts
 """
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 
+def _fake_hapi(has_unique_index):
+    """execute_query stand-in: answers the CONCURRENTLY-eligibility probe, else a count"""
+
+    async def execute_query(sql, params=None):
+        if "pg_matviews" in sql:
+            return [{"ispopulated": True, "has_unique_index": has_unique_index}]
+        return [{"count": 1, "size_bytes": 8192}]
+
+    return execute_query
+
+
 @pytest.mark.asyncio
 async def test_refresh_view_uses_concurrently():
     """Issue #18 + decision 8A: REFRESH MATERIALIZED VIEW must include
@@ -27,7 +43,7 @@ async def test_refresh_view_uses_concurrently():
     svc = MaterializedViewService.__new__(MaterializedViewService)
     svc.SCHEMA_NAME = "sqlonfhir"
     svc.db_client = AsyncMock()
-    svc.db_client.execute_query = AsyncMock(return_value=[{"count": 1}])
+    svc.db_client.execute_query = AsyncMock(side_effect=_fake_hapi(has_unique_index=True))
     svc._update_metadata = AsyncMock()
 
     await svc.refresh_view("patient_simple")
@@ -123,3 +139,146 @@ async def test_refresh_all_endpoint_requires_admin_role():
             f"Expected 401 or 403 from unauth refresh-all; got {response.status_code}. "
             f"Endpoint exists but lacks admin-role gate (Depends(require_role('admin')))."
         )
+
+
+@pytest.mark.asyncio
+async def test_refresh_all_views_bounds_concurrency_and_serializes_metadata(monkeypatch):
+    """At most MV_REFRESH_CONCURRENCY refreshes run at once, and their
+    metadata writes never overlap on the service's single AsyncSession."""
+    import asyncio
+
+    from app.services import materialized_view_service
+    from app.services.materialized_view_service import MaterializedViewService
+
+    monkeypatch.setattr(materialized_view_service, "MV_REFRESH_CONCURRENCY", 2)
+    in_flight = {"refresh": 0, "refresh_peak": 0, "session": 0, "session_peak": 0}
+
+    async def execute_query(sql, *args):
+        if sql.startswith("REFRESH"):
+            in_flight["refresh"] += 1
+            in_flight["refresh_peak"] = max(in_flight["refresh_peak"], in_flight["refresh"])
+            await asyncio.sleep(0.02)
+            in_flight["refresh"] -= 1
+        return [{"count": 1, "size_bytes": 1}]
+
+    async def session_execute(stmt):
+        in_flight["session"] += 1
+        in_flight["session_peak"] = max(in_flight["session_peak"], in_flight["session"])
+        await asyncio.sleep(0.005)
+        in_flight["session"] -= 1
+        return MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+
+    session = MagicMock(execute=session_execute, commit=AsyncMock(), rollback=AsyncMock())
+    svc = MaterializedViewService(MagicMock(execute_query=execute_query), session)
+    svc.list_views = AsyncMock(return_value=[{"view_name": f"view_{i}"} for i in range(6)])
+
+    summary = await svc.refresh_all_views()
+
+    assert summary["success"] == 6
+    assert in_flight["refresh_peak"] == 2
+    assert in_flight["session_peak"] == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_refresh_views_yields_in_completion_order():
+    """Fast views are reported before slow ones finish; _refresh_views still
+    returns input order and converts escaped exceptions to failures."""
+    import asyncio
+
+    from app.services.materialized_view_service import MaterializedViewService
+
+    delays = {"slow_view": 0.05, "fast_view": 0.0}
+
+    async def refresh_view(view_name):
+        if view_name == "broken_view":
+            raise RuntimeError("lock timeout")
+        await asyncio.sleep(delays[view_name])
+        return {"view_name": view_name, "success": True}
+
+    svc = MaterializedViewService.__new__(MaterializedViewService)
+    svc.refresh_view = refresh_view
+    names = ["slow_view", "broken_view", "fast_view"]
+
+    streamed = [r["view_name"] async for r in svc.iter_refresh_views(names)]
+    ordered = await svc._refresh_views(names)
+
+    assert streamed[-1] == "slow_view"
+    assert [r["view_name"] for r in ordered] == names
+    assert ordered[1] == {"view_name": "broken_view", "success": False, "error": "lock timeout"}
+
+
+@pytest.mark.asyncio
+async def test_view_exists_is_one_cached_lookup(monkeypatch):
+    """view_exists() runs one parameterized pg_matviews probe per name and
+    reuses the answer (found or not) until MV_EXISTS_TTL or invalidation."""
+    from app.services import materialized_view_service
+    from app.services.materialized_view_service import MaterializedViewService
+
+    monkeypatch.setattr(materialized_view_service, "_view_exists_cache", {})
+    svc = MaterializedViewService.__new__(MaterializedViewService)
+    svc.db_client = MagicMock()
+    svc.db_client.execute_query = AsyncMock(side_effect=lambda sql, params: [{"?column?": 1}])
+
+    assert await svc.view_exists("patient_simple")
+    assert await svc.view_exists("patient_simple")
+    svc.db_client.execute_query.side_effect = lambda sql, params: []
+    assert not await svc.view_exists("missing_view")
+    assert not await svc.view_exists("missing_view")
+
+    assert svc.db_client.execute_query.await_count == 2
+    assert svc.db_client.execute_query.call_args.args[1] == ["sqlonfhir", "missing_view"]
+
+    materialized_view_service.invalidate_view_exists_cache("patient_simple")
+    assert not await svc.view_exists("patient_simple")
+    assert svc.db_client.execute_query.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_view_falls_back_without_unique_index():
+    """A view with no unique index cannot be refreshed CONCURRENTLY; it gets a
+    plain REFRESH instead of failing, and the result says so."""
+    from app.services.materialized_view_service import MaterializedViewService
+
+    svc = MaterializedViewService.__new__(MaterializedViewService)
+    svc.SCHEMA_NAME = "sqlonfhir"
+    svc.db_client = MagicMock()
+    svc.db_client.execute_query = AsyncMock(side_effect=_fake_hapi(has_unique_index=False))
+    svc._update_metadata = AsyncMock()
+
+    result = await svc.refresh_view("patient_simple")
+
+    sql_calls = [call.args[0] for call in svc.db_client.execute_query.call_args_list]
+    assert "REFRESH MATERIALIZED VIEW sqlonfhir.patient_simple" in sql_calls
+    assert result["success"] and result["concurrent"] is False
+
+
+@pytest.mark.asyncio
+async def test_views_etag_tracks_metadata_not_live_counts():
+    from datetime import datetime
+
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database.models import Base, MaterializedViewMetadata
+    from app.services.materialized_view_service import MaterializedViewService
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        session.add(MaterializedViewMetadata(view_name="patient_simple"))
+        await session.commit()
+        db_client = MagicMock()
+        db_client.execute_query = AsyncMock(return_value=[{"matviewname": "patient_simple"}])
+        svc = MaterializedViewService(db_client, session)
+
+        before = await svc.views_etag()
+        assert await svc.views_etag() == before
+
+        metadata = await session.get(MaterializedViewMetadata, 1)
+        metadata.last_refreshed_at = datetime(2026, 1, 1)
+        await session.commit()
+
+        assert await svc.views_etag() != before
+        assert before.startswith('W/"')
+    await engine.dispose()
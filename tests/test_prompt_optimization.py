@@ -217,6 +217,35 @@ class TestPromptCachingWireLevel:
         )
         assert first_block["cache_control"] == {"type": "ephemeral"}
 
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key-for-mock"})
+    async def test_extract_requirements_marks_newest_history_turn_for_caching(self):
+        """The conversation history reaches the wire as one block per turn, with a
+        second cache breakpoint on the newest turn so the next turn's prefix hits."""
+        from anthropic.resources.messages.messages import AsyncMessages
+
+        captured_kwargs = {}
+
+        async def capture_create(self, *args, **kwargs):
+            captured_kwargs.update(kwargs)
+            raise RuntimeError("captured")
+
+        history = [
+            {"role": "user", "content": "I need diabetic patients"},
+            {"role": "assistant", "content": "What is your IRB number?"},
+        ]
+        with patch.object(AsyncMessages, "create", new=capture_create):
+            with pytest.raises(RuntimeError):
+                await LLMClient().extract_requirements(history, {"phi_level": "de-identified"})
+
+        assert captured_kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+        user_blocks = captured_kwargs["messages"][0]["content"]
+        assert isinstance(user_blocks, list)
+        breakpoints = [i for i, block in enumerate(user_blocks) if "cache_control" in block]
+        assert breakpoints == [2]
+        assert "What is your IRB number?" in user_blocks[2]["text"]
+        assert "Current extracted requirements" in user_blocks[3]["text"]
+
 
 class TestPromptCachingIntegration:
     """Integration tests: Verify caching works with real LLM calls"""
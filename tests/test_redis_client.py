@@ -390,6 +390,26 @@ async def test_flush_all(redis_client, sample_patient):
     print("\n✅ TEST PASSED")
 
 
+# ============================================================================
+# Test 10: Cohort Patient IDs
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_cohort_patient_ids_round_trip(redis_client):
+    """Test caching a generated cohort with TTL"""
+    assert await redis_client.get_cohort_patient_ids("abc123") is None
+
+    success = await redis_client.set_cohort_patient_ids("abc123", ["p1", "p2"], ttl_seconds=60)
+    assert success, "❌ Failed to cache cohort"
+
+    assert await redis_client.get_cohort_patient_ids("abc123") == ["p1", "p2"]
+
+    client = await redis_client.connect()
+    ttl = await client.ttl("cohort:abc123")
+    assert 0 < ttl <= 60, f"❌ Unexpected cohort TTL: {ttl}"
+
+
 # ============================================================================
 # Run all tests
 # ============================================================================
@@ -0,0 +1,118 @@
+"""
+Tests for the speed layer's Redis layout.
+
+Resources are hashes (data / ts / type) so reads HGET the payload
+directly; scan_recent_resources(since=...) reads only the ids the
+idx:fhir:<type> sorted set lists at or after since, and drops index
+entries whose cached resource has expired. Both paths stop at
+cache_config.max_scan_results. Uses fakeredis, like the audit pipeline
+tests.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import fakeredis.aioredis
+import pytest
+
+from app.cache.redis_client import RedisClient
+
+
+@pytest.fixture
+async def redis_client():
+    client = RedisClient()
+    client._client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    yield client
+    await client._client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_since_reads_only_recent_index_entries(redis_client):
+    await redis_client.set_fhir_resource("Patient", "old", {"id": "old"})
+    await redis_client._client.zadd("idx:fhir:patient", {"old": 0})  # cached long ago
+    await redis_client.set_fhir_resource("Patient", "new", {"id": "new"})
+    await redis_client.set_fhir_resource("Condition", "c1", {"id": "c1"})
+
+    recent = await redis_client.scan_recent_resources(
+        "Patient", since=datetime.utcnow() - timedelta(minutes=1)
+    )
+    everything = await redis_client.scan_recent_resources("Patient")
+
+    assert recent == [{"id": "new"}]
+    assert sorted(r["id"] for r in everything) == ["new", "old"]
+
+
+@pytest.mark.asyncio
+async def test_expired_and_deleted_resources_leave_the_index(redis_client):
+    since = datetime.utcnow() - timedelta(minutes=1)
+    for resource_id in ("a", "b", "c"):
+        await redis_client.set_fhir_resource("Patient", resource_id, {"id": resource_id})
+    await redis_client._client.delete("fhir:patient:a")  # TTL ran out
+    await redis_client.delete_resource("Patient", "b")
+
+    assert await redis_client.scan_recent_resources("Patient", since=since) == [{"id": "c"}]
+    assert await redis_client._client.zrange("idx:fhir:patient", 0, -1) == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_writes_prune_index_entries_older_than_the_ttl(redis_client):
+    raw = redis_client._client
+    two_hours_ago = time.time() - 2 * 3600
+    await raw.zadd("idx:fhir:patient", {"gone": two_hours_ago - 60, "live": two_hours_ago + 60})
+
+    await redis_client.set_fhir_resource("Patient", "p1", {"id": "p1"}, ttl_hours=2)
+
+    assert await raw.zrange("idx:fhir:patient", 0, -1) == ["live", "p1"]
+
+
+@pytest.mark.asyncio
+async def test_resources_are_hashes_and_replace_legacy_strings(redis_client):
+    raw = redis_client._client
+    await raw.set("fhir:patient:p1", '{"resource": {"id": "p1"}}')  # pre-hash entry
+
+    assert await redis_client.get_fhir_resource("Patient", "p1") is None
+    assert await redis_client.scan_recent_resources("Patient") == []
+
+    assert await redis_client.set_fhir_resource("Patient", "p1", {"id": "p1"}, ttl_hours=1)
+
+    stored = await raw.hgetall("fhir:patient:p1")
+    assert stored["data"] == '{"id":"p1"}' and stored["type"] == "Patient"
+    assert int(stored["ts"]) > 0
+    assert 0 < await raw.ttl("fhir:patient:p1") <= 3600
+    assert await redis_client.get_fhir_resource("Patient", "p1") == {"id": "p1"}
+
+
+@pytest.mark.asyncio
+async def test_connect_uses_bounded_blocking_pool_shared_per_process(monkeypatch):
+    from app.cache import redis_client as redis_client_module
+    from app.cache.cache_config import cache_config
+
+    monkeypatch.setattr(redis_client_module, "_redis_client", None)
+    shared = redis_client_module.get_redis_client()
+    assert redis_client_module.get_redis_client() is shared
+
+    client = await shared.connect()
+
+    pool = client.connection_pool
+    assert type(pool).__name__ == "BlockingConnectionPool"
+    assert pool.max_connections == cache_config.max_connections
+    assert pool.timeout == cache_config.connection_timeout_seconds
+
+    await redis_client_module.close_redis_client()
+    assert redis_client_module._redis_client is None
+
+
+@pytest.mark.asyncio
+async def test_scans_stop_at_max_scan_results(redis_client, monkeypatch):
+    from app.cache.redis_client import cache_config
+
+    since = datetime.utcnow() - timedelta(minutes=1)
+    for i in range(5):
+        await redis_client.set_fhir_resource("Patient", f"p{i}", {"id": f"p{i}"})
+        await redis_client._client.zadd("idx:fhir:patient", {f"p{i}": 10**10 + i})
+    monkeypatch.setattr(cache_config, "scan_batch_size", 2)
+    monkeypatch.setattr(cache_config, "max_scan_results", 3)
+
+    assert len(await redis_client.scan_recent_resources("Patient")) == 3
+    recent = await redis_client.scan_recent_resources("Patient", since=since)
+    assert recent == [{"id": "p2"}, {"id": "p3"}, {"id": "p4"}]  # newest, oldest first
@@ -0,0 +1,125 @@
+"""
+Tests for streaming the requirements conversation.
+
+Pins that next_question text is decoded out of the streamed JSON as it
+arrives, that the parsed result still comes back whole, and that the SSE
+route sends question deltas before its terminal `final` event.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import research
+from app.api.dependencies import get_requirements_agent
+from app.utils import llm_client as llm_client_module
+from app.utils.llm_client import LLMClient, _StringFieldStreamer
+
+ANALYSIS = {
+    "next_question": 'Which "HbA1c" threshold\nshould we use?',
+    "extracted_requirements": {"inclusion_criteria": ["type 2 diabetes"]},
+    "missing_fields": ["time_period"],
+    "completeness_score": 0.4,
+    "ready_for_submission": False,
+}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7])
+def test_string_field_streamer_decodes_across_chunk_boundaries(chunk_size):
+    text = json.dumps(ANALYSIS, ensure_ascii=True)
+    streamer = _StringFieldStreamer("next_question")
+
+    decoded = "".join(
+        streamer.feed(text[i : i + chunk_size]) for i in range(0, len(text), chunk_size)
+    )
+
+    assert decoded == ANALYSIS["next_question"]
+
+
+@pytest.mark.unit
+async def test_extract_requirements_streams_question_and_returns_full_analysis(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    text = json.dumps(ANALYSIS)
+
+    async def astream(messages):
+        for i in range(0, len(text), 5):
+            yield MagicMock(content=text[i : i + 5])
+
+    chat_cls = MagicMock()
+    chat_cls.return_value.astream = astream
+    history = [{"role": "user", "content": "diabetes cohort"}]
+    streamed, cached = [], []
+
+    with patch.object(llm_client_module, "ChatAnthropic", chat_cls):
+        client = LLMClient()
+        result = await client.extract_requirements(
+            history, {}, on_question_delta=AsyncMock(side_effect=streamed.append)
+        )
+        await client.extract_requirements(
+            history, {}, on_question_delta=AsyncMock(side_effect=cached.append)
+        )
+
+    assert result == ANALYSIS
+    assert len(streamed) > 1
+    assert "".join(streamed) == ANALYSIS["next_question"]
+    assert cached == [ANALYSIS["next_question"]]  # cache hit reports the question once
+
+
+@pytest.fixture
+def client(monkeypatch):
+    request = MagicMock(initial_request="diabetes cohort", researcher_email="pi@example.org")
+    session = MagicMock()
+    session.execute = AsyncMock(
+        return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=request))
+    )
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    monkeypatch.setattr(research, "get_db_session", fake_session)
+    app = FastAPI()
+    app.include_router(research.router)
+    return TestClient(app)
+
+
+@pytest.mark.unit
+def test_stream_route_sends_question_deltas_then_final(client, monkeypatch):
+    agent = MagicMock()
+
+    async def execute_task(task, context):
+        for part in ("Which ", "threshold?"):
+            await context["on_question_delta"](part)
+        return {"requirements_complete": False, "next_question": "Which threshold?"}
+
+    agent.execute_task = execute_task
+    client.app.dependency_overrides[get_requirements_agent] = lambda: agent
+
+    response = client.post(
+        "/research/REQ-1/requirements/stream", json={"user_response": "HbA1c above 7"}
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [f for f in response.text.split("\n\n") if f]
+    events = [(f.split("\n")[0][7:], json.loads(f.split("\n")[1][6:])) for f in frames]
+    assert events == [
+        ("question", {"delta": "Which "}),
+        ("question", {"delta": "threshold?"}),
+        ("final", {"requirements_complete": False, "next_question": "Which threshold?"}),
+    ]
+
+
+@pytest.mark.unit
+def test_requirements_agent_is_created_once_per_app():
+    app = FastAPI()
+    request = MagicMock(app=app)
+
+    agent = get_requirements_agent(request)
+
+    assert app.state.requirements_agent is agent
+    assert get_requirements_agent(request) is agent
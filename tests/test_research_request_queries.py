@@ -0,0 +1,201 @@
+"""
+Tests for the /research status and list queries.
+
+Both routes select only the columns they return (no full ResearchRequest
+hydration) and keep their response shapes, as does /process with the
+columns it hands the orchestrator; the status route reads the
+history from state_transitions rows, oldest first; datetimes are encoded by
+orjson in the same ISO format isoformat() produced.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import research
+from app.database.models import Base, ResearchRequest, StateTransition
+
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def session_scope():
+        async with factory() as session:
+            yield session
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            for i, created in enumerate([datetime(2026, 1, 1), datetime(2026, 2, 1)]):
+                session.add(
+                    ResearchRequest(
+                        id=f"REQ-{i}",
+                        researcher_name="Dr. Test",
+                        researcher_email="test@example.org",
+                        initial_request="cohort",
+                        current_state="requirements_review",
+                        created_at=created,
+                    )
+                )
+                session.add_all(
+                    [
+                        StateTransition(
+                            request_id=f"REQ-{i}",
+                            state="requirements_review",
+                            timestamp=datetime(2026, 3, 1),
+                        ),
+                        StateTransition(
+                            request_id=f"REQ-{i}",
+                            state="new_request",
+                            timestamp=created,
+                            notes="Request submitted",
+                        ),
+                    ]
+                )
+            await session.commit()
+
+    monkeypatch.setattr(research, "get_db_session", session_scope)
+    app = FastAPI()
+    app.include_router(research.router)
+    with TestClient(app) as test_client:
+        test_client.portal.call(seed)
+        yield test_client
+        test_client.portal.call(engine.dispose)
+
+
+@pytest.mark.unit
+def test_list_returns_projected_rows_newest_first(client):
+    body = client.get("/research/").json()
+
+    assert body["count"] == 2
+    assert body["requests"][0] == {
+        "request_id": "REQ-1",
+        "researcher_name": "Dr. Test",
+        "current_state": "requirements_review",
+        "current_agent": None,
+        "created_at": "2026-02-01T00:00:00",
+    }
+
+
+@pytest.mark.unit
+def test_status_returns_projected_columns(client):
+    body = client.get("/research/REQ-0").json()
+
+    assert body["researcher_email"] == "test@example.org"
+    assert body["state_history"] == [
+        {"state": "new_request", "timestamp": "2026-01-01T00:00:00", "notes": "Request submitted"},
+        {"state": "requirements_review", "timestamp": "2026-03-01T00:00:00"},
+    ]
+    assert set(body) == {
+        "request_id",
+        "researcher_name",
+        "researcher_email",
+        "irb_number",
+        "current_state",
+        "current_agent",
+        "created_at",
+        "updated_at",
+        "agents_involved",
+        "state_history",
+    }
+    assert client.get("/research/REQ-9").status_code == 404
+
+
+@pytest.mark.unit
+def test_process_passes_initial_request_to_orchestrator(client):
+    from unittest.mock import AsyncMock, MagicMock
+
+    from app.api.dependencies import get_orchestrator
+
+    orchestrator = MagicMock(route_task=AsyncMock(return_value={"ok": True}))
+    client.app.dependency_overrides[get_orchestrator] = lambda: orchestrator
+
+    response = client.post("/research/process/REQ-0")
+    missing = client.post("/research/process/REQ-9")
+
+    assert response.status_code == 200
+    assert response.json()["result"] == {"ok": True}
+    context = orchestrator.route_task.await_args.kwargs["context"]
+    assert context == {
+        "request_id": "REQ-0",
+        "initial_request": "cohort",
+        "researcher_email": "test@example.org",
+    }
+    assert missing.status_code == 404
+
+
+@pytest.mark.unit
+def test_new_request_ids_sort_by_creation_time(monkeypatch):
+    import re
+
+    from app.database import models
+
+    class Clock:
+        moments = iter([datetime(2026, 5, 17, 9, 0, 0), datetime(2026, 5, 17, 14, 32, 5)])
+
+        @classmethod
+        def now(cls):
+            return next(cls.moments)
+
+    monkeypatch.setattr(models, "datetime", Clock)
+
+    earlier, later = models.new_request_id(), models.new_request_id()
+
+    assert re.fullmatch(r"REQ-20260517-090000-[0-9A-F]{8}", earlier)
+    assert later.startswith("REQ-20260517-143205-") and later > earlier
+
+    # Pre-timestamp IDs keep their day; within it the random suffix decides
+    assert "REQ-20260516-FFFFFFFF" < earlier
+    assert earlier < "REQ-20260517-1200ABCD" < later < "REQ-20260517-A1B2C3D4"
+
+
+@pytest.mark.asyncio
+async def test_facade_state_sync_appends_one_transition_per_change(monkeypatch):
+    from sqlalchemy import select
+
+    from app.langchain_orchestrator import request_facade
+    from app.langchain_orchestrator.request_facade import LangGraphRequestFacade
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    @asynccontextmanager
+    async def session_scope():
+        async with factory() as session:
+            yield session
+
+    monkeypatch.setattr(request_facade, "get_db_session", session_scope)
+    async with factory() as session:
+        session.add(
+            ResearchRequest(
+                id="REQ-1",
+                researcher_name="Dr. Test",
+                researcher_email="test@example.org",
+                initial_request="cohort",
+                current_state="new_request",
+            )
+        )
+        await session.commit()
+
+    facade = LangGraphRequestFacade.__new__(LangGraphRequestFacade)
+    for state in ("requirements_gathering", "requirements_gathering", "requirements_review"):
+        await facade._update_request_from_state("REQ-1", {"current_state": state})
+
+    async with factory() as session:
+        states = (await session.scalars(select(StateTransition.state))).all()
+        request = await session.get(ResearchRequest, "REQ-1")
+    await engine.dispose()
+
+    assert states == ["requirements_gathering", "requirements_review"]
+    assert request.current_state == "requirements_review"
@@ -0,0 +1,32 @@
+"""
+Tests for POST /sql_query.
+
+The route takes its SQLonFHIRAdapter from the get_sql_adapter dependency,
+which hands every request the same process-wide instance.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import sql_on_fhir
+
+
+@pytest.mark.unit
+def test_sql_query_reuses_one_adapter():
+    sql_on_fhir.get_sql_adapter.cache_clear()
+    assert sql_on_fhir.get_sql_adapter() is sql_on_fhir.get_sql_adapter()
+    sql_on_fhir.get_sql_adapter.cache_clear()
+
+    adapter = MagicMock()
+    adapter.execute_sql = AsyncMock(return_value=[{"n": 1}])
+    app = FastAPI()
+    app.include_router(sql_on_fhir.router)
+    app.dependency_overrides[sql_on_fhir.get_sql_adapter] = lambda: adapter
+
+    response = TestClient(app).post("/sql_query", json={"sql": "SELECT 1 AS n"})
+
+    assert response.json() == {"rows": [{"n": 1}]}
+    adapter.execute_sql.assert_awaited_once_with("SELECT 1 AS n")